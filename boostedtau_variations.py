@@ -4,6 +4,8 @@ from .producers import scalefactors as scalefactors
 from .producers import muons as muons
 from .producers import electrons as electrons
 from .producers import boostedtaus as boostedtaus
+from .constants import TAU_ES_VARIATIONS_IN_ONE_PASS
+from .tau_variations import tes_shift_config
 
 
 def add_boostedtauVariations(configuration: Configuration, sample: str):
@@ -401,11 +403,21 @@ def add_boostedtauVariations(configuration: Configuration, sample: str):
     #########################
     # TES Shifts
     #########################
+    # with TAU_ES_VARIATIONS_IN_ONE_PASS, the shifts select the variations
+    # evaluated by boostedtaus.boostedTauEnergyCorrectionVariations
+    if TAU_ES_VARIATIONS_IN_ONE_PASS:
+        boosted_tau_pt_correction_producer = boostedtaus.boostedTauPtCorrectionSelection
+    else:
+        boosted_tau_pt_correction_producer = boostedtaus.boostedTauPtCorrection
     configuration.add_shift(
         SystematicShift(
             name="boostedtauEs1prong0pizeroDown",
-            shift_config={("et", "mt", "tt"): {"boostedtau_ES_shift_DM0": "down"}},
-            producers={("et", "mt", "tt"): boostedtaus.boostedTauPtCorrection},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config(
+                    "boostedtauEs1prong0pizeroDown", "boostedtau_ES_shift_DM0", "down", "boostedtau_ES_variation"
+                )
+            },
+            producers={("et", "mt", "tt"): boosted_tau_pt_correction_producer},
             ignore_producers={
                 "et": [boostedtaus.boostedLVEl1, electrons.VetoElectrons_boosted],
                 "mt": [boostedtaus.boostedLVMu1, muons.VetoMuons_boosted],
@@ -416,8 +428,12 @@ def add_boostedtauVariations(configuration: Configuration, sample: str):
     configuration.add_shift(
         SystematicShift(
             name="boostedtauEs1prong0pizeroUp",
-            shift_config={("et", "mt", "tt"): {"boostedtau_ES_shift_DM0": "up"}},
-            producers={("et", "mt", "tt"): boostedtaus.boostedTauPtCorrection},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config(
+                    "boostedtauEs1prong0pizeroUp", "boostedtau_ES_shift_DM0", "up", "boostedtau_ES_variation"
+                )
+            },
+            producers={("et", "mt", "tt"): boosted_tau_pt_correction_producer},
             ignore_producers={
                 "et": [boostedtaus.boostedLVEl1, electrons.VetoElectrons_boosted],
                 "mt": [boostedtaus.boostedLVMu1, muons.VetoMuons_boosted],
@@ -428,8 +444,12 @@ def add_boostedtauVariations(configuration: Configuration, sample: str):
     configuration.add_shift(
         SystematicShift(
             name="boostedtauEs1prong1pizeroDown",
-            shift_config={("et", "mt", "tt"): {"boostedtau_ES_shift_DM1": "down"}},
-            producers={("et", "mt", "tt"): boostedtaus.boostedTauPtCorrection},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config(
+                    "boostedtauEs1prong1pizeroDown", "boostedtau_ES_shift_DM1", "down", "boostedtau_ES_variation"
+                )
+            },
+            producers={("et", "mt", "tt"): boosted_tau_pt_correction_producer},
             ignore_producers={
                 "et": [boostedtaus.boostedLVEl1, electrons.VetoElectrons_boosted],
                 "mt": [boostedtaus.boostedLVMu1, muons.VetoMuons_boosted],
@@ -440,8 +460,12 @@ def add_boostedtauVariations(configuration: Configuration, sample: str):
     configuration.add_shift(
         SystematicShift(
             name="boostedtauEs1prong1pizeroUp",
-            shift_config={("et", "mt", "tt"): {"boostedtau_ES_shift_DM1": "up"}},
-            producers={("et", "mt", "tt"): boostedtaus.boostedTauPtCorrection},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config(
+                    "boostedtauEs1prong1pizeroUp", "boostedtau_ES_shift_DM1", "up", "boostedtau_ES_variation"
+                )
+            },
+            producers={("et", "mt", "tt"): boosted_tau_pt_correction_producer},
             ignore_producers={
                 "et": [boostedtaus.boostedLVEl1, electrons.VetoElectrons_boosted],
                 "mt": [boostedtaus.boostedLVMu1, muons.VetoMuons_boosted],
@@ -452,8 +476,12 @@ def add_boostedtauVariations(configuration: Configuration, sample: str):
     configuration.add_shift(
         SystematicShift(
             name="boostedtauEs3prong0pizeroDown",
-            shift_config={("et", "mt", "tt"): {"boostedtau_ES_shift_DM10": "down"}},
-            producers={("et", "mt", "tt"): boostedtaus.boostedTauPtCorrection},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config(
+                    "boostedtauEs3prong0pizeroDown", "boostedtau_ES_shift_DM10", "down", "boostedtau_ES_variation"
+                )
+            },
+            producers={("et", "mt", "tt"): boosted_tau_pt_correction_producer},
             ignore_producers={
                 "et": [boostedtaus.boostedLVEl1, electrons.VetoElectrons_boosted],
                 "mt": [boostedtaus.boostedLVMu1, muons.VetoMuons_boosted],
@@ -464,8 +492,12 @@ def add_boostedtauVariations(configuration: Configuration, sample: str):
     configuration.add_shift(
         SystematicShift(
             name="boostedtauEs3prong0pizeroUp",
-            shift_config={("et", "mt", "tt"): {"boostedtau_ES_shift_DM10": "up"}},
-            producers={("et", "mt", "tt"): boostedtaus.boostedTauPtCorrection},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config(
+                    "boostedtauEs3prong0pizeroUp", "boostedtau_ES_shift_DM10", "up", "boostedtau_ES_variation"
+                )
+            },
+            producers={("et", "mt", "tt"): boosted_tau_pt_correction_producer},
             ignore_producers={
                 "et": [boostedtaus.boostedLVEl1, electrons.VetoElectrons_boosted],
                 "mt": [boostedtaus.boostedLVMu1, muons.VetoMuons_boosted],
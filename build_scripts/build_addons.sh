@@ -0,0 +1,106 @@
+#!/usr/bin/env bash
+
+# Build the cpp_addons as shared library and print the CMake arguments of the
+# CROWN build, one per line, e.g.
+#
+#   mapfile -t addons_args <<< "$( bash build_addons.sh <crown_build_dir> )"
+#   cmake .. -DANALYSIS=... "${addons_args[@]}"
+#
+# If "false" is given as second argument, the library is not built and the
+# arguments remove the library from a build directory configured before.
+
+
+cached_value () {
+    # print the value of a variable in the CMake cache of a build directory
+    local crown_build_dir="${1}"
+    local name="${2}"
+    local cache_file="${crown_build_dir}/CMakeCache.txt"
+    if [[ -f "${cache_file}" ]]; then
+        sed -n "s/^${name}:[A-Z]*=//p" "${cache_file}"
+    fi
+}
+
+trim () {
+    # print a string without leading and trailing whitespace
+    local value="${1}"
+    value="${value#"${value%%[![:space:]]*}"}"
+    value="${value%"${value##*[![:space:]]}"}"
+    echo "${value}"
+}
+
+addons_cmake_args () {
+    # print the CMake arguments for building the executables with or without
+    # the prebuilt library; the flags set by the user are kept and only the
+    # define and the linker flags of the library are added or removed, as the
+    # cached values of earlier runs persist in the build directory
+    local crown_build_dir="${1}"
+    local prebuilt_addons="${2}"
+    local lib_dir="${crown_build_dir}/lib"
+    local addons_define="-DXYH_PREBUILT_ADDONS"
+    local addons_libraries="-L${lib_dir} -Wl,-rpath,${lib_dir} -lXYHADDONS"
+
+    local cxx_flags="$( cached_value "${crown_build_dir}" CMAKE_CXX_FLAGS )"
+    local libraries="$( cached_value "${crown_build_dir}" CMAKE_CXX_STANDARD_LIBRARIES )"
+    if [[ ! -f "${crown_build_dir}/CMakeCache.txt" ]]; then
+        # CMake initializes the flags from the environment in the first run
+        cxx_flags="${CXXFLAGS}"
+    fi
+    cxx_flags="$( trim "${cxx_flags//"${addons_define}"/}" )"
+    libraries="$( trim "${libraries//"${addons_libraries}"/}" )"
+    if [[ "${prebuilt_addons}" == true ]]; then
+        cxx_flags="$( trim "${cxx_flags} ${addons_define}" )"
+        libraries="$( trim "${libraries} ${addons_libraries}" )"
+    fi
+    echo "-DCMAKE_CXX_FLAGS=${cxx_flags}"
+    echo "-DCMAKE_CXX_STANDARD_LIBRARIES=${libraries}"
+}
+
+build_addons () {
+    # get paths of the script and its directory
+    local this_file="$( echo "${BASH_SOURCE[0]:-${0}}" )"
+    local this_dir="$( cd "$( dirname "${this_file}" )" && pwd )"
+
+    # the library is installed to the lib directory of the given CROWN build
+    # directory
+    local crown_build_dir="${1}"
+
+    # get the CROWN directories, the library is built once for all eras
+    local crown_dir="$( cd "${this_dir}/../../.." && pwd )"
+    local addons_build_dir="${crown_dir}/build_xyh_addons"
+    local addons_source_dir="$( cd "${this_dir}/../cpp_addons/lib" && pwd )"
+    local cores="16"
+
+    # create the build directory if it does not exist
+    if [[ ! -d "${addons_build_dir}" ]]; then
+        mkdir -p "${addons_build_dir}"
+    fi
+
+    # configure and compile the library, make only recompiles the changed
+    # sources of the cpp_addons
+    (
+        cd "${addons_build_dir}" \
+        && cmake "${addons_source_dir}" \
+        && make -j "${cores}" \
+        && cmake --install . --prefix "${crown_build_dir}"
+    ) || return "${?}"
+}
+
+main () {
+    # get input parameters from the command line
+    local crown_build_dir="${1}"
+    local prebuilt_addons="${2:-true}"
+    if [[ -z "${crown_build_dir}" ]]; then
+        echo "usage: build_addons.sh <crown_build_dir> [true|false]" >&2
+        return 1
+    fi
+
+    # the output of the build is redirected to stderr, as stdout holds the
+    # CMake arguments
+    if [[ "${prebuilt_addons}" == true ]]; then
+        build_addons "${crown_build_dir}" >&2 || return "${?}"
+    fi
+    addons_cmake_args "${crown_build_dir}" "${prebuilt_addons}"
+}
+
+
+main "${@}"
@@ -11,6 +11,7 @@ main () {
     local channels="${2:-all}"
     local debug="${3:-false}"
     local steps="${4:-all}"
+    local prebuilt_addons="${5:-true}"
 
     # get the CROWN directories
     local crown_dir="$( cd "${this_dir}/../../.." && pwd )"
@@ -50,9 +51,16 @@ main () {
 
     # configure and compile the project
     if [[ "${steps}" == "build" || "${steps}" == "all" ]]; then
+        # build the cpp_addons once as shared library, which is linked by the
+        # executables instead of compiling the addons for each of them, see
+        # build_addons.sh
+        local addons_output
+        addons_output="$( bash "${this_dir}/build_addons.sh" "${crown_build_dir}" "${prebuilt_addons}" )" || return "${?}"
+        local addons_args=()
+        mapfile -t addons_args <<< "${addons_output}"
         (
             cd "${crown_build_dir}" \
-            && cmake .. -DANALYSIS="${analysis}" -DCONFIG="${config}" -DERAS="${era}" -DSAMPLES="${samples}" -DSCOPES="${channels}" -DSHIFTS="${shifts}" -DTHREADS="${threads}" -DDEBUG="${debug}" \
+            && cmake .. -DANALYSIS="${analysis}" -DCONFIG="${config}" -DERAS="${era}" -DSAMPLES="${samples}" -DSCOPES="${channels}" -DSHIFTS="${shifts}" -DTHREADS="${threads}" -DDEBUG="${debug}" "${addons_args[@]}" \
             && make -j "${cores}" \
             && make install
         ) || return "${?}"
@@ -0,0 +1,190 @@
+"""
+Explicit hooks of the configurations.
+
+Several modules take part in building a configuration besides the producer
+and output declarations: the output profiles (`output_profiles.py`) record the
+producers of each scope and select the written outputs, the shift survey
+(`shift_analysis.py`) records the systematic shifts to add them after all
+producers, and the startup report (`startup_report.py`) and the correction
+cache (`correction_cache.py`) rewrite the expanded configuration.
+
+They are implemented as `ConfigurationHook` and registered explicitly with
+`add_hook` of a `HookedConfiguration` or `HookedFriendTreeConfiguration`,
+which notifies the hooks in the order of their registration. The methods of
+the configuration are not replaced, so that the result does not depend on the
+order, in which the modules are attached.
+"""
+
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import copy
+from typing import Iterator, List, Union
+
+from code_generation.configuration import Configuration
+from code_generation.friend_trees import FriendTreeConfiguration
+
+from .helpers import as_list
+
+__all__ = [
+    "ConfigurationHook",
+    "HookedConfiguration",
+    "HookedFriendTreeConfiguration",
+    "reachable_objects",
+]
+
+
+def reachable_objects(root) -> Iterator:
+    """
+    All objects reachable from `root` through containers and instance
+    attributes, e.g. the producers, parameters and systematic shifts of an
+    expanded configuration, which are stored in different attributes of the
+    configuration. Each object is returned once, strings and numbers are not
+    returned.
+    """
+    visited = set()
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if item is None or isinstance(item, (str, bytes, int, float, bool)) or id(item) in visited:
+            continue
+        visited.add(id(item))
+        yield item
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            stack.extend(getattr(item, "__dict__", {}).values())
+
+
+class ConfigurationHook:
+    """
+    Hook notified by a hooked configuration. All methods do nothing by
+    default and are overridden by the hooks as needed.
+    """
+
+    # whether the hook rewrites the expanded configuration with `rewrite`
+    rewrites_expansion = False
+
+    def select_outputs(self, scopes: List[str], outputs: list) -> list:
+        """
+        Called before outputs are added to the configuration.
+
+        :return: Outputs, which are added to the configuration
+        """
+        return outputs
+
+    def producers_added(self, scopes: List[str], producers: list):
+        """
+        Called after producers have been added to the configuration.
+        """
+
+    def rule_added(self, scopes: List[str], rule):
+        """
+        Called after a modification rule has been added to the configuration.
+        """
+
+    def record_shift(self, shift, exclude_samples=None, samples=None) -> bool:
+        """
+        Called before a systematic shift is added to the configuration.
+
+        :return: Whether the hook records the shift to add it later with
+                 `add_shift(..., hooked=False)`, instead of adding it now
+        """
+        return False
+
+    def finalize(self, configuration: Configuration):
+        """
+        Called before the configuration is optimized, i.e. after all
+        producers, outputs, rules and shifts have been added.
+        """
+
+    def rewrite(self, expanded: Configuration):
+        """
+        Rewrite a copy of the expanded configuration, which is passed to the
+        code generation. Only called if `rewrites_expansion` is set.
+        """
+
+
+class ConfigurationHooks:
+    """
+    Configuration methods notifying the registered hooks, shared by
+    `HookedConfiguration` and `HookedFriendTreeConfiguration`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # the hooks are set first, in case the configuration adds parameters
+        # or producers on construction
+        self.hooks: List[ConfigurationHook] = []
+        super().__init__(*args, **kwargs)
+
+    def add_hook(self, hook: ConfigurationHook) -> ConfigurationHook:
+        """
+        Register a hook. The hooks are notified in the order of their
+        registration.
+
+        :param hook: Hook to be registered
+        :return: The registered hook
+        """
+        self.hooks.append(hook)
+        return hook
+
+    def add_outputs(self, scopes: Union[str, List[str]], output, *args, **kwargs):
+        outputs = as_list(output)
+        for hook in self.hooks:
+            outputs = hook.select_outputs(as_list(scopes), outputs)
+        if outputs:
+            super().add_outputs(scopes, outputs, *args, **kwargs)
+
+    def add_producers(self, scopes: Union[str, List[str]], producers, *args, **kwargs):
+        super().add_producers(scopes, producers, *args, **kwargs)
+        for hook in self.hooks:
+            hook.producers_added(as_list(scopes), as_list(producers))
+
+    def add_modification_rule(self, scopes: Union[str, List[str]], rule, *args, **kwargs):
+        super().add_modification_rule(scopes, rule, *args, **kwargs)
+        for hook in self.hooks:
+            hook.rule_added(as_list(scopes), rule)
+
+    def add_shift(self, shift, exclude_samples=None, samples=None, hooked: bool = True):
+        """
+        Add a systematic shift, unless a hook records it to add it later.
+
+        :param hooked: Whether the hooks are notified. Shifts added by the
+                       hooks themselves are added with `hooked=False`.
+        """
+        if hooked:
+            recorded = [hook.record_shift(shift, exclude_samples, samples) for hook in self.hooks]
+            if any(recorded):
+                return
+        super().add_shift(shift, exclude_samples=exclude_samples, samples=samples)
+
+    def optimize(self, *args, **kwargs):
+        for hook in self.hooks:
+            hook.finalize(self)
+        return super().optimize(*args, **kwargs)
+
+    def expanded_configuration(self, *args, **kwargs):
+        expanded = super().expanded_configuration(*args, **kwargs)
+        rewriting = [hook for hook in self.hooks if hook.rewrites_expansion]
+        if not rewriting:
+            return expanded
+        # the producers and quantities are shared between the configurations
+        # built in one process, hence only a copy is rewritten; the hooks are
+        # not copied
+        expanded = copy.deepcopy(expanded, {id(self.hooks): []})
+        for hook in rewriting:
+            hook.rewrite(expanded)
+        return expanded
+
+
+class HookedConfiguration(ConfigurationHooks, Configuration):
+    """
+    Configuration notifying the hooks registered with `add_hook`.
+    """
+
+
+class HookedFriendTreeConfiguration(ConfigurationHooks, FriendTreeConfiguration):
+    """
+    Friend tree configuration notifying the hooks registered with `add_hook`.
+    """
@@ -22,6 +22,17 @@ __all__ = [
     "ERAS",
     "AvailableBJetIDs",
     "BJET_ID_ALGORITHM",
+    "PNNModelPrecisions",
+    "PNN_MODEL_PRECISION",
+    "FF_VARIATIONS_IN_ONE_PASS",
+    "REDUCED_OUTPUT_PRECISION",
+    "INCREMENTAL_TYPE1_MET",
+    "TAU_ES_VARIATIONS_IN_ONE_PASS",
+    "LHE_SCALE_VARIATIONS_IN_ONE_PASS",
+    "TRIGGER_SFS_IN_ONE_PASS",
+    "USE_CORRECTION_CACHE",
+    "STARTUP_REPORT",
+    "PRUNE_IRRELEVANT_SHIFTS",
 ]
 
 
@@ -65,3 +76,70 @@ class AvailableBJetIDs(enum.Enum):
     PNET = enum.auto()
     UPART = enum.auto()
 BJET_ID_ALGORITHM = AvailableBJetIDs.PNET
+
+# numerical precision of the PNN models used in the ML friend configurations;
+# reduced-precision variants are created with `scripts/pnn_quantization.py`
+class PNNModelPrecisions(enum.Enum):
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+PNN_MODEL_PRECISION = PNNModelPrecisions.FLOAT32
+
+# The fake factor friend trees evaluate the nominal fake factors and all their
+# variations in one correctionlib call per event, instead of rerunning the fake
+# factor producers in one systematic shift per variation. The variations are
+# written as columns named like the shifted outputs, e.g.
+# `fake_factor__QCDFFslopeUncUp`, independent of the requested shifts (see
+# `add_fake_factor_variations` in `nmssm_fake_factors.py`).
+FF_VARIATIONS_IN_ONE_PASS = True
+
+# Kinematic quantities and weights are written with their mantissas rounded to
+# the precision of `output_storage.py`. This changes the stored values and is
+# only meant for ntuples, whose consumers tolerate the rounding.
+REDUCED_OUTPUT_PRECISION = False
+
+# Run 3 only: the shifted Type-I MET of the jet energy shifts starts from the
+# nominal corrected MET and only replaces the contributions of the jets with
+# shifted momenta (`met::Type1CorrectionIncremental`). The result can differ from
+# the full recalculation by floating point rounding and for jets crossing the
+# Type-I selection thresholds; it has not been validated against it yet, which
+# can be done with the `t1met_validate_incremental` parameter.
+INCREMENTAL_TYPE1_MET = False
+
+# The hadronic tau energy scale correction is evaluated for all variations
+# together with the nominal one, and the energy scale shifts only select the
+# precomputed variation (`TAU_ES_VARIATIONS` in `producers/taus.py`). Not yet
+# compared with the per-shift evaluation on full ntuples.
+TAU_ES_VARIATIONS_IN_ONE_PASS = False
+
+# The muR and muF variations of the LHE scale weight are extracted in the nominal
+# pass and written as columns like `lhe_scale_weight__muRWeightUp`, instead of the
+# muR and muF systematic shifts. This changes the layout of the ntuples, which
+# the downstream tools have to support before it is enabled.
+LHE_SCALE_VARIATIONS_IN_ONE_PASS = False
+
+# The trigger scale factors of all triggers of a leg are evaluated in one
+# producer (`scalefactor::trigger::Evaluate`) instead of one producer per entry of
+# the trigger scale factor configuration (`get_trigger_scalefactor_producers` in
+# `tau_triggersetup.py`). Not yet compared with the per-trigger producers on full
+# ntuples.
+TRIGGER_SFS_IN_ONE_PASS = False
+
+# The correctionlib payloads are read from the minified copies recorded in the
+# manifest written by `scripts/correction_cache.py`. The code generation fails
+# if a payload of the configuration is not in the manifest, instead of reading
+# the original file (see `correction_cache.py`).
+USE_CORRECTION_CACHE = False
+
+# The executables write the time and memory spent in each phase of their startup
+# to `<output>.startup_report.json` next to their output file. Every producer
+# call is enclosed by timers, which adds a small overhead to the startup, hence
+# the report is only enabled for startup studies (see `startup_report.py`).
+STARTUP_REPORT = False
+
+# Systematic shifts, which only rerun producers whose outputs are not written in
+# the scopes and output profile of the configuration, are left out. The written
+# quantities of the remaining shifts are unchanged, but the shifted columns of
+# the pruned shifts, which a downstream tool may still expect, are missing (see
+# `ShiftSurvey.add_shifts` in `shift_analysis.py`).
+PRUNE_IRRELEVANT_SHIFTS = False
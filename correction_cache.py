@@ -0,0 +1,179 @@
+"""
+Precompiled correctionlib payloads.
+
+Each executable loads the correctionlib payloads of the configuration at
+startup. Most of them are distributed as pretty-printed, gzip-compressed json
+files, so that a part of the startup time is spent decompressing and
+tokenizing whitespace. `scripts/correction_cache.py` validates the payloads
+once, stores them as uncompressed, minified json files in the cache directory,
+keyed by the sha256 digest of the original file content,
+
+    payloads/correction_cache/<sha256>.json
+
+and records them in the manifest `payloads/correction_cache/manifest.json`.
+The manifest maps each payload path, as given in the configurations, to its
+cache entry, or to no entry for json files, which are no correctionlib
+payloads (e.g. the golden json files).
+
+The cache is only used if `USE_CORRECTION_CACHE` is set in `constants.py`.
+The correction manager of CROWN loads payloads by their file name, hence the
+paths of the payloads are replaced by the paths of their cache entries in the
+copy of the expanded configuration, which is passed to the code generation,
+see `CorrectionCache`. At this point, CROWN has resolved the era and sample
+modifiers of the parameters. Only the manifest is read when the code is
+generated: payloads missing in the manifest and missing cache entries are
+errors instead of falling back to the original files, so that an executable
+either loads all its payloads from the cache or is not built. The cache
+entries are checked against the digests of the original payloads with
+`scripts/correction_cache.py --check`.
+"""
+
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import functools
+import hashlib
+import json
+import os
+from typing import Dict
+
+from .configuration_hooks import ConfigurationHook, HookedConfiguration, reachable_objects
+
+__all__ = [
+    "CORRECTION_CACHE_DIR",
+    "CORRECTION_CACHE_MANIFEST",
+    "PAYLOAD_EXTENSIONS",
+    "payload_digest",
+    "local_payload_path",
+    "read_manifest",
+    "CorrectionCache",
+    "use_correction_cache",
+]
+
+
+# cache directory relative to the analysis directory, from where the payloads
+# are shipped together with the executables
+CORRECTION_CACHE_DIR = "payloads/correction_cache"
+# manifest of the cache, written by `scripts/correction_cache.py`
+CORRECTION_CACHE_MANIFEST = os.path.join(CORRECTION_CACHE_DIR, "manifest.json")
+# extensions of payload files, which can be replaced by cache entries
+PAYLOAD_EXTENSIONS = (".json", ".json.gz")
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))
+CROWN_DIR = os.path.abspath(os.path.join(ANALYSIS_DIR, "..", ".."))
+
+
+def payload_digest(path: str) -> str:
+    """
+    Sha256 digest of the content of a payload file, which is the key of its
+    cache entry.
+
+    :param path: Path to the payload file
+    :return: Hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(functools.partial(f.read, 1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def local_payload_path(path: str) -> str | None:
+    """
+    Path of a payload on this machine. Relative paths are given either relative
+    to the analysis directory (`payloads/...`) or to the CROWN directory
+    (`data/...`).
+    """
+    if os.path.isabs(path):
+        candidates = [path]
+    else:
+        candidates = [os.path.join(ANALYSIS_DIR, path), os.path.join(CROWN_DIR, path)]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def read_manifest(manifest: str = CORRECTION_CACHE_MANIFEST) -> Dict[str, Dict[str, object]]:
+    """
+    Read the manifest of the cache and check that all cache entries exist
+    with the recorded size.
+
+    :param manifest: Path of the manifest relative to the analysis directory.
+                     Defaults to `CORRECTION_CACHE_MANIFEST`.
+    :return: Dictionary of the manifest entries per payload path. The
+             `entry` of payloads without cache entry is `None`.
+
+    :raises FileNotFoundError: If the manifest or a cache entry does not exist.
+    :raises RuntimeError: If the size of a cache entry differs from the manifest.
+    """
+    path = os.path.join(ANALYSIS_DIR, manifest)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(
+            f"Manifest {manifest} of the correction cache not found, create it with "
+            "`python scripts/correction_cache.py` or unset USE_CORRECTION_CACHE."
+        )
+    with open(path) as f:
+        entries = json.load(f)
+    for payload, entry in entries.items():
+        if entry["entry"] is None:
+            continue
+        entry_path = os.path.join(ANALYSIS_DIR, entry["entry"])
+        if not os.path.isfile(entry_path):
+            raise FileNotFoundError(
+                f"Cache entry {entry['entry']} of {payload} not found, recreate the cache with "
+                "`python scripts/correction_cache.py`."
+            )
+        if os.path.getsize(entry_path) != entry["cached_size"]:
+            raise RuntimeError(
+                f"Cache entry {entry['entry']} of {payload} differs from the manifest, recreate "
+                "the cache with `python scripts/correction_cache.py --force`."
+            )
+    return entries
+
+
+class CorrectionCache(ConfigurationHook):
+    """
+    Replace the paths of the correctionlib payloads in the expanded
+    configuration by the paths of their cache entries in the manifest.
+
+    :param manifest: Dictionary of the manifest entries per payload path,
+                     see `read_manifest`
+    """
+
+    rewrites_expansion = True
+
+    def __init__(self, manifest: Dict[str, Dict[str, object]]):
+        self.manifest = manifest
+
+    def _cached(self, value, missing: set):
+        if not isinstance(value, str) or not value.endswith(PAYLOAD_EXTENSIONS):
+            return value
+        if value not in self.manifest:
+            missing.add(value)
+            return value
+        return self.manifest[value]["entry"] or value
+
+    def rewrite(self, expanded: HookedConfiguration):
+        missing = set()
+        for item in reachable_objects(expanded):
+            if isinstance(item, dict):
+                for key, value in item.items():
+                    item[key] = self._cached(value, missing)
+            elif isinstance(item, list):
+                item[:] = [self._cached(value, missing) for value in item]
+        if missing:
+            raise RuntimeError(
+                f"Payloads {', '.join(sorted(missing))} are not in the manifest of the correction "
+                "cache, add them with `python scripts/correction_cache.py`."
+            )
+
+
+def use_correction_cache(configuration: HookedConfiguration) -> CorrectionCache:
+    """
+    Load the correctionlib payloads of a configuration from the cache entries
+    recorded in the manifest.
+
+    :param configuration: Configuration, whose payloads are loaded from the cache
+    :return: The registered hook
+    """
+    return configuration.add_hook(CorrectionCache(read_manifest()))
@@ -0,0 +1,701 @@
+/**
+ * @file producer_benchmarks.cxx
+ * @brief Micro-benchmarks of the producer functions in `cpp_addons/src`.
+ *
+ * The producers are applied to an in-memory `ROOT::RDataFrame` whose input
+ * columns are non-owning views into pre-generated synthetic events, so that
+ * the measurement is dominated by the producer lambdas and not by reading or
+ * generating the inputs. For each benchmark case the event loop is run once
+ * as warm-up (JIT compilation, lazy setup of helpers) and then measured.
+ * The time and the number of heap allocations of an event loop without any
+ * producer are subtracted from the results.
+ *
+ * The results are reported in ns/event and allocations/event, can be written
+ * to a json file and compared to the json file of a previous run:
+ *
+ *     ./producer_benchmarks --events 100000 --output benchmarks.json
+ *     ./producer_benchmarks --baseline benchmarks.json --tolerance 0.1
+ *
+ * The program exits with a non-zero exit code if one of the cases is slower
+ * or allocates more than the baseline by more than the tolerance.
+ */
+
+#include "../src/fakefactors.cxx"
+#include "../src/fatjets.cxx"
+#include "../src/hhkinfit.cxx"
+#include "../src/jets.cxx"
+#include "../src/pairselection.cxx"
+#include "../src/vetoes.cxx"
+
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <cmath>
+#include <cstdlib>
+#include <fstream>
+#include <functional>
+#include <iomanip>
+#include <iostream>
+#include <map>
+#include <new>
+#include <nlohmann/json.hpp>
+#include <random>
+#include <string>
+#include <vector>
+
+#ifndef ANALYSIS_DIR
+#define ANALYSIS_DIR "../.."
+#endif
+
+namespace {
+// number of heap allocations via the global operator new, counted to
+// report the allocations per event of the producers
+std::atomic<std::size_t> allocation_count{0};
+} // namespace
+
+void *operator new(std::size_t size) {
+    allocation_count.fetch_add(1, std::memory_order_relaxed);
+    if (void *ptr = std::malloc(size > 0 ? size : 1)) {
+        return ptr;
+    }
+    throw std::bad_alloc();
+}
+void operator delete(void *ptr) noexcept { std::free(ptr); }
+void operator delete(void *ptr, std::size_t) noexcept { std::free(ptr); }
+
+namespace benchmark {
+
+/**
+ * @brief Jagged column of a collection, stored as flat values and the offsets
+ * of the events.
+ */
+template <typename T> struct VectorColumn {
+    ROOT::RVec<T> values;
+    std::vector<std::size_t> offsets = {0};
+
+    void add_event(const ROOT::RVec<T> &event_values) {
+        values.insert(values.end(), event_values.begin(), event_values.end());
+        offsets.push_back(values.size());
+    }
+    /// non-owning view of the values of an event, no allocation is needed
+    ROOT::RVec<T> view(const ULong64_t entry) const {
+        return ROOT::RVec<T>(const_cast<T *>(values.data()) + offsets[entry],
+                             offsets[entry + 1] - offsets[entry]);
+    }
+};
+
+struct SyntheticEvents {
+    std::size_t size = 0;
+    std::map<std::string, VectorColumn<float>> float_vectors;
+    std::map<std::string, VectorColumn<int>> int_vectors;
+    std::map<std::string, VectorColumn<UChar_t>> uchar_vectors;
+    std::map<std::string, VectorColumn<bool>> bool_vectors;
+    std::map<std::string, std::vector<float>> floats;
+    std::map<std::string, std::vector<int>> ints;
+    std::map<std::string, std::vector<unsigned int>> uints;
+};
+
+/**
+ * @brief Generate events with multiplicities and distributions roughly
+ * resembling the selected events of the analysis.
+ */
+SyntheticEvents generate_events(const std::size_t n_events,
+                                const unsigned int seed) {
+    std::mt19937 rng(seed);
+    std::uniform_real_distribution<float> uniform(0., 1.);
+    std::uniform_real_distribution<float> eta(-2.5, 2.5);
+    std::uniform_real_distribution<float> phi(-M_PI, M_PI);
+    std::exponential_distribution<float> falling(1. / 40.);
+    std::normal_distribution<float> impact(0., 0.02);
+
+    auto pt = [&](const float min_pt) { return min_pt + falling(rng); };
+    auto charge = [&]() { return uniform(rng) < 0.5 ? -1 : 1; };
+    auto multiplicity = [&](const double mean) {
+        return std::poisson_distribution<int>(mean)(rng);
+    };
+
+    SyntheticEvents events;
+    events.size = n_events;
+    for (std::size_t entry = 0; entry < n_events; ++entry) {
+        // leptons and boosted taus
+        for (const auto &[name, mean] :
+             std::vector<std::pair<std::string, double>>{
+                 {"Muon", 1.2}, {"Electron", 1.2}, {"boostedTau", 2.}}) {
+            const auto n = multiplicity(mean);
+            ROOT::RVec<float> pts(n), etas(n), phis(n), masses(n), isos(n),
+                dxys(n), dzs(n);
+            ROOT::RVec<int> charges(n), masks(n);
+            ROOT::RVec<UChar_t> ids(n);
+            ROOT::RVec<bool> is_pf(n), is_tracker(n), is_global(n);
+            for (int i = 0; i < n; ++i) {
+                pts[i] = pt(10.);
+                etas[i] = eta(rng);
+                phis[i] = phi(rng);
+                masses[i] = name == "boostedTau" ? 1.2 * uniform(rng) : 0.1;
+                isos[i] = 0.2 * uniform(rng);
+                dxys[i] = std::abs(impact(rng));
+                dzs[i] = std::abs(5. * impact(rng));
+                charges[i] = charge();
+                masks[i] = uniform(rng) < 0.7;
+                ids[i] = static_cast<UChar_t>(4. * uniform(rng) + 1.);
+                is_pf[i] = uniform(rng) < 0.95;
+                is_tracker[i] = uniform(rng) < 0.95;
+                is_global[i] = uniform(rng) < 0.9;
+            }
+            std::sort(pts.begin(), pts.end(), std::greater<float>());
+            events.float_vectors[name + "_pt"].add_event(pts);
+            events.float_vectors[name + "_eta"].add_event(etas);
+            events.float_vectors[name + "_phi"].add_event(phis);
+            events.float_vectors[name + "_mass"].add_event(masses);
+            events.float_vectors[name + "_iso"].add_event(isos);
+            events.float_vectors[name + "_dxy"].add_event(dxys);
+            events.float_vectors[name + "_dz"].add_event(dzs);
+            events.int_vectors[name + "_charge"].add_event(charges);
+            events.int_vectors[name + "_mask"].add_event(masks);
+            events.uchar_vectors[name + "_id"].add_event(ids);
+            events.bool_vectors[name + "_isPFcand"].add_event(is_pf);
+            events.bool_vectors[name + "_isTracker"].add_event(is_tracker);
+            events.bool_vectors[name + "_isGlobal"].add_event(is_global);
+        }
+
+        // jets with the indices of the good (b) jets
+        const auto n_jets = multiplicity(5.);
+        ROOT::RVec<float> jet_pt(n_jets), jet_eta(n_jets), jet_phi(n_jets),
+            jet_mass(n_jets), jet_btag(n_jets), jet_raw_factor(n_jets),
+            jet_muon_subtr_factor(n_jets), jet_area(n_jets);
+        ROOT::RVec<UChar_t> jet_id(n_jets);
+        ROOT::RVec<int> good_jets, good_bjets;
+        for (int i = 0; i < n_jets; ++i) {
+            jet_pt[i] = pt(20.);
+            jet_eta[i] = eta(rng);
+            jet_phi[i] = phi(rng);
+            jet_mass[i] = 5. + 10. * uniform(rng);
+            jet_btag[i] = uniform(rng);
+            jet_raw_factor[i] = 0.1 * uniform(rng);
+            jet_muon_subtr_factor[i] = 0.05 * uniform(rng);
+            jet_area[i] = 0.4 + 0.2 * uniform(rng);
+            jet_id[i] = 6;
+        }
+        std::sort(jet_pt.begin(), jet_pt.end(), std::greater<float>());
+        for (int i = 0; i < n_jets; ++i) {
+            good_jets.push_back(i);
+            if (jet_btag[i] > 0.3) {
+                good_bjets.push_back(i);
+            }
+        }
+        events.float_vectors["Jet_pt"].add_event(jet_pt);
+        events.float_vectors["Jet_eta"].add_event(jet_eta);
+        events.float_vectors["Jet_phi"].add_event(jet_phi);
+        events.float_vectors["Jet_mass"].add_event(jet_mass);
+        events.float_vectors["Jet_btag"].add_event(jet_btag);
+        events.float_vectors["Jet_rawFactor"].add_event(jet_raw_factor);
+        events.float_vectors["Jet_muonSubtrFactor"].add_event(
+            jet_muon_subtr_factor);
+        events.float_vectors["Jet_area"].add_event(jet_area);
+        events.uchar_vectors["Jet_jetId"].add_event(jet_id);
+        events.int_vectors["good_jet_collection"].add_event(good_jets);
+        events.int_vectors["good_bjet_collection"].add_event(good_bjets);
+
+        // generator-level jets
+        const auto n_genjets = multiplicity(5.);
+        ROOT::RVec<float> genjet_pt(n_genjets), genjet_eta(n_genjets),
+            genjet_phi(n_genjets);
+        for (int i = 0; i < n_genjets; ++i) {
+            genjet_pt[i] = pt(10.);
+            genjet_eta[i] = eta(rng);
+            genjet_phi[i] = phi(rng);
+        }
+        events.float_vectors["GenJet_pt"].add_event(genjet_pt);
+        events.float_vectors["GenJet_eta"].add_event(genjet_eta);
+        events.float_vectors["GenJet_phi"].add_event(genjet_phi);
+
+        // fatjets with the indices of the good fatjets
+        const auto n_fatjets = multiplicity(1.5);
+        ROOT::RVec<float> xbb(n_fatjets), qcd(n_fatjets);
+        ROOT::RVec<int> good_fatjets;
+        for (int i = 0; i < n_fatjets; ++i) {
+            xbb[i] = uniform(rng);
+            qcd[i] = uniform(rng);
+            if (uniform(rng) < 0.8) {
+                good_fatjets.push_back(i);
+            }
+        }
+        events.float_vectors["FatJet_particleNet_XbbVsQCD"].add_event(xbb);
+        events.float_vectors["FatJet_particleNet_QCD"].add_event(qcd);
+        events.int_vectors["good_fatjet_collection"].add_event(good_fatjets);
+
+        // quantities of the selected di-tau and bb pairs and of the event,
+        // pt_2 gets the default value for a fraction of the events like for
+        // events without a valid pair
+        events.floats["pt_1"].push_back(pt(25.));
+        events.floats["pt_2"].push_back(uniform(rng) < 0.05 ? -10. : pt(30.));
+        events.floats["eta_1"].push_back(eta(rng));
+        events.floats["eta_2"].push_back(eta(rng));
+        events.floats["phi_1"].push_back(phi(rng));
+        events.floats["phi_2"].push_back(phi(rng));
+        events.floats["mass_1"].push_back(0.1 + 1.5 * uniform(rng));
+        events.floats["mass_2"].push_back(0.1 + 1.5 * uniform(rng));
+        events.floats["mt_1"].push_back(100. * uniform(rng));
+        events.floats["m_vis"].push_back(20. + 200. * uniform(rng));
+        events.floats["bpair_pt_1"].push_back(pt(20.));
+        events.floats["bpair_pt_2"].push_back(pt(20.));
+        events.floats["bpair_eta_1"].push_back(eta(rng));
+        events.floats["bpair_eta_2"].push_back(eta(rng));
+        events.floats["bpair_phi_1"].push_back(phi(rng));
+        events.floats["bpair_phi_2"].push_back(phi(rng));
+        events.floats["bpair_mass_1"].push_back(5. + 10. * uniform(rng));
+        events.floats["bpair_mass_2"].push_back(5. + 10. * uniform(rng));
+        events.floats["bpair_reso_1"].push_back(0.1 + 0.1 * uniform(rng));
+        events.floats["bpair_reso_2"].push_back(0.1 + 0.1 * uniform(rng));
+        events.floats["met"].push_back(falling(rng));
+        events.floats["metphi"].push_back(phi(rng));
+        events.floats["metcov00"].push_back(400. + 100. * uniform(rng));
+        events.floats["metcov01"].push_back(50. * (uniform(rng) - 0.5));
+        events.floats["metcov10"].push_back(events.floats["metcov01"].back());
+        events.floats["metcov11"].push_back(400. + 100. * uniform(rng));
+        events.floats["rho"].push_back(5. + 30. * uniform(rng));
+        events.ints["njets"].push_back(multiplicity(3.));
+        events.ints["nbtag"].push_back(multiplicity(1.));
+        events.uints["jer_seed"].push_back(rng());
+        events.uints["run"].push_back(320000);
+    }
+    return events;
+}
+
+/**
+ * @brief Define all columns of the synthetic events as views of the stored
+ * values, indexed by the entry number of the dataframe.
+ */
+ROOT::RDF::RNode define_inputs(ROOT::RDF::RNode df,
+                               const SyntheticEvents &events) {
+    auto define_vectors = [&df](const auto &columns) {
+        for (const auto &[name, column] : columns) {
+            df = df.Define(name,
+                           [&column = column](const ULong64_t entry) {
+                               return column.view(entry);
+                           },
+                           {"rdfentry_"});
+        }
+    };
+    auto define_scalars = [&df](const auto &columns) {
+        for (const auto &[name, column] : columns) {
+            df = df.Define(name,
+                           [&column = column](const ULong64_t entry) {
+                               return column[entry];
+                           },
+                           {"rdfentry_"});
+        }
+    };
+    define_vectors(events.float_vectors);
+    define_vectors(events.int_vectors);
+    define_vectors(events.uchar_vectors);
+    define_vectors(events.bool_vectors);
+    define_scalars(events.floats);
+    define_scalars(events.ints);
+    define_scalars(events.uints);
+    return df;
+}
+
+using Producer = std::function<ROOT::RDF::RNode(ROOT::RDF::RNode)>;
+using Runner = std::function<void(ROOT::RDF::RNode)>;
+
+/// prevent the compiler from optimizing away the consumed outputs
+template <typename T> void do_not_optimize(const T &value) {
+    asm volatile("" : : "r"(&value) : "memory");
+}
+
+/**
+ * @brief Event loop reading the given output columns of types `T...`.
+ */
+template <typename... T>
+Runner consume(const std::vector<std::string> &columns) {
+    return [columns](ROOT::RDF::RNode df) {
+        df.Foreach([](const T &...values) { (do_not_optimize(values), ...); },
+                   columns);
+    };
+}
+
+struct Case {
+    std::string name;
+    Producer producer;
+    Runner runner;
+};
+
+struct Measurement {
+    double ns_per_event = 0.;
+    double allocations_per_event = 0.;
+};
+
+Measurement measure(ROOT::RDF::RNode df, const Runner &runner,
+                    const std::size_t n_events, const int repetitions) {
+    // warm-up run for the JIT compilation and lazily initialized helpers
+    runner(df);
+    Measurement best;
+    for (int i = 0; i < repetitions; ++i) {
+        const auto allocations = allocation_count.load();
+        const auto start = std::chrono::steady_clock::now();
+        runner(df);
+        const auto stop = std::chrono::steady_clock::now();
+        Measurement current;
+        current.ns_per_event =
+            std::chrono::duration<double, std::nano>(stop - start).count() /
+            n_events;
+        current.allocations_per_event =
+            static_cast<double>(allocation_count.load() - allocations) /
+            n_events;
+        if (i == 0 || current.ns_per_event < best.ns_per_event) {
+            best = current;
+        }
+    }
+    return best;
+}
+
+struct Options {
+    std::size_t events = 100000;
+    unsigned int seed = 42;
+    int repetitions = 3;
+    std::string filter = "";
+    std::string output = "";
+    std::string baseline = "";
+    double tolerance = 0.1;
+    std::string payload_dir = std::string(ANALYSIS_DIR) + "/payloads";
+    std::string jec_file = "/cvmfs/cms-griddata.cern.ch/cat/metadata/JME/"
+                           "Run2-2018-UL-NanoAODv9/2026-04-22/jet_jerc.json.gz";
+    std::string jec_algo = "AK4PFchs";
+    std::string jes_tag = "Summer19UL18_V5";
+    std::string jer_tag = "Summer19UL18_JRV2";
+    std::string era = "2018";
+};
+
+std::vector<Case> build_cases(const Options &options,
+                              correctionManager::CorrectionManager &cm) {
+    const std::string ff_dir =
+        options.payload_dir + "/fake_factors/nmssm/2018/resolved/";
+    const std::vector<std::string> lt_variation_parameters = {
+        "qcd", "qcd", "wjets", "ttbar", "fraction", "qcd_corr_leppt"};
+    const std::vector<std::string> lt_variation_names = {
+        "QCDFFslopeUncUp",
+        "QCDFFslopeUncDown",
+        "WjetsFFnormUncUp",
+        "ttbarFFnormUncUp",
+        "process_fractionsfracQCDUncUp",
+        "QCDnonClosureLeadingLepPtCorrUp"};
+    std::vector<std::string> lt_variation_outputs = {"fake_factor"};
+    for (const auto &name : lt_variation_names) {
+        lt_variation_outputs.push_back("fake_factor__" + name);
+    }
+
+    std::vector<Case> cases = {
+        {"pairselection::boosted_mutau",
+         [](ROOT::RDF::RNode df) {
+             return boosted_ditau_pairselection::mutau::PairSelection(
+                 df,
+                 {"boostedTau_pt", "boostedTau_eta", "boostedTau_phi",
+                  "boostedTau_mass", "Muon_pt", "Muon_eta", "Muon_phi",
+                  "Muon_mass", "Muon_mask", "boostedTau_mask"},
+                 "boosted_dileptonpair", 0.1, 0.8);
+         },
+         consume<ROOT::RVec<int>>({"boosted_dileptonpair"})},
+        {"pairselection::boosted_tautau",
+         [](ROOT::RDF::RNode df) {
+             return boosted_ditau_pairselection::tautau::PairSelection(
+                 df,
+                 {"boostedTau_pt", "boostedTau_eta", "boostedTau_phi",
+                  "boostedTau_mass", "boostedTau_mask"},
+                 "boosted_dileptonpair", 0.1, 0.8);
+         },
+         consume<ROOT::RVec<int>>({"boosted_dileptonpair"})},
+        {"pairselection::bb",
+         [](ROOT::RDF::RNode df) {
+             return bb_pairselection::PairSelection(
+                 df,
+                 {"Jet_pt", "Jet_eta", "Jet_phi", "Jet_mass",
+                  "good_bjet_collection", "good_jet_collection"},
+                 "Jet_btag", "dibjetpair", 0.4, 0.3);
+         },
+         consume<ROOT::RVec<int>>({"dibjetpair"})},
+        {"vetoes::dielectron",
+         [](ROOT::RDF::RNode df) {
+             return xyh::vetoes::dielectron(
+                 df, "dielectron_veto", "Electron_pt", "Electron_eta",
+                 "Electron_phi", "Electron_iso", "Electron_dxy", "Electron_dz",
+                 "Electron_id", "Electron_charge", 15., 2.5, 0.3, 0.045, 0.2, 1,
+                 0.15);
+         },
+         consume<bool>({"dielectron_veto"})},
+        {"vetoes::dimuon",
+         [](ROOT::RDF::RNode df) {
+             return xyh::vetoes::dimuon(
+                 df, "dimuon_veto", "Muon_pt", "Muon_eta", "Muon_phi",
+                 "Muon_iso", "Muon_dxy", "Muon_dz", "Muon_isPFcand",
+                 "Muon_isTracker", "Muon_isGlobal", "Muon_charge", 15., 2.4,
+                 0.3, 0.045, 0.2, 0.15);
+         },
+         consume<bool>({"dimuon_veto"})},
+        {"fatjets::FindXbbFatjet",
+         [](ROOT::RDF::RNode df) {
+             return fatjet::FindXbbFatjet(
+                 df, "selected_fatjet", "good_fatjet_collection",
+                 "FatJet_particleNet_XbbVsQCD", "FatJet_particleNet_QCD");
+         },
+         consume<ROOT::RVec<int>>({"selected_fatjet"})},
+        {"fakefactors::raw_fakefactor_nmssm_lt",
+         [ff_dir](ROOT::RDF::RNode df) {
+             return fakefactors::raw_fakefactor_nmssm_lt(
+                 df, "raw_fake_factor", "pt_2", "njets", "mt_1", "nbtag",
+                 "nominal", "nominal", "nominal", "nominal",
+                 ff_dir + "fake_factors_mt.json.gz");
+         },
+         consume<float>({"raw_fake_factor"})},
+        {"fakefactors::fakefactor_nmssm_lt",
+         [ff_dir](ROOT::RDF::RNode df) {
+             return fakefactors::fakefactor_nmssm_lt(
+                 df, "fake_factor", "pt_2", "njets", "mt_1", "nbtag", "pt_1",
+                 "mass_2", "m_vis", "nominal", "nominal", "nominal", "nominal",
+                 "nominal", "nominal", "nominal", "nominal", "nominal",
+                 "nominal", "nominal", "nominal",
+                 ff_dir + "fake_factors_mt.json.gz",
+                 ff_dir + "FF_corrections_mt.json.gz");
+         },
+         consume<float>({"fake_factor"})},
+        {"fakefactors::fakefactor_nmssm_tt",
+         [ff_dir](ROOT::RDF::RNode df) {
+             return fakefactors::fakefactor_nmssm_tt(
+                 df, "fake_factor_1", 0, "pt_1", "pt_2", "njets", "m_vis",
+                 "nbtag", "mass_1", "mass_2", "nominal", "nominal", "nominal",
+                 "nominal", "nominal", "nominal", "nominal", "nominal",
+                 ff_dir + "fake_factors_tt.json.gz",
+                 ff_dir + "FF_corrections_tt.json.gz");
+         },
+         consume<float>({"fake_factor_1"})},
+        {"fakefactors::fakefactor_nmssm_lt_variations",
+         [ff_dir, lt_variation_outputs, lt_variation_parameters,
+          lt_variation_names](ROOT::RDF::RNode df) {
+             return fakefactors::fakefactor_nmssm_lt_variations(
+                 df, lt_variation_outputs, "pt_2", "njets", "mt_1", "nbtag",
+                 "pt_1", "mass_2", "m_vis", lt_variation_parameters,
+                 lt_variation_names, ff_dir + "fake_factors_mt.json.gz",
+                 ff_dir + "FF_corrections_mt.json.gz");
+         },
+         consume<ROOT::RVec<float>>({"fake_factor_variations"})},
+        {"jets::RawMuonSubtr",
+         [](ROOT::RDF::RNode df) {
+             return physicsobject::jet::jec::RawMuonSubtr(
+                 df, "Jet_pt_raw", "Jet_pt", "Jet_rawFactor",
+                 "Jet_muonSubtrFactor");
+         },
+         consume<ROOT::RVec<float>>({"Jet_pt_raw"})},
+        {"jets::MassCorrectionFromPt",
+         [](ROOT::RDF::RNode df) {
+             auto df1 = physicsobject::jet::jec::Raw(df, "Jet_pt_raw", "Jet_pt",
+                                                     "Jet_rawFactor");
+             return physicsobject::jet::jec::MassCorrectionFromPt(
+                 df1, "Jet_mass_corrected", "Jet_mass", "Jet_pt_raw", "Jet_pt");
+         },
+         consume<ROOT::RVec<float>>({"Jet_mass_corrected"})},
+        {"hhkinfit::YHKinFit",
+         [](ROOT::RDF::RNode df) {
+             return hhkinfit::YHKinFit(
+                 df, "kinfit_convergence", "kinfit_mX", "kinfit_mY",
+                 "kinfit_mh", "kinfit_chi2", "kinfit_prob", "pt_1", "eta_1",
+                 "phi_1", "mass_1", "pt_2", "eta_2", "phi_2", "mass_2",
+                 "bpair_pt_1", "bpair_eta_1", "bpair_phi_1", "bpair_mass_1",
+                 "bpair_reso_1", "bpair_pt_2", "bpair_eta_2", "bpair_phi_2",
+                 "bpair_mass_2", "bpair_reso_2", "met", "metphi", "metcov00",
+                 "metcov01", "metcov10", "metcov11", "YToBB");
+         },
+         consume<float, float, float, float, float, float>(
+             {"kinfit_convergence", "kinfit_mX", "kinfit_mY", "kinfit_mh",
+              "kinfit_chi2", "kinfit_prob"})},
+    };
+
+    // the full jet energy corrections need the JERC file of the JME POG, the
+    // raw jet pt is calculated as input of the corrections
+    if (std::ifstream(options.jec_file).good()) {
+        cases.push_back(
+            {"jets::PtCorrectionMC",
+             [&cm, options](ROOT::RDF::RNode df) {
+                 auto df1 = physicsobject::jet::jec::Raw(
+                     df, "Jet_pt_raw", "Jet_pt", "Jet_rawFactor");
+                 return physicsobject::jet::jec::PtCorrectionMC(
+                     df1, cm, "Jet_jec_result", "Jet_pt_l1", "Jet_pt_l2rel",
+                     "Jet_pt_l2l3res", "Jet_pt_corrected", "Jet_pt_raw",
+                     "Jet_eta", "Jet_phi", "Jet_area", "Jet_jetId", "GenJet_pt",
+                     "GenJet_eta", "GenJet_phi", "rho", "jer_seed",
+                     options.jec_file, options.jec_algo, options.jes_tag,
+                     options.jer_tag, {""}, 0, "nom", true, options.era);
+             },
+             consume<ROOT::RVec<float>>({"Jet_pt_corrected"})});
+        cases.push_back({"jets::PtCorrectionData",
+                         [&cm, options](ROOT::RDF::RNode df) {
+                             auto df1 = physicsobject::jet::jec::Raw(
+                                 df, "Jet_pt_raw", "Jet_pt", "Jet_rawFactor");
+                             return physicsobject::jet::jec::PtCorrectionData(
+                                 df1, cm, "Jet_jec_result", "Jet_pt_l1",
+                                 "Jet_pt_l2rel", "Jet_pt_l2l3res",
+                                 "Jet_pt_corrected", "Jet_pt_raw", "Jet_eta",
+                                 "Jet_phi", "Jet_area", "rho", "run",
+                                 options.jec_file, options.jec_algo,
+                                 {options.jes_tag}, {0u}, true, options.era);
+                         },
+                         consume<ROOT::RVec<float>>({"Jet_pt_corrected"})});
+    } else {
+        std::cerr << "JERC file " << options.jec_file
+                  << " not found, skipping the jet energy corrections"
+                  << std::endl;
+    }
+    return cases;
+}
+
+Options parse_options(int argc, char **argv) {
+    Options options;
+    for (int i = 1; i < argc; ++i) {
+        const std::string arg = argv[i];
+        if (arg == "--help" || arg == "-h") {
+            std::cout
+                << "Usage: " << argv[0] << " [options]\n"
+                << "  --events N         number of synthetic events\n"
+                << "  --seed N           seed of the event generation\n"
+                << "  --repetitions N    measured event loops per case\n"
+                << "  --filter STRING    only run cases containing STRING\n"
+                << "  --output FILE      json file for the results\n"
+                << "  --baseline FILE    json file of a previous run\n"
+                << "  --tolerance X      relative tolerance w.r.t. baseline\n"
+                << "  --payload-dir DIR  payload directory of the analysis\n"
+                << "  --jec-file FILE    JERC file of the JME POG\n"
+                << "  --jec-algo NAME    jet algorithm of the JEC\n"
+                << "  --jes-tag NAME     JES tag\n"
+                << "  --jer-tag NAME     JER tag\n"
+                << "  --era NAME         era of the JEC\n";
+            std::exit(0);
+        }
+        if (i + 1 >= argc) {
+            throw std::invalid_argument("Missing value for option " + arg);
+        }
+        const std::string value = argv[++i];
+        if (arg == "--events") {
+            options.events = std::stoul(value);
+        } else if (arg == "--seed") {
+            options.seed = std::stoul(value);
+        } else if (arg == "--repetitions") {
+            options.repetitions = std::stoi(value);
+        } else if (arg == "--filter") {
+            options.filter = value;
+        } else if (arg == "--output") {
+            options.output = value;
+        } else if (arg == "--baseline") {
+            options.baseline = value;
+        } else if (arg == "--tolerance") {
+            options.tolerance = std::stod(value);
+        } else if (arg == "--payload-dir") {
+            options.payload_dir = value;
+        } else if (arg == "--jec-file") {
+            options.jec_file = value;
+        } else if (arg == "--jec-algo") {
+            options.jec_algo = value;
+        } else if (arg == "--jes-tag") {
+            options.jes_tag = value;
+        } else if (arg == "--jer-tag") {
+            options.jer_tag = value;
+        } else if (arg == "--era") {
+            options.era = value;
+        } else {
+            throw std::invalid_argument("Unknown option " + arg);
+        }
+    }
+    return options;
+}
+
+/**
+ * @brief Compare the results to a baseline and return a description of each
+ * case that is slower or allocates more than allowed by the tolerance.
+ */
+std::vector<std::string> find_regressions(const nlohmann::json &results,
+                                          const nlohmann::json &baseline,
+                                          const double tolerance) {
+    std::vector<std::string> regressions;
+    for (const auto &[name, result] : results.items()) {
+        if (!baseline.contains(name)) {
+            continue;
+        }
+        for (const std::string metric :
+             {"ns_per_event", "allocations_per_event"}) {
+            const double reference = baseline[name][metric];
+            const double value = result[metric];
+            // allocation counts are exact, a small absolute margin avoids
+            // flagging cases without any allocations in the baseline
+            if (value > reference * (1. + tolerance) + 1e-3) {
+                regressions.push_back(name + ": " + metric + " changed from " +
+                                      std::to_string(reference) + " to " +
+                                      std::to_string(value));
+            }
+        }
+    }
+    return regressions;
+}
+
+} // namespace benchmark
+
+int main(int argc, char **argv) {
+    const auto options = benchmark::parse_options(argc, argv);
+
+    std::cout << "Generating " << options.events << " synthetic events"
+              << std::endl;
+    const auto events =
+        benchmark::generate_events(options.events, options.seed);
+    correctionManager::CorrectionManager correction_manager;
+
+    // reference event loop without producers, subtracted from all cases
+    ROOT::RDataFrame empty_df(options.events);
+    const auto empty = benchmark::measure(
+        benchmark::define_inputs(ROOT::RDF::RNode(empty_df), events),
+        benchmark::consume<ULong64_t>({"rdfentry_"}), options.events,
+        options.repetitions);
+
+    nlohmann::json results;
+    std::cout << std::left << std::setw(48) << "case" << std::right
+              << std::setw(14) << "ns/event" << std::setw(18)
+              << "allocations/event" << std::endl;
+    std::cout << std::string(80, '-') << std::endl;
+    for (const auto &c : benchmark::build_cases(options, correction_manager)) {
+        if (c.name.find(options.filter) == std::string::npos) {
+            continue;
+        }
+        ROOT::RDataFrame df(options.events);
+        const auto node =
+            c.producer(benchmark::define_inputs(ROOT::RDF::RNode(df), events));
+        const auto measurement = benchmark::measure(
+            node, c.runner, options.events, options.repetitions);
+        const double ns_per_event =
+            std::max(measurement.ns_per_event - empty.ns_per_event, 0.);
+        const double allocations_per_event = std::max(
+            measurement.allocations_per_event - empty.allocations_per_event,
+            0.);
+        results[c.name] = {{"ns_per_event", ns_per_event},
+                           {"allocations_per_event", allocations_per_event}};
+        std::cout << std::left << std::setw(48) << c.name << std::right
+                  << std::fixed << std::setprecision(1) << std::setw(14)
+                  << ns_per_event << std::setprecision(2) << std::setw(18)
+                  << allocations_per_event << std::endl;
+    }
+
+    if (!options.output.empty()) {
+        std::ofstream(options.output) << results.dump(4) << std::endl;
+        std::cout << "Results saved to " << options.output << std::endl;
+    }
+    if (!options.baseline.empty()) {
+        nlohmann::json baseline;
+        std::ifstream(options.baseline) >> baseline;
+        const auto regressions =
+            benchmark::find_regressions(results, baseline, options.tolerance);
+        for (const auto &regression : regressions) {
+            std::cout << "Regression: " << regression << std::endl;
+        }
+        if (!regressions.empty()) {
+            return 1;
+        }
+    }
+    return 0;
+}
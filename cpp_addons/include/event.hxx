@@ -1,9 +1,16 @@
 #ifndef GUARDEVENTEXT_H
 #define GUARDEVENTEXT_H
 
+#include "../../../../include/defaults.hxx"
+#include "../../../../include/event.hxx"
 #include "ROOT/RDataFrame.hxx"
 #include "ROOT/RVec.hxx"
 #include <Math/VectorUtil.h>
+#include <stdexcept>
+#include <string>
+#include <tuple>
+#include <utility>
+#include <vector>
 
 namespace event {
 
@@ -25,9 +32,8 @@ namespace quantity {
  * @return a dataframe with the new column
  */
 template <typename T>
-inline ROOT::RDF::RNode
-Define(ROOT::RDF::RNode df, const std::string &outputname,
-       const std::string &number_column, T const &value) {
+ROOT::RDF::RNode Define(ROOT::RDF::RNode df, const std::string &outputname,
+                        const std::string &number_column, T const &value) {
     return df.Define(outputname,
                      [value](const int &number_column) {
                          return ROOT::RVec<T>(number_column, value);
@@ -61,10 +67,10 @@ ROOT::RDF::RNode Concatenate(ROOT::RDF::RNode df, const std::string &outputname,
  * @return a dataframe with the new column
  */
 template <typename T>
-inline ROOT::RDF::RNode
-SumVectors(ROOT::RDF::RNode df, const std::string &outputname,
-           const std::string &quantity_1, const std::string &quantity_2,
-           const T zero = T(0)) {
+ROOT::RDF::RNode SumVectors(ROOT::RDF::RNode df, const std::string &outputname,
+                            const std::string &quantity_1,
+                            const std::string &quantity_2,
+                            const T zero = T(0)) {
     auto sum_func = [](const ROOT::RVec<T> &quantity_1,
                        const ROOT::RVec<T> &quantity_2) {
         return quantity_1 + quantity_2;
@@ -72,6 +78,114 @@ SumVectors(ROOT::RDF::RNode df, const std::string &outputname,
     return df.Define(outputname, sum_func, {quantity_1, quantity_2});
 }
 
+/**
+ * @brief This function defines the columns of the attributes collected in a
+ * tuple column by `event::quantity::GetAttributes`, one column per attribute.
+ *
+ * @tparam Ts types of the attributes in the tuple
+ * @tparam Is positions of the attributes in the tuple
+ * @param df input dataframe
+ * @param outputnames names of the new columns, one for each attribute
+ * @param attributes name of the tuple column containing the attributes
+ *
+ * @return a dataframe with the new columns
+ */
+template <typename... Ts, std::size_t... Is>
+inline ROOT::RDF::RNode
+DefineAttributes(ROOT::RDF::RNode df,
+                 const std::vector<std::string> &outputnames,
+                 const std::string &attributes, std::index_sequence<Is...>) {
+    ((df = df.Define(
+          outputnames[Is],
+          [](const std::tuple<Ts...> &values) {
+              return std::get<Is>(values);
+          },
+          {attributes})),
+     ...);
+    return df;
+}
+
+/**
+ * @brief This function extracts several attributes of one selected object,
+ * e.g. the first leg of the selected pair, from the columns of its object
+ * collection with a single producer, instead of one `event::quantity::Get`
+ * producer per attribute.
+ *
+ * For each event, the index of the object is read once and all attributes
+ * are collected in a tuple column named `<first output name>_attributes`,
+ * from which the named columns are defined. If the index is not found, all
+ * attributes are set to their default values, as in `event::quantity::Get`.
+ * A single attribute is defined with `event::quantity::Get` directly.
+ *
+ * @tparam Ts types of the attributes, one for each output column
+ * @param df input dataframe
+ * @param outputnames names of the new columns, one for each attribute
+ * @param columns names of the collection columns containing the attributes,
+ * followed by the name of the column containing the indices of the selected
+ * objects
+ * @param position position of the object in the index column
+ *
+ * @return a dataframe with the new columns
+ */
+template <typename... Ts>
+inline ROOT::RDF::RNode
+GetAttributes(ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+              const std::vector<std::string> &columns, const int &position) {
+    if (outputnames.size() != sizeof...(Ts) ||
+        columns.size() != sizeof...(Ts) + 1) {
+        throw std::invalid_argument(
+            "Number of output columns, attribute columns and types differ");
+    }
+    if constexpr (sizeof...(Ts) == 1) {
+        return Get<Ts...>(df, outputnames.front(), columns.front(),
+                          columns.back(), position);
+    } else {
+        const auto attributes = outputnames.front() + "_attributes";
+        // the index column is passed first, followed by the attribute columns
+        std::vector<std::string> inputs = {columns.back()};
+        inputs.insert(inputs.end(), columns.begin(), columns.end() - 1);
+        auto get_attributes = [position](const ROOT::RVec<int> &index_vector,
+                                         const ROOT::RVec<Ts> &...collections) {
+            if (position >= 0 && position < index_vector.size()) {
+                const auto index = index_vector.at(position);
+                if (index >= 0 && ((index < collections.size()) && ...)) {
+                    return std::tuple<Ts...>(collections.at(index)...);
+                }
+            }
+            return std::tuple<Ts...>(default_value<Ts>()...);
+        };
+        return DefineAttributes<Ts...>(df.Define(attributes, get_attributes,
+                                                 inputs),
+                                       outputnames, attributes,
+                                       std::index_sequence_for<Ts...>{});
+    }
+}
+
+#ifdef XYH_PREBUILT_ADDONS
+// instantiated in the prebuilt cpp_addons library, see
+// cpp_addons/lib/instantiations.cxx
+extern template ROOT::RDF::RNode Define<int>(ROOT::RDF::RNode df,
+                                             const std::string &outputname,
+                                             const std::string &number_column,
+                                             int const &value);
+extern template ROOT::RDF::RNode Define<float>(ROOT::RDF::RNode df,
+                                               const std::string &outputname,
+                                               const std::string &number_column,
+                                               float const &value);
+extern template ROOT::RDF::RNode
+Concatenate<int>(ROOT::RDF::RNode df, const std::string &outputname,
+                 const std::string &inputname_1,
+                 const std::string &inputname_2);
+extern template ROOT::RDF::RNode
+Concatenate<float>(ROOT::RDF::RNode df, const std::string &outputname,
+                   const std::string &inputname_1,
+                   const std::string &inputname_2);
+extern template ROOT::RDF::RNode
+SumVectors<float>(ROOT::RDF::RNode df, const std::string &outputname,
+                  const std::string &quantity_1, const std::string &quantity_2,
+                  const float zero);
+#endif // end XYH_PREBUILT_ADDONS
+
 } // end namespace quantity
 
 } // end namespace event
@@ -1,8 +1,111 @@
 #ifndef GUARDFAKEFACTORS_H
 #define GUARDFAKEFACTORS_H
 
+#include "ROOT/RDataFrame.hxx"
+#include "correction.h"
+#include <map>
+#include <memory>
+#include <nlohmann/json_fwd.hpp>
+#include <string>
+#include <vector>
+
 namespace fakefactors {
 
+namespace dense {
+
+/**
+ * @brief Binned correctionlib correction compiled into flat arrays for a fixed
+ * set of categorical inputs.
+ *
+ * All categorical inputs (e.g. the systematic variation or the process of a
+ * fraction) are resolved once at setup. The remaining binning tree is stored
+ * as flat node, edge and child arrays, so that an evaluation is a sequence of
+ * bin searches without allocations or string comparisons. Leaves can be
+ * constants or linear formulas `a*x+b` of a single input. Bin finding and
+ * flow handling follow correctionlib, and constant leaves are taken from an
+ * evaluation of the correctionlib correction itself, so the results are
+ * identical to `correction::Correction::evaluate`.
+ */
+class Correction {
+  public:
+    Correction() = default;
+    Correction(const nlohmann::json &correction,
+               const std::map<std::string, std::string> &categories,
+               const correction::Correction &reference);
+
+    /**
+     * @brief Evaluate the correction. The values of the numerical inputs
+     * must be given in the order of the correction inputs, skipping the
+     * categorical inputs that have been fixed at setup.
+     */
+    double evaluate(const double *values) const;
+    double evaluate(const double x) const { return evaluate(&x); }
+    double evaluate(const double x, const double y) const {
+        const double values[2] = {x, y};
+        return evaluate(values);
+    }
+    const std::string &name() const { return name_; }
+
+  private:
+    enum class NodeType { Constant, Linear, Binning };
+    enum class Flow { Clamp, Error, Default };
+    struct Node {
+        NodeType type = NodeType::Constant;
+        int input = -1;
+        // leaves: value = slope * input + intercept
+        double slope = 0.;
+        double intercept = 0.;
+        // binning nodes
+        Flow flow = Flow::Clamp;
+        std::size_t default_node = 0;
+        bool uniform = false;
+        double low = 0.;
+        double high = 0.;
+        std::size_t nbins = 0;
+        std::size_t edges_offset = 0;
+        std::size_t children_offset = 0;
+    };
+
+    std::size_t compile(const nlohmann::json &node,
+                        const std::map<std::string, std::string> &categories,
+                        const correction::Correction &reference);
+    int input_index(const std::string &input) const;
+
+    std::string name_;
+    std::vector<std::string> inputs_;
+    // position of the numerical inputs in the full input list of the
+    // correction and a point in the input space inside the currently compiled
+    // bin, only needed at setup
+    std::vector<std::size_t> input_positions_;
+    std::vector<bool> integer_inputs_;
+    std::vector<correction::Variable::Type> point_;
+    std::vector<Node> nodes_;
+    std::vector<double> edges_;
+    std::vector<std::size_t> children_;
+    std::size_t root_ = 0;
+};
+
+/**
+ * @brief Parsed correctionlib json file (optionally gzipped) from which dense
+ * corrections can be compiled. The file is parsed once at construction,
+ * independent of the number of compiled corrections, together with the
+ * correctionlib set that serves as reference for the compiled values.
+ */
+class CorrectionFile {
+  public:
+    explicit CorrectionFile(const std::string &filename);
+    Correction
+    compile(const std::string &name,
+            const std::map<std::string, std::string> &categories) const;
+
+  private:
+    std::string filename_;
+    std::shared_ptr<const nlohmann::json> corrections_;
+    std::unique_ptr<correction::CorrectionSet> reference_;
+};
+
+} // namespace dense
+
 ROOT::RDF::RNode raw_fakefactor_nmssm_lt(
     ROOT::RDF::RNode df, const std::string &outputname,
     const std::string &tau_pt, const std::string &njets,
@@ -62,5 +165,38 @@ ROOT::RDF::RNode fakefactor_nmssm_tt(
     const std::string &ttbar_corr_leppt_variation,
     const std::string &ttbar_corr_taumass_variation, const std::string &ff_file,
     const std::string &ff_corr_file);
+ROOT::RDF::RNode raw_fakefactor_nmssm_lt_variations(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &tau_pt, const std::string &njets,
+    const std::string &lep_mt, const std::string &nbtags,
+    const std::vector<std::string> &variation_parameters,
+    const std::vector<std::string> &variation_names,
+    const std::string &ff_file);
+ROOT::RDF::RNode raw_fakefactor_nmssm_tt_variations(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const int &tau_idx, const std::string &tau_pt_1,
+    const std::string &tau_pt_2, const std::string &njets,
+    const std::string &m_vis, const std::string &nbtag,
+    const std::vector<std::string> &variation_parameters,
+    const std::vector<std::string> &variation_names,
+    const std::string &ff_file);
+ROOT::RDF::RNode fakefactor_nmssm_lt_variations(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &tau_pt, const std::string &njets,
+    const std::string &lep_mt, const std::string &nbtags,
+    const std::string &lep_pt, const std::string &tau_mass,
+    const std::string &m_vis,
+    const std::vector<std::string> &variation_parameters,
+    const std::vector<std::string> &variation_names, const std::string &ff_file,
+    const std::string &ff_corr_file);
+ROOT::RDF::RNode fakefactor_nmssm_tt_variations(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const int &tau_idx, const std::string &tau_pt_1,
+    const std::string &tau_pt_2, const std::string &njets,
+    const std::string &m_vis, const std::string &nbtag,
+    const std::string &tau_mass_1, const std::string &tau_mass_2,
+    const std::vector<std::string> &variation_parameters,
+    const std::vector<std::string> &variation_names, const std::string &ff_file,
+    const std::string &ff_corr_file);
 } // namespace fakefactors
 #endif /* GUARDFAKEFACTORS_H */
\ No newline at end of file
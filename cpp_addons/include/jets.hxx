@@ -119,18 +119,18 @@ PtCorrectionMC(ROOT::RDF::RNode df,
                const std::vector<std::string> &jes_shift_sources,
                const int &jes_shift_factor, const std::string &jer_shift,
                const bool &reapply_jes, const std::string &era);
-ROOT::RDF::RNode
-PtCorrectionData(ROOT::RDF::RNode df,
-                 correctionManager::CorrectionManager &correction_manager,
-                 const std::string &output_jec_result,
-                 const std::string &output_l1, const std::string &output_l2rel,
-                 const std::string &output_l2l3res,
-                 const std::string &output_full, const std::string &jet_pt_raw,
-                 const std::string &jet_eta, const std::string &jet_phi,
-                 const std::string &jet_area, const std::string &rho,
-                 const std::string &run, const std::string &jec_file,
-                 const std::string &jec_algo, const std::string &jes_tag,
-                 const bool &reapply_jes, const std::string &era);
+ROOT::RDF::RNode PtCorrectionData(
+    ROOT::RDF::RNode df,
+    correctionManager::CorrectionManager &correction_manager,
+    const std::string &output_jec_result, const std::string &output_l1,
+    const std::string &output_l2rel, const std::string &output_l2l3res,
+    const std::string &output_full, const std::string &jet_pt_raw,
+    const std::string &jet_eta, const std::string &jet_phi,
+    const std::string &jet_area, const std::string &rho, const std::string &run,
+    const std::string &jec_file, const std::string &jec_algo,
+    const std::vector<std::string> &jes_tags,
+    const std::vector<unsigned int> &first_runs, const bool &reapply_jes,
+    const std::string &era);
 ROOT::RDF::RNode MassCorrectionFromPt(ROOT::RDF::RNode df,
                                       const std::string &outputname,
                                       const std::string &jet_mass_raw,
@@ -0,0 +1,23 @@
+#ifndef GUARDLORENTZVECTORS_HXX
+#define GUARDLORENTZVECTORS_HXX
+
+#include "ROOT/RDataFrame.hxx"
+#include <string>
+#include <vector>
+
+// namespace xyh
+namespace xyh {
+
+// namespace lorentzvector
+namespace lorentzvector {
+
+ROOT::RDF::RNode Components(ROOT::RDF::RNode df,
+                            const std::vector<std::string> &outputnames,
+                            const std::string &p4,
+                            const std::vector<std::string> &components);
+
+} // end namespace lorentzvector
+
+} // end namespace xyh
+
+#endif // end GUARDLORENTZVECTORS_HXX
@@ -0,0 +1,87 @@
+#ifndef GUARDLUMI_HXX
+#define GUARDLUMI_HXX
+
+#include "ROOT/RDataFrame.hxx"
+#include <algorithm>
+#include <cstddef>
+#include <string>
+#include <utility>
+#include <vector>
+
+// namespace xyh
+namespace xyh {
+
+// namespace lumi
+namespace lumi {
+
+/**
+ * @brief Certified luminosity sections of a golden JSON file, indexed for
+ * fast lookups.
+ *
+ * The runs are stored in a sorted array. The luminosity section intervals of
+ * all runs are stored in one array, sorted and merged per run, and the
+ * intervals of a run are addressed by offsets into this array. A lookup
+ * consists of a binary search for the run and, for runs with more than one
+ * interval, a binary search for the luminosity section. Runs, which are not
+ * contained in the file, are rejected after the first search.
+ */
+class CertifiedLumiSections {
+  public:
+    explicit CertifiedLumiSections(const std::string &json_path);
+
+    /**
+     * @brief Check whether a luminosity section of a run is certified.
+     *
+     * This inline function is intended to be used in
+     * `ROOT::RDataFrame::Filter` calls.
+     *
+     * @param run The run number.
+     * @param luminosity The luminosity section.
+     * @return `true` if the luminosity section is certified.
+     */
+    inline bool contains(const unsigned int &run,
+                         const unsigned int &luminosity) const {
+        const auto run_it = std::lower_bound(runs_.begin(), runs_.end(), run);
+        if (run_it == runs_.end() || *run_it != run) {
+            return false;
+        }
+        const auto index = run_it - runs_.begin();
+        const auto first = intervals_.begin() + offsets_[index];
+        const auto last = intervals_.begin() + offsets_[index + 1];
+        if (last - first == 1) {
+            return luminosity >= first->first && luminosity <= first->second;
+        }
+        // last interval starting at or before the luminosity section
+        auto interval = std::upper_bound(
+            first, last, luminosity,
+            [](const unsigned int &luminosity,
+               const std::pair<unsigned int, unsigned int> &interval) {
+                return luminosity < interval.first;
+            });
+        if (interval == first) {
+            return false;
+        }
+        --interval;
+        return luminosity <= interval->second;
+    }
+
+    std::size_t n_runs() const { return runs_.size(); }
+    std::size_t n_intervals() const { return intervals_.size(); }
+
+  private:
+    std::vector<unsigned int> runs_;
+    std::vector<std::size_t> offsets_;
+    std::vector<std::pair<unsigned int, unsigned int>> intervals_;
+};
+
+ROOT::RDF::RNode GoldenJSONFilter(ROOT::RDF::RNode df,
+                                  const std::string &filtername,
+                                  const std::string &run,
+                                  const std::string &luminosity,
+                                  const std::string &json_path);
+
+} // end namespace lumi
+
+} // end namespace xyh
+
+#endif // end GUARDLUMI_HXX
@@ -14,6 +14,15 @@ Type1Correction(ROOT::RDF::RNode df, const std::string &outputname,
                 const std::string &t1jet_em_ef, const float &t1jet_min_pt,
                 const float &t1jet_max_abs_eta, const float &t1jet_max_em_ef);
 
-}
+ROOT::RDF::RNode Type1CorrectionIncremental(
+    ROOT::RDF::RNode df, const std::string &outputname,
+    const std::string raw_met, const std::string &t1jet_pt_l1corrected,
+    const std::string &t1jet_pt_corrected, const std::string &t1jet_eta,
+    const std::string &t1jet_phi, const std::string &t1jet_em_ef,
+    const float &t1jet_min_pt, const float &t1jet_max_abs_eta,
+    const float &t1jet_max_em_ef, const std::string &nominal_outputname,
+    const std::string &nominal_pt_corrected, const bool &validate);
+
+} // namespace met
 
 #endif
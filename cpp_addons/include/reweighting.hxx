@@ -1,17 +1,40 @@
 #ifndef GUARDREWEIGHTINGEXT_HXX
 #define GUARDREWEIGHTINGEXT_HXX
 
+#include "../../../../include/utility/CorrectionManager.hxx"
 #include "ROOT/RDataFrame.hxx"
 #include "ROOT/RVec.hxx"
+#include <string>
+#include <vector>
 
 namespace event {
 
 namespace reweighting {
 
+int lhe_scale_weight_index(const float &muR, const float &muF,
+                           const bool &nmssm_convention);
+ROOT::RDF::RNode LHEScaleWeights(ROOT::RDF::RNode df,
+                                 const std::vector<std::string> &outputnames,
+                                 const std::string &lhe_scale_weights,
+                                 const std::vector<float> &muRs,
+                                 const std::vector<float> &muFs,
+                                 const bool &nmssm_convention);
 ROOT::RDF::RNode NMSSMLHEScaleWeights(ROOT::RDF::RNode df,
                                       const std::string &weightname,
                                       const std::string &lhe_scale_weights,
                                       const float muR, const float muF);
+ROOT::RDF::RNode
+PileupTable(ROOT::RDF::RNode df,
+            correctionManager::CorrectionManager &correction_manager,
+            const std::vector<std::string> &outputnames,
+            const std::string &true_pileup, const std::string &json_file,
+            const std::string &json_name,
+            const std::vector<std::string> &variations);
+ROOT::RDF::RNode SelectVariation(ROOT::RDF::RNode df,
+                                 const std::string &outputname,
+                                 const std::vector<std::string> &weights,
+                                 const std::vector<std::string> &variations,
+                                 const std::string &variation);
 
 }
 
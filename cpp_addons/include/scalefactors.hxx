@@ -1,6 +1,20 @@
 #ifndef GUARD_SCALEFACTORSEXT_H
 #define GUARD_SCALEFACTORSEXT_H
 
+#include "../../../../include/utility/CorrectionManager.hxx"
+#include "../../../../include/utility/Logger.hxx"
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include "correction.h"
+#include <array>
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <tuple>
+#include <type_traits>
+#include <variant>
+#include <vector>
+
 namespace scalefactor {
 
 namespace electron {
@@ -71,6 +85,292 @@ trigger(ROOT::RDF::RNode df,
 
 } // namespace fatjet
 
+/**
+ * @brief Convert the value of an input column to an input of a correctionlib
+ * correction. Floating point values are passed as `double`, integral values,
+ * e.g. decay modes or trigger flags, as `int`.
+ *
+ * @tparam T type of the input column
+ * @param value value of the input column
+ * @return the input of the correction
+ */
+template <typename T>
+inline correction::Variable::Type scalefactor_input(const T &value) {
+    if constexpr (std::is_floating_point_v<T>) {
+        return static_cast<double>(value);
+    } else {
+        return static_cast<int>(value);
+    }
+}
+
+/**
+ * @brief Function used to evaluate several correctionlib scale factors in a
+ * single `Define` statement, see `lepton::Evaluate` and `trigger::Evaluate`.
+ *
+ * The input columns and the flags are passed with their native types, which
+ * are given by the template parameters. All scale factors are evaluated in
+ * one `Define` of a vector column, from which the scale factor columns are
+ * taken. A single scale factor without product is defined directly.
+ *
+ * @tparam Ts types of the input columns, followed by the types of the flag
+ * columns
+ * @param df The input dataframe
+ * @param correctionManager The CorrectionManager object
+ * @param logger name of the logger
+ * @param outputnames names of the scale factor columns, one for each scale
+ * factor, followed by the name of the column of the product of all scale
+ * factors if `product` is set
+ * @param columns names of the input columns, starting with the pt
+ * @param flags names of the flag columns, one for each scale factor, or empty
+ * if the scale factors are always evaluated
+ * @param sf_files paths to the files with the scale factors, one for each
+ * scale factor
+ * @param sf_names names of the corrections, one for each scale factor
+ * @param arguments arguments passed to the corrections, one list for each
+ * scale factor
+ * @param product whether the product of all scale factors is written as
+ * additional column
+ * @return a new dataframe containing the new columns
+ */
+template <typename... Ts>
+ROOT::RDF::RNode
+evaluate_scalefactors(ROOT::RDF::RNode df,
+                      correctionManager::CorrectionManager &correctionManager,
+                      const std::string &logger,
+                      const std::vector<std::string> &outputnames,
+                      const std::vector<std::string> &columns,
+                      const std::vector<std::string> &flags,
+                      const std::vector<std::string> &sf_files,
+                      const std::vector<std::string> &sf_names,
+                      const std::vector<std::vector<std::string>> &arguments,
+                      const bool &product) {
+    static_assert(sizeof...(Ts) > 0 &&
+                      std::is_floating_point_v<
+                          std::tuple_element_t<0, std::tuple<Ts...>>>,
+                  "The first input column must be the floating point pt");
+    const std::size_t n_sfs = sf_names.size();
+    if (columns.empty() || sf_files.size() != n_sfs ||
+        arguments.size() != n_sfs ||
+        (!flags.empty() && flags.size() != n_sfs) ||
+        columns.size() + flags.size() != sizeof...(Ts) ||
+        outputnames.size() != n_sfs + (product ? 1 : 0)) {
+        Logger::get(logger)->error(
+            "Got {} output columns, {} input columns, {} flags, {} column "
+            "types, {} files, {} corrections and {} argument lists",
+            outputnames.size(), columns.size(), flags.size(), sizeof...(Ts),
+            sf_files.size(), n_sfs, arguments.size());
+        throw std::invalid_argument(
+            "Inconsistent configuration of the scale factors");
+    }
+
+    // arguments of the corrections, either (absolute) values of input columns
+    // or strings
+    struct Argument {
+        int column;
+        bool absolute;
+        std::string value;
+    };
+    std::vector<const correction::Correction *> evaluators;
+    std::vector<std::vector<Argument>> parsed_arguments;
+    for (std::size_t i = 0; i < n_sfs; ++i) {
+        Logger::get(logger)->debug("Scale factor {} - Name {}", outputnames[i],
+                                   sf_names[i]);
+        auto evaluator =
+            correctionManager.loadCorrection(sf_files[i], sf_names[i]);
+        std::vector<Argument> sf_arguments;
+        for (const auto &argument : arguments[i]) {
+            if (sf_arguments.size() == evaluator->inputs().size()) {
+                break;
+            }
+            const bool absolute = argument.rfind("abs:$", 0) == 0;
+            if (absolute || argument.rfind("$", 0) == 0) {
+                const int column = std::stoi(argument.substr(absolute ? 5 : 1));
+                if (column < 0 || column >= (int)columns.size()) {
+                    throw std::invalid_argument(
+                        "Invalid input column in scale factor argument " +
+                        argument);
+                }
+                sf_arguments.push_back({column, absolute, ""});
+            } else {
+                sf_arguments.push_back({-1, false, argument});
+            }
+        }
+        evaluators.push_back(evaluator);
+        parsed_arguments.push_back(sf_arguments);
+    }
+
+    // evaluate the i-th scale factor, the flags follow the input columns
+    using Inputs = std::array<correction::Variable::Type, sizeof...(Ts)>;
+    const std::size_t n_columns = columns.size();
+    const bool has_flags = !flags.empty();
+    auto evaluate = [evaluators, parsed_arguments, n_columns,
+                     has_flags](const Inputs &values, const std::size_t &i) {
+        if (std::get<double>(values[0]) < 0.0 ||
+            (has_flags && std::get<int>(values[n_columns + i]) == 0)) {
+            return 1.;
+        }
+        std::vector<correction::Variable::Type> inputs;
+        inputs.reserve(parsed_arguments[i].size());
+        for (const auto &argument : parsed_arguments[i]) {
+            if (argument.column < 0) {
+                inputs.push_back(argument.value);
+            } else if (!argument.absolute) {
+                inputs.push_back(values[argument.column]);
+            } else if (std::holds_alternative<int>(values[argument.column])) {
+                inputs.push_back(
+                    std::abs(std::get<int>(values[argument.column])));
+            } else {
+                inputs.push_back(
+                    std::abs(std::get<double>(values[argument.column])));
+            }
+        }
+        return evaluators[i]->evaluate(inputs);
+    };
+
+    std::vector<std::string> inputs = columns;
+    inputs.insert(inputs.end(), flags.begin(), flags.end());
+    if (n_sfs == 1 && !product) {
+        return df.Define(
+            outputnames.front(),
+            [evaluate](const Ts &...values) {
+                return evaluate(Inputs{scalefactor_input(values)...}, 0);
+            },
+            inputs);
+    }
+
+    const auto sfs_column = outputnames.front() + "_all";
+    auto df1 = df.Define(
+        sfs_column,
+        [evaluate, n_sfs](const Ts &...values) {
+            const Inputs inputs{scalefactor_input(values)...};
+            ROOT::RVec<double> sfs(n_sfs);
+            for (std::size_t i = 0; i < n_sfs; ++i) {
+                sfs[i] = evaluate(inputs, i);
+            }
+            return sfs;
+        },
+        inputs);
+    for (std::size_t i = 0; i < n_sfs; ++i) {
+        df1 = df1.Define(outputnames[i],
+                         [i](const ROOT::RVec<double> &sfs) { return sfs[i]; },
+                         {sfs_column});
+    }
+    if (product) {
+        df1 = df1.Define(outputnames.back(),
+                         [](const ROOT::RVec<double> &sfs) {
+                             return ROOT::VecOps::Product(sfs);
+                         },
+                         {sfs_column});
+    }
+    return df1;
+}
+
+namespace lepton {
+
+/**
+ * @brief Function used to evaluate several correctionlib scale factors of one
+ * lepton, e.g. the identification and isolation scale factors of a muon, in a
+ * single `Define` statement instead of one producer per scale factor.
+ *
+ * The scale factors are given declaratively by the correction file, the
+ * correction name and the list of arguments passed to the correction. Each
+ * argument is either
+ *
+ * - `$<i>`: the value of the `i`-th input column,
+ * - `abs:$<i>`: the absolute value of the `i`-th input column, or
+ * - any other string, which is passed as string argument, e.g. the variation.
+ *
+ * Arguments exceeding the number of inputs of a correction are dropped, so
+ * that optional trailing inputs, e.g. the electron phi in some eras, can be
+ * given for all eras. The arguments are parsed once when the dataframe graph
+ * is built. The first input column must contain the transverse momentum of
+ * the lepton. If it is negative, i.e. the lepton does not exist, all scale
+ * factors are set to 1.
+ *
+ * @tparam Ts types of the input columns
+ * @param df The input dataframe
+ * @param correctionManager The CorrectionManager object
+ * @param outputnames names of the scale factor columns, one for each scale
+ * factor, followed by the name of the column of the product of all scale
+ * factors if `product` is set
+ * @param columns names of the input columns, starting with the lepton pt
+ * @param sf_files paths to the files with the scale factors, one for each
+ * scale factor
+ * @param sf_names names of the corrections, one for each scale factor
+ * @param arguments arguments passed to the corrections, one list for each
+ * scale factor
+ * @param product whether the product of all scale factors is written as
+ * additional column
+ * @return a new dataframe containing the new columns
+ */
+template <typename... Ts>
+ROOT::RDF::RNode
+Evaluate(ROOT::RDF::RNode df,
+         correctionManager::CorrectionManager &correctionManager,
+         const std::vector<std::string> &outputnames,
+         const std::vector<std::string> &columns,
+         const std::vector<std::string> &sf_files,
+         const std::vector<std::string> &sf_names,
+         const std::vector<std::vector<std::string>> &arguments,
+         const bool &product) {
+    return evaluate_scalefactors<Ts...>(df, correctionManager, "leptonSF",
+                                        outputnames, columns, {}, sf_files,
+                                        sf_names, arguments, product);
+}
+
+} // namespace lepton
+
+namespace trigger {
+
+/**
+ * @brief Function used to evaluate the trigger scale factors of several
+ * triggers for one leg, e.g. all single muon triggers, in a single `Define`
+ * statement instead of one producer per trigger.
+ *
+ * The scale factors and their arguments are given as for `lepton::Evaluate`.
+ * In addition, each scale factor is assigned to the flag of its trigger. The
+ * scale factor is only evaluated if the flag is set, otherwise it is set to
+ * 1. All scale factors are set to 1 if the transverse momentum of the leg,
+ * which must be given by the first input column, is negative.
+ *
+ * @tparam Ts types of the input columns, followed by the types of the trigger
+ * flags
+ * @param df The input dataframe
+ * @param correctionManager The CorrectionManager object
+ * @param outputnames names of the scale factor columns, one for each trigger
+ * @param columns names of the input columns, starting with the pt of the leg
+ * @param flags names of the trigger flag columns, one for each trigger
+ * @param sf_files paths to the files with the scale factors, one for each
+ * trigger
+ * @param sf_names names of the corrections, one for each trigger
+ * @param arguments arguments passed to the corrections, one list for each
+ * trigger
+ * @return a new dataframe containing the new columns
+ */
+template <typename... Ts>
+ROOT::RDF::RNode
+Evaluate(ROOT::RDF::RNode df,
+         correctionManager::CorrectionManager &correctionManager,
+         const std::vector<std::string> &outputnames,
+         const std::vector<std::string> &columns,
+         const std::vector<std::string> &flags,
+         const std::vector<std::string> &sf_files,
+         const std::vector<std::string> &sf_names,
+         const std::vector<std::vector<std::string>> &arguments) {
+    if (flags.size() != sf_names.size()) {
+        Logger::get("triggerSF")
+            ->error("Got {} trigger flags for {} corrections", flags.size(),
+                    sf_names.size());
+        throw std::invalid_argument(
+            "Number of trigger flags and scale factors differ");
+    }
+    return evaluate_scalefactors<Ts...>(df, correctionManager, "triggerSF",
+                                        outputnames, columns, flags, sf_files,
+                                        sf_names, arguments, false);
+}
+
+} // namespace trigger
+
 } // namespace scalefactor
 
 #endif
\ No newline at end of file
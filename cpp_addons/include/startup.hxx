@@ -0,0 +1,86 @@
+#ifndef GUARDSTARTUP_HXX
+#define GUARDSTARTUP_HXX
+
+#include "ROOT/RDataFrame.hxx"
+#include <chrono>
+#include <mutex>
+#include <set>
+#include <string>
+#include <vector>
+
+// namespace xyh
+namespace xyh {
+
+// namespace startup
+namespace startup {
+
+/**
+ * @brief Time and memory spent in the phases of the startup of an executable.
+ *
+ * The dataframe graph is constructed by calling the producers one after
+ * another. Each producer call is enclosed by `Begin` and `End`, which record
+ * the wall time and the change of the resident memory of the call. This
+ * includes the loading of correctionlib payloads and the creation of ONNX
+ * sessions, which happen when the producers are called. As the correction
+ * manager loads each payload only once, the loading time of a payload is
+ * contained in the call of the first producer using it. The just-in-time
+ * compilation of the graph happens when the event loop is started and is
+ * recorded with the first processed event, see `Write`.
+ */
+class Report {
+  public:
+    static Report &get();
+
+    void begin(const std::string &producer, const std::string &scope,
+               const std::vector<std::string> &outputs,
+               const std::vector<std::string> &payloads,
+               const std::vector<std::string> &corrections);
+    void end();
+    void first_event();
+    bool write();
+    std::once_flag &first_event_flag() { return first_event_flag_; }
+
+  private:
+    // a producer call or another phase of the startup
+    struct Phase {
+        std::string category;
+        std::string producer;
+        std::string scope;
+        std::string shift;
+        std::vector<std::string> outputs;
+        std::vector<std::string> payloads;
+        std::vector<std::string> corrections;
+        std::vector<std::string> loaded_payloads;
+        double time;
+        double rss_before;
+        double rss_after;
+    };
+
+    Report();
+    ~Report();
+
+    std::mutex mutex_;
+    std::chrono::steady_clock::time_point start_;
+    std::chrono::steady_clock::time_point phase_start_;
+    std::chrono::steady_clock::time_point last_end_;
+    double last_rss_;
+    std::vector<Phase> phases_;
+    std::set<std::string> loaded_payloads_;
+    std::once_flag first_event_flag_;
+    bool written_;
+};
+
+void Begin(const std::string &producer, const std::string &scope,
+           const std::vector<std::string> &outputs,
+           const std::vector<std::string> &payloads,
+           const std::vector<std::string> &corrections);
+
+ROOT::RDF::RNode End(ROOT::RDF::RNode df);
+
+ROOT::RDF::RNode Write(ROOT::RDF::RNode df);
+
+} // end namespace startup
+
+} // end namespace xyh
+
+#endif // end GUARDSTARTUP_HXX
@@ -0,0 +1,71 @@
+#ifndef GUARDSTORAGE_HXX
+#define GUARDSTORAGE_HXX
+
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <cstdint>
+#include <cstring>
+#include <string>
+#include <vector>
+
+// namespace xyh
+namespace xyh {
+
+// namespace storage
+namespace storage {
+
+/**
+ * @brief Round the mantissa of a single-precision float to a given number of
+ * bits.
+ *
+ * The value is rounded to the nearest representable value with `bits`
+ * mantissa bits, the remaining mantissa bits are set to zero. The relative
+ * precision of the result is `2^-(bits + 1)`, e.g. about 5e-4 for 10 bits,
+ * which corresponds to the mantissa of a half-precision float. As the zeroed
+ * bits are compressed very efficiently, the compressed size of the column is
+ * reduced considerably. Infinities and NaNs are returned unchanged, and values
+ * close to the largest finite float are truncated instead of rounded to
+ * infinity.
+ *
+ * This inline function is intended to be used in `ROOT::RDataFrame::Define`
+ * statements.
+ *
+ * @param value The value to be rounded.
+ * @param bits The number of mantissa bits to be kept, between 1 and 23.
+ * @return The rounded value.
+ */
+inline float reduce_mantissa(const float &value, const int &bits) {
+    constexpr std::uint32_t exponent_mask = 0x7F800000;
+    if (bits >= 23) {
+        return value;
+    }
+    std::uint32_t raw;
+    std::memcpy(&raw, &value, sizeof(raw));
+    if ((raw & exponent_mask) == exponent_mask) {
+        return value;
+    }
+    const int shift = 23 - bits;
+    const std::uint32_t mask = ~((std::uint32_t(1) << shift) - 1);
+    // a carry of the rounding into the exponent yields the next power of two,
+    // which is the correctly rounded value
+    std::uint32_t rounded = (raw + (std::uint32_t(1) << (shift - 1))) & mask;
+    if ((rounded & exponent_mask) == exponent_mask) {
+        rounded = raw & mask;
+    }
+    float result;
+    std::memcpy(&result, &rounded, sizeof(result));
+    return result;
+}
+
+ROOT::RDF::RNode ApplyPolicies(ROOT::RDF::RNode df,
+                               const std::vector<std::string> &quantities,
+                               const std::vector<std::string> &policies);
+
+ROOT::RDF::RNode PackFlags(ROOT::RDF::RNode df, const std::string &outputname,
+                           const std::vector<std::string> &flags);
+
+} // end namespace storage
+
+} // end namespace xyh
+
+#endif // end GUARDSTORAGE_HXX
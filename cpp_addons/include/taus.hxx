@@ -3,6 +3,8 @@
 
 #include "../include/utility/CorrectionManager.hxx"
 #include "ROOT/RDataFrame.hxx"
+#include <string>
+#include <vector>
 
 namespace physicsobject {
 namespace tau {
@@ -21,4 +23,49 @@ Id_vsJet(ROOT::RDF::RNode df,
 } // namespace tau
 } // namespace physicsobject
 
+// namespace xyh
+namespace xyh {
+
+// namespace tau
+namespace tau {
+
+// categories of hadronic taus with separate energy scale variations
+enum class EnergyScaleCategory {
+    none,
+    dm0,
+    dm1,
+    dm10,
+    dm11,
+    efake_dm0_barrel,
+    efake_dm1_barrel,
+    efake_dm0_endcap,
+    efake_dm1_endcap,
+    mufake
+};
+
+EnergyScaleCategory parse_es_category(const std::string &name);
+
+EnergyScaleCategory es_category(const float &eta, const int &decay_mode,
+                                const int &gen_match);
+
+ROOT::RDF::RNode PtCorrectionVariationsMC(
+    ROOT::RDF::RNode df,
+    correctionManager::CorrectionManager &correction_manager,
+    const std::vector<std::string> &outputnames, const std::string &pt,
+    const std::string &eta, const std::string &decay_mode,
+    const std::string &gen_match, const std::string &pt_corrected,
+    const std::string &es_file, const std::string &correction_name,
+    const std::string &id_algorithm, const std::vector<std::string> &wps,
+    const std::vector<std::string> &categories,
+    const std::vector<std::string> &variations);
+
+ROOT::RDF::RNode SelectVariation(ROOT::RDF::RNode df,
+                                 const std::string &outputname,
+                                 const std::vector<std::string> &columns,
+                                 const std::string &variation);
+
+} // end namespace tau
+
+} // end namespace xyh
+
 #endif
\ No newline at end of file
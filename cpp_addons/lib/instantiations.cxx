@@ -0,0 +1,45 @@
+/**
+ * @file instantiations.cxx
+ * @brief Explicit instantiations of the templates of the cpp_addons for the
+ * prebuilt library, see `CMakeLists.txt`.
+ *
+ * The instantiations used by the producers are compiled once into the
+ * library. In the executables, which are built with `XYH_PREBUILT_ADDONS`,
+ * they are declared as `extern template` in the headers, so that they are not
+ * instantiated again in every translation unit. Both lists have to be kept in
+ * sync with the template arguments used in the producer calls.
+ */
+
+#include "../include/event.hxx"
+
+// namespace event
+namespace event {
+
+// namespace quantity
+namespace quantity {
+
+template ROOT::RDF::RNode Define<int>(ROOT::RDF::RNode df,
+                                      const std::string &outputname,
+                                      const std::string &number_column,
+                                      int const &value);
+template ROOT::RDF::RNode Define<float>(ROOT::RDF::RNode df,
+                                        const std::string &outputname,
+                                        const std::string &number_column,
+                                        float const &value);
+template ROOT::RDF::RNode Concatenate<int>(ROOT::RDF::RNode df,
+                                           const std::string &outputname,
+                                           const std::string &inputname_1,
+                                           const std::string &inputname_2);
+template ROOT::RDF::RNode Concatenate<float>(ROOT::RDF::RNode df,
+                                             const std::string &outputname,
+                                             const std::string &inputname_1,
+                                             const std::string &inputname_2);
+template ROOT::RDF::RNode SumVectors<float>(ROOT::RDF::RNode df,
+                                            const std::string &outputname,
+                                            const std::string &quantity_1,
+                                            const std::string &quantity_2,
+                                            const float zero);
+
+} // end namespace quantity
+
+} // end namespace event
@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../../include/HHKinFit/PSFit.hxx"
+#else
 #include "../../include/HHKinFit/PSFit.hxx"
 
 #include <TMarker.h>
@@ -1075,4 +1080,5 @@ double PSFit::PSMmultiplyMRRT(
         }
     }
     return 0;
-}
\ No newline at end of file
+}
+#endif // end XYH_PREBUILT_ADDONS
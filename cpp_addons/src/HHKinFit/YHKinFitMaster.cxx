@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../../include/HHKinFit/YHKinFitMaster.hxx"
+#else
 #include "../../include/HHKinFit/YHKinFitMaster.hxx"
 #include "../../include/HHKinFit/PSFit.hxx"
 #include "../../../../../include/utility/Logger.hxx"
@@ -722,4 +727,5 @@ double YHKinFitMaster::GetPullBalanceY(ROOT::Math::PtEtaPhiEVector p4_X_fit) {
     double dE_fit = sqrt(m_covRecoil[1][1]);
     double pull = (p4_X_fit.Py() - p4_X_reco.Py()) / dE_fit;
     return pull;
-}
\ No newline at end of file
+}
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,11 +1,563 @@
-#ifndef GUARDFAKEFACTORS_H
-#define GUARDFAKEFACTORS_H
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/fakefactors.hxx"
+#else
+#ifndef GUARDFAKEFACTORS_CXX
+#define GUARDFAKEFACTORS_CXX
 
+#include "../include/fakefactors.hxx"
 #include "../../../../include/utility/Logger.hxx"
 #include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
 #include "correction.h"
+#include <algorithm>
+#include <cmath>
+#include <cstdlib>
+#include <nlohmann/json.hpp>
+#include <stdexcept>
+#include <utility>
+#include <zlib.h>
 
 namespace fakefactors {
+
+namespace dense {
+
+namespace {
+
+/**
+ * @brief Read a (optionally gzipped) text file into a string. `gzread` reads
+ * uncompressed files transparently.
+ */
+std::string read_file(const std::string &filename) {
+    gzFile file = gzopen(filename.c_str(), "rb");
+    if (file == nullptr) {
+        Logger::get("fakefactors::dense")
+            ->error("Could not open file {}", filename);
+        throw std::runtime_error("Could not open file " + filename);
+    }
+    std::string content;
+    char buffer[65536];
+    int nbytes = 0;
+    while ((nbytes = gzread(file, buffer, sizeof(buffer))) > 0) {
+        content.append(buffer, nbytes);
+    }
+    gzclose(file);
+    if (nbytes < 0) {
+        throw std::runtime_error("Could not read file " + filename);
+    }
+    return content;
+}
+
+/**
+ * @brief Parse a formula of the form `a*x+b` (with `b` possibly negative,
+ * e.g. `a*x+-b`) or a plain constant. These are the only formulas appearing in
+ * the fake factor payloads. Any other expression raises an exception, so
+ * that the dense lookup never silently deviates from correctionlib.
+ */
+void parse_linear_formula(const std::string &expression, double &slope,
+                          double &intercept) {
+    const char *begin = expression.c_str();
+    char *end = nullptr;
+    const double first = std::strtod(begin, &end);
+    if (end != begin && *end == '\0') {
+        slope = 0.;
+        intercept = first;
+        return;
+    }
+    if (end != begin && std::string(end).rfind("*x", 0) == 0) {
+        const char *rest = end + 2;
+        if (*rest == '\0') {
+            slope = first;
+            intercept = 0.;
+            return;
+        }
+        if (*rest == '+' || *rest == '-') {
+            const double sign = (*rest == '-') ? -1. : 1.;
+            const char *number = rest + 1;
+            const double second = std::strtod(number, &end);
+            if (end != number && *end == '\0') {
+                slope = first;
+                intercept = sign * second;
+                return;
+            }
+        }
+    }
+    Logger::get("fakefactors::dense")
+        ->error("Formula {} is not supported by the dense lookup", expression);
+    throw std::runtime_error("Unsupported formula " + expression);
+}
+
+} // namespace
+
+/**
+ * @brief Compile a correctionlib correction into flat arrays.
+ *
+ * @param correction json object of the correction
+ * @param categories map from the names of categorical inputs to the keys
+ * that are used for all evaluations, e.g. `{{"syst", "nominal"}}`
+ * @param reference the same correction loaded with correctionlib, used to
+ * obtain the values of constant leaves with the exact floating point
+ * representation of correctionlib
+ */
+Correction::Correction(const nlohmann::json &correction,
+                       const std::map<std::string, std::string> &categories,
+                       const correction::Correction &reference)
+    : name_(correction.at("name").get<std::string>()) {
+    for (const auto &input : correction.at("inputs")) {
+        const auto input_name = input.at("name").get<std::string>();
+        auto category = categories.find(input_name);
+        if (category != categories.end()) {
+            point_.push_back(category->second);
+        } else {
+            inputs_.push_back(input_name);
+            input_positions_.push_back(point_.size());
+            integer_inputs_.push_back(input.at("type").get<std::string>() ==
+                                      "int");
+            point_.push_back(0.);
+        }
+    }
+    root_ = compile(correction.at("data"), categories, reference);
+    point_.clear();
+    Logger::get("fakefactors::dense")
+        ->debug("Compiled correction {} into {} nodes with {} bin edges", name_,
+                nodes_.size(), edges_.size());
+}
+
+int Correction::input_index(const std::string &input) const {
+    auto it = std::find(inputs_.begin(), inputs_.end(), input);
+    if (it == inputs_.end()) {
+        Logger::get("fakefactors::dense")
+            ->error("Input {} of correction {} is neither numerical nor fixed "
+                    "by a category",
+                    input, name_);
+        throw std::runtime_error("Unknown input " + input);
+    }
+    return std::distance(inputs_.begin(), it);
+}
+
+std::size_t
+Correction::compile(const nlohmann::json &node,
+                    const std::map<std::string, std::string> &categories,
+                    const correction::Correction &reference) {
+    if (node.is_number()) {
+        // evaluate the reference correction inside the current bin instead of
+        // using the parsed json value, as the json parser of correctionlib
+        // may round differently in the last digit
+        Node leaf;
+        leaf.type = NodeType::Constant;
+        leaf.intercept = reference.evaluate(point_);
+        nodes_.push_back(leaf);
+        return nodes_.size() - 1;
+    }
+    const auto nodetype = node.at("nodetype").get<std::string>();
+    if (nodetype == "formula") {
+        Node leaf;
+        parse_linear_formula(node.at("expression").get<std::string>(),
+                             leaf.slope, leaf.intercept);
+        if (leaf.slope == 0.) {
+            leaf.type = NodeType::Constant;
+        } else {
+            leaf.type = NodeType::Linear;
+            leaf.input =
+                input_index(node.at("variables").at(0).get<std::string>());
+        }
+        nodes_.push_back(leaf);
+        return nodes_.size() - 1;
+    } else if (nodetype == "category") {
+        const auto input = node.at("input").get<std::string>();
+        auto category = categories.find(input);
+        if (category == categories.end()) {
+            Logger::get("fakefactors::dense")
+                ->error("No key given for category {} of correction {}", input,
+                        name_);
+            throw std::runtime_error("Missing category " + input);
+        }
+        for (const auto &item : node.at("content")) {
+            if (item.at("key").is_string() &&
+                item.at("key").get<std::string>() == category->second) {
+                return compile(item.at("value"), categories, reference);
+            }
+        }
+        if (node.contains("default") && !node.at("default").is_null()) {
+            return compile(node.at("default"), categories, reference);
+        }
+        Logger::get("fakefactors::dense")
+            ->error("Key {} not found in category {} of correction {}",
+                    category->second, input, name_);
+        throw std::runtime_error("Key " + category->second + " not found");
+    } else if (nodetype == "binning") {
+        Node binning;
+        binning.type = NodeType::Binning;
+        binning.input = input_index(node.at("input").get<std::string>());
+        const auto &edges = node.at("edges");
+        binning.edges_offset = edges_.size();
+        if (edges.is_array()) {
+            for (const auto &edge : edges) {
+                edges_.push_back(edge.get<double>());
+            }
+            binning.nbins = edges.size() - 1;
+            binning.low = edges_[binning.edges_offset];
+            binning.high = edges_.back();
+        } else {
+            binning.uniform = true;
+            binning.nbins = edges.at("n").get<std::size_t>();
+            binning.low = edges.at("low").get<double>();
+            binning.high = edges.at("high").get<double>();
+        }
+        // set the input of this binning to a value inside the compiled bin
+        // (or below the binning range for the default flow content)
+        auto set_point = [this, &binning](const double value) {
+            const auto position = input_positions_[binning.input];
+            if (integer_inputs_[binning.input]) {
+                point_[position] = static_cast<int>(std::floor(value));
+            } else {
+                point_[position] = value;
+            }
+        };
+        const auto &flow = node.at("flow");
+        if (flow.is_string() && flow.get<std::string>() == "clamp") {
+            binning.flow = Flow::Clamp;
+        } else if (flow.is_string() && flow.get<std::string>() == "error") {
+            binning.flow = Flow::Error;
+        } else {
+            binning.flow = Flow::Default;
+            set_point(binning.low - 1.);
+            binning.default_node = compile(flow, categories, reference);
+        }
+        std::vector<std::size_t> children;
+        const auto &content = node.at("content");
+        for (std::size_t i = 0; i < content.size(); ++i) {
+            if (binning.uniform) {
+                set_point(binning.low + (i + 0.5) *
+                                            (binning.high - binning.low) /
+                                            binning.nbins);
+            } else {
+                set_point(0.5 * (edges_[binning.edges_offset + i] +
+                                 edges_[binning.edges_offset + i + 1]));
+            }
+            children.push_back(compile(content.at(i), categories, reference));
+        }
+        binning.children_offset = children_.size();
+        children_.insert(children_.end(), children.begin(), children.end());
+        nodes_.push_back(binning);
+        return nodes_.size() - 1;
+    }
+    Logger::get("fakefactors::dense")
+        ->error("Node type {} in correction {} is not supported by the dense "
+                "lookup",
+                nodetype, name_);
+    throw std::runtime_error("Unsupported node type " + nodetype);
+}
+
+double Correction::evaluate(const double *values) const {
+    const Node *node = &nodes_[root_];
+    while (node->type == NodeType::Binning) {
+        const double value = values[node->input];
+        if (std::isnan(value)) {
+            throw std::runtime_error("NaN input in correction " + name_);
+        }
+        std::size_t idx = 0;
+        bool underflow = false;
+        bool overflow = false;
+        if (node->uniform) {
+            if (value < node->low) {
+                underflow = true;
+            } else if (value >= node->high) {
+                overflow = true;
+            } else {
+                idx = static_cast<std::size_t>((value - node->low) /
+                                               (node->high - node->low) *
+                                               node->nbins);
+            }
+        } else {
+            const double *begin = edges_.data() + node->edges_offset;
+            const double *end = begin + node->nbins + 1;
+            const double *it = std::upper_bound(begin, end, value);
+            if (it == begin) {
+                underflow = true;
+            } else if (it == end) {
+                overflow = true;
+            } else {
+                idx = std::distance(begin, it) - 1;
+            }
+        }
+        if (underflow || overflow) {
+            if (node->flow == Flow::Clamp) {
+                idx = underflow ? 0 : node->nbins - 1;
+            } else if (node->flow == Flow::Default) {
+                node = &nodes_[node->default_node];
+                continue;
+            } else {
+                throw std::runtime_error("Input out of range in correction " +
+                                         name_);
+            }
+        }
+        node = &nodes_[children_[node->children_offset + idx]];
+    }
+    if (node->type == NodeType::Linear) {
+        return node->slope * values[node->input] + node->intercept;
+    }
+    return node->intercept;
+}
+
+CorrectionFile::CorrectionFile(const std::string &filename)
+    : filename_(filename), corrections_(std::make_shared<const nlohmann::json>(
+                               nlohmann::json::parse(read_file(filename)))),
+      reference_(correction::CorrectionSet::from_file(filename)) {}
+
+/**
+ * @brief Compile a correction from the file into a dense lookup.
+ *
+ * @param name name of the correction in the file
+ * @param categories keys used for the categorical inputs of the correction
+ * @returns the compiled correction
+ */
+Correction CorrectionFile::compile(
+    const std::string &name,
+    const std::map<std::string, std::string> &categories) const {
+    for (const auto &correction : corrections_->at("corrections")) {
+        if (correction.at("name").get<std::string>() == name) {
+            return Correction(correction, categories, *reference_->at(name));
+        }
+    }
+    Logger::get("fakefactors::dense")
+        ->error("Correction {} not found in {}", name, filename_);
+    throw std::runtime_error("Correction " + name + " not found");
+}
+
+} // namespace dense
+
+namespace {
+
+/**
+ * @brief Definition of a single factor entering the fake factor, e.g. the QCD
+ * fake factor or the Wjets fraction. The factor belongs to a variation
+ * parameter (e.g. `qcd` or `fraction`) and is evaluated on one or two of the
+ * event inputs.
+ */
+struct FactorDefinition {
+    std::string parameter;
+    const dense::CorrectionFile *file;
+    std::string correction;
+    std::map<std::string, std::string> categories;
+    int input_1;
+    int input_2;
+};
+
+/**
+ * @brief Compiled factor, evaluated on the event inputs.
+ */
+struct Factor {
+    dense::Correction correction;
+    int input_1;
+    int input_2;
+
+    float evaluate(const double *inputs) const {
+        if (input_2 < 0) {
+            return correction.evaluate(inputs[input_1]);
+        }
+        return correction.evaluate(inputs[input_1], inputs[input_2]);
+    }
+};
+
+/**
+ * @brief Nominal factors and the factors replaced by each variation. All
+ * nominal factors are evaluated once per event, each variation only evaluates
+ * the factors that belong to its variation parameter.
+ */
+struct FactorVariations {
+    std::vector<Factor> nominal;
+    std::vector<std::vector<std::pair<std::size_t, Factor>>> variations;
+};
+
+Factor compile_factor(const FactorDefinition &definition,
+                      const std::string &variation) {
+    auto categories = definition.categories;
+    categories["syst"] = variation;
+    return Factor{definition.file->compile(definition.correction, categories),
+                  definition.input_1, definition.input_2};
+}
+
+FactorVariations
+compile_factors(const std::vector<FactorDefinition> &definitions,
+                const std::vector<std::string> &outputnames,
+                const std::vector<std::string> &variation_parameters,
+                const std::vector<std::string> &variation_names) {
+    if (variation_parameters.size() != variation_names.size() ||
+        outputnames.size() != variation_names.size() + 1) {
+        Logger::get("FakeFactorVariations")
+            ->error("Got {} output names for {} variation parameters and {} "
+                    "variation names, expected one output more than "
+                    "variations (the nominal fake factor)",
+                    outputnames.size(), variation_parameters.size(),
+                    variation_names.size());
+        throw std::runtime_error("Inconsistent number of fake factor "
+                                 "variations");
+    }
+    FactorVariations factors;
+    for (const auto &definition : definitions) {
+        factors.nominal.push_back(compile_factor(definition, "nominal"));
+    }
+    for (std::size_t i = 0; i < variation_names.size(); ++i) {
+        Logger::get("FakeFactorVariations")
+            ->debug("Variation {} - parameter {}, name {}", outputnames[i + 1],
+                    variation_parameters[i], variation_names[i]);
+        std::vector<std::pair<std::size_t, Factor>> variation;
+        for (std::size_t j = 0; j < definitions.size(); ++j) {
+            if (definitions[j].parameter == variation_parameters[i]) {
+                variation.emplace_back(
+                    j, compile_factor(definitions[j], variation_names[i]));
+            }
+        }
+        if (variation.empty()) {
+            Logger::get("FakeFactorVariations")
+                ->error("Unknown variation parameter {} for variation {}",
+                        variation_parameters[i], variation_names[i]);
+            throw std::runtime_error("Unknown fake factor variation "
+                                     "parameter " +
+                                     variation_parameters[i]);
+        }
+        factors.variations.push_back(variation);
+    }
+    return factors;
+}
+
+/**
+ * @brief Evaluate the nominal factors once and combine them into the nominal
+ * fake factor and all its variations.
+ *
+ * @param factors compiled nominal and varied factors
+ * @param inputs event inputs
+ * @param combine function combining the factor values into the fake factor
+ * @returns vector with the nominal fake factor followed by the variations
+ */
+template <typename Combine>
+ROOT::RVec<float> evaluate_variations(const FactorVariations &factors,
+                                      const double *inputs, Combine combine) {
+    ROOT::RVec<float> nominal(factors.nominal.size());
+    for (std::size_t i = 0; i < factors.nominal.size(); ++i) {
+        nominal[i] = factors.nominal[i].evaluate(inputs);
+    }
+    ROOT::RVec<float> result(factors.variations.size() + 1);
+    result[0] = combine(nominal);
+    ROOT::RVec<float> varied(nominal.size());
+    for (std::size_t i = 0; i < factors.variations.size(); ++i) {
+        std::copy(nominal.begin(), nominal.end(), varied.begin());
+        for (const auto &[index, factor] : factors.variations[i]) {
+            varied[index] = factor.evaluate(inputs);
+        }
+        result[i + 1] = combine(varied);
+    }
+    return result;
+}
+
+/**
+ * @brief Define one output column per entry of the vector column with the
+ * nominal fake factor and its variations.
+ */
+ROOT::RDF::RNode
+define_variation_outputs(ROOT::RDF::RNode df,
+                         const std::vector<std::string> &outputnames,
+                         const std::string &result_vec_name) {
+    for (std::size_t i = 0; i < outputnames.size(); ++i) {
+        df = df.Define(
+            outputnames[i],
+            [i](const ROOT::RVec<float> &result) { return result[i]; },
+            {result_vec_name});
+    }
+    return df;
+}
+
+// position of the factors in the semileptonic channels
+enum LtFactor {
+    LtQcdFF,
+    LtWjetsFF,
+    LtTtbarFF,
+    LtQcdFrac,
+    LtWjetsFrac,
+    LtTtbarFrac,
+    LtQcdLepPt,
+    LtQcdTauMass,
+    LtQcdDRSR,
+    LtWjetsLepPt,
+    LtWjetsTauMass,
+    LtWjetsDRSR,
+    LtTtbarLepPt,
+    LtTtbarTauMass,
+};
+
+// position of the factors in the full hadronic channel
+enum TtFactor {
+    TtQcdFF,
+    TtTtbarFF,
+    TtQcdFrac,
+    TtWjetsFrac,
+    TtTtbarFrac,
+    TtQcdTauPt,
+    TtQcdTauMass,
+    TtQcdDRSR,
+    TtTtbarTauPt,
+    TtTtbarTauMass,
+};
+
+std::vector<FactorDefinition>
+raw_factor_definitions_lt(const dense::CorrectionFile &ff_corrections) {
+    // event inputs: tau pt, njets, lep mt, nbtags
+    return {
+        {"qcd", &ff_corrections, "QCD_fake_factors", {}, 0, 1},
+        {"wjets", &ff_corrections, "Wjets_fake_factors", {}, 0, 1},
+        {"ttbar", &ff_corrections, "ttbar_fake_factors", {}, 0, 1},
+        {"fraction",
+         &ff_corrections,
+         "process_fractions",
+         {{"process", "QCD"}},
+         2,
+         3},
+        {"fraction",
+         &ff_corrections,
+         "process_fractions",
+         {{"process", "Wjets"}},
+         2,
+         3},
+        {"fraction",
+         &ff_corrections,
+         "process_fractions",
+         {{"process", "ttbar"}},
+         2,
+         3},
+    };
+}
+
+std::vector<FactorDefinition>
+raw_factor_definitions_tt(const dense::CorrectionFile &ff_corrections,
+                          const int &tau_idx) {
+    // event inputs: leading tau pt, subleading tau pt, njets, m_vis, nbtag;
+    // the inputs follow raw_fakefactor_nmssm_tt
+    const std::string suffix = tau_idx == 0 ? "" : "_subleading";
+    const std::string fractions =
+        tau_idx == 0 ? "process_fractions" : "process_fractions_subleading";
+    return {
+        {"qcd",
+         &ff_corrections,
+         "QCD" + suffix + "_fake_factors",
+         {},
+         tau_idx == 0 ? 0 : 1,
+         2},
+        {"ttbar",
+         &ff_corrections,
+         "ttbar" + suffix + "_fake_factors",
+         {},
+         0,
+         2},
+        {"fraction", &ff_corrections, fractions, {{"process", "QCD"}}, 3, 4},
+        {"fraction", &ff_corrections, fractions, {{"process", "Wjets"}}, 3, 4},
+        {"fraction", &ff_corrections, fractions, {{"process", "ttbar"}}, 3, 4},
+    };
+}
+
+} // namespace
+
 /**
  * @brief Function to calculate raw fake factors without corrections with
  * correctionlib for the semileptonic channels
@@ -42,44 +594,47 @@ ROOT::RDF::RNode raw_fakefactor_nmssm_lt(
         ->debug("ttbar variation - Name {}", ttbar_variation);
     Logger::get("RawFakeFactor")
         ->debug("Fraction variation - Name {}", fraction_variation);
-    auto qcd =
-        correction::CorrectionSet::from_file(ff_file)->at("QCD_fake_factors");
-    auto wjets =
-        correction::CorrectionSet::from_file(ff_file)->at("Wjets_fake_factors");
-    auto ttbar =
-        correction::CorrectionSet::from_file(ff_file)->at("ttbar_fake_factors");
-    auto fractions =
-        correction::CorrectionSet::from_file(ff_file)->at("process_fractions");
-    auto calc_fake_factor = [qcd_variation, wjets_variation, ttbar_variation,
-                             fraction_variation, qcd, wjets, ttbar,
-                             fractions](const float &pt_2, const int &njets,
-                                        const float &mt_1, const int &nbtag) {
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto qcd =
+        ff_corrections.compile("QCD_fake_factors", {{"syst", qcd_variation}});
+    const auto wjets = ff_corrections.compile("Wjets_fake_factors",
+                                              {{"syst", wjets_variation}});
+    const auto ttbar = ff_corrections.compile("ttbar_fake_factors",
+                                              {{"syst", ttbar_variation}});
+    const auto fractions_qcd = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "QCD"}, {"syst", fraction_variation}});
+    const auto fractions_wjets = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "Wjets"}, {"syst", fraction_variation}});
+    const auto fractions_ttbar = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "ttbar"}, {"syst", fraction_variation}});
+    auto calc_fake_factor = [qcd, wjets, ttbar, fractions_qcd, fractions_wjets,
+                             fractions_ttbar](
+                                const float &pt_2, const int &njets,
+                                const float &mt_1, const int &nbtag) {
         float ff = 0.;
         if (pt_2 >= 0.) {
             Logger::get("RawFakeFactor")->debug("Tau pt - value {}", pt_2);
             Logger::get("RawFakeFactor")->debug("N jets - value {}", njets);
 
-            float qcd_ff = qcd->evaluate({pt_2, (float)njets, qcd_variation});
+            float qcd_ff = qcd.evaluate(pt_2, njets);
             Logger::get("RawFakeFactor")->debug("QCD - value {}", qcd_ff);
-            float wjets_ff =
-                wjets->evaluate({pt_2, (float)njets, wjets_variation});
+            float wjets_ff = wjets.evaluate(pt_2, njets);
             Logger::get("RawFakeFactor")->debug("Wjets - value {}", wjets_ff);
-            float ttbar_ff =
-                ttbar->evaluate({pt_2, (float)njets, ttbar_variation});
+            float ttbar_ff = ttbar.evaluate(pt_2, njets);
             Logger::get("RawFakeFactor")->debug("ttbar - value {}", ttbar_ff);
 
             Logger::get("RawFakeFactor")->debug("Lep mt - value {}", mt_1);
             Logger::get("RawFakeFactor")->debug("N b-jets - value {}", nbtag);
 
-            float qcd_frac = fractions->evaluate(
-                {"QCD", mt_1, (float)nbtag, fraction_variation});
+            float qcd_frac = fractions_qcd.evaluate(mt_1, nbtag);
             Logger::get("RawFakeFactor")->debug("QCD - fraction {}", qcd_frac);
-            float wjets_frac = fractions->evaluate(
-                {"Wjets", mt_1, (float)nbtag, fraction_variation});
+            float wjets_frac = fractions_wjets.evaluate(mt_1, nbtag);
             Logger::get("RawFakeFactor")
                 ->debug("Wjets - fraction {}", wjets_frac);
-            float ttbar_frac = fractions->evaluate(
-                {"ttbar", mt_1, (float)nbtag, fraction_variation});
+            float ttbar_frac = fractions_ttbar.evaluate(mt_1, nbtag);
             Logger::get("RawFakeFactor")
                 ->debug("ttbar - fraction {}", ttbar_frac);
 
@@ -132,23 +687,39 @@ ROOT::RDF::RNode raw_fakefactor_nmssm_tt(
     Logger::get("RawFakeFactor")
         ->debug("Fraction variation - Name {}", fraction_variation);
 
-    auto qcd =
-        correction::CorrectionSet::from_file(ff_file)->at("QCD_fake_factors");
-    auto qcd_subleading = correction::CorrectionSet::from_file(ff_file)->at(
-        "QCD_subleading_fake_factors");
-    auto ttbar =
-        correction::CorrectionSet::from_file(ff_file)->at("ttbar_fake_factors");
-    auto ttbar_subleading = correction::CorrectionSet::from_file(ff_file)->at(
-        "ttbar_subleading_fake_factors");
-    auto fractions =
-        correction::CorrectionSet::from_file(ff_file)->at("process_fractions");
-    auto fractions_subleading =
-        correction::CorrectionSet::from_file(ff_file)->at(
-            "process_fractions_subleading");
-
-    auto calc_fake_factor = [tau_idx, qcd_variation, ttbar_variation,
-                             fraction_variation, qcd, qcd_subleading, ttbar,
-                             ttbar_subleading, fractions, fractions_subleading](
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto qcd =
+        ff_corrections.compile("QCD_fake_factors", {{"syst", qcd_variation}});
+    const auto qcd_subleading = ff_corrections.compile(
+        "QCD_subleading_fake_factors", {{"syst", qcd_variation}});
+    const auto ttbar = ff_corrections.compile("ttbar_fake_factors",
+                                              {{"syst", ttbar_variation}});
+    const auto ttbar_subleading = ff_corrections.compile(
+        "ttbar_subleading_fake_factors", {{"syst", ttbar_variation}});
+    const auto fractions_qcd = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "QCD"}, {"syst", fraction_variation}});
+    const auto fractions_wjets = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "Wjets"}, {"syst", fraction_variation}});
+    const auto fractions_ttbar = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "ttbar"}, {"syst", fraction_variation}});
+    const auto fractions_subleading_qcd = ff_corrections.compile(
+        "process_fractions_subleading",
+        {{"process", "QCD"}, {"syst", fraction_variation}});
+    const auto fractions_subleading_wjets = ff_corrections.compile(
+        "process_fractions_subleading",
+        {{"process", "Wjets"}, {"syst", fraction_variation}});
+    const auto fractions_subleading_ttbar = ff_corrections.compile(
+        "process_fractions_subleading",
+        {{"process", "ttbar"}, {"syst", fraction_variation}});
+
+    auto calc_fake_factor = [tau_idx, qcd, qcd_subleading, ttbar,
+                             ttbar_subleading, fractions_qcd, fractions_wjets,
+                             fractions_ttbar, fractions_subleading_qcd,
+                             fractions_subleading_wjets,
+                             fractions_subleading_ttbar](
                                 const float &pt_1, const float &pt_2,
                                 const int &njets, const float &m_vis,
                                 const int &nbtag) {
@@ -166,45 +737,36 @@ ROOT::RDF::RNode raw_fakefactor_nmssm_tt(
             float wjets_frac = -1.;
             float ttbar_frac = -1.;
             if (tau_idx == 0) {
-                qcd_ff = qcd->evaluate({pt_1, (float)njets, qcd_variation});
+                qcd_ff = qcd.evaluate(pt_1, njets);
                 Logger::get("RawFakeFactor")->debug("QCD - value {}", qcd_ff);
-                ttbar_ff =
-                    ttbar->evaluate({pt_1, (float)njets, ttbar_variation});
+                ttbar_ff = ttbar.evaluate(pt_1, njets);
                 Logger::get("RawFakeFactor")
                     ->debug("ttbar - value {}", ttbar_ff);
-                qcd_frac = fractions->evaluate(
-                    {"QCD", m_vis, (float)nbtag, fraction_variation});
+                qcd_frac = fractions_qcd.evaluate(m_vis, nbtag);
                 Logger::get("RawFakeFactor")
                     ->debug("QCD - fraction {}", qcd_frac);
-                wjets_frac = fractions->evaluate(
-                    {"Wjets", m_vis, (float)nbtag, fraction_variation});
+                wjets_frac = fractions_wjets.evaluate(m_vis, nbtag);
                 Logger::get("RawFakeFactor")
                     ->debug("Wjets - fraction {}", wjets_frac);
-                ttbar_frac = fractions->evaluate(
-                    {"ttbar", m_vis, (float)nbtag, fraction_variation});
+                ttbar_frac = fractions_ttbar.evaluate(m_vis, nbtag);
                 Logger::get("RawFakeFactor")
                     ->debug("ttbar - fraction {}", ttbar_frac);
 
                 ff = (qcd_frac + wjets_frac) * std::max(qcd_ff, (float)0.) +
                      ttbar_frac * std::max(ttbar_ff, (float)0.);
             } else if (tau_idx == 1) {
-                qcd_ff = qcd_subleading->evaluate(
-                    {pt_2, (float)njets, qcd_variation});
+                qcd_ff = qcd_subleading.evaluate(pt_2, njets);
                 Logger::get("RawFakeFactor")->debug("QCD - value {}", qcd_ff);
-                ttbar_ff = ttbar_subleading->evaluate(
-                    {pt_1, (float)njets, ttbar_variation});
+                ttbar_ff = ttbar_subleading.evaluate(pt_1, njets);
                 Logger::get("RawFakeFactor")
                     ->debug("ttbar - value {}", ttbar_ff);
-                qcd_frac = fractions_subleading->evaluate(
-                    {"QCD", m_vis, (float)nbtag, fraction_variation});
+                qcd_frac = fractions_subleading_qcd.evaluate(m_vis, nbtag);
                 Logger::get("RawFakeFactor")
                     ->debug("QCD - fraction {}", qcd_frac);
-                wjets_frac = fractions_subleading->evaluate(
-                    {"Wjets", m_vis, (float)nbtag, fraction_variation});
+                wjets_frac = fractions_subleading_wjets.evaluate(m_vis, nbtag);
                 Logger::get("RawFakeFactor")
                     ->debug("Wjets - fraction {}", wjets_frac);
-                ttbar_frac = fractions_subleading->evaluate(
-                    {"ttbar", m_vis, (float)nbtag, fraction_variation});
+                ttbar_frac = fractions_subleading_ttbar.evaluate(m_vis, nbtag);
                 Logger::get("RawFakeFactor")
                     ->debug("ttbar - fraction {}", ttbar_frac);
 
@@ -311,47 +873,48 @@ ROOT::RDF::RNode fakefactor_nmssm_lt(
         ->debug("ttbar tau mass corr variation - Name {}",
                 ttbar_corr_taumass_variation);
 
-    auto qcd =
-        correction::CorrectionSet::from_file(ff_file)->at("QCD_fake_factors");
-    auto wjets =
-        correction::CorrectionSet::from_file(ff_file)->at("Wjets_fake_factors");
-    auto ttbar =
-        correction::CorrectionSet::from_file(ff_file)->at("ttbar_fake_factors");
-    auto fractions =
-        correction::CorrectionSet::from_file(ff_file)->at("process_fractions");
-
-    auto qcd_lep_pt_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("QCD_non_closure_leading_lep_pt_correction");
-    auto qcd_tau_mass_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("QCD_non_closure_subleading_lep_mass_correction");
-    auto qcd_DR_SR = correction::CorrectionSet::from_file(ff_corr_file)
-                         ->at("QCD_DR_SR_correction");
-    auto wjets_lep_pt_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("Wjets_non_closure_leading_lep_pt_correction");
-    auto wjets_tau_mass_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("Wjets_non_closure_subleading_lep_mass_correction");
-    auto wjets_DR_SR = correction::CorrectionSet::from_file(ff_corr_file)
-                           ->at("Wjets_DR_SR_correction");
-    auto ttbar_lep_pt_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("ttbar_non_closure_leading_lep_pt_correction");
-    auto ttbar_tau_mass_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("ttbar_non_closure_subleading_lep_mass_correction");
-    auto calc_fake_factor = [qcd_variation, wjets_variation, ttbar_variation,
-                             fraction_variation, qcd_corr_leppt_variation,
-                             qcd_corr_taumass_variation,
-                             qcd_corr_drsr_variation,
-                             wjets_corr_leppt_variation,
-                             wjets_corr_taumass_variation,
-                             wjets_corr_drsr_variation,
-                             ttbar_corr_leppt_variation,
-                             ttbar_corr_taumass_variation, qcd, wjets, ttbar,
-                             fractions, qcd_lep_pt_closure,
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto qcd =
+        ff_corrections.compile("QCD_fake_factors", {{"syst", qcd_variation}});
+    const auto wjets = ff_corrections.compile("Wjets_fake_factors",
+                                              {{"syst", wjets_variation}});
+    const auto ttbar = ff_corrections.compile("ttbar_fake_factors",
+                                              {{"syst", ttbar_variation}});
+    const auto fractions_qcd = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "QCD"}, {"syst", fraction_variation}});
+    const auto fractions_wjets = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "Wjets"}, {"syst", fraction_variation}});
+    const auto fractions_ttbar = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "ttbar"}, {"syst", fraction_variation}});
+
+    const auto ff_corr_corrections = dense::CorrectionFile(ff_corr_file);
+    const auto qcd_lep_pt_closure =
+        ff_corr_corrections.compile("QCD_non_closure_leading_lep_pt_correction",
+                                    {{"syst", qcd_corr_leppt_variation}});
+    const auto qcd_tau_mass_closure = ff_corr_corrections.compile(
+        "QCD_non_closure_subleading_lep_mass_correction",
+        {{"syst", qcd_corr_taumass_variation}});
+    const auto qcd_DR_SR = ff_corr_corrections.compile(
+        "QCD_DR_SR_correction", {{"syst", qcd_corr_drsr_variation}});
+    const auto wjets_lep_pt_closure = ff_corr_corrections.compile(
+        "Wjets_non_closure_leading_lep_pt_correction",
+        {{"syst", wjets_corr_leppt_variation}});
+    const auto wjets_tau_mass_closure = ff_corr_corrections.compile(
+        "Wjets_non_closure_subleading_lep_mass_correction",
+        {{"syst", wjets_corr_taumass_variation}});
+    const auto wjets_DR_SR = ff_corr_corrections.compile(
+        "Wjets_DR_SR_correction", {{"syst", wjets_corr_drsr_variation}});
+    const auto ttbar_lep_pt_closure = ff_corr_corrections.compile(
+        "ttbar_non_closure_leading_lep_pt_correction",
+        {{"syst", ttbar_corr_leppt_variation}});
+    const auto ttbar_tau_mass_closure = ff_corr_corrections.compile(
+        "ttbar_non_closure_subleading_lep_mass_correction",
+        {{"syst", ttbar_corr_taumass_variation}});
+    auto calc_fake_factor = [qcd, wjets, ttbar, fractions_qcd, fractions_wjets,
+                             fractions_ttbar, qcd_lep_pt_closure,
                              qcd_tau_mass_closure, qcd_DR_SR,
                              wjets_lep_pt_closure, wjets_tau_mass_closure,
                              wjets_DR_SR, ttbar_lep_pt_closure,
@@ -365,62 +928,49 @@ ROOT::RDF::RNode fakefactor_nmssm_lt(
             Logger::get("FakeFactor")->debug("Tau pt - value {}", pt_2);
             Logger::get("FakeFactor")->debug("N jets - value {}", njets);
 
-            float qcd_ff = qcd->evaluate({pt_2, (float)njets, qcd_variation});
+            float qcd_ff = qcd.evaluate(pt_2, njets);
             Logger::get("FakeFactor")->debug("QCD - value {}", qcd_ff);
-            float wjets_ff =
-                wjets->evaluate({pt_2, (float)njets, wjets_variation});
+            float wjets_ff = wjets.evaluate(pt_2, njets);
             Logger::get("FakeFactor")->debug("Wjets - value {}", wjets_ff);
-            float ttbar_ff =
-                ttbar->evaluate({pt_2, (float)njets, ttbar_variation});
+            float ttbar_ff = ttbar.evaluate(pt_2, njets);
             Logger::get("FakeFactor")->debug("ttbar - value {}", ttbar_ff);
 
             Logger::get("FakeFactor")->debug("Lep mt - value {}", mt_1);
             Logger::get("FakeFactor")->debug("N b-jets - value {}", nbtag);
 
-            float qcd_frac = fractions->evaluate(
-                {"QCD", mt_1, (float)nbtag, fraction_variation});
+            float qcd_frac = fractions_qcd.evaluate(mt_1, nbtag);
             Logger::get("FakeFactor")->debug("QCD - fraction {}", qcd_frac);
-            float wjets_frac = fractions->evaluate(
-                {"Wjets", mt_1, (float)nbtag, fraction_variation});
+            float wjets_frac = fractions_wjets.evaluate(mt_1, nbtag);
             Logger::get("FakeFactor")->debug("Wjets - fraction {}", wjets_frac);
-            float ttbar_frac = fractions->evaluate(
-                {"ttbar", mt_1, (float)nbtag, fraction_variation});
+            float ttbar_frac = fractions_ttbar.evaluate(mt_1, nbtag);
             Logger::get("FakeFactor")->debug("ttbar - fraction {}", ttbar_frac);
 
             Logger::get("FakeFactor")->debug("Lep pt - value {}", pt_1);
             Logger::get("FakeFactor")->debug("Tau mass - value {}", mass_2);
             Logger::get("FakeFactor")->debug("m_vis - value {}", m_vis);
 
-            float qcd_lep_pt_corr =
-                qcd_lep_pt_closure->evaluate({pt_1, qcd_corr_leppt_variation});
+            float qcd_lep_pt_corr = qcd_lep_pt_closure.evaluate(pt_1);
             Logger::get("FakeFactor")
                 ->debug("QCD - lep pt correction {}", qcd_lep_pt_corr);
-            float qcd_tau_mass_corr = qcd_tau_mass_closure->evaluate(
-                {mass_2, qcd_corr_taumass_variation});
+            float qcd_tau_mass_corr = qcd_tau_mass_closure.evaluate(mass_2);
             Logger::get("FakeFactor")
                 ->debug("QCD - tau mass correction {}", qcd_tau_mass_corr);
-            float qcd_DR_SR_corr =
-                qcd_DR_SR->evaluate({m_vis, qcd_corr_drsr_variation});
+            float qcd_DR_SR_corr = qcd_DR_SR.evaluate(m_vis);
             Logger::get("FakeFactor")
                 ->debug("QCD - DR to SR correction {}", qcd_DR_SR_corr);
-            float wjets_lep_pt_corr = wjets_lep_pt_closure->evaluate(
-                {pt_1, wjets_corr_leppt_variation});
+            float wjets_lep_pt_corr = wjets_lep_pt_closure.evaluate(pt_1);
             Logger::get("FakeFactor")
                 ->debug("Wjets - lep pt correction {}", wjets_lep_pt_corr);
-            float wjets_tau_mass_corr = wjets_tau_mass_closure->evaluate(
-                {mass_2, wjets_corr_taumass_variation});
+            float wjets_tau_mass_corr = wjets_tau_mass_closure.evaluate(mass_2);
             Logger::get("FakeFactor")
                 ->debug("Wjets - tau mass correction {}", wjets_tau_mass_corr);
-            float wjets_DR_SR_corr =
-                wjets_DR_SR->evaluate({m_vis, wjets_corr_drsr_variation});
+            float wjets_DR_SR_corr = wjets_DR_SR.evaluate(m_vis);
             Logger::get("FakeFactor")
                 ->debug("Wjets - DR to SR correction {}", wjets_DR_SR_corr);
-            float ttbar_lep_pt_corr = ttbar_lep_pt_closure->evaluate(
-                {pt_1, ttbar_corr_leppt_variation});
+            float ttbar_lep_pt_corr = ttbar_lep_pt_closure.evaluate(pt_1);
             Logger::get("FakeFactor")
                 ->debug("ttbar - lep pt correction {}", ttbar_lep_pt_corr);
-            float ttbar_tau_mass_corr = ttbar_tau_mass_closure->evaluate(
-                {mass_2, ttbar_corr_taumass_variation});
+            float ttbar_tau_mass_corr = ttbar_tau_mass_closure.evaluate(mass_2);
             Logger::get("FakeFactor")
                 ->debug("ttbar - tau mass correction {}", ttbar_tau_mass_corr);
 
@@ -521,41 +1071,47 @@ ROOT::RDF::RNode fakefactor_nmssm_boosted_lt(
     Logger::get("FakeFactor")
         ->debug("ttbar lep pt corr variation - Name {}",
                 ttbar_corr_leppt_variation);
-    auto qcd =
-        correction::CorrectionSet::from_file(ff_file)->at("QCD_fake_factors");
-    auto wjets =
-        correction::CorrectionSet::from_file(ff_file)->at("Wjets_fake_factors");
-    auto ttbar =
-        correction::CorrectionSet::from_file(ff_file)->at("ttbar_fake_factors");
-    auto fractions =
-        correction::CorrectionSet::from_file(ff_file)->at("process_fractions");
-
-    auto qcd_lep_pt_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("QCD_non_closure_leading_lep_pt_correction");
-    auto qcd_lep_mt_closure = correction::CorrectionSet::from_file(ff_corr_file)
-                                  ->at("QCD_non_closure_lep_mt_correction");
-    auto qcd_DR_SR = correction::CorrectionSet::from_file(ff_corr_file)
-                         ->at("QCD_DR_SR_correction");
-    auto wjets_lep_pt_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("Wjets_non_closure_leading_lep_pt_correction");
-    auto wjets_DR_SR = correction::CorrectionSet::from_file(ff_corr_file)
-                           ->at("Wjets_DR_SR_correction");
-    auto ttbar_lep_pt_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("ttbar_non_closure_leading_lep_pt_correction");
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto qcd =
+        ff_corrections.compile("QCD_fake_factors", {{"syst", qcd_variation}});
+    const auto wjets = ff_corrections.compile("Wjets_fake_factors",
+                                              {{"syst", wjets_variation}});
+    const auto ttbar = ff_corrections.compile("ttbar_fake_factors",
+                                              {{"syst", ttbar_variation}});
+    const auto fractions_qcd = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "QCD"}, {"syst", fraction_variation}});
+    const auto fractions_wjets = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "Wjets"}, {"syst", fraction_variation}});
+    const auto fractions_ttbar = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "ttbar"}, {"syst", fraction_variation}});
+
+    const auto ff_corr_corrections = dense::CorrectionFile(ff_corr_file);
+    const auto qcd_lep_pt_closure =
+        ff_corr_corrections.compile("QCD_non_closure_leading_lep_pt_correction",
+                                    {{"syst", qcd_corr_leppt_variation}});
+    const auto qcd_lep_mt_closure =
+        ff_corr_corrections.compile("QCD_non_closure_lep_mt_correction",
+                                    {{"syst", qcd_corr_lepmt_variation}});
+    const auto qcd_DR_SR = ff_corr_corrections.compile(
+        "QCD_DR_SR_correction", {{"syst", qcd_corr_drsr_variation}});
+    const auto wjets_lep_pt_closure = ff_corr_corrections.compile(
+        "Wjets_non_closure_leading_lep_pt_correction",
+        {{"syst", wjets_corr_leppt_variation}});
+    const auto wjets_DR_SR = ff_corr_corrections.compile(
+        "Wjets_DR_SR_correction", {{"syst", wjets_corr_drsr_variation}});
+    const auto ttbar_lep_pt_closure = ff_corr_corrections.compile(
+        "ttbar_non_closure_leading_lep_pt_correction",
+        {{"syst", ttbar_corr_leppt_variation}});
     // auto ttbar_m_vis_closure =
     //     correction::CorrectionSet::from_file(ff_corr_file)
     //         ->at("ttbar_non_closure_m_vis_correction");
-    auto calc_fake_factor = [qcd_variation, wjets_variation, ttbar_variation,
-                             fraction_variation, qcd_corr_leppt_variation,
-                             qcd_corr_lepmt_variation, qcd_corr_drsr_variation,
-                             wjets_corr_leppt_variation,
-                             wjets_corr_drsr_variation,
-                             ttbar_corr_leppt_variation, qcd, wjets, ttbar,
-                             fractions, qcd_lep_pt_closure, qcd_lep_mt_closure,
-                             qcd_DR_SR, wjets_lep_pt_closure, wjets_DR_SR,
+    auto calc_fake_factor = [qcd, wjets, ttbar, fractions_qcd, fractions_wjets,
+                             fractions_ttbar, qcd_lep_pt_closure,
+                             qcd_lep_mt_closure, qcd_DR_SR,
+                             wjets_lep_pt_closure, wjets_DR_SR,
                              ttbar_lep_pt_closure](
                                 const float &boosted_pt_2, const int &njets,
                                 const float &boosted_mt_1, const int &nbtag,
@@ -567,54 +1123,44 @@ ROOT::RDF::RNode fakefactor_nmssm_boosted_lt(
             Logger::get("FakeFactor")->debug("Tau pt - value {}", boosted_pt_2);
             Logger::get("FakeFactor")->debug("N jets - value {}", njets);
 
-            float qcd_ff =
-                qcd->evaluate({boosted_pt_2, (float)njets, qcd_variation});
+            float qcd_ff = qcd.evaluate(boosted_pt_2, njets);
             Logger::get("FakeFactor")->debug("QCD - value {}", qcd_ff);
-            float wjets_ff =
-                wjets->evaluate({boosted_pt_2, (float)njets, wjets_variation});
+            float wjets_ff = wjets.evaluate(boosted_pt_2, njets);
             Logger::get("FakeFactor")->debug("Wjets - value {}", wjets_ff);
-            float ttbar_ff =
-                ttbar->evaluate({boosted_pt_2, (float)njets, ttbar_variation});
+            float ttbar_ff = ttbar.evaluate(boosted_pt_2, njets);
             Logger::get("FakeFactor")->debug("ttbar - value {}", ttbar_ff);
 
             Logger::get("FakeFactor")->debug("Lep mt - value {}", boosted_mt_1);
             Logger::get("FakeFactor")->debug("N b-jets - value {}", nbtag);
 
-            float qcd_frac = fractions->evaluate(
-                {"QCD", boosted_mt_1, (float)nbtag, fraction_variation});
+            float qcd_frac = fractions_qcd.evaluate(boosted_mt_1, nbtag);
             Logger::get("FakeFactor")->debug("QCD - fraction {}", qcd_frac);
-            float wjets_frac = fractions->evaluate(
-                {"Wjets", boosted_mt_1, (float)nbtag, fraction_variation});
+            float wjets_frac = fractions_wjets.evaluate(boosted_mt_1, nbtag);
             Logger::get("FakeFactor")->debug("Wjets - fraction {}", wjets_frac);
-            float ttbar_frac = fractions->evaluate(
-                {"ttbar", boosted_mt_1, (float)nbtag, fraction_variation});
+            float ttbar_frac = fractions_ttbar.evaluate(boosted_mt_1, nbtag);
             Logger::get("FakeFactor")->debug("ttbar - fraction {}", ttbar_frac);
 
             Logger::get("FakeFactor")->debug("Lep pt - value {}", boosted_pt_1);
             Logger::get("FakeFactor")->debug("m_vis - value {}", boosted_m_vis);
 
-            float qcd_lep_pt_corr = qcd_lep_pt_closure->evaluate(
-                {boosted_pt_1, qcd_corr_leppt_variation});
+            float qcd_lep_pt_corr = qcd_lep_pt_closure.evaluate(boosted_pt_1);
             Logger::get("FakeFactor")
                 ->debug("QCD - lep pt correction {}", qcd_lep_pt_corr);
-            float qcd_lep_mt_corr = qcd_lep_mt_closure->evaluate(
-                {boosted_mt_1, qcd_corr_lepmt_variation});
+            float qcd_lep_mt_corr = qcd_lep_mt_closure.evaluate(boosted_mt_1);
             Logger::get("FakeFactor")
                 ->debug("QCD - lep mt correction {}", qcd_lep_mt_corr);
-            float qcd_DR_SR_corr = qcd_DR_SR->evaluate(
-                {boosted_dR_ditau, qcd_corr_drsr_variation});
+            float qcd_DR_SR_corr = qcd_DR_SR.evaluate(boosted_dR_ditau);
             Logger::get("FakeFactor")
                 ->debug("QCD - DR to SR correction {}", qcd_DR_SR_corr);
-            float wjets_lep_pt_corr = wjets_lep_pt_closure->evaluate(
-                {boosted_pt_1, wjets_corr_leppt_variation});
+            float wjets_lep_pt_corr =
+                wjets_lep_pt_closure.evaluate(boosted_pt_1);
             Logger::get("FakeFactor")
                 ->debug("Wjets - lep pt correction {}", wjets_lep_pt_corr);
-            float wjets_DR_SR_corr = wjets_DR_SR->evaluate(
-                {boosted_dR_ditau, wjets_corr_drsr_variation});
+            float wjets_DR_SR_corr = wjets_DR_SR.evaluate(boosted_dR_ditau);
             Logger::get("FakeFactor")
                 ->debug("Wjets - DR to SR correction {}", wjets_DR_SR_corr);
-            float ttbar_lep_pt_corr = ttbar_lep_pt_closure->evaluate(
-                {boosted_pt_1, ttbar_corr_leppt_variation});
+            float ttbar_lep_pt_corr =
+                ttbar_lep_pt_closure.evaluate(boosted_pt_1);
             Logger::get("FakeFactor")
                 ->debug("ttbar - lep pt correction {}", ttbar_lep_pt_corr);
             // float ttbar_m_vis_corr =
@@ -705,60 +1251,71 @@ ROOT::RDF::RNode fakefactor_nmssm_tt(
         ->debug("ttbar lepton mass variation - Name {}",
                 ttbar_corr_taumass_variation);
 
-    auto qcd =
-        correction::CorrectionSet::from_file(ff_file)->at("QCD_fake_factors");
-    auto qcd_subleading = correction::CorrectionSet::from_file(ff_file)->at(
-        "QCD_subleading_fake_factors");
-    auto ttbar =
-        correction::CorrectionSet::from_file(ff_file)->at("ttbar_fake_factors");
-    auto ttbar_subleading = correction::CorrectionSet::from_file(ff_file)->at(
-        "ttbar_subleading_fake_factors");
-    auto fractions =
-        correction::CorrectionSet::from_file(ff_file)->at("process_fractions");
-    auto fractions_subleading =
-        correction::CorrectionSet::from_file(ff_file)->at(
-            "process_fractions_subleading");
-    auto qcd_tau_pt_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("QCD_non_closure_subleading_lep_pt_correction");
-    auto qcd_tau_mass_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("QCD_non_closure_leading_lep_mass_correction");
-    auto qcd_DR_SR = correction::CorrectionSet::from_file(ff_corr_file)
-                         ->at("QCD_DR_SR_correction");
-    auto ttbar_tau_pt_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("ttbar_non_closure_subleading_lep_pt_correction");
-    auto ttbar_tau_mass_closure =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("ttbar_non_closure_leading_lep_mass_correction");
-    auto qcd_tau_pt_closure_subleading =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("QCD_subleading_non_closure_leading_lep_pt_correction");
-    auto qcd_tau_mass_closure_subleading =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("QCD_subleading_non_closure_subleading_lep_mass_correction");
-    auto qcd_DR_SR_subleading =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("QCD_subleading_DR_SR_correction");
-    auto ttbar_tau_pt_closure_subleading =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("ttbar_subleading_non_closure_leading_lep_pt_correction");
-    auto ttbar_tau_mass_closure_subleading =
-        correction::CorrectionSet::from_file(ff_corr_file)
-            ->at("ttbar_subleading_non_closure_subleading_lep_mass_correction");
-
-    auto calc_fake_factor = [tau_idx, qcd_variation, ttbar_variation,
-                             fraction_variation, qcd_corr_leppt_variation,
-                             qcd_corr_taumass_variation,
-                             qcd_corr_drsr_variation,
-                             ttbar_corr_leppt_variation,
-                             ttbar_corr_taumass_variation, qcd, ttbar,
-                             fractions, qcd_tau_pt_closure,
-                             qcd_tau_mass_closure, qcd_DR_SR,
-                             ttbar_tau_pt_closure, ttbar_tau_mass_closure,
-                             qcd_subleading, ttbar_subleading,
-                             fractions_subleading,
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto qcd =
+        ff_corrections.compile("QCD_fake_factors", {{"syst", qcd_variation}});
+    const auto qcd_subleading = ff_corrections.compile(
+        "QCD_subleading_fake_factors", {{"syst", qcd_variation}});
+    const auto ttbar = ff_corrections.compile("ttbar_fake_factors",
+                                              {{"syst", ttbar_variation}});
+    const auto ttbar_subleading = ff_corrections.compile(
+        "ttbar_subleading_fake_factors", {{"syst", ttbar_variation}});
+    const auto fractions_qcd = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "QCD"}, {"syst", fraction_variation}});
+    const auto fractions_wjets = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "Wjets"}, {"syst", fraction_variation}});
+    const auto fractions_ttbar = ff_corrections.compile(
+        "process_fractions",
+        {{"process", "ttbar"}, {"syst", fraction_variation}});
+    const auto fractions_subleading_qcd = ff_corrections.compile(
+        "process_fractions_subleading",
+        {{"process", "QCD"}, {"syst", fraction_variation}});
+    const auto fractions_subleading_wjets = ff_corrections.compile(
+        "process_fractions_subleading",
+        {{"process", "Wjets"}, {"syst", fraction_variation}});
+    const auto fractions_subleading_ttbar = ff_corrections.compile(
+        "process_fractions_subleading",
+        {{"process", "ttbar"}, {"syst", fraction_variation}});
+    const auto ff_corr_corrections = dense::CorrectionFile(ff_corr_file);
+    const auto qcd_tau_pt_closure = ff_corr_corrections.compile(
+        "QCD_non_closure_subleading_lep_pt_correction",
+        {{"syst", qcd_corr_leppt_variation}});
+    const auto qcd_tau_mass_closure = ff_corr_corrections.compile(
+        "QCD_non_closure_leading_lep_mass_correction",
+        {{"syst", qcd_corr_taumass_variation}});
+    const auto qcd_DR_SR = ff_corr_corrections.compile(
+        "QCD_DR_SR_correction", {{"syst", qcd_corr_drsr_variation}});
+    const auto ttbar_tau_pt_closure = ff_corr_corrections.compile(
+        "ttbar_non_closure_subleading_lep_pt_correction",
+        {{"syst", ttbar_corr_leppt_variation}});
+    const auto ttbar_tau_mass_closure = ff_corr_corrections.compile(
+        "ttbar_non_closure_leading_lep_mass_correction",
+        {{"syst", ttbar_corr_taumass_variation}});
+    const auto qcd_tau_pt_closure_subleading = ff_corr_corrections.compile(
+        "QCD_subleading_non_closure_leading_lep_pt_correction",
+        {{"syst", qcd_corr_leppt_variation}});
+    const auto qcd_tau_mass_closure_subleading = ff_corr_corrections.compile(
+        "QCD_subleading_non_closure_subleading_lep_mass_correction",
+        {{"syst", qcd_corr_taumass_variation}});
+    const auto qcd_DR_SR_subleading = ff_corr_corrections.compile(
+        "QCD_subleading_DR_SR_correction", {{"syst", qcd_corr_drsr_variation}});
+    const auto ttbar_tau_pt_closure_subleading = ff_corr_corrections.compile(
+        "ttbar_subleading_non_closure_leading_lep_pt_correction",
+        {{"syst", ttbar_corr_leppt_variation}});
+    const auto ttbar_tau_mass_closure_subleading = ff_corr_corrections.compile(
+        "ttbar_subleading_non_closure_subleading_lep_mass_correction",
+        {{"syst", ttbar_corr_taumass_variation}});
+
+    auto calc_fake_factor = [tau_idx, qcd, ttbar, fractions_qcd,
+                             fractions_wjets, fractions_ttbar,
+                             qcd_tau_pt_closure, qcd_tau_mass_closure,
+                             qcd_DR_SR, ttbar_tau_pt_closure,
+                             ttbar_tau_mass_closure, qcd_subleading,
+                             ttbar_subleading, fractions_subleading_qcd,
+                             fractions_subleading_wjets,
+                             fractions_subleading_ttbar,
                              qcd_tau_pt_closure_subleading,
                              qcd_tau_mass_closure_subleading,
                              qcd_DR_SR_subleading,
@@ -792,41 +1349,32 @@ ROOT::RDF::RNode fakefactor_nmssm_tt(
             float ttbar_tau_pt_corr = -1.;
             float ttbar_tau_mass_corr = -1.;
             if (tau_idx == 0) {
-                qcd_ff = qcd->evaluate({pt_1, (float)njets, qcd_variation});
+                qcd_ff = qcd.evaluate(pt_1, njets);
                 Logger::get("FakeFactor")->debug("QCD - value {}", qcd_ff);
-                ttbar_ff =
-                    ttbar->evaluate({pt_1, (float)njets, ttbar_variation});
+                ttbar_ff = ttbar.evaluate(pt_1, njets);
                 Logger::get("FakeFactor")->debug("ttbar - value {}", ttbar_ff);
-                qcd_frac = fractions->evaluate(
-                    {"QCD", m_vis, (float)nbtag, fraction_variation});
+                qcd_frac = fractions_qcd.evaluate(m_vis, nbtag);
                 Logger::get("FakeFactor")->debug("QCD - fraction {}", qcd_frac);
-                wjets_frac = fractions->evaluate(
-                    {"Wjets", m_vis, (float)nbtag, fraction_variation});
+                wjets_frac = fractions_wjets.evaluate(m_vis, nbtag);
                 Logger::get("FakeFactor")
                     ->debug("Wjets - fraction {}", wjets_frac);
-                ttbar_frac = fractions->evaluate(
-                    {"ttbar", m_vis, (float)nbtag, fraction_variation});
+                ttbar_frac = fractions_ttbar.evaluate(m_vis, nbtag);
                 Logger::get("FakeFactor")
                     ->debug("ttbar - fraction {}", ttbar_frac);
 
-                qcd_tau_pt_corr = qcd_tau_pt_closure->evaluate(
-                    {pt_2, qcd_corr_leppt_variation});
+                qcd_tau_pt_corr = qcd_tau_pt_closure.evaluate(pt_2);
                 Logger::get("FakeFactor")
                     ->debug("QCD - lep pt correction {}", qcd_tau_pt_corr);
-                qcd_tau_mass_corr = qcd_tau_mass_closure->evaluate(
-                    {mass_1, qcd_corr_taumass_variation});
+                qcd_tau_mass_corr = qcd_tau_mass_closure.evaluate(mass_1);
                 Logger::get("FakeFactor")
                     ->debug("QCD - lep mass correction {}", qcd_tau_mass_corr);
-                qcd_DR_SR_corr =
-                    qcd_DR_SR->evaluate({m_vis, qcd_corr_drsr_variation});
+                qcd_DR_SR_corr = qcd_DR_SR.evaluate(m_vis);
                 Logger::get("FakeFactor")
                     ->debug("QCD - DR to SR correction {}", qcd_DR_SR_corr);
-                ttbar_tau_pt_corr = ttbar_tau_pt_closure->evaluate(
-                    {pt_2, ttbar_corr_leppt_variation});
+                ttbar_tau_pt_corr = ttbar_tau_pt_closure.evaluate(pt_2);
                 Logger::get("FakeFactor")
                     ->debug("ttbar - lep pt correction {}", ttbar_tau_pt_corr);
-                ttbar_tau_mass_corr = ttbar_tau_mass_closure->evaluate(
-                    {mass_1, ttbar_corr_taumass_variation});
+                ttbar_tau_mass_corr = ttbar_tau_mass_closure.evaluate(mass_1);
                 Logger::get("FakeFactor")
                     ->debug("ttbar - lep mass correction {}",
                             ttbar_tau_mass_corr);
@@ -836,43 +1384,35 @@ ROOT::RDF::RNode fakefactor_nmssm_tt(
                      ttbar_frac * std::max(ttbar_ff, (float)0.) *
                          ttbar_tau_pt_corr * ttbar_tau_mass_corr;
             } else if (tau_idx == 1) {
-                qcd_ff = qcd_subleading->evaluate(
-                    {pt_2, (float)njets, qcd_variation});
+                qcd_ff = qcd_subleading.evaluate(pt_2, njets);
                 Logger::get("FakeFactor")->debug("QCD - value {}", qcd_ff);
-                ttbar_ff = ttbar_subleading->evaluate(
-                    {pt_2, (float)njets, ttbar_variation});
+                ttbar_ff = ttbar_subleading.evaluate(pt_2, njets);
                 Logger::get("FakeFactor")->debug("ttbar - value {}", ttbar_ff);
-                qcd_frac = fractions_subleading->evaluate(
-                    {"QCD", m_vis, (float)nbtag, fraction_variation});
+                qcd_frac = fractions_subleading_qcd.evaluate(m_vis, nbtag);
                 Logger::get("FakeFactor")->debug("QCD - fraction {}", qcd_frac);
-                wjets_frac = fractions_subleading->evaluate(
-                    {"Wjets", m_vis, (float)nbtag, fraction_variation});
+                wjets_frac = fractions_subleading_wjets.evaluate(m_vis, nbtag);
                 Logger::get("FakeFactor")
                     ->debug("Wjets - fraction {}", wjets_frac);
-                ttbar_frac = fractions_subleading->evaluate(
-                    {"ttbar", m_vis, (float)nbtag, fraction_variation});
+                ttbar_frac = fractions_subleading_ttbar.evaluate(m_vis, nbtag);
                 Logger::get("FakeFactor")
                     ->debug("ttbar - fraction {}", ttbar_frac);
 
-                qcd_tau_pt_corr = qcd_tau_pt_closure_subleading->evaluate(
-                    {pt_1, qcd_corr_leppt_variation});
+                qcd_tau_pt_corr = qcd_tau_pt_closure_subleading.evaluate(pt_1);
                 Logger::get("FakeFactor")
                     ->debug("QCD - lep pt correction {}", qcd_tau_pt_corr);
-                qcd_tau_mass_corr = qcd_tau_mass_closure_subleading->evaluate(
-                    {mass_2, qcd_corr_taumass_variation});
+                qcd_tau_mass_corr =
+                    qcd_tau_mass_closure_subleading.evaluate(mass_2);
                 Logger::get("FakeFactor")
                     ->debug("QCD - lep mass correction {}", qcd_tau_mass_corr);
-                qcd_DR_SR_corr = qcd_DR_SR_subleading->evaluate(
-                    {m_vis, qcd_corr_drsr_variation});
+                qcd_DR_SR_corr = qcd_DR_SR_subleading.evaluate(m_vis);
                 Logger::get("FakeFactor")
                     ->debug("QCD - DR to SR correction {}", qcd_DR_SR_corr);
-                ttbar_tau_pt_corr = ttbar_tau_pt_closure_subleading->evaluate(
-                    {pt_1, ttbar_corr_leppt_variation});
+                ttbar_tau_pt_corr =
+                    ttbar_tau_pt_closure_subleading.evaluate(pt_1);
                 Logger::get("FakeFactor")
                     ->debug("ttbar - lep pt correction {}", ttbar_tau_pt_corr);
                 ttbar_tau_mass_corr =
-                    ttbar_tau_mass_closure_subleading->evaluate(
-                        {mass_2, ttbar_corr_taumass_variation});
+                    ttbar_tau_mass_closure_subleading.evaluate(mass_2);
                 Logger::get("FakeFactor")
                     ->debug("ttbar - lep mass correction {}",
                             ttbar_tau_mass_corr);
@@ -893,5 +1433,437 @@ ROOT::RDF::RNode fakefactor_nmssm_tt(
     return df1;
 }
 
+/**
+ * @brief Function to calculate the raw fake factors without corrections and
+ * all their variations in one pass for the semileptonic channels. The
+ * nominal factors are evaluated once per event and each variation only
+ * replaces the factors of its variation parameter, instead of running a
+ * separate producer for each variation.
+ *
+ * @param df the input dataframe
+ * @param outputnames names of the output columns, the nominal fake factor
+ * followed by one column per variation
+ * @param tau_pt pt of the hadronic tau in the tau pair
+ * @param njets number of good jets in the event
+ * @param lep_mt transverse mass of the leptonic tau in the tau pair
+ * @param nbtags number of good b-tagged jets in the event
+ * @param variation_parameters parameter varied by each variation, one of
+ * `qcd`, `wjets`, `ttbar` or `fraction`
+ * @param variation_names names of the FF uncertainty variations in the
+ * correctionlib file
+ * @param ff_file correctionlib json file with the fake factors
+ * @returns a dataframe with the fake factors
+ */
+ROOT::RDF::RNode raw_fakefactor_nmssm_lt_variations(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &tau_pt, const std::string &njets,
+    const std::string &lep_mt, const std::string &nbtags,
+    const std::vector<std::string> &variation_parameters,
+    const std::vector<std::string> &variation_names,
+    const std::string &ff_file) {
+    Logger::get("RawFakeFactor")
+        ->debug("Setting up functions for raw fake factor (without "
+                "corrections) evaluation with {} variations",
+                variation_names.size());
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto factors =
+        compile_factors(raw_factor_definitions_lt(ff_corrections), outputnames,
+                        variation_parameters, variation_names);
+    auto combine = [](const ROOT::RVec<float> &f) {
+        return f[LtQcdFrac] * std::max(f[LtQcdFF], (float)0.) +
+               f[LtWjetsFrac] * std::max(f[LtWjetsFF], (float)0.) +
+               f[LtTtbarFrac] * std::max(f[LtTtbarFF], (float)0.);
+    };
+    auto calc_fake_factors = [factors,
+                              combine](const float &pt_2, const int &njets,
+                                       const float &mt_1, const int &nbtag) {
+        if (pt_2 < 0.) {
+            return ROOT::RVec<float>(factors.variations.size() + 1, 0.);
+        }
+        const double inputs[4] = {pt_2, (double)njets, mt_1, (double)nbtag};
+        return evaluate_variations(factors, inputs, combine);
+    };
+    const std::string result_vec_name = outputnames[0] + "_variations";
+    auto df1 = df.Define(result_vec_name, calc_fake_factors,
+                         {tau_pt, njets, lep_mt, nbtags});
+    return define_variation_outputs(df1, outputnames, result_vec_name);
+}
+
+/**
+ * @brief Function to calculate the raw fake factors without corrections and
+ * all their variations in one pass for the full hadronic channel, see
+ * `raw_fakefactor_nmssm_lt_variations`.
+ *
+ * @param df the input dataframe
+ * @param outputnames names of the output columns, the nominal fake factor
+ * followed by one column per variation
+ * @param tau_idx index of the tau, leading/subleading
+ * @param tau_pt_1 pt of the leading hadronic tau in the tau pair
+ * @param tau_pt_2 pt of the subleading hadronic tau in the tau pair
+ * @param njets number of good jets in the event
+ * @param m_vis visible di-tau mass of the tau pair
+ * @param nbtag number of good b-tagged jets in the event
+ * @param variation_parameters parameter varied by each variation, one of
+ * `qcd`, `ttbar` or `fraction`
+ * @param variation_names names of the FF uncertainty variations in the
+ * correctionlib file
+ * @param ff_file correctionlib json file with the fake factors
+ * @returns a dataframe with the fake factors
+ */
+ROOT::RDF::RNode raw_fakefactor_nmssm_tt_variations(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const int &tau_idx, const std::string &tau_pt_1,
+    const std::string &tau_pt_2, const std::string &njets,
+    const std::string &m_vis, const std::string &nbtag,
+    const std::vector<std::string> &variation_parameters,
+    const std::vector<std::string> &variation_names,
+    const std::string &ff_file) {
+    Logger::get("RawFakeFactor")
+        ->debug("Setting up functions for raw fake factor (without "
+                "corrections) evaluation with {} variations",
+                variation_names.size());
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto factors =
+        compile_factors(raw_factor_definitions_tt(ff_corrections, tau_idx),
+                        outputnames, variation_parameters, variation_names);
+    auto combine = [](const ROOT::RVec<float> &f) {
+        return (f[TtQcdFrac] + f[TtWjetsFrac]) *
+                   std::max(f[TtQcdFF], (float)0.) +
+               f[TtTtbarFrac] * std::max(f[TtTtbarFF], (float)0.);
+    };
+    auto calc_fake_factors = [factors,
+                              combine](const float &pt_1, const float &pt_2,
+                                       const int &njets, const float &m_vis,
+                                       const int &nbtag) {
+        if (pt_2 < 0.) {
+            return ROOT::RVec<float>(factors.variations.size() + 1, 0.);
+        }
+        const double inputs[5] = {pt_1, pt_2, (double)njets, m_vis,
+                                  (double)nbtag};
+        return evaluate_variations(factors, inputs, combine);
+    };
+    const std::string result_vec_name = outputnames[0] + "_variations";
+    auto df1 = df.Define(result_vec_name, calc_fake_factors,
+                         {tau_pt_1, tau_pt_2, njets, m_vis, nbtag});
+    return define_variation_outputs(df1, outputnames, result_vec_name);
+}
+
+/**
+ * @brief Function to calculate the fake factors and all their variations in
+ * one pass for the NMSSM Di-Higgs analysis for the semileptonic channels.
+ * All nominal fake factors, fractions and corrections are evaluated once per
+ * event and each variation only replaces the factors of its variation
+ * parameter. The results are identical to running `fakefactor_nmssm_lt`
+ * once per variation.
+ *
+ * @param df the dataframe to add the quantity to
+ * @param outputnames names of the output columns, the nominal fake factor
+ * followed by one column per variation
+ * @param tau_pt pt of the hadronic tau in the tau pair
+ * @param njets number of good jets in the event
+ * @param lep_mt transverse mass of the leptonic tau in the tau pair
+ * @param nbtags number of good b-tagged jets in the event
+ * @param lep_pt pt of the leptonic tau in the tau pair
+ * @param tau_mass mass of the hadronic tau in the tau pair
+ * @param m_vis visible mass of the tau pair
+ * @param variation_parameters parameter varied by each variation, one of
+ * `qcd`, `wjets`, `ttbar`, `fraction`, `qcd_corr_leppt`, `qcd_corr_taumass`,
+ * `qcd_corr_drsr`, `wjets_corr_leppt`, `wjets_corr_taumass`,
+ * `wjets_corr_drsr`, `ttbar_corr_leppt` or `ttbar_corr_taumass`
+ * @param variation_names names of the FF uncertainty variations in the
+ * correctionlib files
+ * @param ff_file correctionlib json file with the fake factors
+ * @param ff_corr_file correctionlib json file with corrections for the fake
+ * factors
+ * @returns a dataframe with the fake factors
+ */
+ROOT::RDF::RNode fakefactor_nmssm_lt_variations(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const std::string &tau_pt, const std::string &njets,
+    const std::string &lep_mt, const std::string &nbtags,
+    const std::string &lep_pt, const std::string &tau_mass,
+    const std::string &m_vis,
+    const std::vector<std::string> &variation_parameters,
+    const std::vector<std::string> &variation_names, const std::string &ff_file,
+    const std::string &ff_corr_file) {
+    Logger::get("FakeFactor")
+        ->debug("Setting up functions for fake factor evaluation with {} "
+                "variations",
+                variation_names.size());
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto ff_corr_corrections = dense::CorrectionFile(ff_corr_file);
+    // event inputs: tau pt, njets, lep mt, nbtags, lep pt, tau mass, m_vis
+    auto definitions = raw_factor_definitions_lt(ff_corrections);
+    definitions.insert(definitions.end(),
+                       {
+                           {"qcd_corr_leppt",
+                            &ff_corr_corrections,
+                            "QCD_non_closure_leading_lep_pt_correction",
+                            {},
+                            4,
+                            -1},
+                           {"qcd_corr_taumass",
+                            &ff_corr_corrections,
+                            "QCD_non_closure_subleading_lep_mass_correction",
+                            {},
+                            5,
+                            -1},
+                           {"qcd_corr_drsr",
+                            &ff_corr_corrections,
+                            "QCD_DR_SR_correction",
+                            {},
+                            6,
+                            -1},
+                           {"wjets_corr_leppt",
+                            &ff_corr_corrections,
+                            "Wjets_non_closure_leading_lep_pt_correction",
+                            {},
+                            4,
+                            -1},
+                           {"wjets_corr_taumass",
+                            &ff_corr_corrections,
+                            "Wjets_non_closure_subleading_lep_mass_correction",
+                            {},
+                            5,
+                            -1},
+                           {"wjets_corr_drsr",
+                            &ff_corr_corrections,
+                            "Wjets_DR_SR_correction",
+                            {},
+                            6,
+                            -1},
+                           {"ttbar_corr_leppt",
+                            &ff_corr_corrections,
+                            "ttbar_non_closure_leading_lep_pt_correction",
+                            {},
+                            4,
+                            -1},
+                           {"ttbar_corr_taumass",
+                            &ff_corr_corrections,
+                            "ttbar_non_closure_subleading_lep_mass_correction",
+                            {},
+                            5,
+                            -1},
+                       });
+    const auto factors = compile_factors(definitions, outputnames,
+                                         variation_parameters, variation_names);
+    auto combine = [](const ROOT::RVec<float> &f) {
+        return f[LtQcdFrac] * std::max(f[LtQcdFF], (float)0.) * f[LtQcdLepPt] *
+                   f[LtQcdTauMass] * f[LtQcdDRSR] +
+               f[LtWjetsFrac] * std::max(f[LtWjetsFF], (float)0.) *
+                   f[LtWjetsLepPt] * f[LtWjetsTauMass] * f[LtWjetsDRSR] +
+               f[LtTtbarFrac] * std::max(f[LtTtbarFF], (float)0.) *
+                   f[LtTtbarLepPt] * f[LtTtbarTauMass];
+    };
+    auto calc_fake_factors = [factors,
+                              combine](const float &pt_2, const int &njets,
+                                       const float &mt_1, const int &nbtag,
+                                       const float &pt_1, const float &mass_2,
+                                       const float &m_vis) {
+        if (pt_2 < 0.) {
+            return ROOT::RVec<float>(factors.variations.size() + 1, 0.);
+        }
+        const double inputs[7] = {pt_2, (double)njets, mt_1, (double)nbtag,
+                                  pt_1, mass_2,        m_vis};
+        return evaluate_variations(factors, inputs, combine);
+    };
+    const std::string result_vec_name = outputnames[0] + "_variations";
+    auto df1 =
+        df.Define(result_vec_name, calc_fake_factors,
+                  {tau_pt, njets, lep_mt, nbtags, lep_pt, tau_mass, m_vis});
+    return define_variation_outputs(df1, outputnames, result_vec_name);
+}
+
+/**
+ * @brief Function to calculate the fake factors and all their variations in
+ * one pass for the NMSSM Di-Higgs analysis for the full hadronic channel, see
+ * `fakefactor_nmssm_lt_variations`. The results are identical to running
+ * `fakefactor_nmssm_tt` once per variation.
+ *
+ * @param df the dataframe to add the quantity to
+ * @param outputnames names of the output columns, the nominal fake factor
+ * followed by one column per variation
+ * @param tau_idx index of the tau, leading/subleading
+ * @param tau_pt_1 pt of the leading hadronic tau in the tau pair
+ * @param tau_pt_2 pt of the subleading hadronic tau in the tau pair
+ * @param njets number of good jets in the event
+ * @param m_vis visible mass of the tau pair
+ * @param nbtag number of good b-tagged jets in the event
+ * @param tau_mass_1 mass of the leading hadronic tau in the tau pair
+ * @param tau_mass_2 mass of the subleading hadronic tau in the tau pair
+ * @param variation_parameters parameter varied by each variation, one of
+ * `qcd`, `ttbar`, `fraction`, `qcd_corr_leppt`, `qcd_corr_taumass`,
+ * `qcd_corr_drsr`, `ttbar_corr_leppt` or `ttbar_corr_taumass`
+ * @param variation_names names of the FF uncertainty variations in the
+ * correctionlib files
+ * @param ff_file correctionlib json file with the fake factors
+ * @param ff_corr_file correctionlib json file with corrections for the fake
+ * factors
+ * @returns a dataframe with the fake factors
+ */
+ROOT::RDF::RNode fakefactor_nmssm_tt_variations(
+    ROOT::RDF::RNode df, const std::vector<std::string> &outputnames,
+    const int &tau_idx, const std::string &tau_pt_1,
+    const std::string &tau_pt_2, const std::string &njets,
+    const std::string &m_vis, const std::string &nbtag,
+    const std::string &tau_mass_1, const std::string &tau_mass_2,
+    const std::vector<std::string> &variation_parameters,
+    const std::vector<std::string> &variation_names, const std::string &ff_file,
+    const std::string &ff_corr_file) {
+    Logger::get("FakeFactor")
+        ->debug("Setting up functions for fake factor evaluation with {} "
+                "variations",
+                variation_names.size());
+    const auto ff_corrections = dense::CorrectionFile(ff_file);
+    const auto ff_corr_corrections = dense::CorrectionFile(ff_corr_file);
+    // event inputs: leading tau pt, subleading tau pt, njets, m_vis, nbtag,
+    // leading tau mass, subleading tau mass
+    const std::string fractions =
+        tau_idx == 0 ? "process_fractions" : "process_fractions_subleading";
+    const int tau_pt = tau_idx == 0 ? 0 : 1;
+    const int other_tau_pt = tau_idx == 0 ? 1 : 0;
+    const int tau_mass = tau_idx == 0 ? 5 : 6;
+    std::vector<FactorDefinition> definitions;
+    if (tau_idx == 0) {
+        definitions = {
+            {"qcd", &ff_corrections, "QCD_fake_factors", {}, tau_pt, 2},
+            {"ttbar", &ff_corrections, "ttbar_fake_factors", {}, tau_pt, 2},
+        };
+    } else {
+        definitions = {
+            {"qcd",
+             &ff_corrections,
+             "QCD_subleading_fake_factors",
+             {},
+             tau_pt,
+             2},
+            {"ttbar",
+             &ff_corrections,
+             "ttbar_subleading_fake_factors",
+             {},
+             tau_pt,
+             2},
+        };
+    }
+    definitions.insert(definitions.end(), {
+                                              {"fraction",
+                                               &ff_corrections,
+                                               fractions,
+                                               {{"process", "QCD"}},
+                                               3,
+                                               4},
+                                              {"fraction",
+                                               &ff_corrections,
+                                               fractions,
+                                               {{"process", "Wjets"}},
+                                               3,
+                                               4},
+                                              {"fraction",
+                                               &ff_corrections,
+                                               fractions,
+                                               {{"process", "ttbar"}},
+                                               3,
+                                               4},
+                                          });
+    if (tau_idx == 0) {
+        definitions.insert(
+            definitions.end(),
+            {
+                {"qcd_corr_leppt",
+                 &ff_corr_corrections,
+                 "QCD_non_closure_subleading_lep_pt_correction",
+                 {},
+                 other_tau_pt,
+                 -1},
+                {"qcd_corr_taumass",
+                 &ff_corr_corrections,
+                 "QCD_non_closure_leading_lep_mass_correction",
+                 {},
+                 tau_mass,
+                 -1},
+                {"qcd_corr_drsr",
+                 &ff_corr_corrections,
+                 "QCD_DR_SR_correction",
+                 {},
+                 3,
+                 -1},
+                {"ttbar_corr_leppt",
+                 &ff_corr_corrections,
+                 "ttbar_non_closure_subleading_lep_pt_correction",
+                 {},
+                 other_tau_pt,
+                 -1},
+                {"ttbar_corr_taumass",
+                 &ff_corr_corrections,
+                 "ttbar_non_closure_leading_lep_mass_correction",
+                 {},
+                 tau_mass,
+                 -1},
+            });
+    } else {
+        definitions.insert(
+            definitions.end(),
+            {
+                {"qcd_corr_leppt",
+                 &ff_corr_corrections,
+                 "QCD_subleading_non_closure_leading_lep_pt_correction",
+                 {},
+                 other_tau_pt,
+                 -1},
+                {"qcd_corr_taumass",
+                 &ff_corr_corrections,
+                 "QCD_subleading_non_closure_subleading_lep_mass_correction",
+                 {},
+                 tau_mass,
+                 -1},
+                {"qcd_corr_drsr",
+                 &ff_corr_corrections,
+                 "QCD_subleading_DR_SR_correction",
+                 {},
+                 3,
+                 -1},
+                {"ttbar_corr_leppt",
+                 &ff_corr_corrections,
+                 "ttbar_subleading_non_closure_leading_lep_pt_correction",
+                 {},
+                 other_tau_pt,
+                 -1},
+                {"ttbar_corr_taumass",
+                 &ff_corr_corrections,
+                 "ttbar_subleading_non_closure_subleading_lep_mass_correction",
+                 {},
+                 tau_mass,
+                 -1},
+            });
+    }
+    const auto factors = compile_factors(definitions, outputnames,
+                                         variation_parameters, variation_names);
+    auto combine = [](const ROOT::RVec<float> &f) {
+        return (f[TtQcdFrac] + f[TtWjetsFrac]) *
+                   std::max(f[TtQcdFF], (float)0.) * f[TtQcdTauPt] *
+                   f[TtQcdTauMass] * f[TtQcdDRSR] +
+               f[TtTtbarFrac] * std::max(f[TtTtbarFF], (float)0.) *
+                   f[TtTtbarTauPt] * f[TtTtbarTauMass];
+    };
+    auto calc_fake_factors = [factors,
+                              combine](const float &pt_1, const float &pt_2,
+                                       const int &njets, const float &m_vis,
+                                       const int &nbtag, const float &mass_1,
+                                       const float &mass_2) {
+        if (pt_2 < 0.) {
+            return ROOT::RVec<float>(factors.variations.size() + 1, 0.);
+        }
+        const double inputs[7] = {pt_1,          pt_2,   (double)njets, m_vis,
+                                  (double)nbtag, mass_1, mass_2};
+        return evaluate_variations(factors, inputs, combine);
+    };
+    const std::string result_vec_name = outputnames[0] + "_variations";
+    auto df1 = df.Define(
+        result_vec_name, calc_fake_factors,
+        {tau_pt_1, tau_pt_2, njets, m_vis, nbtag, tau_mass_1, tau_mass_2});
+    return define_variation_outputs(df1, outputnames, result_vec_name);
+}
+
 } // namespace fakefactors
-#endif /* GUARDFAKEFACTORS_H */
\ No newline at end of file
+#endif /* GUARDFAKEFACTORS_H */
+#endif // end XYH_PREBUILT_ADDONS
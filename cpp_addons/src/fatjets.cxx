@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/fatjets.hxx"
+#else
 #ifndef GUARDFATJETSEXT_H
 #define GUARDFATJETSEXT_H
 
@@ -119,4 +124,5 @@ auto FindXbbFatjet(ROOT::RDF::RNode df, const std::string &output_name,
     return df1;
 }
 } // end namespace fatjet
-#endif /* GUARDFATJETS_H */
\ No newline at end of file
+#endif /* GUARDFATJETS_H */
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/hhkinfit.hxx"
+#else
 #ifndef GUARDHHKINFIT_H
 #define GUARDHHKINFIT_H
 /// The namespace that contains the HHKinFit function.
@@ -379,4 +384,5 @@ ROOT::RDF::RNode BestYHKinFit(
 }
 
 } // namespace hhkinfit
-#endif /* GUARDHHKINFIT_H */
\ No newline at end of file
+#endif /* GUARDHHKINFIT_H */
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/jets.hxx"
+#else
 #include "../include/jets.hxx"
 #include "../../../../include/defaults.hxx"
 #include "../../../../include/utility/CorrectionManager.hxx"
@@ -11,6 +16,9 @@
 #include <Math/Vector4D.h>
 #include <Math/VectorUtil.h>
 #include <algorithm>
+#include <stdexcept>
+#include <string>
+#include <vector>
 
 namespace physicsobject {
 
@@ -347,6 +355,12 @@ ROOT::RDF::RNode RawMuonSubtr(ROOT::RDF::RNode df,
  * [CMS analysis corrections
  * documentation](https://cms-analysis-corrections.docs.cern.ch/corrections/JME/).
  *
+ * In Run 2, the corrections for data are derived for each run period
+ * separately. All corrections of the era are loaded once and the correction
+ * of each event is selected from a table of run ranges, given by the first
+ * run of each period in `first_runs`. In Run 3, the run dependence is part of
+ * the `L2L3Residual` correction and a single entry is sufficient.
+ *
  * @param df input dataframe
  * @param correction_manager correction manager responsible for loading the jet
  * energy correction file
@@ -638,8 +652,10 @@ PtCorrectionMC(ROOT::RDF::RNode df,
  * @param jec_file path to the JEC correction file
  * @param jec_algo name of the jet reconstruction algorithm (e.g., "AK4PFchs" or
  * "AK8PFPuppi")
- * @param jes_tag tag of the JES correction campaign (e.g., "Summer19UL18_V5")
- * @param jer_shift name of the JER shift variation ("nom", "up", or "down")
+ * @param jes_tags tags of the JES correction campaign for each run period
+ * (e.g., "Summer19UL18_RunA_V5"), sorted by the first runs of the periods
+ * @param first_runs first run of each run period, in ascending order; the
+ * first period is also used for events with smaller run numbers
  * @param reapply_jes flag to reapply the jet energy calibration, otherwise
  * `jet_pt_raw` is taken as the already JES-corrected \f$p_T\f$
  * @param era string defining the currently processed era, needed due to
@@ -657,7 +673,9 @@ PtCorrectionData(ROOT::RDF::RNode df,
                  const std::string &jet_eta, const std::string &jet_phi,
                  const std::string &jet_area, const std::string &rho,
                  const std::string &run, const std::string &jec_file,
-                 const std::string &jec_algo, const std::string &jes_tag,
+                 const std::string &jec_algo,
+                 const std::vector<std::string> &jes_tags,
+                 const std::vector<unsigned int> &first_runs,
                  const bool &reapply_jes, const std::string &era) {
     // Identify jet radius from algorithm
     float jet_radius = 0.4;
@@ -665,29 +683,55 @@ PtCorrectionData(ROOT::RDF::RNode df,
         jet_radius = 0.8;
     }
 
+    // Check the table of run periods
+    if (jes_tags.empty() || jes_tags.size() != first_runs.size() ||
+        !std::is_sorted(first_runs.begin(), first_runs.end())) {
+        Logger::get("physicsobject::jet::jec::PtCorrectionData")
+            ->error("Got {} JES tags and {} first runs, which must be sorted",
+                    jes_tags.size(), first_runs.size());
+        throw std::invalid_argument("Invalid run periods of the JES tags");
+    }
+
     // Set the type tag to "DATA"
     const std::string type_tag = "DATA";
 
-    // Load the nominal jet energy scale evaluators
-    auto jes_l1_evaluator = load_nominal_jes_correction(
-        correction_manager, jec_file, jes_tag, type_tag, "L1FastJet", jec_algo);
-    auto jes_l2rel_evaluator =
-        load_nominal_jes_correction(correction_manager, jec_file, jes_tag,
-                                    type_tag, "L2Relative", jec_algo);
-    auto jes_l2l3res_evaluator =
-        load_nominal_jes_correction(correction_manager, jec_file, jes_tag,
-                                    type_tag, "L2L3Residual", jec_algo);
+    // Load the nominal jet energy scale evaluators of all run periods
+    std::vector<const correction::Correction *> jes_l1_evaluators;
+    std::vector<const correction::Correction *> jes_l2rel_evaluators;
+    std::vector<const correction::Correction *> jes_l2l3res_evaluators;
+    for (const auto &jes_tag : jes_tags) {
+        jes_l1_evaluators.push_back(
+            load_nominal_jes_correction(correction_manager, jec_file, jes_tag,
+                                        type_tag, "L1FastJet", jec_algo));
+        jes_l2rel_evaluators.push_back(
+            load_nominal_jes_correction(correction_manager, jec_file, jes_tag,
+                                        type_tag, "L2Relative", jec_algo));
+        jes_l2l3res_evaluators.push_back(
+            load_nominal_jes_correction(correction_manager, jec_file, jes_tag,
+                                        type_tag, "L2L3Residual", jec_algo));
+    }
 
     // Function to retrieve the JEC result with intermediate steps
     auto func_jec_result =
-        [era, reapply_jes, jes_l1_evaluator, jes_l2rel_evaluator,
-         jes_l2l3res_evaluator](const ROOT::RVec<float> &jet_pt_raw,
-                                const ROOT::RVec<float> &jet_eta,
-                                const ROOT::RVec<float> &jet_phi,
-                                const ROOT::RVec<float> &jet_area,
-                                const float &rho, const unsigned int &run) {
+        [era, reapply_jes, first_runs, jes_l1_evaluators, jes_l2rel_evaluators,
+         jes_l2l3res_evaluators](const ROOT::RVec<float> &jet_pt_raw,
+                                 const ROOT::RVec<float> &jet_eta,
+                                 const ROOT::RVec<float> &jet_phi,
+                                 const ROOT::RVec<float> &jet_area,
+                                 const float &rho, const unsigned int &run) {
             ROOT::RVec<JECResult> jet_jec_result;
             if (reapply_jes) {
+                // Find the run period of the event, events before the first
+                // period are corrected with the first period
+                const auto period =
+                    std::upper_bound(first_runs.begin(), first_runs.end(),
+                                     run) -
+                    first_runs.begin();
+                const std::size_t index = period > 0 ? period - 1 : 0;
+                const auto jes_l1_evaluator = jes_l1_evaluators[index];
+                const auto jes_l2rel_evaluator = jes_l2rel_evaluators[index];
+                const auto jes_l2l3res_evaluator =
+                    jes_l2l3res_evaluators[index];
                 // Apply the jet energy scale corrections to data. This is done
                 // by using the corresponding helper function for single jets
                 // and wrap it with ROOT::VecOps::Map to retrieve the calibrated
@@ -975,3 +1019,4 @@ ROOT::RDF::RNode JetPtPNetRegressionWithNeutrino(
 } // namespace jet
 
 } // namespace physicsobject
+#endif // end XYH_PREBUILT_ADDONS
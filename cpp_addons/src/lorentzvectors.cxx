@@ -0,0 +1,172 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/lorentzvectors.hxx"
+#else
+#ifndef GUARDLORENTZVECTORS_CXX
+#define GUARDLORENTZVECTORS_CXX
+
+#include "../include/lorentzvectors.hxx"
+#include "../../../../include/defaults.hxx"
+#include "../../../../include/utility/Logger.hxx"
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <Math/Vector4D.h>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+// namespace xyh
+namespace xyh {
+
+// namespace lorentzvector
+namespace lorentzvector {
+
+// components of a four-vector, which can be extracted with `Components`
+enum class Component { pt, eta, phi, mass, energy, rapidity, mt, px, py, pz };
+
+/**
+ * @brief Parse the name of a four-vector component.
+ *
+ * @param name The name of the component.
+ * @return The component.
+ */
+Component parse_component(const std::string &name) {
+    if (name == "pt") {
+        return Component::pt;
+    } else if (name == "eta") {
+        return Component::eta;
+    } else if (name == "phi") {
+        return Component::phi;
+    } else if (name == "mass") {
+        return Component::mass;
+    } else if (name == "energy") {
+        return Component::energy;
+    } else if (name == "rapidity") {
+        return Component::rapidity;
+    } else if (name == "mt") {
+        return Component::mt;
+    } else if (name == "px") {
+        return Component::px;
+    } else if (name == "py") {
+        return Component::py;
+    } else if (name == "pz") {
+        return Component::pz;
+    }
+    Logger::get("lorentzvector::Components")
+        ->error("Unknown four-vector component {}", name);
+    throw std::invalid_argument("Unknown four-vector component " + name);
+}
+
+/**
+ * @brief Get a component of a four-vector. Four-vectors with negative
+ * transverse momentum mark missing objects, for which the default value is
+ * returned.
+ *
+ * @param p4 The four-vector.
+ * @param component The component.
+ * @return The value of the component.
+ */
+float get_component(const ROOT::Math::PtEtaPhiMVector &p4,
+                    const Component &component) {
+    if (p4.pt() < 0.0) {
+        return default_float;
+    }
+    switch (component) {
+    case Component::pt:
+        return (float)p4.pt();
+    case Component::eta:
+        return (float)p4.eta();
+    case Component::phi:
+        return (float)p4.phi();
+    case Component::mass:
+        return (float)p4.mass();
+    case Component::energy:
+        return (float)p4.energy();
+    case Component::rapidity:
+        return (float)p4.Rapidity();
+    case Component::mt:
+        return (float)p4.mt();
+    case Component::px:
+        return (float)p4.px();
+    case Component::py:
+        return (float)p4.py();
+    case Component::pz:
+        return (float)p4.pz();
+    }
+    return default_float;
+}
+
+/**
+ * @brief Extract several components of a four-vector into separate columns
+ * with a single producer, instead of one `lorentzvector::GetPt`,
+ * `lorentzvector::GetEta`, ... producer per component.
+ *
+ * The components are parsed once when the dataframe graph is built. For each
+ * event, the four-vector is read once and all requested components are
+ * computed in a single typed, non-jitted lambda and collected in a vector
+ * column named `<first output name>_components`, from which the named columns
+ * are defined. Four-vectors with negative transverse momentum mark missing
+ * objects, for which all components are set to the default value, as for the
+ * `lorentzvector::Get*` functions. The following components are supported:
+ * `pt`, `eta`, `phi`, `mass`, `energy`, `rapidity`, `mt`, `px`, `py` and `pz`.
+ *
+ * @param df The input dataframe.
+ * @param outputnames The names of the new columns, one for each component.
+ * @param p4 The name of the column containing the four-vector.
+ * @param components The names of the components, one for each output column.
+ * @return A dataframe with the new columns.
+ */
+ROOT::RDF::RNode Components(ROOT::RDF::RNode df,
+                            const std::vector<std::string> &outputnames,
+                            const std::string &p4,
+                            const std::vector<std::string> &components) {
+    if (outputnames.size() != components.size() || outputnames.empty()) {
+        Logger::get("lorentzvector::Components")
+            ->error("Got {} output columns but {} components of {}",
+                    outputnames.size(), components.size(), p4);
+        throw std::invalid_argument(
+            "Number of output columns and components differ");
+    }
+    std::vector<Component> parsed;
+    for (const auto &component : components) {
+        parsed.push_back(parse_component(component));
+    }
+    if (outputnames.size() == 1) {
+        const auto component = parsed.front();
+        return df.Define(
+            outputnames.front(),
+            [component](const ROOT::Math::PtEtaPhiMVector &p4) {
+                return get_component(p4, component);
+            },
+            {p4});
+    }
+    const auto components_column = outputnames.front() + "_components";
+    auto df1 = df.Define(
+        components_column,
+        [parsed](const ROOT::Math::PtEtaPhiMVector &p4) {
+            ROOT::RVec<float> values(parsed.size(), default_float);
+            if (p4.pt() < 0.0) {
+                return values;
+            }
+            for (std::size_t i = 0; i < parsed.size(); ++i) {
+                values[i] = get_component(p4, parsed[i]);
+            }
+            return values;
+        },
+        {p4});
+    for (std::size_t i = 0; i < outputnames.size(); ++i) {
+        df1 = df1.Define(
+            outputnames[i],
+            [i](const ROOT::RVec<float> &values) { return values[i]; },
+            {components_column});
+    }
+    return df1;
+}
+
+} // end namespace lorentzvector
+
+} // end namespace xyh
+
+#endif // end GUARDLORENTZVECTORS_CXX
+#endif // end XYH_PREBUILT_ADDONS
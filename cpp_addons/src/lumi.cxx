@@ -0,0 +1,116 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/lumi.hxx"
+#else
+#ifndef GUARDLUMI_CXX
+#define GUARDLUMI_CXX
+
+#include "../include/lumi.hxx"
+#include "../../../../include/utility/Logger.hxx"
+#include "ROOT/RDataFrame.hxx"
+#include <algorithm>
+#include <fstream>
+#include <memory>
+#include <nlohmann/json.hpp>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+// namespace xyh
+namespace xyh {
+
+// namespace lumi
+namespace lumi {
+
+/**
+ * @brief Read and index a golden JSON file, which maps run numbers to lists
+ * of certified luminosity section intervals `[first, last]`.
+ *
+ * The runs are sorted numerically and the intervals of each run are sorted
+ * and merged, if they overlap or are adjacent.
+ *
+ * @param json_path The path to the golden JSON file.
+ */
+CertifiedLumiSections::CertifiedLumiSections(const std::string &json_path) {
+    std::ifstream file(json_path);
+    if (!file.is_open()) {
+        Logger::get("lumi::GoldenJSONFilter")
+            ->error("Cannot open golden JSON file {}", json_path);
+        throw std::runtime_error("Cannot open golden JSON file " + json_path);
+    }
+    const auto golden_json = nlohmann::json::parse(file);
+
+    // the keys of the json object are sorted as strings, hence the runs are
+    // sorted numerically here
+    std::vector<std::pair<unsigned int, nlohmann::json>> runs;
+    for (const auto &[run, intervals] : golden_json.items()) {
+        runs.emplace_back(std::stoul(run), intervals);
+    }
+    std::sort(runs.begin(), runs.end(),
+              [](const auto &a, const auto &b) { return a.first < b.first; });
+
+    offsets_.push_back(0);
+    for (const auto &[run, run_intervals] : runs) {
+        std::vector<std::pair<unsigned int, unsigned int>> intervals;
+        for (const auto &interval : run_intervals) {
+            intervals.emplace_back(interval.at(0).get<unsigned int>(),
+                                   interval.at(1).get<unsigned int>());
+        }
+        std::sort(intervals.begin(), intervals.end());
+        for (const auto &interval : intervals) {
+            if (intervals_.size() > offsets_.back() &&
+                interval.first <= intervals_.back().second + 1) {
+                intervals_.back().second =
+                    std::max(intervals_.back().second, interval.second);
+            } else {
+                intervals_.push_back(interval);
+            }
+        }
+        runs_.push_back(run);
+        offsets_.push_back(intervals_.size());
+    }
+}
+
+/**
+ * @brief Filter events with certified luminosity sections, as listed in the
+ * golden JSON file.
+ *
+ * This is a faster alternative to `event::filter::GoldenJSON`, which searches
+ * the parsed json object of the file for each event. Here, the file is
+ * indexed once when the dataframe graph is built (see
+ * `CertifiedLumiSections`), such that each event is checked with binary
+ * searches in sorted arrays.
+ *
+ * @param df The input dataframe.
+ * @param filtername The name of the filter.
+ * @param run The name of the column containing the run number.
+ * @param luminosity The name of the column containing the luminosity section.
+ * @param json_path The path to the golden JSON file.
+ * @return A dataframe with the filter applied.
+ */
+ROOT::RDF::RNode GoldenJSONFilter(ROOT::RDF::RNode df,
+                                  const std::string &filtername,
+                                  const std::string &run,
+                                  const std::string &luminosity,
+                                  const std::string &json_path) {
+    const auto certified =
+        std::make_shared<const CertifiedLumiSections>(json_path);
+    Logger::get("lumi::GoldenJSONFilter")
+        ->debug("Read {} certified luminosity section intervals of {} runs "
+                "from {}",
+                certified->n_intervals(), certified->n_runs(), json_path);
+    return df.Filter(
+        [certified](const unsigned int &run, const unsigned int &luminosity) {
+            return certified->contains(run, luminosity);
+        },
+        {run, luminosity}, filtername);
+}
+
+} // end namespace lumi
+
+} // end namespace xyh
+
+#endif // end GUARDLUMI_CXX
+#endif // end XYH_PREBUILT_ADDONS
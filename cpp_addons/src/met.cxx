@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/met.hxx"
+#else
 #include "../include/met.hxx"
 #include "../../../../include/utility/Logger.hxx"
 #include "ROOT/RDataFrame.hxx"
@@ -6,9 +11,29 @@
 #include <Math/Vector4D.h>
 #include <Math/VectorUtil.h>
 #include <cmath>
+#include <stdexcept>
+#include <string>
 
 namespace met {
 
+/**
+ * @brief Check whether a jet is used for the type-I MET correction.
+ *
+ * @param pt_corrected The fully corrected transverse momentum of the jet.
+ * @param eta The pseudorapidity of the jet.
+ * @param em_ef The electromagnetic energy fraction of the jet.
+ * @param min_pt The minimum corrected transverse momentum.
+ * @param max_abs_eta The maximum absolute pseudorapidity.
+ * @param max_em_ef The maximum electromagnetic energy fraction.
+ * @return `true` if the jet is selected.
+ */
+bool type1_jet_selected(const float &pt_corrected, const float &eta,
+                        const float &em_ef, const float &min_pt,
+                        const float &max_abs_eta, const float &max_em_ef) {
+    return pt_corrected >= min_pt && std::abs(eta) <= max_abs_eta &&
+           em_ef <= max_em_ef;
+}
+
 ROOT::RDF::RNode
 Type1Correction(ROOT::RDF::RNode df, const std::string &outputname,
                 const std::string raw_met,
@@ -26,8 +51,9 @@ Type1Correction(ROOT::RDF::RNode df, const std::string &outputname,
                                const ROOT::RVec<float> &t1jet_phi,
                                const ROOT::RVec<float> &t1jet_em_ef) {
         // Select jets for the type-I correction
-        auto mask = (t1jet_pt_corrected >= 15.0 && abs(t1jet_eta) <= 5.2 &&
-                     t1jet_em_ef <= 0.9);
+        auto mask = (t1jet_pt_corrected >= t1jet_min_pt &&
+                     abs(t1jet_eta) <= t1jet_max_abs_eta &&
+                     t1jet_em_ef <= t1jet_max_em_ef);
 
         // Calculate the difference vector between the fully corrected and the
         // L1-corrected transverse momentum vectors with all selected jets
@@ -56,4 +82,139 @@ Type1Correction(ROOT::RDF::RNode df, const std::string &outputname,
                       t1jet_eta, t1jet_phi, t1jet_em_ef});
 }
 
-} // namespace met
\ No newline at end of file
+/**
+ * @brief Type-I MET correction, which is updated incrementally in systematic
+ * shifts of the jet energy.
+ *
+ * In the nominal case, i.e. if `outputname` is equal to `nominal_outputname`,
+ * the full type-I correction is calculated with `met::Type1Correction`. In a
+ * jet energy shift, the shifted corrected transverse momenta are compared to
+ * the nominal ones, which are read from the column `nominal_pt_corrected`.
+ * Only the contributions of jets with changed transverse momenta are
+ * replaced in the nominal corrected MET read from the column
+ * `nominal_outputname`, which has to be defined before. The pseudorapidities,
+ * azimuthal angles and electromagnetic energy fractions of the jets must not
+ * be changed by the shift.
+ *
+ * If `validate` is set, the shifted MET is also fully recalculated from the
+ * raw MET, and an exception is thrown if the two calculations differ by more
+ * than the float precision.
+ *
+ * @param df The input dataframe.
+ * @param outputname The name of the new column containing the corrected MET.
+ * @param raw_met The name of the column containing the raw MET.
+ * @param t1jet_pt_l1corrected The name of the column containing the
+ * L1-corrected transverse momenta of the jets.
+ * @param t1jet_pt_corrected The name of the column containing the fully
+ * corrected (and possibly shifted) transverse momenta of the jets.
+ * @param t1jet_eta The name of the column containing the pseudorapidities of
+ * the jets.
+ * @param t1jet_phi The name of the column containing the azimuthal angles of
+ * the jets.
+ * @param t1jet_em_ef The name of the column containing the electromagnetic
+ * energy fractions of the jets.
+ * @param t1jet_min_pt The minimum corrected transverse momentum of the jets.
+ * @param t1jet_max_abs_eta The maximum absolute pseudorapidity of the jets.
+ * @param t1jet_max_em_ef The maximum electromagnetic energy fraction of the
+ * jets.
+ * @param nominal_outputname The name of the column containing the nominal
+ * corrected MET.
+ * @param nominal_pt_corrected The name of the column containing the nominal
+ * fully corrected transverse momenta of the jets.
+ * @param validate Whether the result is compared to the full recalculation.
+ * @return A dataframe with the new column.
+ */
+ROOT::RDF::RNode Type1CorrectionIncremental(
+    ROOT::RDF::RNode df, const std::string &outputname,
+    const std::string raw_met, const std::string &t1jet_pt_l1corrected,
+    const std::string &t1jet_pt_corrected, const std::string &t1jet_eta,
+    const std::string &t1jet_phi, const std::string &t1jet_em_ef,
+    const float &t1jet_min_pt, const float &t1jet_max_abs_eta,
+    const float &t1jet_max_em_ef, const std::string &nominal_outputname,
+    const std::string &nominal_pt_corrected, const bool &validate) {
+    if (outputname == nominal_outputname) {
+        return Type1Correction(df, outputname, raw_met, t1jet_pt_l1corrected,
+                               t1jet_pt_corrected, t1jet_eta, t1jet_phi,
+                               t1jet_em_ef, t1jet_min_pt, t1jet_max_abs_eta,
+                               t1jet_max_em_ef);
+    }
+    Logger::get("met::Type1CorrectionIncremental")
+        ->debug("Updating {} incrementally from {} with jet momenta {}",
+                outputname, nominal_outputname, t1jet_pt_corrected);
+
+    auto type1_incremental_func =
+        [t1jet_min_pt, t1jet_max_abs_eta, t1jet_max_em_ef,
+         validate](const ROOT::Math::PtEtaPhiMVector &nominal_met,
+                   const ROOT::Math::PtEtaPhiMVector &raw_met,
+                   const ROOT::RVec<float> &t1jet_pt_l1corrected,
+                   const ROOT::RVec<float> &nominal_pt_corrected,
+                   const ROOT::RVec<float> &t1jet_pt_corrected,
+                   const ROOT::RVec<float> &t1jet_eta,
+                   const ROOT::RVec<float> &t1jet_phi,
+                   const ROOT::RVec<float> &t1jet_em_ef) {
+            // Replace the contributions of the jets with shifted momenta, the
+            // contributions of all other jets are already contained in the
+            // nominal MET
+            auto met_corrected_3d = ROOT::Math::RhoEtaPhiVector(
+                nominal_met.Pt(), 0.0, nominal_met.Phi());
+            for (std::size_t i = 0; i < t1jet_pt_corrected.size(); ++i) {
+                if (t1jet_pt_corrected[i] == nominal_pt_corrected[i]) {
+                    continue;
+                }
+                if (type1_jet_selected(nominal_pt_corrected[i], t1jet_eta[i],
+                                       t1jet_em_ef[i], t1jet_min_pt,
+                                       t1jet_max_abs_eta, t1jet_max_em_ef)) {
+                    met_corrected_3d -= ROOT::Math::RhoEtaPhiVector(
+                        nominal_pt_corrected[i] - t1jet_pt_l1corrected[i], 0.0,
+                        t1jet_phi[i]);
+                }
+                if (type1_jet_selected(t1jet_pt_corrected[i], t1jet_eta[i],
+                                       t1jet_em_ef[i], t1jet_min_pt,
+                                       t1jet_max_abs_eta, t1jet_max_em_ef)) {
+                    met_corrected_3d += ROOT::Math::RhoEtaPhiVector(
+                        t1jet_pt_corrected[i] - t1jet_pt_l1corrected[i], 0.0,
+                        t1jet_phi[i]);
+                }
+            }
+
+            if (validate) {
+                // Compare to the full recalculation from the raw MET
+                auto met_full_3d = ROOT::Math::RhoEtaPhiVector(
+                    raw_met.Pt(), 0.0, raw_met.Phi());
+                for (std::size_t i = 0; i < t1jet_pt_corrected.size(); ++i) {
+                    if (type1_jet_selected(
+                            t1jet_pt_corrected[i], t1jet_eta[i], t1jet_em_ef[i],
+                            t1jet_min_pt, t1jet_max_abs_eta, t1jet_max_em_ef)) {
+                        met_full_3d += ROOT::Math::RhoEtaPhiVector(
+                            t1jet_pt_corrected[i] - t1jet_pt_l1corrected[i],
+                            0.0, t1jet_phi[i]);
+                    }
+                }
+                const auto difference = (met_corrected_3d - met_full_3d).Rho();
+                const auto tolerance = 1e-4 * (1.0 + met_full_3d.Rho());
+                if (difference > tolerance) {
+                    Logger::get("met::Type1CorrectionIncremental")
+                        ->error("Incremental type-I MET ({}, {}) differs from "
+                                "the full recalculation ({}, {}) by {} GeV",
+                                met_corrected_3d.Rho(), met_corrected_3d.Phi(),
+                                met_full_3d.Rho(), met_full_3d.Phi(),
+                                difference);
+                    throw std::runtime_error(
+                        "Incremental type-I MET differs from the full "
+                        "recalculation");
+                }
+            }
+
+            return ROOT::Math::PtEtaPhiMVector(met_corrected_3d.Rho(), 0.0,
+                                               met_corrected_3d.Phi(),
+                                               met_corrected_3d.Rho());
+        };
+
+    return df.Define(outputname, type1_incremental_func,
+                     {nominal_outputname, raw_met, t1jet_pt_l1corrected,
+                      nominal_pt_corrected, t1jet_pt_corrected, t1jet_eta,
+                      t1jet_phi, t1jet_em_ef});
+}
+
+} // namespace met
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/object_selection.hxx"
+#else
 #ifndef GUARDOBJECTSELECTION_CXX
 #define GUARDOBJECTSELECTION_CXX
 
@@ -412,3 +417,4 @@ ROOT::RDF::RNode jet(ROOT::RDF::RNode df, const std::string &output_mask,
 } // end namespace xyh
 
 #endif // end GUARDOBJECTSELECTION_CXX
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/pairselection.hxx"
+#else
 #ifndef GUARDPAIRSELECTIONEXT_H
 #define GUARDPAIRSELECTIONEXT_H
 
@@ -620,3 +625,4 @@ PairSelection(ROOT::RDF::RNode df, const std::vector<std::string> &input_vector,
 } // namespace bb_pairselection
 
 #endif
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,17 +1,142 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/reweighting.hxx"
+#else
 #ifndef GUARDREWEIGHTINGEXT_CXX
 #define GUARDREWEIGHTINGEXT_CXX
 
+#include "../../../../include/utility/CorrectionManager.hxx"
 #include "../../../../include/utility/Logger.hxx"
 #include "../../../../include/utility/utility.hxx"
 #include "ROOT/RDataFrame.hxx"
 #include "ROOT/RVec.hxx"
 #include <Math/Vector4D.h>
 #include <Math/VectorUtil.h>
+#include <algorithm>
+#include <cmath>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
 
 namespace event {
 
 namespace reweighting {
 
+/**
+ * @brief Get the position of a scale variation in the `LHEScaleWeight`
+ * column. In the nanoAOD files, the weights are ordered by muR and then by
+ * muF, with the values 0.5, 1.0 and 2.0 each, i.e. the position is
+ * `3 * i(muR) + i(muF)`. The NMSSM signal samples do not contain the nominal
+ * weight (muR = muF = 1.0), such that the following weights are shifted by
+ * one, see `NMSSMLHEScaleWeights`.
+ *
+ * @param muR the value of muR, possible values are 0.5, 1.0, 2.0
+ * @param muF the value of muF, possible values are 0.5, 1.0, 2.0
+ * @param nmssm_convention whether the weights follow the convention of the
+ * NMSSM signal samples
+ * @return the position of the weight, -1 for the nominal weight of the NMSSM
+ * signal samples, which is 1
+ */
+int lhe_scale_weight_index(const float &muR, const float &muF,
+                           const bool &nmssm_convention) {
+    const std::vector<float> allowed_values = {0.5, 1.0, 2.0};
+    const auto muR_index =
+        std::find(allowed_values.begin(), allowed_values.end(), muR) -
+        allowed_values.begin();
+    const auto muF_index =
+        std::find(allowed_values.begin(), allowed_values.end(), muF) -
+        allowed_values.begin();
+    if (muR_index == 3) {
+        Logger::get("event::reweighting::LHEScaleWeights")
+            ->error("Invalid value for muR: {}", muR);
+        throw std::runtime_error("Invalid value for muR");
+    }
+    if (muF_index == 3) {
+        Logger::get("event::reweighting::LHEScaleWeights")
+            ->error("Invalid value for muF: {}", muF);
+        throw std::runtime_error("Invalid value for muF");
+    }
+    const int index = 3 * muR_index + muF_index;
+    if (!nmssm_convention || index < 4) {
+        return index;
+    }
+    return index == 4 ? -1 : index - 1;
+}
+
+/**
+ * @brief Function used to extract several scale variations of the LHE weights
+ * into named columns, e.g. the nominal weight and the muR and muF variations,
+ * instead of one producer per variation.
+ *
+ * The positions of the variations in the `LHEScaleWeight` column are
+ * determined once when the dataframe graph is built, see
+ * `lhe_scale_weight_index`. For each event, the column is read once and all
+ * requested weights are collected in a vector column named
+ * `<first output name>_variations`, from which the named columns are
+ * defined.
+ *
+ * @param df The input dataframe
+ * @param outputnames names of the weight columns, one for each variation
+ * @param lhe_scale_weights name of the column containing the lhe scale weights
+ * @param muRs the values of muR, one for each variation
+ * @param muFs the values of muF, one for each variation
+ * @param nmssm_convention whether the weights follow the convention of the
+ * NMSSM signal samples
+ * @return a new dataframe containing the new columns
+ */
+ROOT::RDF::RNode LHEScaleWeights(ROOT::RDF::RNode df,
+                                 const std::vector<std::string> &outputnames,
+                                 const std::string &lhe_scale_weights,
+                                 const std::vector<float> &muRs,
+                                 const std::vector<float> &muFs,
+                                 const bool &nmssm_convention) {
+    if (outputnames.size() != muRs.size() ||
+        outputnames.size() != muFs.size() || outputnames.empty()) {
+        Logger::get("event::reweighting::LHEScaleWeights")
+            ->error("Got {} output columns, {} muR and {} muF values",
+                    outputnames.size(), muRs.size(), muFs.size());
+        throw std::invalid_argument(
+            "Number of output columns and scale variations differ");
+    }
+    std::vector<int> indices;
+    for (std::size_t i = 0; i < outputnames.size(); ++i) {
+        indices.push_back(
+            lhe_scale_weight_index(muRs[i], muFs[i], nmssm_convention));
+        Logger::get("event::reweighting::LHEScaleWeights")
+            ->debug("Weight {} with muR = {} and muF = {} at position {}",
+                    outputnames[i], muRs[i], muFs[i], indices.back());
+    }
+    if (outputnames.size() == 1) {
+        const int index = indices.front();
+        return df.Define(outputnames.front(),
+                         [index](const ROOT::RVec<float> &scale_weights) {
+                             return index < 0 ? 1.f : scale_weights.at(index);
+                         },
+                         {lhe_scale_weights});
+    }
+    const auto variations_column = outputnames.front() + "_variations";
+    auto df1 = df.Define(variations_column,
+                         [indices](const ROOT::RVec<float> &scale_weights) {
+                             ROOT::RVec<float> weights(indices.size(), 1.f);
+                             for (std::size_t i = 0; i < indices.size(); ++i) {
+                                 if (indices[i] >= 0) {
+                                     weights[i] = scale_weights.at(indices[i]);
+                                 }
+                             }
+                             return weights;
+                         },
+                         {lhe_scale_weights});
+    for (std::size_t i = 0; i < outputnames.size(); ++i) {
+        df1 = df1.Define(
+            outputnames[i],
+            [i](const ROOT::RVec<float> &weights) { return weights[i]; },
+            {variations_column});
+    }
+    return df1;
+}
+
 /**
  * @brief Function used to evaluate the lheScaleweight of an event from NMSSM
 signal samples. The weights are stored in the nanoAOD file an defined as
@@ -45,44 +170,138 @@ ROOT::RDF::RNode NMSSMLHEScaleWeights(ROOT::RDF::RNode df,
                                       const std::string &weightname,
                                       const std::string &lhe_scale_weights,
                                       const float muR, const float muF) {
-    // find the index we have to use, first check if the muR and muF values are
-    // valid, only 0.5, 1.0, 2.0 are allowed
-    std::vector<float> allowed_values = {0.5, 1.0, 2.0};
-    if (std::find(allowed_values.begin(), allowed_values.end(), muR) ==
-        allowed_values.end()) {
-        Logger::get("event::reweighting::NMSSMLHEScaleWeights")
-            ->error("Invalid value for muR: {}", muR);
-        throw std::runtime_error("Invalid value for muR");
+    return LHEScaleWeights(df, {weightname}, lhe_scale_weights, {muR}, {muF},
+                           true);
+}
+
+// number of unit bins of the true number of pileup interactions, for which
+// the pileup weights are tabulated by `PileupTable`
+const int pileup_table_bins = 100;
+
+/**
+ * @brief Function used to evaluate the pileup weights of several variations,
+ * e.g. `nominal`, `up` and `down`, with a precomputed table.
+ *
+ * The pileup weights are binned in the true number of pileup interactions.
+ * When the dataframe graph is built, the weights of all variations are
+ * evaluated once for each unit bin between 0 and `pileup_table_bins`. Bins,
+ * in which the weights are not constant, e.g. for payloads with finer
+ * binnings, are not tabulated. For each event, the bin is calculated once
+ * and the weights of all variations are read from the table. Events outside
+ * the tabulated bins are evaluated with correctionlib, as in
+ * `event::reweighting::Pileup`.
+ *
+ * @param df The input dataframe
+ * @param correction_manager The CorrectionManager object
+ * @param outputnames names of the weight columns, one for each variation
+ * @param true_pileup name of the column containing the true number of pileup
+ * interactions
+ * @param json_file path to the file with the pileup weights
+ * @param json_name name of the correction with the pileup weights
+ * @param variations names of the variations, one for each output column
+ * @return a new dataframe containing the new columns
+ */
+ROOT::RDF::RNode
+PileupTable(ROOT::RDF::RNode df,
+            correctionManager::CorrectionManager &correction_manager,
+            const std::vector<std::string> &outputnames,
+            const std::string &true_pileup, const std::string &json_file,
+            const std::string &json_name,
+            const std::vector<std::string> &variations) {
+    if (outputnames.size() != variations.size() || variations.empty()) {
+        Logger::get("event::reweighting::PileupTable")
+            ->error("Got {} output columns but {} variations",
+                    outputnames.size(), variations.size());
+        throw std::invalid_argument(
+            "Number of output columns and variations differ");
     }
-    if (std::find(allowed_values.begin(), allowed_values.end(), muF) ==
-        allowed_values.end()) {
-        Logger::get("event::reweighting::NMSSMLHEScaleWeights")
-            ->error("Invalid value for muF: {}", muF);
-        throw std::runtime_error("Invalid value for muF");
+    auto evaluator = correction_manager.loadCorrection(json_file, json_name);
+    const std::size_t n_variations = variations.size();
+
+    // tabulate the weights, a bin is only used if the weights at its lower
+    // and upper edges agree for all variations
+    auto table =
+        std::make_shared<std::vector<double>>(pileup_table_bins * n_variations);
+    auto tabulated = std::make_shared<std::vector<bool>>(pileup_table_bins);
+    for (int bin = 0; bin < pileup_table_bins; ++bin) {
+        const double lower = bin;
+        const double upper = std::nextafter(static_cast<float>(bin + 1),
+                                            static_cast<float>(bin));
+        bool constant = true;
+        for (std::size_t i = 0; i < n_variations; ++i) {
+            const auto weight = evaluator->evaluate({lower, variations[i]});
+            constant = constant &&
+                       (weight == evaluator->evaluate({upper, variations[i]}));
+            (*table)[bin * n_variations + i] = weight;
+        }
+        (*tabulated)[bin] = constant;
     }
-    // now find the index
-    std::map<std::pair<const float, const float>, int> index_map = {
-        {{0.5, 0.5}, 0}, {{1.0, 0.5}, 1}, {{2.0, 0.5}, 2},
-        {{0.5, 1.0}, 3}, {{2.0, 1.0}, 4}, {{0.5, 2.0}, 5},
-        {{1.0, 2.0}, 6}, {{2.0, 2.0}, 7}, {{1.0, 1.0}, 8}};
-    std::pair<const float, const float> variations = {muR, muF};
-    int index = index_map[variations];
-    auto lhe_scale_weights_lambda =
-        [index](const ROOT::RVec<float> scale_weight) {
-            if (index == 8) {
-                float default_weight = 1.;
-                return default_weight;
-            } else {
-                return scale_weight.at(index);
+    const auto n_tabulated =
+        std::count(tabulated->begin(), tabulated->end(), true);
+    Logger::get("event::reweighting::PileupTable")
+        ->debug("Tabulated pileup weights of {} variations in {} of {} bins",
+                n_variations, n_tabulated, pileup_table_bins);
+
+    // bin of the event in the table, -1 if it is not tabulated
+    const auto bin_column = outputnames.front() + "_bin";
+    auto df1 = df.Define(
+        bin_column,
+        [tabulated](const float &true_pileup) {
+            const int bin = static_cast<int>(std::floor(true_pileup));
+            if (bin < 0 || bin >= pileup_table_bins || !(*tabulated)[bin]) {
+                return -1;
             }
-        };
-    auto df1 =
-        df.Define(weightname, lhe_scale_weights_lambda, {lhe_scale_weights});
+            return bin;
+        },
+        {true_pileup});
+    for (std::size_t i = 0; i < n_variations; ++i) {
+        df1 = df1.Define(
+            outputnames[i],
+            [table, evaluator, n_variations, i, variation = variations[i]](
+                const float &true_pileup, const int &bin) {
+                if (bin < 0) {
+                    return evaluator->evaluate({true_pileup, variation});
+                }
+                return (*table)[bin * n_variations + i];
+            },
+            {true_pileup, bin_column});
+    }
     return df1;
 }
 
+/**
+ * @brief Function used to select one of several variations of a weight, e.g.
+ * of the pileup weights evaluated by `PileupTable`. Systematic shifts only
+ * have to change the selected variation, instead of evaluating the weight
+ * again.
+ *
+ * @param df The input dataframe
+ * @param outputname name of the new column containing the selected weight
+ * @param weights names of the weight columns of all variations
+ * @param variations names of the variations, one for each weight column
+ * @param variation name of the selected variation
+ * @return a new dataframe containing the new column
+ */
+ROOT::RDF::RNode SelectVariation(ROOT::RDF::RNode df,
+                                 const std::string &outputname,
+                                 const std::vector<std::string> &weights,
+                                 const std::vector<std::string> &variations,
+                                 const std::string &variation) {
+    const auto selected =
+        std::find(variations.begin(), variations.end(), variation);
+    if (weights.size() != variations.size() || selected == variations.end()) {
+        Logger::get("event::reweighting::SelectVariation")
+            ->error("Variation {} of {} not found", variation, outputname);
+        throw std::invalid_argument("Unknown variation " + variation);
+    }
+    const auto &weight = weights[selected - variations.begin()];
+    return df.Define(outputname, [](const double &weight) { return weight; },
+                     {weight});
+}
+
 } // namespace reweighting
 
 } // namespace event
 
-#endif
\ No newline at end of file
+#endif
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,9 +1,19 @@
-#ifndef GUARD_SCALEFACTORSEXT_H
-#define GUARD_SCALEFACTORSEXT_H
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/scalefactors.hxx"
+#else
+#ifndef GUARD_SCALEFACTORSEXT_CXX
+#define GUARD_SCALEFACTORSEXT_CXX
 
+#include "../include/scalefactors.hxx"
 #include "../../../../include/utility/CorrectionManager.hxx"
 #include "../../../../include/utility/Logger.hxx"
 #include "ROOT/RDataFrame.hxx"
+#include <cmath>
+#include <stdexcept>
+#include <string>
+#include <vector>
 
 namespace scalefactor {
 
@@ -444,6 +454,8 @@ trigger(ROOT::RDF::RNode df,
     return df1;
 }
 } // namespace fatjet
+
 } // namespace scalefactor
 
-#endif
\ No newline at end of file
+#endif
+#endif // end XYH_PREBUILT_ADDONS
@@ -0,0 +1,335 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/startup.hxx"
+#else
+#ifndef GUARDSTARTUP_CXX
+#define GUARDSTARTUP_CXX
+
+#include "../include/startup.hxx"
+#include "../../../../include/utility/Logger.hxx"
+#include "ROOT/RDataFrame.hxx"
+#include <chrono>
+#include <cstdlib>
+#include <fstream>
+#include <map>
+#include <mutex>
+#include <nlohmann/json.hpp>
+#include <string>
+#include <sys/resource.h>
+#include <unistd.h>
+#include <vector>
+
+// namespace xyh
+namespace xyh {
+
+// namespace startup
+namespace startup {
+
+namespace {
+
+// the static initialization of the executable is taken as its start
+const auto executable_start = std::chrono::steady_clock::now();
+
+/**
+ * @brief Resident memory of the process in MB, read from `/proc/self/statm`.
+ */
+double resident_memory() {
+    std::ifstream statm("/proc/self/statm");
+    long size = 0;
+    long resident = 0;
+    statm >> size >> resident;
+    return resident * static_cast<double>(sysconf(_SC_PAGESIZE)) /
+           (1024.0 * 1024.0);
+}
+
+/**
+ * @brief Peak resident memory of the process in MB.
+ */
+double peak_resident_memory() {
+    rusage usage;
+    getrusage(RUSAGE_SELF, &usage);
+    // ru_maxrss is given in kilobytes on Linux
+    return usage.ru_maxrss / 1024.0;
+}
+
+double seconds(const std::chrono::steady_clock::duration &duration) {
+    return std::chrono::duration<double>(duration).count();
+}
+
+bool ends_with(const std::string &value, const std::string &suffix) {
+    return value.size() >= suffix.size() &&
+           value.compare(value.size() - suffix.size(), suffix.size(), suffix) ==
+               0;
+}
+
+/**
+ * @brief Path of the report file. The path is taken from the environment
+ * variable `XYH_STARTUP_REPORT`, if it is set, and is placed next to the
+ * output file of the executable otherwise, e.g. `output.startup_report.json`
+ * for `output.root`. The output file is the first argument of the
+ * executable, which is read from `/proc/self/cmdline`, as the producers have
+ * no access to the arguments of the main function.
+ *
+ * @return The path, or an empty string if the output file is unknown.
+ */
+std::string report_path() {
+    const char *env_path = std::getenv("XYH_STARTUP_REPORT");
+    if (env_path != nullptr) {
+        return env_path;
+    }
+    std::ifstream cmdline("/proc/self/cmdline");
+    std::string executable;
+    std::string output;
+    std::getline(cmdline, executable, '\0');
+    std::getline(cmdline, output, '\0');
+    if (output.empty()) {
+        return "";
+    }
+    if (ends_with(output, ".root")) {
+        output.erase(output.size() - std::string(".root").size());
+    }
+    return output + ".startup_report.json";
+}
+
+} // namespace
+
+Report &Report::get() {
+    static Report report;
+    return report;
+}
+
+Report::Report()
+    : start_(executable_start), phase_start_(executable_start),
+      last_end_(executable_start), last_rss_(0.0), written_(false) {}
+
+/**
+ * @brief Write the report at the exit of the executable, if no event has
+ * been processed. Nothing is logged here, as the logger may already be
+ * destroyed.
+ */
+Report::~Report() {
+    try {
+        write();
+    } catch (...) {
+    }
+}
+
+/**
+ * @brief Start the phase of a producer call. The time since the start of the
+ * executable is recorded as `initialization` phase before the first producer.
+ *
+ * @param producer The name of the producer.
+ * @param scope The scope of the producer.
+ * @param outputs The names of the output columns. Shifted outputs are named
+ * `<quantity>__<shift>`.
+ * @param payloads The payload files used by the producer.
+ * @param corrections The names of the corrections in the payload files, one
+ * for each file, or empty if unknown.
+ */
+void Report::begin(const std::string &producer, const std::string &scope,
+                   const std::vector<std::string> &outputs,
+                   const std::vector<std::string> &payloads,
+                   const std::vector<std::string> &corrections) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    const auto now = std::chrono::steady_clock::now();
+    const auto rss = resident_memory();
+    if (phases_.empty()) {
+        Phase initialization;
+        initialization.category = "initialization";
+        initialization.time = seconds(now - start_);
+        initialization.rss_before = 0.0;
+        initialization.rss_after = rss;
+        phases_.push_back(initialization);
+    }
+    std::string shift = "nominal";
+    for (const auto &output : outputs) {
+        const auto separator = output.find("__");
+        if (separator != std::string::npos) {
+            shift = output.substr(separator + 2);
+            break;
+        }
+    }
+    std::vector<std::string> loaded_payloads;
+    for (const auto &payload : payloads) {
+        if (!payload.empty() && loaded_payloads_.insert(payload).second) {
+            loaded_payloads.push_back(payload);
+        }
+    }
+    std::string category = "producer";
+    for (const auto &payload : loaded_payloads) {
+        category = ends_with(payload, ".onnx") ? "onnx" : "payload";
+        if (category == "onnx") {
+            break;
+        }
+    }
+    phases_.push_back({category, producer, scope, shift, outputs, payloads,
+                       corrections, loaded_payloads, 0.0, rss, rss});
+    phase_start_ = now;
+}
+
+/**
+ * @brief End the phase of the producer call started last.
+ */
+void Report::end() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    last_end_ = std::chrono::steady_clock::now();
+    last_rss_ = resident_memory();
+    phases_.back().time = seconds(last_end_ - phase_start_);
+    phases_.back().rss_after = last_rss_;
+}
+
+/**
+ * @brief Record the time between the end of the graph construction and the
+ * first processed event as `jit` phase, which is dominated by the
+ * just-in-time compilation of the graph, and write the report. This
+ * function is called once per executable, see `Write`.
+ */
+void Report::first_event() {
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        Phase jit;
+        jit.category = "jit";
+        jit.time = seconds(std::chrono::steady_clock::now() - last_end_);
+        jit.rss_before = last_rss_;
+        jit.rss_after = resident_memory();
+        phases_.push_back(jit);
+    }
+    if (write()) {
+        Logger::get("startup::Report")->info("Startup report written");
+    } else {
+        Logger::get("startup::Report")->warn("Cannot write startup report");
+    }
+}
+
+/**
+ * @brief Write the report as json file next to the output file of the
+ * executable, see `report_path`. The report contains all phases in the order
+ * of their execution, together with the summed times of the graph
+ * construction per scope and shift and of the payloads.
+ *
+ * @return `true` if the report has been written.
+ */
+bool Report::write() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (written_ || phases_.empty()) {
+        return false;
+    }
+    written_ = true;
+    const auto path = report_path();
+    if (path.empty()) {
+        return false;
+    }
+
+    nlohmann::json report;
+    nlohmann::json phases = nlohmann::json::array();
+    std::map<std::string, std::map<std::string, double>> scope_times;
+    nlohmann::json payloads = nlohmann::json::object();
+    double graph_time = 0.0;
+    for (const auto &phase : phases_) {
+        phases.push_back({{"category", phase.category},
+                          {"producer", phase.producer},
+                          {"scope", phase.scope},
+                          {"shift", phase.shift},
+                          {"outputs", phase.outputs},
+                          {"payloads", phase.payloads},
+                          {"corrections", phase.corrections},
+                          {"loaded_payloads", phase.loaded_payloads},
+                          {"time", phase.time},
+                          {"rss_before_mb", phase.rss_before},
+                          {"rss_after_mb", phase.rss_after}});
+        if (phase.category == "initialization" || phase.category == "jit") {
+            report[phase.category + "_time"] = phase.time;
+            continue;
+        }
+        graph_time += phase.time;
+        scope_times[phase.scope][phase.shift] += phase.time;
+        for (const auto &payload : phase.loaded_payloads) {
+            std::vector<std::string> corrections;
+            for (std::size_t i = 0; i < phase.payloads.size(); ++i) {
+                if (phase.payloads[i] == payload &&
+                    i < phase.corrections.size() &&
+                    !phase.corrections[i].empty()) {
+                    corrections.push_back(phase.corrections[i]);
+                }
+            }
+            // the time of the producer call is attributed to each payload
+            // loaded first by the producer
+            payloads[payload] = {
+                {"producer", phase.producer},
+                {"scope", phase.scope},
+                {"corrections", corrections},
+                {"time", phase.time},
+                {"rss_mb", phase.rss_after - phase.rss_before}};
+        }
+    }
+    report["startup_time"] = seconds(std::chrono::steady_clock::now() - start_);
+    report["graph_construction_time"] = graph_time;
+    report["peak_rss_mb"] = peak_resident_memory();
+    report["scopes"] = scope_times;
+    report["payloads"] = payloads;
+    report["phases"] = phases;
+
+    std::ofstream file(path);
+    file << report.dump(4) << std::endl;
+    return file.good();
+}
+
+/**
+ * @brief Start the startup report phase of a producer call. This function
+ * is called together with `End` around the call of the producer, e.g.
+ * `(xyh::startup::Begin(...), xyh::startup::End(<call>))`, such that the
+ * producer call is evaluated in between.
+ *
+ * @param producer The name of the producer.
+ * @param scope The scope of the producer.
+ * @param outputs The names of the output columns.
+ * @param payloads The payload files used by the producer.
+ * @param corrections The names of the corrections in the payload files, one
+ * for each file, or empty if unknown.
+ */
+void Begin(const std::string &producer, const std::string &scope,
+           const std::vector<std::string> &outputs,
+           const std::vector<std::string> &payloads,
+           const std::vector<std::string> &corrections) {
+    Report::get().begin(producer, scope, outputs, payloads, corrections);
+}
+
+/**
+ * @brief End the startup report phase of the producer call started last.
+ *
+ * @param df The dataframe returned by the producer call.
+ * @return The unchanged dataframe.
+ */
+ROOT::RDF::RNode End(ROOT::RDF::RNode df) {
+    Report::get().end();
+    return df;
+}
+
+/**
+ * @brief Write the startup report when the first event is processed. The
+ * filter passes all events, it is added at the end of the producers of each
+ * scope, and the report is written only once per executable.
+ *
+ * @param df The input dataframe.
+ * @return A dataframe with the filter applied.
+ */
+ROOT::RDF::RNode Write(ROOT::RDF::RNode df) {
+    // construct the report before the event loop, which is started by
+    // several threads
+    auto &report = Report::get();
+    return df.Filter(
+        [&report]() {
+            std::call_once(report.first_event_flag(),
+                           [&report]() { report.first_event(); });
+            return true;
+        },
+        {});
+}
+
+} // end namespace startup
+
+} // end namespace xyh
+
+#endif // end GUARDSTARTUP_CXX
+#endif // end XYH_PREBUILT_ADDONS
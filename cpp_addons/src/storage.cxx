@@ -0,0 +1,236 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/storage.hxx"
+#else
+#ifndef GUARDSTORAGE_CXX
+#define GUARDSTORAGE_CXX
+
+#include "../include/storage.hxx"
+#include "../../../../include/utility/Logger.hxx"
+#include "ROOT/RDataFrame.hxx"
+#include "ROOT/RVec.hxx"
+#include <algorithm>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+// namespace xyh
+namespace xyh {
+
+// namespace storage
+namespace storage {
+
+// leaf types to which quantities can be cast by a storage policy
+const std::vector<std::string> narrow_types = {"Bool_t",  "Char_t",   "UChar_t",
+                                               "Short_t", "UShort_t", "Int_t",
+                                               "UInt_t",  "Float_t"};
+
+/**
+ * @brief Check whether a column type is a single-precision float or a vector
+ * of single-precision floats.
+ *
+ * @param type The column type as returned by `GetColumnType`.
+ * @param vector Whether a vector type is expected.
+ * @return `true` if the type matches.
+ */
+bool is_float_type(const std::string &type, const bool &vector) {
+    const bool is_vector = type.find("RVec") != std::string::npos;
+    const bool is_float = type.find("float") != std::string::npos ||
+                          type.find("Float_t") != std::string::npos;
+    return is_float && (is_vector == vector);
+}
+
+/**
+ * @brief Check whether a column type is a double-precision float or a vector
+ * of double-precision floats.
+ *
+ * @param type The column type as returned by `GetColumnType`.
+ * @param vector Whether a vector type is expected.
+ * @return `true` if the type matches.
+ */
+bool is_double_type(const std::string &type, const bool &vector) {
+    const bool is_vector = type.find("RVec") != std::string::npos;
+    const bool is_double = type.find("double") != std::string::npos ||
+                           type.find("Double_t") != std::string::npos;
+    return is_double && (is_vector == vector);
+}
+
+/**
+ * @brief Apply storage policies to output quantities right before they are
+ * written.
+ *
+ * The columns of the quantities are redefined in place, so that the policies
+ * must be applied after all producers reading the quantities. Shifted
+ * variants of the quantities (columns named `<quantity>__<shift>`) are
+ * redefined with the same policy. Quantities, which are not defined in the
+ * dataframe, are skipped. The following policies are supported:
+ *
+ * - `mantissa:<bits>`: round the mantissa of float columns or vectors of
+ *   floats to `<bits>` bits, see `reduce_mantissa`. Double columns, e.g. the
+ *   scale factors returned by many CROWN functions, are converted to floats
+ *   before rounding,
+ * - `type:<type>`: cast the values of a column or of a vector column to the
+ *   leaf type `<type>`, which must be one of `Bool_t`, `Char_t`, `UChar_t`,
+ *   `Short_t`, `UShort_t`, `Int_t`, `UInt_t` or `Float_t`.
+ *
+ * @param df The input dataframe.
+ * @param quantities The names of the quantities.
+ * @param policies The storage policies of the quantities, one for each
+ * quantity.
+ * @return A dataframe with the redefined columns.
+ */
+ROOT::RDF::RNode ApplyPolicies(ROOT::RDF::RNode df,
+                               const std::vector<std::string> &quantities,
+                               const std::vector<std::string> &policies) {
+    if (quantities.size() != policies.size()) {
+        Logger::get("storage::ApplyPolicies")
+            ->error("Got {} quantities but {} storage policies",
+                    quantities.size(), policies.size());
+        throw std::invalid_argument(
+            "Number of quantities and storage policies differ");
+    }
+    std::unordered_map<std::string, std::string> policy_map;
+    for (std::size_t i = 0; i < quantities.size(); ++i) {
+        policy_map[quantities[i]] = policies[i];
+    }
+
+    auto redefined_df = df;
+    for (const auto &column : df.GetColumnNames()) {
+        // shifted quantities are named <quantity>__<shift>
+        const auto policy =
+            policy_map.find(column.substr(0, column.find("__")));
+        if (policy == policy_map.end()) {
+            continue;
+        }
+        const auto separator = policy->second.find(':');
+        if (separator == std::string::npos) {
+            throw std::invalid_argument("Invalid storage policy " +
+                                        policy->second);
+        }
+        const auto kind = policy->second.substr(0, separator);
+        const auto value = policy->second.substr(separator + 1);
+        const auto type = df.GetColumnType(column);
+        const bool is_vector = type.find("RVec") != std::string::npos;
+        Logger::get("storage::ApplyPolicies")
+            ->debug("Applying storage policy {} to column {} of type {}",
+                    policy->second, column, type);
+        if (kind == "mantissa") {
+            const int bits = std::stoi(value);
+            if (bits < 1 || bits > 23) {
+                throw std::invalid_argument(
+                    "Number of mantissa bits must be between 1 and 23, got " +
+                    value);
+            }
+            if (is_float_type(type, false)) {
+                redefined_df = redefined_df.Redefine(
+                    column,
+                    [bits](const float &quantity) {
+                        return reduce_mantissa(quantity, bits);
+                    },
+                    {column});
+            } else if (is_float_type(type, true)) {
+                redefined_df = redefined_df.Redefine(
+                    column,
+                    [bits](const ROOT::RVec<float> &quantity) {
+                        return ROOT::VecOps::Map(quantity, [bits](float x) {
+                            return reduce_mantissa(x, bits);
+                        });
+                    },
+                    {column});
+            } else if (is_double_type(type, false)) {
+                redefined_df = redefined_df.Redefine(
+                    column,
+                    [bits](const double &quantity) {
+                        return reduce_mantissa(static_cast<float>(quantity),
+                                               bits);
+                    },
+                    {column});
+            } else if (is_double_type(type, true)) {
+                redefined_df = redefined_df.Redefine(
+                    column,
+                    [bits](const ROOT::RVec<double> &quantity) {
+                        return ROOT::VecOps::Map(quantity, [bits](double x) {
+                            return reduce_mantissa(static_cast<float>(x), bits);
+                        });
+                    },
+                    {column});
+            } else {
+                Logger::get("storage::ApplyPolicies")
+                    ->error(
+                        "Cannot reduce the mantissa of column {} of type {}",
+                        column, type);
+                throw std::invalid_argument("Mantissa reduction is only "
+                                            "supported for floating-point "
+                                            "columns");
+            }
+        } else if (kind == "type") {
+            if (std::find(narrow_types.begin(), narrow_types.end(), value) ==
+                narrow_types.end()) {
+                throw std::invalid_argument("Unsupported storage type " +
+                                            value);
+            }
+            // the cast is jitted, as the types of the quantities are only
+            // known at runtime
+            const auto expression =
+                is_vector ? "ROOT::RVec<" + value + ">(" + column +
+                                ".begin(), " + column + ".end())"
+                          : "static_cast<" + value + ">(" + column + ")";
+            redefined_df = redefined_df.Redefine(column, expression);
+        } else {
+            throw std::invalid_argument("Unknown storage policy " +
+                                        policy->second);
+        }
+    }
+    return redefined_df;
+}
+
+/**
+ * @brief Pack boolean flags into a single integer word.
+ *
+ * Bit `i` of the word is set if the `i`-th flag is non-zero. The type of the
+ * word is the smallest unsigned integer type holding all flags, i.e.
+ * `UChar_t` for up to 8 flags, `UShort_t` for up to 16 flags, `UInt_t` for up
+ * to 32 flags and `ULong64_t` for up to 64 flags.
+ *
+ * @param df The input dataframe.
+ * @param outputname The name of the new column containing the packed flags.
+ * @param flags The names of the flag columns, in the order of the bits.
+ * @return A dataframe with the new column.
+ */
+ROOT::RDF::RNode PackFlags(ROOT::RDF::RNode df, const std::string &outputname,
+                           const std::vector<std::string> &flags) {
+    std::string word_type;
+    if (flags.size() <= 8) {
+        word_type = "UChar_t";
+    } else if (flags.size() <= 16) {
+        word_type = "UShort_t";
+    } else if (flags.size() <= 32) {
+        word_type = "UInt_t";
+    } else if (flags.size() <= 64) {
+        word_type = "ULong64_t";
+    } else {
+        Logger::get("storage::PackFlags")
+            ->error("Cannot pack {} flags into {}", flags.size(), outputname);
+        throw std::invalid_argument("At most 64 flags can be packed");
+    }
+    // the flags have different types (bool or int), hence the expression is
+    // jitted
+    std::string expression = "static_cast<" + word_type + ">(0";
+    for (std::size_t i = 0; i < flags.size(); ++i) {
+        Logger::get("storage::PackFlags")
+            ->debug("Packing flag {} into bit {} of {}", flags[i], i,
+                    outputname);
+        expression += " | (static_cast<ULong64_t>(" + flags[i] + " != 0) << " +
+                      std::to_string(i) + ")";
+    }
+    expression += ")";
+    return df.Define(outputname, expression);
+}
+
+} // end namespace storage
+
+} // end namespace xyh
+
+#endif // end GUARDSTORAGE_CXX
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,14 +1,24 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/taus.hxx"
+#else
 #ifndef GUARD_TAUSEXT_CXX
 #define GUARD_TAUSEXT_CXX
 
+#include "../include/taus.hxx"
 #include "../include/defaults.hxx"
 #include "../include/utility/CorrectionManager.hxx"
 #include "../include/utility/Logger.hxx"
 #include "../include/utility/utility.hxx"
 #include "ROOT/RDataFrame.hxx"
 #include "correction.h"
+#include <algorithm>
+#include <cmath>
 #include <stdexcept>
+#include <string>
 #include <unordered_map>
+#include <vector>
 
 namespace physicsobject {
 
@@ -129,4 +139,250 @@ Id_vsJet(ROOT::RDF::RNode df,
 
 } // namespace physicsobject
 
-#endif
\ No newline at end of file
+// namespace xyh
+namespace xyh {
+
+// namespace tau
+namespace tau {
+
+/**
+ * @brief Parse the name of a category of hadronic taus with a separate energy
+ * scale variation.
+ *
+ * @param name The name of the category.
+ * @return The category.
+ */
+EnergyScaleCategory parse_es_category(const std::string &name) {
+    if (name == "dm0") {
+        return EnergyScaleCategory::dm0;
+    } else if (name == "dm1") {
+        return EnergyScaleCategory::dm1;
+    } else if (name == "dm10") {
+        return EnergyScaleCategory::dm10;
+    } else if (name == "dm11") {
+        return EnergyScaleCategory::dm11;
+    } else if (name == "efake_dm0_barrel") {
+        return EnergyScaleCategory::efake_dm0_barrel;
+    } else if (name == "efake_dm1_barrel") {
+        return EnergyScaleCategory::efake_dm1_barrel;
+    } else if (name == "efake_dm0_endcap") {
+        return EnergyScaleCategory::efake_dm0_endcap;
+    } else if (name == "efake_dm1_endcap") {
+        return EnergyScaleCategory::efake_dm1_endcap;
+    } else if (name == "mufake") {
+        return EnergyScaleCategory::mufake;
+    }
+    Logger::get("tau::PtCorrectionVariationsMC")
+        ->error("Unknown tau energy scale category {}", name);
+    throw std::invalid_argument("Unknown tau energy scale category " + name);
+}
+
+/**
+ * @brief Get the energy scale category of a hadronic tau, following the
+ * categories of `physicsobject::tau::PtCorrectionMC`: genuine taus per decay
+ * mode, electrons faking taus in decay modes 0 and 1 in the barrel
+ * (\f$|\eta| \leq 1.5\f$) and endcap (\f$1.5 < |\eta| \leq 2.5\f$) and
+ * muons faking taus.
+ *
+ * @param eta The pseudorapidity of the tau.
+ * @param decay_mode The decay mode of the tau.
+ * @param gen_match The generator-level match of the tau (1=prompt e, 2=prompt
+ * mu, 3=tau->e, 4=tau->mu, 5=had. tau, 0=unmatched).
+ * @return The category, `EnergyScaleCategory::none` for taus without energy
+ * scale correction.
+ */
+EnergyScaleCategory es_category(const float &eta, const int &decay_mode,
+                                const int &gen_match) {
+    if (gen_match == 5) {
+        switch (decay_mode) {
+        case 0:
+            return EnergyScaleCategory::dm0;
+        case 1:
+            return EnergyScaleCategory::dm1;
+        case 10:
+            return EnergyScaleCategory::dm10;
+        case 11:
+            return EnergyScaleCategory::dm11;
+        }
+    } else if (gen_match == 1 || gen_match == 3) {
+        const bool barrel = std::abs(eta) <= 1.5;
+        const bool endcap = std::abs(eta) > 1.5 && std::abs(eta) <= 2.5;
+        if (decay_mode == 0 && barrel) {
+            return EnergyScaleCategory::efake_dm0_barrel;
+        } else if (decay_mode == 1 && barrel) {
+            return EnergyScaleCategory::efake_dm1_barrel;
+        } else if (decay_mode == 0 && endcap) {
+            return EnergyScaleCategory::efake_dm0_endcap;
+        } else if (decay_mode == 1 && endcap) {
+            return EnergyScaleCategory::efake_dm1_endcap;
+        }
+    } else if (gen_match == 2 || gen_match == 4) {
+        return EnergyScaleCategory::mufake;
+    }
+    return EnergyScaleCategory::none;
+}
+
+/**
+ * @brief Evaluate all energy scale variations of hadronic taus in one loop
+ * over the taus, instead of rerunning the full energy scale correction in one
+ * systematic shift per variation.
+ *
+ * Each variation only affects the taus of one category (see `es_category`),
+ * e.g. genuine taus with decay mode 0 or electrons faking taus in the barrel.
+ * The category of each tau is determined once. For each variation, the
+ * corrected transverse momentum is only evaluated for taus in the category of
+ * the variation, all other taus keep their nominal corrected transverse
+ * momentum from the column `pt_corrected`. Hence, every tau requires at most
+ * two additional lookups of the correction (up and down) for all variations.
+ *
+ * The correction is evaluated with the inputs transverse momentum, absolute
+ * pseudorapidity, decay mode, generator-level match, ID algorithm, the
+ * working points `wps` (empty for correction sets without working point
+ * inputs) and the variation.
+ *
+ * @param df The input dataframe.
+ * @param correction_manager The correction manager responsible for loading
+ * the tau energy scale file.
+ * @param outputnames The names of the new columns, one for each variation.
+ * @param pt The name of the column containing the uncorrected transverse
+ * momenta of the taus.
+ * @param eta The name of the column containing the pseudorapidities of the
+ * taus.
+ * @param decay_mode The name of the column containing the decay modes of the
+ * taus.
+ * @param gen_match The name of the column containing the generator-level
+ * matches of the taus.
+ * @param pt_corrected The name of the column containing the nominal corrected
+ * transverse momenta of the taus.
+ * @param es_file The path to the file with the tau energy scale corrections.
+ * @param correction_name The name of the tau energy scale correction.
+ * @param id_algorithm The name of the tau ID algorithm.
+ * @param wps The working points passed to the correction.
+ * @param categories The categories of the affected taus, one for each
+ * variation.
+ * @param variations The variations of the correction, e.g. `up` or `down`,
+ * one for each variation.
+ * @return A dataframe with the new columns.
+ */
+ROOT::RDF::RNode PtCorrectionVariationsMC(
+    ROOT::RDF::RNode df,
+    correctionManager::CorrectionManager &correction_manager,
+    const std::vector<std::string> &outputnames, const std::string &pt,
+    const std::string &eta, const std::string &decay_mode,
+    const std::string &gen_match, const std::string &pt_corrected,
+    const std::string &es_file, const std::string &correction_name,
+    const std::string &id_algorithm, const std::vector<std::string> &wps,
+    const std::vector<std::string> &categories,
+    const std::vector<std::string> &variations) {
+    if (outputnames.size() != categories.size() ||
+        outputnames.size() != variations.size()) {
+        Logger::get("tau::PtCorrectionVariationsMC")
+            ->error("Got {} output columns, {} categories and {} variations",
+                    outputnames.size(), categories.size(), variations.size());
+        throw std::invalid_argument(
+            "Number of output columns, categories and variations differ");
+    }
+    std::vector<EnergyScaleCategory> parsed_categories;
+    for (const auto &category : categories) {
+        parsed_categories.push_back(parse_es_category(category));
+    }
+    auto evaluator =
+        correction_manager.loadCorrection(es_file, correction_name);
+
+    // the decay modes and generator-level matches are stored with different
+    // types in the nanoAOD versions, hence they are converted with jitted
+    // expressions
+    const auto table_name = outputnames.front() + "_variations";
+    auto df_converted = df.Define(table_name + "_decay_mode",
+                                  "ROOT::RVec<int>(" + decay_mode +
+                                      ".begin(), " + decay_mode + ".end())")
+                            .Define(table_name + "_gen_match",
+                                    "ROOT::RVec<int>(" + gen_match +
+                                        ".begin(), " + gen_match + ".end())");
+
+    auto variations_func =
+        [evaluator, id_algorithm, wps, parsed_categories, variations](
+            const ROOT::RVec<float> &pts, const ROOT::RVec<float> &etas,
+            const ROOT::RVec<int> &decay_modes,
+            const ROOT::RVec<int> &gen_matches,
+            const ROOT::RVec<float> &pts_corrected) {
+            std::vector<ROOT::RVec<float>> varied_pts(parsed_categories.size(),
+                                                      pts_corrected);
+            for (std::size_t i = 0; i < pts.size(); ++i) {
+                const auto category =
+                    es_category(etas[i], decay_modes[i], gen_matches[i]);
+                if (category == EnergyScaleCategory::none) {
+                    continue;
+                }
+                std::vector<correction::Variable::Type> inputs = {
+                    pts[i], std::abs(etas[i]), decay_modes[i], gen_matches[i],
+                    id_algorithm};
+                inputs.insert(inputs.end(), wps.begin(), wps.end());
+                inputs.push_back(std::string("nom"));
+                for (std::size_t j = 0; j < parsed_categories.size(); ++j) {
+                    if (parsed_categories[j] != category) {
+                        continue;
+                    }
+                    inputs.back() = variations[j];
+                    varied_pts[j][i] = pts[i] * evaluator->evaluate(inputs);
+                }
+            }
+            return varied_pts;
+        };
+
+    auto df_variations =
+        df_converted.Define(table_name, variations_func,
+                            {pt, eta, table_name + "_decay_mode",
+                             table_name + "_gen_match", pt_corrected});
+    for (std::size_t j = 0; j < outputnames.size(); ++j) {
+        df_variations = df_variations.Define(
+            outputnames[j],
+            [j](const std::vector<ROOT::RVec<float>> &varied_pts) {
+                return varied_pts[j];
+            },
+            {table_name});
+    }
+    return df_variations;
+}
+
+/**
+ * @brief Select the nominal or one of the varied collections of a quantity as
+ * a new column. The variations are given by columns named
+ * `<nominal>_<variation>`, e.g. as defined by `PtCorrectionVariationsMC`.
+ *
+ * In systematic shifts, only the parameter `variation` is changed, so that
+ * the shifted quantity is a copy of a precomputed variation.
+ *
+ * @param df The input dataframe.
+ * @param outputname The name of the new column.
+ * @param columns The names of the columns of the nominal collection, followed
+ * by the varied collections.
+ * @param variation The name of the variation, or `nom` for the nominal
+ * collection.
+ * @return A dataframe with the new column.
+ */
+ROOT::RDF::RNode SelectVariation(ROOT::RDF::RNode df,
+                                 const std::string &outputname,
+                                 const std::vector<std::string> &columns,
+                                 const std::string &variation) {
+    const auto column = variation == "nom" ? columns.front()
+                                           : columns.front() + "_" + variation;
+    if (std::find(columns.begin(), columns.end(), column) == columns.end()) {
+        Logger::get("tau::SelectVariation")
+            ->error("Variation {} of {} is not available", variation,
+                    columns.front());
+        throw std::invalid_argument("Unknown variation " + variation);
+    }
+    Logger::get("tau::SelectVariation")
+        ->debug("Selecting {} as {}", column, outputname);
+    return df.Define(outputname,
+                     [](const ROOT::RVec<float> &quantity) { return quantity; },
+                     {column});
+}
+
+} // end namespace tau
+
+} // end namespace xyh
+
+#endif
+#endif // end XYH_PREBUILT_ADDONS
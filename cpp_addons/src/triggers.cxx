@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/triggers.hxx"
+#else
 #ifndef GUARD_TRIGGERSEXT_H
 #define GUARD_TRIGGERSEXT_H
 
@@ -72,4 +77,5 @@ ROOT::RDF::RNode GenerateTriggerFlag(ROOT::RDF::RNode df,
 
 } // namespace trigger
 
-#endif // end GUARD_TRIGGERSEXT_H
\ No newline at end of file
+#endif // end GUARD_TRIGGERSEXT_H
+#endif // end XYH_PREBUILT_ADDONS
@@ -1,3 +1,8 @@
+#ifdef XYH_PREBUILT_ADDONS
+// the definitions are compiled into the prebuilt cpp_addons library, see
+// cpp_addons/lib/CMakeLists.txt
+#include "../include/vetoes.hxx"
+#else
 #ifndef GUARDVETOES_CXX
 #define GUARDVETOES_CXX
 
@@ -345,3 +350,4 @@ jet_vetomap(ROOT::RDF::RNode df,
 } // end namespace xyh
 
 #endif // end GUARDVETOES_CXX
+#endif // end XYH_PREBUILT_ADDONS
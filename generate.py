@@ -1,8 +1,11 @@
-from os import path
+from os import path, environ
 import importlib
+import json
 from code_generation.code_generation import CodeGenerator
 
 from .constants import ERAS, SCOPES
+from .output_profiles import DEFAULT_OUTPUT_PROFILE
+from .shift_analysis import ShiftSurvey, shift_executable_name
 
 
 def run(args):
@@ -49,6 +52,11 @@ def run(args):
     sample_group = args.sample
     era = args.era
     scopes = list(set([scope.lower() for scope in args.scopes]))
+    # the output profile is selected with the XYH_OUTPUT_PROFILE environment
+    # variable, as the arguments are fixed by the CROWN CMake setup
+    output_profile = getattr(args, "output_profile", None) or environ.get(
+        "XYH_OUTPUT_PROFILE", DEFAULT_OUTPUT_PROFILE
+    )
 
     ## load config
     configname = args.config
@@ -56,26 +64,88 @@ def run(args):
         f"analysis_configurations.{analysis_name}.{configname}"
     )
     ## Setting up executable
-    executable = f"{configname}_{sample_group}_{era}.cxx"
+    executable_name = f"{configname}_{sample_group}_{era}"
+    if output_profile != DEFAULT_OUTPUT_PROFILE:
+        executable_name = f"{configname}_{output_profile}_{sample_group}_{era}"
     args.logger.info(f"Generating code for {sample_group}...")
     args.logger.info(f"Configuration used: {config}")
     args.logger.info(f"Era: {era}")
     args.logger.info(f"Shifts: {shifts}")
-    config = config.build_config(
-        era,
-        sample_group,
-        scopes,
-        shifts,
-        available_samples,
-        available_eras,
-        available_scopes,
+    args.logger.info(f"Output profile: {output_profile}")
+    profile_kwargs = {}
+    if output_profile != DEFAULT_OUTPUT_PROFILE:
+        profile_kwargs["output_profile"] = output_profile
+
+    def build_config(executable_shifts, **kwargs):
+        return config.build_config(
+            era,
+            sample_group,
+            scopes,
+            executable_shifts,
+            available_samples,
+            available_eras,
+            available_scopes,
+            **profile_kwargs,
+            **kwargs,
+        )
+
+    # the shifts are split across several executables, if requested with the
+    # XYH_SHIFT_EXECUTABLES environment variable, see shift_analysis.py; the
+    # configuration built with the survey contains the shifts of the first
+    # executable
+    shift_executables = int(environ.get("XYH_SHIFT_EXECUTABLES", "1"))
+    survey = None
+    if shift_executables > 1 and not shifts <= {"none"}:
+        survey = ShiftSurvey(executables=shift_executables)
+    generate_executable(
+        args,
+        build_config(shifts, shift_survey=survey),
+        executable_name,
+        analysis_name,
+        configname,
     )
+    if survey is None or len(survey.partition) <= 1:
+        return
+
+    summary = survey.partition_summary
+    args.logger.info(
+        f"Splitting {sum(len(names) for names in survey.partition)} shifts into {len(survey.partition)} executables"
+    )
+    for index, names in enumerate(survey.partition):
+        summary[index]["executable"] = shift_executable_name(executable_name, index)
+        args.logger.info(
+            f"{summary[index]['executable']}: {len(names)} shifts, cost {summary[index]['cost']}"
+        )
+        if index > 0:
+            generate_executable(
+                args,
+                build_config(set(name.lower() for name in names)),
+                summary[index]["executable"],
+                analysis_name,
+                configname,
+            )
+    # the assignment of the shifts to the executables is needed to read the
+    # shifted quantities from their outputs
+    with open(path.join(args.output, f"{executable_name}_shifts.json"), "w") as f:
+        json.dump(
+            {
+                "executables": summary,
+                "shifts": {
+                    name: entry["executable"] for entry in summary for name in entry["shifts"]
+                },
+            },
+            f,
+            indent=4,
+        )
+
+
+def generate_executable(args, config, executable_name, analysis_name, configname):
     # create a CodeGenerator object
     generator = CodeGenerator(
         main_template_path=args.template,
         sub_template_path=args.subset_template,
         configuration=config,
-        executable_name=f"{configname}_{sample_group}_{era}",
+        executable_name=executable_name,
         analysis_name=analysis_name,
         config_name=configname,
         output_folder=args.output,
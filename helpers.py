@@ -1,9 +1,13 @@
 """
 General helper functions useful for building the configuration.
 """
-from typing import TypeVar 
+import os
+from typing import Iterable, Set, TypeVar
 
-from code_generation.producer import ProducerGroup
+from code_generation.producer import Producer, ProducerGroup
+from code_generation.quantity import Quantity
+
+from .constants import PNN_MODEL_PRECISION, PNNModelPrecisions
 
 T = TypeVar("T")
 
@@ -132,3 +136,106 @@ def era_producer_groups(
         )
 
     return producer_group_dict
+
+
+def get_pnn_model_file(
+    model_file: str,
+    precision: PNNModelPrecisions = PNN_MODEL_PRECISION,
+) -> str:
+    """
+    Return the path to the variant of a PNN model with the requested numerical precision.
+
+    Reduced-precision variants are stored next to the original model with the precision appended
+    to the file stem, e.g. `resolved_mt_best_pnn_EVTID_int8.onnx` for
+    `resolved_mt_best_pnn_EVTID.onnx`. These files are created with
+    `scripts/pnn_quantization.py`. Empty paths (eras without a model) are returned unchanged.
+
+    :param model_file: Path to the original `float32` model
+    :param precision: Requested precision of the model. Defaults to `PNN_MODEL_PRECISION`.
+
+    :return: Path to the model with the requested precision.
+    """
+    if not model_file or precision == PNNModelPrecisions.FLOAT32:
+        return model_file
+    root, ext = os.path.splitext(model_file)
+    return f"{root}_{precision.value}{ext}"
+
+
+def as_list(items) -> list:
+    """
+    Return `items` as list. `None` gives an empty list, single items, e.g. a
+    string or a quantity, a list with one entry.
+    """
+    if items is None:
+        return []
+    if isinstance(items, (str, Quantity)) or not isinstance(items, Iterable):
+        return [items]
+    return list(items)
+
+
+def scoped(items, scope: str | None) -> list:
+    """
+    Entries of a producer attribute, which is either a list or a dictionary
+    of lists per scope. If `scope` is `None`, the entries of all scopes are
+    returned.
+    """
+    if isinstance(items, dict):
+        if scope is None:
+            return [item for scope_items in items.values() for item in as_list(scope_items)]
+        return as_list(items.get(scope))
+    return as_list(items)
+
+
+def subproducers(producer: Producer | ProducerGroup, scope: str | None) -> list:
+    """
+    Direct subproducers of a producer group in `scope`, or of all scopes if
+    `scope` is `None`. Producers have no subproducers.
+    """
+    nested = getattr(producer, "producers", None)
+    if nested is None:
+        nested = getattr(producer, "subproducers", None)
+    return scoped(nested, scope)
+
+
+def all_producers(producer: Producer | ProducerGroup, scope: str | None = None) -> list:
+    """
+    The producer itself and all its subproducers, recursively.
+    """
+    return [producer] + [
+        nested
+        for subproducer in subproducers(producer, scope)
+        for nested in all_producers(subproducer, scope)
+    ]
+
+
+def leaf_producers(producer: Producer | ProducerGroup, scope: str) -> list:
+    """
+    The producers without subproducers in a producer group, recursively, or
+    the producer itself.
+    """
+    nested = subproducers(producer, scope)
+    if not nested:
+        return [producer]
+    return [leaf for subproducer in nested for leaf in leaf_producers(subproducer, scope)]
+
+
+def input_names(producer: Producer | ProducerGroup, scope: str | None = None) -> Set[str]:
+    """
+    Names of the input quantities of a producer in `scope`.
+    """
+    return set(
+        quantity.name
+        for quantity in scoped(getattr(producer, "input", None), scope)
+        if hasattr(quantity, "name")
+    )
+
+
+def output_names(producer: Producer, scope: str) -> Set[str]:
+    """
+    Names of the output quantities of a producer in `scope`.
+    """
+    if hasattr(producer, "get_outputs"):
+        outputs = producer.get_outputs(scope)
+    else:
+        outputs = getattr(producer, "output", None)
+    return set(quantity.name for quantity in as_list(outputs) if hasattr(quantity, "name"))
@@ -18,19 +18,24 @@ from .producers import taus as taus
 from .producers import triggers as triggers
 from .quantities import nanoAOD, nanoAOD_run2
 from .quantities import output as q
-from .tau_triggersetup import add_diTauTriggerSetup
-from .tau_variations import add_tauVariations
+from .tau_triggersetup import add_diTauTriggerSetup, get_trigger_scalefactor_producers
+from .tau_variations import add_tauVariations, tes_shift_config
 from .jet_variations import add_jetVariations
 from .tau_embedding_settings import setup_embedding
 from .btag_variations import add_btagVariations
-# from .jec_data import add_jetCorrectionData
 from code_generation.configuration import Configuration
 from code_generation.modifiers import EraModifier, SampleModifier
 from code_generation.rules import AppendProducer, RemoveProducer, ReplaceProducer
 from code_generation.systematics import SystematicShift, SystematicShiftByQuantity
 
-from .constants import ERAS_RUN2, ERAS_RUN3, CORRECTIONLIB_CAMPAIGNS, ET_SCOPES, MT_SCOPES, TT_SCOPES, EE_SCOPES, MM_SCOPES, EM_SCOPES, SL_SCOPES, FH_SCOPES, HAD_TAU_SCOPES, ELECTRON_SCOPES, MUON_SCOPES, SCOPES, GLOBAL_SCOPES
+from .constants import ERAS_RUN2, ERAS_RUN3, CORRECTIONLIB_CAMPAIGNS, REDUCED_OUTPUT_PRECISION, TAU_ES_VARIATIONS_IN_ONE_PASS, LHE_SCALE_VARIATIONS_IN_ONE_PASS, TRIGGER_SFS_IN_ONE_PASS, USE_CORRECTION_CACHE, PRUNE_IRRELEVANT_SHIFTS, ET_SCOPES, MT_SCOPES, TT_SCOPES, EE_SCOPES, MM_SCOPES, EM_SCOPES, SL_SCOPES, FH_SCOPES, HAD_TAU_SCOPES, ELECTRON_SCOPES, MUON_SCOPES, SCOPES, GLOBAL_SCOPES
 from .helpers import get_for_era
+from .output_storage import add_storage_policies, mantissa_bits, FLOAT16
+from .configuration_hooks import HookedConfiguration
+from .output_profiles import select_output_profile, DEFAULT_OUTPUT_PROFILE
+from .correction_cache import use_correction_cache
+from .startup_report import attach_startup_report
+from .shift_analysis import ShiftSurvey
 
 
 def add_noise_filters_config(configuration: Configuration):
@@ -833,6 +838,9 @@ def add_hadronic_tau_config(configuration: Configuration, era: str):
             "tau_elefake_es_DM1_barrel": "nom",
             "tau_elefake_es_DM1_endcap": "nom",
             "tau_mufake_es": "nom",
+            # variation selected from the energy scale variations evaluated in one pass, see
+            # TAU_ES_VARIATIONS_IN_ONE_PASS
+            "tau_ES_variation": "nom",
         },
     )
 
@@ -1070,6 +1078,7 @@ def add_boosted_hadronic_tau_config(configuration: Configuration):
             "boostedtau_ES_shift_DM1": "nom",
             "boostedtau_ES_shift_DM10": "nom",
             "boostedtau_ES_shift_DM11": "nom",
+            "boostedtau_ES_variation": "nom",
         },
     )
 
@@ -1269,6 +1278,38 @@ def add_ak4jet_config(configuration: Configuration):
         "2024": "Summer24Prompt24_V2",
     }
 
+    # JES tags for data given as sorted tuples of the first run of a run period
+    # and its tag. All periods of an era are processed by a single producer,
+    # which selects the tag from the run number of the event. In Run 3, the
+    # run dependence is included in the L2L3Residual corrections.
+    jes_run_periods_data = {
+        "2016preVFP": [
+            (0, "Summer19UL16APV_RunBCD_V7"),
+            (276831, "Summer19UL16APV_RunEF_V7"),
+        ],
+        "2016postVFP": [
+            (0, "Summer19UL16_RunFGH_V7"),
+        ],
+        "2017": [
+            (0, "Summer19UL17_RunB_V5"),
+            (299337, "Summer19UL17_RunC_V5"),
+            (302030, "Summer19UL17_RunD_V5"),
+            (303435, "Summer19UL17_RunE_V5"),
+            (304911, "Summer19UL17_RunF_V5"),
+        ],
+        "2018": [
+            (0, "Summer19UL18_RunA_V5"),
+            (316998, "Summer19UL18_RunB_V5"),
+            (319313, "Summer19UL18_RunC_V5"),
+            (320394, "Summer19UL18_RunD_V5"),
+        ],
+        "2022preEE": [(0, "Summer22_22Sep2023_V3")],
+        "2022postEE": [(0, "Summer22EE_22Sep2023_V3")],
+        "2023preBPix": [(0, common_jes_tags["2023preBPix"])],
+        "2023postBPix": [(0, common_jes_tags["2023postBPix"])],
+        "2024": [(0, common_jes_tags["2024"])],
+    }
+
     # AK4 jet energy calibration and resolution corrections
     # JEC recommendations: https://twiki.cern.ch/twiki/bin/view/CMS/JECDataMC
     configuration.add_config_parameters(
@@ -1305,12 +1346,16 @@ def add_ak4jet_config(configuration: Configuration):
                     "2024": "Summer23BPixPrompt23_RunD_JRV1",  # copied from 2023postBPix
                 }
             ),
-            "ak4jet_jes_tag_data": EraModifier(
+            "ak4jet_jes_tags_data": EraModifier(
                 {
-                    **common_jes_tags,
-                    "2018": "Summer19UL18_V5",
-                    "2022preEE": "Summer22_22Sep2023_V3",
-                    "2022postEE": "Summer22EE_22Sep2023_V3",
+                    _era: ", ".join(f'"{tag}"' for _, tag in _run_periods)
+                    for _era, _run_periods in jes_run_periods_data.items()
+                },
+            ),
+            "ak4jet_jes_first_runs_data": EraModifier(
+                {
+                    _era: ", ".join(str(first_run) for first_run, _ in _run_periods)
+                    for _era, _run_periods in jes_run_periods_data.items()
                 },
             ),
             "ak4jet_jes_tag_mc": EraModifier(
@@ -1797,6 +1842,9 @@ def add_met_corrections_config(configuration: Configuration):
             "t1jet_min_pt": 15.0,
             "t1jet_max_abs_eta": 5.2,
             "t1jet_max_em_ef": 0.9,
+            # compare the incrementally updated Type-I MET in jet energy
+            # shifts to the full recalculation (slow, for validation only)
+            "t1met_validate_incremental": False,
             "propagate_jets_to_met": SampleModifier(
                 {
                     "data": False,
@@ -1941,9 +1989,11 @@ def build_config(
     available_sample_types: List[str],
     available_eras: List[str],
     available_scopes: List[str],
+    output_profile: str = DEFAULT_OUTPUT_PROFILE,
+    shift_survey: ShiftSurvey | None = None,
 ):
 
-    configuration = Configuration(
+    configuration = HookedConfiguration(
         era,
         sample,
         scopes,
@@ -1953,6 +2003,27 @@ def build_config(
         available_scopes,
     )
 
+    # Only the outputs selected by the output profile are written, see
+    # output_profiles.py
+    profile = select_output_profile(configuration, output_profile, sample, shifts)
+
+    # The shifts are recorded and only added after all producers and outputs,
+    # so that shifts without an effect on the written quantities are pruned.
+    # The survey is passed in, if the shifts are split across several
+    # executables, see shift_analysis.py
+    if shift_survey is None:
+        shift_survey = ShiftSurvey()
+    shift_survey.attach(configuration, profile)
+
+    # Correctionlib payloads are loaded from the cache entries recorded in the
+    # manifest of the correction cache, see correction_cache.py
+    if USE_CORRECTION_CACHE:
+        use_correction_cache(configuration)
+
+    # The executables report the time and memory spent in the phases of their
+    # startup, see startup_report.py
+    attach_startup_report(configuration, GLOBAL_SCOPES + SCOPES)
+
     # Set sample flags manually
     # The configuration of is_data and is_embedding is set here for better readability, although
     # it has already been set in the Configuration class.
@@ -2285,6 +2356,28 @@ def build_config(
         era,
     )
 
+    # Hadronic tau energy correction
+    # With TAU_ES_VARIATIONS_IN_ONE_PASS, all energy scale variations are evaluated together with
+    # the nominal correction, and the energy scale shifts only rerun the selection of the varied
+    # tau pt.
+    if TAU_ES_VARIATIONS_IN_ONE_PASS:
+        tau_energy_correction_producer = taus.TauEnergyCorrectionVariationsMC
+        tau_pt_correction_producer = taus.TauPtCorrectionSelectionMC
+    else:
+        tau_energy_correction_producer = taus.TauEnergyCorrectionMC
+        tau_pt_correction_producer = taus.TauPtCorrectionMC
+
+    # Trigger scale factors
+    # With TRIGGER_SFS_IN_ONE_PASS, the scale factors of all triggers of a leg are evaluated in one
+    # producer instead of one producer per trigger. The producers write the same columns.
+    if TRIGGER_SFS_IN_ONE_PASS:
+        trigger_sf_producers = get_trigger_scalefactor_producers(era)
+    else:
+        trigger_sf_producers = {}
+    SingleEleTriggerSF = trigger_sf_producers.get("SingleEleTriggerSF", scalefactors.SingleEleTriggerSF)
+    SingleMuTriggerSF = trigger_sf_producers.get("SingleMuTriggerSF", scalefactors.SingleMuTriggerSF)
+    TauTauTriggerSF = trigger_sf_producers.get("TauTauTriggerSF", scalefactors.TauTauTriggerSF)
+
     # Jet ID producer
     # For a detailed description, see producers/jets.py
     JetID = get_for_era(jets.JetID, era)
@@ -2454,6 +2547,7 @@ def build_config(
             event.Lumi,
             event.npartons,
             event.MetFilter,
+            event.PUweightVariations,
             event.PUweights,
             event.LHE_Scale_weight,
             electrons.BaseElectrons,
@@ -2462,6 +2556,7 @@ def build_config(
             event.DiLeptonVeto,
             MetGlobal,
             JetID,
+            genparticles.GenPairForGenMatching,
         ]
         + prefire_weight_producers
         + base_jet_selection_producers
@@ -2514,7 +2609,7 @@ def build_config(
         HAD_TAU_SCOPES,
         [
             scalefactors.TauIDSF,
-            taus.TauEnergyCorrectionMC,
+            tau_energy_correction_producer,
         ]
     )
 
@@ -2538,7 +2633,7 @@ def build_config(
             scalefactors.EleID_SF,
             triggers.SingleEleTriggerFlags,
             triggers.DoubleEleTauTriggerFlags,
-            scalefactors.SingleEleTriggerSF,
+            SingleEleTriggerSF,
             # scalefactors.DoubleEleTauTriggerSF,  # TODO fix for Run 2, SF seem to not be available
             # TODO rework trigger setup before enabling this
             # triggers.ETGenerateCrossTriggerFlags,
@@ -2566,7 +2661,7 @@ def build_config(
             triggers.SingleMuTriggerFlags,
             triggers.DoubleMuTauTriggerFlags,
             scalefactors.MuonIDIso_SF,
-            scalefactors.SingleMuTriggerSF,
+            SingleMuTriggerSF,
             # scalefactors.DoubleMuTauTriggerSF,  # TODO fix for Run 2, SF seem to not be available
             # TODO rework trigger setup before enabling this
             # triggers.GenerateSingleTrailingTauTriggerFlags,
@@ -2588,7 +2683,7 @@ def build_config(
             pairquantities.TTDiTauPairQuantities,
             genparticles.TTGenDiTauPairQuantities,
             triggers.TauTauTriggerFlags,
-            scalefactors.TauTauTriggerSF,
+            TauTauTriggerSF,
             # TODO rework trigger setup before enabling this
             # triggers.GenerateSingleTrailingTauTriggerFlags,
             # triggers.GenerateSingleLeadingTauTriggerFlags,
@@ -2614,7 +2709,7 @@ def build_config(
             genparticles.ElElGenPairQuantities,
             scalefactors.EleID_SF,
             triggers.SingleEleTriggerFlags,
-            scalefactors.SingleEleTriggerSF,
+            SingleEleTriggerSF,
         ]
     )
 
@@ -2636,7 +2731,7 @@ def build_config(
             genparticles.MuMuGenPairQuantities,
             scalefactors.MuonIDIso_SF,
             triggers.SingleMuTriggerFlags,
-            scalefactors.SingleMuTriggerSF,
+            SingleMuTriggerSF,
         ],
     )
 
@@ -2662,8 +2757,8 @@ def build_config(
             scalefactors.MuonIDIso_SF,
             triggers.SingleEleTriggerFlags,
             triggers.SingleMuTriggerFlags,
-            scalefactors.SingleEleTriggerSF,
-            scalefactors.SingleMuTriggerSF,
+            SingleEleTriggerSF,
+            SingleMuTriggerSF,
         ],
     )
 
@@ -2746,7 +2841,7 @@ def build_config(
         ELECTRON_SCOPES,
         RemoveProducer(
             producers=[
-                scalefactors.SingleEleTriggerSF,
+                SingleEleTriggerSF,
             ],
             samples=["data", "embedding", "embedding_mc"],
         ),
@@ -2768,7 +2863,7 @@ def build_config(
         MUON_SCOPES,
         RemoveProducer(
             producers=[
-                scalefactors.SingleMuTriggerSF,
+                SingleMuTriggerSF,
             ],
             samples=["data", "embedding", "embedding_mc"],
         )
@@ -2800,7 +2895,7 @@ def build_config(
         TT_SCOPES,
         RemoveProducer(
             producers=[
-                scalefactors.TauTauTriggerSF,
+                TauTauTriggerSF,
             ],
             samples=["data", "embedding", "embedding_mc"],
         ),
@@ -2854,7 +2949,7 @@ def build_config(
     configuration.add_modification_rule(
         GLOBAL_SCOPES,
         RemoveProducer(
-            producers=[event.PUweights],
+            producers=[event.PUweightVariations, event.PUweights],
             samples=["data", "embedding", "embedding_mc"],
         ),
     )
@@ -2916,7 +3011,7 @@ def build_config(
     configuration.add_modification_rule(
         HAD_TAU_SCOPES,
         ReplaceProducer(
-            producers=[taus.TauEnergyCorrectionMC, taus.TauEnergyCorrectionData],
+            producers=[tau_energy_correction_producer, taus.TauEnergyCorrectionData],
             samples=["data"],
         ),
     )
@@ -2953,13 +3048,31 @@ def build_config(
 
     # for whatever reason, the nmssm samples have one less entry of the weights and therefore need
     # special treatment
-    configuration.add_modification_rule(
-        GLOBAL_SCOPES,
-        ReplaceProducer(
-            producers=[event.LHE_Scale_weight, event.NMSSM_LHE_Scale_weight],
-            samples=["nmssm_Ybb", "nmssm_Ytautau"],
-        ),
-    )
+    # With LHE_SCALE_VARIATIONS_IN_ONE_PASS, the scale variations are extracted together with the
+    # nominal weight for the samples with muR and muF shifts.
+    if LHE_SCALE_VARIATIONS_IN_ONE_PASS:
+        configuration.add_modification_rule(
+            GLOBAL_SCOPES,
+            ReplaceProducer(
+                producers=[event.LHE_Scale_weight, event.LHEScaleWeightVariations],
+                samples=["ggh", "qqh"],
+            ),
+        )
+        configuration.add_modification_rule(
+            GLOBAL_SCOPES,
+            ReplaceProducer(
+                producers=[event.LHE_Scale_weight, event.NMSSMLHEScaleWeightVariations],
+                samples=["nmssm_Ybb", "nmssm_Ytautau"],
+            ),
+        )
+    else:
+        configuration.add_modification_rule(
+            GLOBAL_SCOPES,
+            ReplaceProducer(
+                producers=[event.LHE_Scale_weight, event.NMSSM_LHE_Scale_weight],
+                samples=["nmssm_Ybb", "nmssm_Ytautau"],
+            ),
+        )
 
     # Remove the generator-level tau matching producers from data samples
     configuration.add_modification_rule(
@@ -2971,6 +3084,15 @@ def build_config(
             samples=["data"],
         ),
     )
+    configuration.add_modification_rule(
+        GLOBAL_SCOPES,
+        RemoveProducer(
+            producers=[
+                genparticles.GenPairForGenMatching,
+            ],
+            samples=["data"],
+        ),
+    )
 
     # Remove the generator-level b jet pair quantities from data and embedding samples
     configuration.add_modification_rule(
@@ -3309,7 +3431,7 @@ def build_config(
             pairquantities.VsEleTauIDFlag_2.output_group,
             pairquantities.VsMuTauIDFlag_2.output_group,
             triggers.SingleMuTriggerFlags.output_group,
-            scalefactors.SingleMuTriggerSF.output_group,
+            *SingleMuTriggerSF.get_outputs("mt"),
             # triggers.DoubleMuTauTriggerFlags.output_group,  # TODO fix for Run 2, SF seem to not be available
             # [
             #     p
@@ -3336,7 +3458,7 @@ def build_config(
             pairquantities.VsEleTauIDFlag_2.output_group,
             pairquantities.VsMuTauIDFlag_2.output_group,
             triggers.SingleEleTriggerFlags.output_group,
-            scalefactors.SingleEleTriggerSF.output_group,
+            *SingleEleTriggerSF.get_outputs("et"),
             # triggers.DoubleEleTauTriggerFlags.output_group,
             # [
             #     p
@@ -3366,7 +3488,7 @@ def build_config(
             pairquantities.VsMuTauIDFlag_2.output_group,
             triggers.TauTauTriggerFlags.output_group,
             ] + [
-                o for o in scalefactors.TauTauTriggerSF.get_outputs("tt")
+                o for o in TauTauTriggerSF.get_outputs("tt")
             ] + [
                 producer.output_group
                 for producer in tautaujet_trigger_producers
@@ -3402,7 +3524,7 @@ def build_config(
             q.electron_veto_flag,
             q.muon_veto_flag,
         ]
-        + scalefactors.SingleMuTriggerSF.get_outputs("mm"),
+        + SingleMuTriggerSF.get_outputs("mm"),
     )
 
     # Outputs for the ee scope
@@ -3413,7 +3535,7 @@ def build_config(
             triggers.SingleEleTriggerFlags.output_group,
             q.electron_veto_flag,
             q.muon_veto_flag,
-        ] + scalefactors.SingleEleTriggerSF.get_outputs("ee"),
+        ] + SingleEleTriggerSF.get_outputs("ee"),
     )
 
     # Outputs for the em scope
@@ -3427,8 +3549,8 @@ def build_config(
             q.electron_veto_flag,
             q.muon_veto_flag,
             q.dilepton_veto,
-        ] + scalefactors.SingleEleTriggerSF.get_outputs("em")
-        + scalefactors.SingleMuTriggerSF.get_outputs("em"),
+        ] + SingleEleTriggerSF.get_outputs("em")
+        + SingleMuTriggerSF.get_outputs("em"),
     )
 
     # TODO re-include
@@ -3464,8 +3586,13 @@ def build_config(
     # LHE Scale Weight variations
     # up is muR=2.0, muF=2.0
     # down is muR=0.5, muF=0.5
+    # With LHE_SCALE_VARIATIONS_IN_ONE_PASS, the variations are written as additional columns
+    # named like the outputs of the shifts, e.g. lhe_scale_weight__muRWeightUp.
     #########################
-    if sample in ["ggh", "qqh"]:
+    if LHE_SCALE_VARIATIONS_IN_ONE_PASS:
+        if sample in ["ggh", "qqh", "nmssm_Ybb", "nmssm_Ytautau"]:
+            configuration.add_outputs(SCOPES, event.LHE_SCALE_WEIGHT_VARIATIONS[1:])
+    elif sample in ["ggh", "qqh"]:
         configuration.add_shift(
             SystematicShift(
                 "muRWeightUp",
@@ -3510,7 +3637,7 @@ def build_config(
                 producers={"global": [event.LHE_Scale_weight]},
             )
         )
-    if sample in ["nmssm_Ybb", "nmssm_Ytautau"]:
+    elif sample in ["nmssm_Ybb", "nmssm_Ytautau"]:
         configuration.add_shift(
             SystematicShift(
                 "muRWeightUp",
@@ -3564,11 +3691,11 @@ def build_config(
             SystematicShift(
                 name="tauMuFakeEsDown",
                 shift_config={
-                    "mt": {
-                        "tau_mufake_es": "down",
-                    }
+                    "mt": tes_shift_config(
+                        "tauMuFakeEsDown", "tau_mufake_es", "down"
+                    )
                 },
-                producers={"mt": [taus.TauPtCorrectionMC]},
+                producers={"mt": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3576,11 +3703,11 @@ def build_config(
             SystematicShift(
                 name="tauMuFakeEsUp",
                 shift_config={
-                    "mt": {
-                        "tau_mufake_es": "up",
-                    }
+                    "mt": tes_shift_config(
+                        "tauMuFakeEsUp", "tau_mufake_es", "up"
+                    )
                 },
-                producers={"mt": [taus.TauPtCorrectionMC]},
+                producers={"mt": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3588,11 +3715,11 @@ def build_config(
             SystematicShift(
                 name="tauEleFakeEs1prongBarrelDown",
                 shift_config={
-                    "et": {
-                        "tau_elefake_es_DM0_barrel": "down",
-                    }
+                    "et": tes_shift_config(
+                        "tauEleFakeEs1prongBarrelDown", "tau_elefake_es_DM0_barrel", "down"
+                    )
                 },
-                producers={"et": [taus.TauPtCorrectionMC]},
+                producers={"et": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3600,11 +3727,11 @@ def build_config(
             SystematicShift(
                 name="tauEleFakeEs1prongBarrelUp",
                 shift_config={
-                    "et": {
-                        "tau_elefake_es_DM0_barrel": "up",
-                    }
+                    "et": tes_shift_config(
+                        "tauEleFakeEs1prongBarrelUp", "tau_elefake_es_DM0_barrel", "up"
+                    )
                 },
-                producers={"et": [taus.TauPtCorrectionMC]},
+                producers={"et": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3612,11 +3739,11 @@ def build_config(
             SystematicShift(
                 name="tauEleFakeEs1prongEndcapDown",
                 shift_config={
-                    "et": {
-                        "tau_elefake_es_DM0_endcap": "down",
-                    }
+                    "et": tes_shift_config(
+                        "tauEleFakeEs1prongEndcapDown", "tau_elefake_es_DM0_endcap", "down"
+                    )
                 },
-                producers={"et": [taus.TauPtCorrectionMC]},
+                producers={"et": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3624,11 +3751,11 @@ def build_config(
             SystematicShift(
                 name="tauEleFakeEs1prongEndcapUp",
                 shift_config={
-                    "et": {
-                        "tau_elefake_es_DM0_endcap": "up",
-                    }
+                    "et": tes_shift_config(
+                        "tauEleFakeEs1prongEndcapUp", "tau_elefake_es_DM0_endcap", "up"
+                    )
                 },
-                producers={"et": [taus.TauPtCorrectionMC]},
+                producers={"et": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3636,11 +3763,11 @@ def build_config(
             SystematicShift(
                 name="tauEleFakeEs1prong1pizeroBarrelDown",
                 shift_config={
-                    "et": {
-                        "tau_elefake_es_DM1_barrel": "down",
-                    }
+                    "et": tes_shift_config(
+                        "tauEleFakeEs1prong1pizeroBarrelDown", "tau_elefake_es_DM1_barrel", "down"
+                    )
                 },
-                producers={"et": [taus.TauPtCorrectionMC]},
+                producers={"et": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3648,11 +3775,11 @@ def build_config(
             SystematicShift(
                 name="tauEleFakeEs1prong1pizeroBarrelUp",
                 shift_config={
-                    "et": {
-                        "tau_elefake_es_DM1_barrel": "up",
-                    }
+                    "et": tes_shift_config(
+                        "tauEleFakeEs1prong1pizeroBarrelUp", "tau_elefake_es_DM1_barrel", "up"
+                    )
                 },
-                producers={"et": [taus.TauPtCorrectionMC]},
+                producers={"et": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3660,11 +3787,11 @@ def build_config(
             SystematicShift(
                 name="tauEleFakeEs1prong1pizeroEndcapDown",
                 shift_config={
-                    "et": {
-                        "tau_elefake_es_DM1_endcap": "down",
-                    }
+                    "et": tes_shift_config(
+                        "tauEleFakeEs1prong1pizeroEndcapDown", "tau_elefake_es_DM1_endcap", "down"
+                    )
                 },
-                producers={"et": [taus.TauPtCorrectionMC]},
+                producers={"et": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -3672,11 +3799,11 @@ def build_config(
             SystematicShift(
                 name="tauEleFakeEs1prong1pizeroEndcapUp",
                 shift_config={
-                    "et": {
-                        "tau_elefake_es_DM1_endcap": "up",
-                    }
+                    "et": tes_shift_config(
+                        "tauEleFakeEs1prong1pizeroEndcapUp", "tau_elefake_es_DM1_endcap", "up"
+                    )
                 },
-                producers={"et": [taus.TauPtCorrectionMC]},
+                producers={"et": [tau_pt_correction_producer]},
             ),
             exclude_samples=["data", "embedding", "embedding_mc"],
         )
@@ -4016,21 +4143,27 @@ def build_config(
 
     if era in ["2022preEE", "2022postEE", "2023preBPix", "2023postBPix"]:
         for _variation in ["up", "down"]:
+            # with TRIGGER_SFS_IN_ONE_PASS, the variation of each trigger is given by a separate
+            # parameter, see get_trigger_scalefactor_producers
+            if TRIGGER_SFS_IN_ONE_PASS:
+                _shift_config = {
+                    "trg_wgt_single_ele30_variation": f"sf{_variation}",
+                }
+            else:
+                _shift_config = {
+                    "ele_trigger_sf": [
+                        {
+                            "e_trigger_flagname": "trg_wgt_single_ele30",
+                            "e_trigger_sf_name": "HLT_SF_Ele30_MVAiso90ID",
+                            "e_trigger_variation": f"sf{_variation}",
+                        },
+                    ],
+                }
             configuration.add_shift(
                 SystematicShift(
                     name=f"singleEleTriggerSF{_variation.upper()}",
-                    shift_config={
-                        ("et"): {
-                            "ele_trigger_sf": [
-                                {
-                                    "e_trigger_flagname": "trg_wgt_single_ele30",
-                                    "e_trigger_sf_name": "HLT_SF_Ele30_MVAiso90ID",
-                                    "e_trigger_variation": f"sf{_variation}",
-                                },
-                            ],
-                        }
-                    },
-                    producers={("et"): scalefactors.SingleEleTriggerSF},
+                    shift_config={("et"): _shift_config},
+                    producers={("et"): SingleEleTriggerSF},
                 ),
                 exclude_samples=["data", "embedding", "embedding_mc"],
             )
@@ -4103,21 +4236,27 @@ def build_config(
     # TODO check run 2 eras
     if era in ["2016preVFP", "2016postVFP", "2017", "2018", "2022preEE", "2022postEE", "2023preBPix", "2023postBPix"]:
         for _variation in ["up", "down"]:
+            # with TRIGGER_SFS_IN_ONE_PASS, the variation of each trigger is given by a separate
+            # parameter, see get_trigger_scalefactor_producers
+            if TRIGGER_SFS_IN_ONE_PASS:
+                _shift_config = {
+                    "trg_wgt_single_mu24_variation": f"syst{_variation}",
+                }
+            else:
+                _shift_config = {
+                    "mu_trigger_sf": [
+                        {
+                            "m_trigger_flagname": "trg_wgt_single_mu24",
+                            "m_trigger_sf_name": "NUM_IsoMu24_DEN_CutBasedIdTight_and_PFIsoTight",
+                            "m_trigger_variation": f"syst{_variation}",
+                        },
+                    ],
+                }
             configuration.add_shift(
                 SystematicShift(
                     name=f"singleMuTriggerSF{_variation.upper()}",
-                    shift_config={
-                        ("mt"): {
-                            "mu_trigger_sf": [
-                                {
-                                    "m_trigger_flagname": "trg_wgt_single_mu24",
-                                    "m_trigger_sf_name": "NUM_IsoMu24_DEN_CutBasedIdTight_and_PFIsoTight",
-                                    "m_trigger_variation": f"syst{_variation}",
-                                },
-                            ],
-                        }
-                    },
-                    producers={("mt"): scalefactors.SingleMuTriggerSF},
+                    shift_config={("mt"): _shift_config},
+                    producers={("mt"): SingleMuTriggerSF},
                 ),
                 exclude_samples=["data", "embedding", "embedding_mc"],
             )
@@ -4196,7 +4335,7 @@ def build_config(
         scalefactors.TauIDVsEleSF2,
         scalefactors.TauIDVsMuSF1,
         scalefactors.TauIDVsMuSF2,
-        taus.TauPtCorrectionMC,
+        tau_pt_correction_producer,
         sample,
     )
 
@@ -4221,9 +4360,80 @@ def build_config(
     add_btagVariations(configuration, bjet_id_sf_producer)
 
     #########################
-    # Jet energy correction for data
+    # Storage policies of the output quantities, applied after all other
+    # producers
+    #########################
+    if REDUCED_OUTPUT_PRECISION:
+        add_storage_policies(
+            configuration,
+            SCOPES,
+            {
+                FLOAT16: [
+                    q.pt_1,
+                    q.pt_2,
+                    q.mass_1,
+                    q.mass_2,
+                    q.m_vis,
+                    q.pt_vis,
+                    q.bpair_pt_1,
+                    q.bpair_pt_2,
+                    q.bpair_mass_1,
+                    q.bpair_mass_2,
+                    q.bpair_m_inv,
+                    q.bpair_pt_dijet,
+                    q.jpt_1,
+                    q.jpt_2,
+                    q.mjj,
+                    q.met,
+                    q.met_raw,
+                    q.met_uncorrected,
+                    q.metSumEt,
+                    q.metSumEt_raw,
+                    q.mt_1,
+                    q.mt_2,
+                    q.pt_tautau,
+                    q.pt_tautaubb,
+                    q.mass_tautaubb,
+                    q.mt_tot,
+                    q.pt_dijet,
+                    q.puweight,
+                    q.id_wgt_bjet,
+                    scalefactors.EleID_SF,
+                    scalefactors.MuonIDIso_SF,
+                    scalefactors.TauIDSF,
+                    SingleEleTriggerSF,
+                    SingleMuTriggerSF,
+                    TauTauTriggerSF,
+                ],
+                mantissa_bits(12): [
+                    q.eta_1,
+                    q.eta_2,
+                    q.phi_1,
+                    q.phi_2,
+                    q.bpair_eta_1,
+                    q.bpair_eta_2,
+                    q.bpair_phi_1,
+                    q.bpair_phi_2,
+                    q.jeta_1,
+                    q.jeta_2,
+                    q.jphi_1,
+                    q.jphi_2,
+                    q.metphi,
+                    q.metphi_raw,
+                    q.metphi_uncorrected,
+                ],
+            },
+        )
+
+    #########################
+    # Remove producers, whose outputs are not written in the output profile
+    #########################
+    profile.prune_producers()
+
+    #########################
+    # Add the systematic shifts, which can change a written quantity
     #########################
-    # add_jetCorrectionData(configuration, era)
+    shift_survey.add_shifts(prune=PRUNE_IRRELEVANT_SHIFTS)
 
     #########################
     # Finalize and validate the configuration
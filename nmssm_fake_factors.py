@@ -4,6 +4,10 @@ from .producers import fakefactors as fakefactors
 from .producers import scalefactors as scalefactors
 from .producers import pairquantities as pairquantities
 from .quantities import output as q
+from .constants import FF_VARIATIONS_IN_ONE_PASS, USE_CORRECTION_CACHE
+from .correction_cache import use_correction_cache
+from .configuration_hooks import HookedFriendTreeConfiguration
+from .startup_report import attach_startup_report
 from code_generation.friend_trees import FriendTreeConfiguration
 from code_generation.modifiers import EraModifier
 from code_generation.systematics import SystematicShift, SystematicShiftByQuantity
@@ -20,7 +24,7 @@ def build_config(
     available_scopes: List[str],
     quantities_map: Union[str, None] = None,
 ):
-    configuration = FriendTreeConfiguration(
+    configuration = HookedFriendTreeConfiguration(
         era,
         sample,
         scopes,
@@ -31,6 +35,15 @@ def build_config(
         quantities_map,
     )
 
+    # Correctionlib payloads are loaded from the cache entries recorded in the
+    # manifest of the correction cache, see correction_cache.py
+    if USE_CORRECTION_CACHE:
+        use_correction_cache(configuration)
+
+    # The executables report the time and memory spent in the phases of their
+    # startup, see startup_report.py
+    attach_startup_report(configuration, scopes)
+
     # fake factor configurations
     configuration.add_config_parameters(
         ["et"],
@@ -213,6 +226,28 @@ def build_config(
         },
     )
 
+    if FF_VARIATIONS_IN_ONE_PASS:
+        add_fake_factor_variations(configuration)
+    else:
+        add_fake_factor_shifts(configuration)
+
+    #########################
+    # Finalize and validate the configuration
+    #########################
+    configuration.optimize()
+    configuration.validate()
+    configuration.report()
+    return configuration.expanded_configuration()
+
+
+def add_fake_factor_shifts(configuration: FriendTreeConfiguration):
+    """
+    Add the fake factor producers for the nominal fake factors and one
+    systematic shift per fake factor variation, each rerunning the fake factor
+    producers with one varied parameter.
+
+    :param configuration: Fake factor friend tree configuration.
+    """
     configuration.add_producers(
         ["mt", "et"],
         [
@@ -1922,10 +1957,62 @@ def build_config(
         ),
     )
 
-    #########################
-    # Finalize and validate the configuration
-    #########################
-    configuration.optimize()
-    configuration.validate()
-    configuration.report()
-    return configuration.expanded_configuration()
+
+def add_fake_factor_variations(configuration: FriendTreeConfiguration):
+    """
+    Add the fake factor producers that evaluate the nominal fake factors and
+    all variations in one pass. The variations are written as additional
+    columns named like the outputs of the shifts in `add_fake_factor_shifts`,
+    e.g. `fake_factor__QCDFFslopeUncUp`, and are always produced independent
+    of the requested shifts.
+
+    :param configuration: Fake factor friend tree configuration.
+    """
+    configuration.add_config_parameters(
+        ["mt", "et"],
+        {
+            **fakefactors.variation_config("raw_ff", fakefactors.RAW_FF_VARIATIONS_LT),
+            **fakefactors.variation_config("ff", fakefactors.FF_VARIATIONS_LT),
+        },
+    )
+    configuration.add_config_parameters(
+        ["tt"],
+        {
+            **fakefactors.variation_config("raw_ff", fakefactors.RAW_FF_VARIATIONS_TT_1),
+            **fakefactors.variation_config("ff", fakefactors.FF_VARIATIONS_TT_1),
+            **fakefactors.variation_config(
+                "raw_ff_subleading", fakefactors.RAW_FF_VARIATIONS_TT_2
+            ),
+            **fakefactors.variation_config(
+                "ff_subleading", fakefactors.FF_VARIATIONS_TT_2
+            ),
+        },
+    )
+
+    lt_producers = [
+        fakefactors.RawFakeFactorVariations_nmssm_lt,
+        fakefactors.FakeFactorVariations_nmssm_lt,
+        fakefactors.RawFakeFactorVariations_nmssm_boosted_lt,
+        fakefactors.FakeFactorVariations_nmssm_boosted_lt,
+    ]
+    configuration.add_producers(["mt", "et"], lt_producers)
+    configuration.add_outputs(
+        ["mt", "et"],
+        [quantity for producer in lt_producers for quantity in producer.output],
+    )
+
+    tt_producers = [
+        fakefactors.RawFakeFactorVariations_nmssm_tt_1,
+        fakefactors.RawFakeFactorVariations_nmssm_tt_2,
+        fakefactors.FakeFactorVariations_nmssm_tt_1,
+        fakefactors.FakeFactorVariations_nmssm_tt_2,
+        fakefactors.RawFakeFactorVariations_nmssm_tt_boosted_1,
+        fakefactors.RawFakeFactorVariations_nmssm_tt_boosted_2,
+        fakefactors.FakeFactorVariations_nmssm_tt_boosted_1,
+        fakefactors.FakeFactorVariations_nmssm_tt_boosted_2,
+    ]
+    configuration.add_producers(["tt"], tt_producers)
+    configuration.add_outputs(
+        ["tt"],
+        [quantity for producer in tt_producers for quantity in producer.output],
+    )
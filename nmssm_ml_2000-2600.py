@@ -3,6 +3,9 @@ from typing import List, Union
 from .producers import pairquantities as pairquantities
 from .producers import ml as ml
 from .quantities import output as q
+from .helpers import get_pnn_model_file
+from .configuration_hooks import HookedFriendTreeConfiguration
+from .startup_report import attach_startup_report
 from code_generation.friend_trees import FriendTreeConfiguration
 from code_generation.modifiers import EraModifier
 
@@ -18,7 +21,7 @@ def build_config(
     quantities_map: Union[str, None] = None,
 ):
 
-    configuration = FriendTreeConfiguration(
+    configuration = HookedFriendTreeConfiguration(
         era,
         sample,
         scopes,
@@ -29,6 +32,10 @@ def build_config(
         quantities_map,
     )
 
+    # The executables report the time and memory spent in the phases of their
+    # startup, see startup_report.py
+    attach_startup_report(configuration, scopes)
+
     # fake factor configurations
     configuration.add_config_parameters(
         ["mt"],
@@ -46,7 +53,7 @@ def build_config(
                     "2016preVFP": "",
                     "2016postVFP": "",
                     "2017": "",
-                    "2018": "payloads/ml/nmssm/2018/resolved_mt_best_pnn_EVTID.onnx",
+                    "2018": get_pnn_model_file("payloads/ml/nmssm/2018/resolved_mt_best_pnn_EVTID.onnx"),
                 }
             ),
             "feature_transformation_file": EraModifier(
@@ -62,7 +69,7 @@ def build_config(
                     "2016preVFP": "",
                     "2016postVFP": "",
                     "2017": "",
-                    "2018": "payloads/ml/nmssm/2018/boosted_mt_best_pnn_EVTID.onnx",
+                    "2018": get_pnn_model_file("payloads/ml/nmssm/2018/boosted_mt_best_pnn_EVTID.onnx"),
                 }
             ),
             "feature_transformation_file_boosted": EraModifier(
@@ -0,0 +1,338 @@
+"""
+Named output profiles for slim ntuples.
+
+The main configuration declares all output quantities, which are needed by
+any downstream consumer. An output profile selects the subset of these
+quantities, which is written for a given consumer:
+
+- `full`: all declared quantities,
+- `ml`: quantities used for the training and evaluation of the neural
+  networks, including the inputs of the FastMTT and kinematic fit friends,
+- `ff`: quantities used for the fake factor measurement and application,
+- `limits`: quantities used for the histograms entering the statistical
+  inference, including the inputs of the mass reconstruction and neural
+  network friends.
+
+Producers, whose outputs are neither written nor read by another active
+producer, are removed from the configuration by `OutputProfileSelection.prune_producers`.
+The profile is selected with the `XYH_OUTPUT_PROFILE` environment variable when
+running CMake, e.g. `XYH_OUTPUT_PROFILE=ml cmake ..`, see `generate.py`.
+"""
+
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+from fnmatch import fnmatch
+from typing import Dict, Iterable, List, Set
+
+from code_generation.producer import Producer, ProducerGroup
+from code_generation.quantity import Quantity
+from code_generation.rules import RemoveProducer
+
+from .configuration_hooks import ConfigurationHook, HookedConfiguration
+from .helpers import all_producers, as_list, input_names, leaf_producers, output_names
+from .producers import fakefactors as fakefactors
+from .producers import hhkinfit as hhkinfit
+from .producers import ml as ml
+from .producers import pairquantities as pairquantities
+
+__all__ = [
+    "OutputProfile",
+    "OutputProfileSelection",
+    "OUTPUT_PROFILES",
+    "DEFAULT_OUTPUT_PROFILE",
+    "select_output_profile",
+]
+
+
+class OutputProfile:
+    """
+    Subset of the declared output quantities, which is written for a
+    downstream consumer.
+
+    :param name: Name of the profile
+    :param drop: Name patterns (`fnmatch` syntax) of quantities, which are not
+                 written
+    :param drop_groups: Producers, whose output groups are not written
+    :param require: Producers of friend trees, whose inputs are always written,
+                    even if they match a pattern in `drop`
+    """
+
+    def __init__(
+        self,
+        name: str,
+        drop: List[str] = [],
+        drop_groups: List[Producer | ProducerGroup] = [],
+        require: List[Producer | ProducerGroup] = [],
+    ):
+        self.name = name
+        self.drop = list(drop)
+        self.drop_groups = [
+            producer.output_group
+            for group in drop_groups
+            for producer in all_producers(group)
+            if hasattr(producer, "output_group")
+        ]
+        self.required = set(
+            quantity
+            for group in require
+            for producer in all_producers(group)
+            for quantity in input_names(producer)
+        )
+
+    def __repr__(self) -> str:
+        return f"OutputProfile({self.name})"
+
+    @property
+    def is_full(self) -> bool:
+        return not self.drop and not self.drop_groups
+
+    def selects(self, output: Quantity) -> bool:
+        """
+        Check whether a quantity or output group is written in this profile.
+
+        :param output: Quantity or output group of a vector producer
+        :return: `True` if the output is written
+        """
+        if any(output is group for group in self.drop_groups):
+            return False
+        if output.name in self.required:
+            return True
+        return not any(fnmatch(output.name, pattern) for pattern in self.drop)
+
+
+# generator-level information, which is only needed for studies with the full
+# ntuples; the generator matching of the legs is kept in all profiles
+GEN_LEVEL_QUANTITIES = [
+    "gen_pt_*",
+    "gen_eta_*",
+    "gen_phi_*",
+    "gen_mass_*",
+    "gen_pdgid_*",
+    "gen_m_vis",
+    "genjet_*",
+]
+# MET before the recoil and type-1 corrections
+UNCORRECTED_MET_QUANTITIES = [
+    "met_raw",
+    "metphi_raw",
+    "metSumEt_raw",
+    "met_uncorrected",
+    "metphi_uncorrected",
+]
+IMPACT_PARAMETER_QUANTITIES = [
+    "dxy_*",
+    "dz_*",
+]
+
+MASS_RECONSTRUCTION_PRODUCERS = [
+    pairquantities.FastMTTQuantities,
+    pairquantities.BoostedFastMTTQuantities,
+    hhkinfit.YHKinFit,
+    hhkinfit.YHKinFit_boosted,
+]
+ML_PRODUCERS = [
+    ml.DefineMassXColumns,
+    ml.DefineMassYColumns,
+    ml.MTTransformVars,
+    ml.BoostedMTTransformVars,
+    ml.Evaluate_PNN_ORT,
+    ml.Evaluate_PNN_ORT_boosted,
+]
+FAKE_FACTOR_PRODUCERS = [
+    fakefactors.RawFakeFactors_nmssm_lt,
+    fakefactors.RawFakeFactors_nmssm_boosted_lt,
+    fakefactors.RawFakeFactors_nmssm_tt_1,
+    fakefactors.RawFakeFactors_nmssm_tt_2,
+    fakefactors.RawFakeFactors_nmssm_tt_boosted_1,
+    fakefactors.RawFakeFactors_nmssm_tt_boosted_2,
+    fakefactors.FakeFactors_nmssm_lt,
+    fakefactors.FakeFactors_nmssm_boosted_lt,
+    fakefactors.FakeFactors_nmssm_tt_1,
+    fakefactors.FakeFactors_nmssm_tt_2,
+    fakefactors.FakeFactors_nmssm_tt_boosted_1,
+    fakefactors.FakeFactors_nmssm_tt_boosted_2,
+    fakefactors.RawFakeFactorVariations_nmssm_lt,
+    fakefactors.RawFakeFactorVariations_nmssm_boosted_lt,
+    fakefactors.RawFakeFactorVariations_nmssm_tt_1,
+    fakefactors.RawFakeFactorVariations_nmssm_tt_2,
+    fakefactors.RawFakeFactorVariations_nmssm_tt_boosted_1,
+    fakefactors.RawFakeFactorVariations_nmssm_tt_boosted_2,
+    fakefactors.FakeFactorVariations_nmssm_lt,
+    fakefactors.FakeFactorVariations_nmssm_boosted_lt,
+    fakefactors.FakeFactorVariations_nmssm_tt_1,
+    fakefactors.FakeFactorVariations_nmssm_tt_2,
+    fakefactors.FakeFactorVariations_nmssm_tt_boosted_1,
+    fakefactors.FakeFactorVariations_nmssm_tt_boosted_2,
+]
+
+DEFAULT_OUTPUT_PROFILE = "full"
+OUTPUT_PROFILES = {
+    profile.name: profile
+    for profile in [
+        OutputProfile("full"),
+        OutputProfile(
+            "ml",
+            drop=(
+                GEN_LEVEL_QUANTITIES
+                + UNCORRECTED_MET_QUANTITIES
+                + IMPACT_PARAMETER_QUANTITIES
+                + ["lhe_scale_weight*"]
+            ),
+            require=MASS_RECONSTRUCTION_PRODUCERS + ML_PRODUCERS,
+        ),
+        OutputProfile(
+            "ff",
+            drop=(
+                GEN_LEVEL_QUANTITIES
+                + UNCORRECTED_MET_QUANTITIES
+                + ["lhe_scale_weight*"]
+            ),
+            require=FAKE_FACTOR_PRODUCERS,
+        ),
+        OutputProfile(
+            "limits",
+            drop=(
+                GEN_LEVEL_QUANTITIES
+                + UNCORRECTED_MET_QUANTITIES
+                + IMPACT_PARAMETER_QUANTITIES
+            ),
+            require=MASS_RECONSTRUCTION_PRODUCERS + ML_PRODUCERS + FAKE_FACTOR_PRODUCERS,
+        ),
+    ]
+}
+
+
+class OutputProfileSelection(ConfigurationHook):
+    """
+    Output profile applied to a configuration.
+
+    The selection is registered as hook of the configuration. It records the
+    producers and outputs of each scope, as well as the producers added by
+    modification rules, and only the outputs selected by the profile are
+    added to the configuration. Hence, the selection has to be registered
+    before any outputs are added. The producers of `RemoveProducer` rules are
+    not recorded, as they do not add producers.
+
+    :param configuration: Configuration, to which the profile is applied
+    :param profile: Output profile
+    :param sample: Sample type of the configuration
+    :param shifts: Requested systematic shifts
+    """
+
+    def __init__(
+        self,
+        configuration: HookedConfiguration,
+        profile: OutputProfile,
+        sample: str,
+        shifts: Iterable[str],
+    ):
+        self.configuration = configuration
+        self.profile = profile
+        self.sample = sample
+        self.shifts = set(shifts)
+        self.producers: Dict[str, list] = {}
+        self.outputs: Dict[str, list] = {}
+        self.rule_producers: Dict[str, list] = {}
+
+    def select_outputs(self, scopes: List[str], outputs: list) -> list:
+        selected = [output for output in outputs if self.profile.selects(output)]
+        for scope in scopes:
+            self.outputs.setdefault(scope, []).extend(selected)
+        return selected
+
+    def producers_added(self, scopes: List[str], producers: list):
+        for scope in scopes:
+            self.producers.setdefault(scope, []).extend(producers)
+
+    def rule_added(self, scopes: List[str], rule):
+        if isinstance(rule, RemoveProducer):
+            return
+        for scope in scopes:
+            self.rule_producers.setdefault(scope, []).extend(
+                as_list(getattr(rule, "producers", None))
+            )
+
+    def _prune_scope(self, scope: str, needed: Set[str], needed_groups: list) -> list:
+        """
+        Walk the producers of a scope backwards and collect the producers,
+        whose outputs are not needed. Producers without outputs, e.g. filters,
+        are always kept. The inputs of kept producers are added to `needed`.
+        """
+        for producer in self.rule_producers.get(scope, []):
+            needed |= input_names(producer, scope)
+        dead = []
+        for producer in reversed(self.producers.get(scope, [])):
+            alive = False
+            for leaf in leaf_producers(producer, scope):
+                outputs = output_names(leaf, scope)
+                if (
+                    not outputs
+                    or outputs & needed
+                    or any(getattr(leaf, "output_group", None) is group for group in needed_groups)
+                ):
+                    alive = True
+                    break
+            if alive:
+                for nested in all_producers(producer, scope):
+                    needed |= input_names(nested, scope)
+            else:
+                dead.append(producer)
+        return dead[::-1]
+
+    def prune_producers(self):
+        """
+        Remove producers, whose outputs are neither written nor read by an
+        active producer, from the configuration. This function has to be
+        called after all producers, outputs and modification rules have been
+        added. The full profile is left untouched, as well as configurations
+        with systematic shifts, which may refer to the pruned producers.
+        """
+        if self.profile.is_full or not self.shifts <= {"none"}:
+            return
+        needed_global = set()
+        for scope in self.producers:
+            if scope == "global":
+                continue
+            needed = set(output.name for output in self.outputs.get(scope, []))
+            dead = self._prune_scope(scope, needed, self.outputs.get(scope, []))
+            needed_global |= needed
+            if dead:
+                self.configuration.add_modification_rule(
+                    [scope], RemoveProducer(producers=dead, samples=[self.sample])
+                )
+        if "global" in self.producers:
+            needed_global |= set(output.name for output in self.outputs.get("global", []))
+            dead = self._prune_scope("global", needed_global, self.outputs.get("global", []))
+            if dead:
+                self.configuration.add_modification_rule(
+                    ["global"], RemoveProducer(producers=dead, samples=[self.sample])
+                )
+
+
+def select_output_profile(
+    configuration: HookedConfiguration,
+    name: str,
+    sample: str,
+    shifts: Iterable[str],
+) -> OutputProfileSelection:
+    """
+    Apply the output profile `name` to a configuration by registering the
+    selection as hook. The profile has to be selected right after the
+    configuration has been created.
+
+    :param configuration: Configuration, to which the profile is applied
+    :param name: Name of the output profile, one of `OUTPUT_PROFILES`
+    :param sample: Sample type of the configuration
+    :param shifts: Requested systematic shifts
+    :return: Output profile selection, which prunes the dead producers with
+             `prune_producers`
+
+    :raises ValueError: If the output profile is unknown.
+    """
+    if name not in OUTPUT_PROFILES:
+        raise ValueError(
+            f"Unknown output profile {name}, available profiles are {list(OUTPUT_PROFILES.keys())}."
+        )
+    return configuration.add_hook(
+        OutputProfileSelection(configuration, OUTPUT_PROFILES[name], sample, shifts)
+    )
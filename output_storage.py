@@ -0,0 +1,196 @@
+"""
+Storage policies for the output quantities.
+
+By default, the output quantities are written with the types returned by their
+producers, e.g. all kinematic quantities and scale factors as 32-bit floats.
+The helpers in this module reduce the size of the ntuples:
+
+- `add_storage_policies` redefines output quantities right before they are
+  written, either by rounding the mantissa of floats to a given number of bits
+  or by casting them to narrower types. Rounded mantissas end with zero bits,
+  which are stored very efficiently by the compression algorithms.
+- `add_packed_flags` packs boolean flags into a single integer word, which is
+  written instead of the individual flags.
+
+The compressed sizes of the quantities and proposals for narrower types are
+obtained with `scripts/inspectNano.py --crown`.
+"""
+
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+from code_generation.configuration import Configuration
+from code_generation.producer import Producer
+from code_generation.quantity import Quantity
+
+__all__ = [
+    "mantissa_bits",
+    "narrow_type",
+    "FLOAT16",
+    "BOOL",
+    "CHAR",
+    "UCHAR",
+    "SHORT",
+    "USHORT",
+    "add_storage_policies",
+    "add_packed_flags",
+]
+
+
+def mantissa_bits(bits: int) -> str:
+    """
+    Storage policy rounding the mantissa of float quantities to `bits` bits.
+    Double quantities are written as floats with rounded mantissas.
+
+    :param bits: Number of mantissa bits to be kept, between 1 and 23
+    :return: Storage policy
+    """
+    if not 1 <= bits <= 23:
+        raise ValueError(f"Number of mantissa bits must be between 1 and 23, got {bits}.")
+    return f"mantissa:{bits}"
+
+
+def narrow_type(type_name: str) -> str:
+    """
+    Storage policy casting quantities to the leaf type `type_name`.
+
+    :param type_name: ROOT leaf type, e.g. `Bool_t` or `Short_t`
+    :return: Storage policy
+    """
+    if type_name not in ("Bool_t", "Char_t", "UChar_t", "Short_t", "UShort_t", "Int_t", "UInt_t", "Float_t"):
+        raise ValueError(f"Unsupported storage type {type_name}.")
+    return f"type:{type_name}"
+
+
+# mantissa of a half-precision float, i.e. a relative precision of about 5e-4
+FLOAT16 = mantissa_bits(10)
+BOOL = narrow_type("Bool_t")
+CHAR = narrow_type("Char_t")
+UCHAR = narrow_type("UChar_t")
+SHORT = narrow_type("Short_t")
+USHORT = narrow_type("UShort_t")
+
+
+def _quantity_names(target: Quantity | Producer | str, scope: str) -> list[str]:
+    """
+    Names of the quantities of a storage policy target, which is either a
+    quantity, a producer or producer group with its output group, or the name
+    of a quantity.
+    """
+    if isinstance(target, str):
+        return [target]
+    if isinstance(target, Quantity):
+        return [target.name]
+    if scope not in target.scopes:
+        return []
+    return [output.name for output in target.get_outputs(scope)]
+
+
+def add_storage_policies(
+    configuration: Configuration,
+    scopes: list[str],
+    policies: dict[str, list[Quantity | Producer | str]],
+    name: str = "StoragePolicies",
+):
+    """
+    Apply storage policies to output quantities of the `scopes`.
+
+    The policies are applied by a producer appended to the producers of the
+    scopes, hence this function has to be called after all other producers
+    have been added. Shifted variants of the quantities are treated with the
+    same policies as the nominal quantities. Output groups of vector producers
+    are given by their producers, e.g. `triggers.SingleMuTriggerFlags`, which
+    are skipped in scopes they are not defined for.
+
+    ```python
+    add_storage_policies(
+        configuration,
+        HAD_TAU_SCOPES,
+        {
+            FLOAT16: [q.pt_1, q.pt_2, scalefactors.SingleMuTriggerSF],
+            BOOL: [pairquantities.VsJetTauIDFlag_2],
+        },
+    )
+    ```
+
+    :param configuration: Configuration, to which the policies are added
+    :param scopes: Scopes, in which the policies are applied
+    :param policies: Dictionary of storage policies and the quantities, to
+                     which they are applied
+    :param name: Name of the producer applying the policies. Optional.
+
+    :raises ValueError: If different policies are given for the same quantity.
+    """
+    for scope in scopes:
+        scope_policies = {}
+        for policy, targets in policies.items():
+            for target in targets:
+                for quantity in _quantity_names(target, scope):
+                    if scope_policies.get(quantity, policy) != policy:
+                        raise ValueError(
+                            f"Different storage policies for quantity {quantity}: "
+                            f"{scope_policies[quantity]} and {policy}."
+                        )
+                    scope_policies[quantity] = policy
+        if not scope_policies:
+            continue
+        quantities = ", ".join(f'"{quantity}"' for quantity in scope_policies.keys())
+        scope_policy_values = ", ".join(f'"{policy}"' for policy in scope_policies.values())
+        configuration.add_producers(
+            scope,
+            [
+                Producer(
+                    name=name,
+                    call=(
+                        "xyh::storage::ApplyPolicies({df}, "
+                        f"{{vec_open}}{quantities}{{vec_close}}, "
+                        f"{{vec_open}}{scope_policy_values}{{vec_close}})"
+                    ),
+                    input=[],
+                    output=None,
+                    scopes=[scope],
+                ),
+            ],
+        )
+
+
+def add_packed_flags(
+    configuration: Configuration,
+    scopes: list[str],
+    word: Quantity,
+    flags: list[Quantity | Producer],
+):
+    """
+    Pack boolean flags into the integer quantity `word`, which is added to the
+    outputs of the `scopes`. Bit `i` of the word corresponds to the `i`-th
+    flag. The flags themselves should not be added to the outputs. Output
+    groups of vector producers are given by their producers, e.g.
+    `triggers.SingleMuTriggerFlags`, the order of their flags is the order of
+    the entries in the vector configuration.
+
+    :param configuration: Configuration, to which the packed flags are added
+    :param scopes: Scopes, in which the flags are packed
+    :param word: Output quantity containing the packed flags
+    :param flags: Flags to be packed, at most 64
+    """
+    for scope in scopes:
+        inputs = []
+        for flag in flags:
+            if isinstance(flag, Quantity):
+                inputs.append(flag)
+            else:
+                inputs.extend(flag.get_outputs(scope))
+        if len(inputs) > 64:
+            raise ValueError(f"At most 64 flags can be packed into {word.name}, got {len(inputs)}.")
+        configuration.add_producers(
+            scope,
+            [
+                Producer(
+                    name=f"Pack{word.name}",
+                    call="xyh::storage::PackFlags({df}, {output}, {input_vec})",
+                    input=inputs,
+                    output=[word],
+                    scopes=[scope],
+                ),
+            ],
+        )
+        configuration.add_outputs(scope, [word])
@@ -182,7 +182,8 @@ def stepwise_jerc_producer_factory(
 
         - `{config_parameter_prefix}_jec_file`: The path to the file containing the JEC/JER corrections (in `data/` or `payloads/`).
         - `{config_parameter_prefix}_jes_tag`: The tag in the correction file that should be used for JEC of the simulation.
-        - `{config_parameter_prefix}_jes_tag_data`: The tag in the correction file that should be used for JEC of the data.
+        - `{config_parameter_prefix}_jes_tags_data`: The tags in the correction file that should be used for JEC of the data, one for each run period.
+        - `{config_parameter_prefix}_jes_first_runs_data`: The first runs of the run periods, in ascending order.
         - `{config_parameter_prefix}_jer_tag`: The tag in the correction file that should be used for JER of the simulation.
         - `{config_parameter_prefix}_jec_algo`: The pileup mitigation algorithm that has been used for the jets (e.g. `AK4chs`, `AK8PFPuppi`).
         - `{config_parameter_prefix}_reapply_jes`: Flag whether to reapply the nominal JEC. The nominal JEC has already been performed in the `NanoAOD` production.
@@ -236,7 +237,8 @@ def stepwise_jerc_producer_factory(
             {{input}},
             "{{{config_parameter_prefix}_jec_file}}",
             "{{{config_parameter_prefix}_jec_algo}}",
-            "{{{config_parameter_prefix}_jes_tag_data}}",
+            {{vec_open}}{{{config_parameter_prefix}_jes_tags_data}}{{vec_close}},
+            {{vec_open}}{{{config_parameter_prefix}_jes_first_runs_data}}{{vec_close}},
             {{{config_parameter_prefix}_reapply_jes}},
             "{{era}}"
         )
@@ -570,3 +572,293 @@ def jerc_producer_factory(
         jet_energy_correction_mc,
         jet_energy_correction_emb,
     )
+
+
+def lorentzvector_components_producer_factory(
+    name: str,
+    p4: Quantity,
+    output: dict[str, Quantity],
+    scopes: list[str],
+):
+    """
+    Create a producer extracting several components of the four-vector `p4`
+    at once, instead of one `lorentzvector::Get*` producer per component.
+
+    :param name: Name of the producer
+    :param p4: Four-vector quantity
+    :param output: Dictionary of the components (`pt`, `eta`, `phi`, `mass`,
+                   `energy`, `rapidity`, `mt`, `px`, `py` or `pz`) and the
+                   output quantities, to which they are written
+    :param scopes: Scopes of the producer
+    :return: Producer
+    """
+    components = ", ".join(f'"{component}"' for component in output.keys())
+    return Producer(
+        name=name,
+        call=f"xyh::lorentzvector::Components({{df}}, {{output_vec}}, {{input}}, {{vec_open}}{components}{{vec_close}})",
+        input=[p4],
+        output=list(output.values()),
+        scopes=scopes,
+    )
+
+
+def object_attributes_producer_factory(
+    name: str,
+    index: Quantity,
+    position: int,
+    attributes: list[Tuple[str, Quantity, Quantity]],
+    scopes: list[str],
+):
+    """
+    Create a producer extracting several attributes of one selected object,
+    e.g. the first leg of the selected pair, instead of one
+    `event::quantity::Get` producer per attribute.
+
+    :param name: Name of the producer
+    :param index: Quantity containing the indices of the selected objects
+    :param position: Position of the object in `index`
+    :param attributes: List of the attributes given as tuples of the type, the
+                       collection quantity and the output quantity
+    :param scopes: Scopes of the producer
+    :return: Producer
+    """
+    types = ", ".join(type_name for type_name, _, _ in attributes)
+    return Producer(
+        name=name,
+        call=f"event::quantity::GetAttributes<{types}>({{df}}, {{output_vec}}, {{input_vec}}, {position})",
+        input=[quantity for _, quantity, _ in attributes] + [index],
+        output=[output for _, _, output in attributes],
+        scopes=scopes,
+    )
+
+
+def tau_es_variations_producer_factory(
+    name: str,
+    pt: Quantity,
+    eta: Quantity,
+    decay_mode: Quantity,
+    gen_match: Quantity,
+    pt_corrected_nominal: Quantity,
+    pt_corrected: Quantity,
+    correction_arguments: str,
+    variation_parameter: str,
+    variations: list[Tuple[str, str, str]],
+    scopes: list[str],
+) -> Tuple[Producer, Producer]:
+    """
+    Create the producers for evaluating all energy scale variations of
+    hadronic taus in one pass.
+
+    The first producer evaluates all variations at once with
+    `xyh::tau::PtCorrectionVariationsMC`, starting from the nominal corrected
+    transverse momenta in `pt_corrected_nominal`. The varied collections are
+    written to columns named `<pt_corrected_nominal>_<shift name>`. The second
+    producer copies the nominal or one of the varied collections to
+    `pt_corrected`, depending on the configuration parameter
+    `variation_parameter`, which is `nom` by default. The energy scale shifts
+    only have to change this parameter and rerun the second producer.
+
+    :param name: Name of the producers, which are suffixed with `Variations`
+                 and `Selection`
+    :param pt: Quantity containing the uncorrected transverse momenta
+    :param eta: Quantity containing the pseudorapidities
+    :param decay_mode: Quantity containing the decay modes
+    :param gen_match: Quantity containing the generator-level matches
+    :param pt_corrected_nominal: Quantity containing the nominal corrected
+                                 transverse momenta
+    :param pt_corrected: Output quantity containing the selected corrected
+                         transverse momenta
+    :param correction_arguments: Call arguments specifying the correction,
+                                 i.e. the correction file, the correction name,
+                                 the ID algorithm and the vector of working
+                                 points
+    :param variation_parameter: Name of the configuration parameter selecting
+                                the variation
+    :param variations: List of the variations given as tuples of the shift
+                       name, the category of the affected taus (see
+                       `xyh::tau::es_category`) and the variation of the
+                       correction
+    :param scopes: Scopes of the producers
+    :return: Tuple of the producer evaluating the variations and the producer
+             selecting the variation
+    """
+    outputs = [
+        Quantity(f"{pt_corrected_nominal.name}_{shift}") for shift, _, _ in variations
+    ]
+    categories = ", ".join(f'"{category}"' for _, category, _ in variations)
+    variation_names = ", ".join(f'"{variation}"' for _, _, variation in variations)
+    variations_producer = Producer(
+        name=f"{name}Variations",
+        call=(
+            f"xyh::tau::PtCorrectionVariationsMC({{df}}, correctionManager, {{output_vec}}, {{input}}, "
+            f"{correction_arguments}, {{vec_open}}{categories}{{vec_close}}, "
+            f"{{vec_open}}{variation_names}{{vec_close}})"
+        ),
+        input=[pt, eta, decay_mode, gen_match, pt_corrected_nominal],
+        output=outputs,
+        scopes=scopes,
+    )
+    selection_producer = Producer(
+        name=f"{name}Selection",
+        call=f'xyh::tau::SelectVariation({{df}}, {{output}}, {{input_vec}}, "{{{variation_parameter}}}")',
+        input=[pt_corrected_nominal] + outputs,
+        output=[pt_corrected],
+        scopes=scopes,
+    )
+    return variations_producer, selection_producer
+
+
+def lepton_scalefactors_producer_factory(
+    name: str,
+    pt: Quantity,
+    scalefactors: list[Tuple[Quantity, str, str, list]],
+    scopes: list[str],
+    product: Quantity = None,
+):
+    """
+    Create a producer evaluating several correctionlib scale factors of one
+    lepton, e.g. the identification and isolation scale factors, with
+    `scalefactor::lepton::Evaluate` instead of one producer per scale factor.
+
+    Each scale factor is given as tuple of the output quantity, the correction
+    file, the correction name and the list of arguments of the correction. The
+    arguments are quantities of type `float`, whose values are passed, tuples
+    `("abs", quantity)` for absolute values, tuples `(type, quantity)` for
+    quantities of other types, e.g. `("UChar_t", q.tau_decaymode_1)`, or
+    strings, e.g. the variation. Configuration parameters are given with
+    braces, e.g. `"{muon_id_sf_variation}"`. All scale factors are set to 1
+    for leptons with negative transverse momentum, i.e. missing leptons.
+
+    :param name: Name of the producer
+    :param pt: Quantity containing the transverse momentum of the lepton
+    :param scalefactors: List of the scale factors given as tuples of the
+                         output quantity, the correction file, the correction
+                         name and the arguments of the correction
+    :param scopes: Scopes of the producer
+    :param product: Output quantity for the product of all scale factors.
+                    Optional.
+    :return: Producer
+    """
+    columns = [pt]
+    types = ["float"]
+    corrections = _scalefactor_corrections(
+        columns, types, [(sf_file, sf_name, sf_arguments) for _, sf_file, sf_name, sf_arguments in scalefactors]
+    )
+    outputs = [output for output, _, _, _ in scalefactors]
+    if product is not None:
+        outputs.append(product)
+    return Producer(
+        name=name,
+        call=(
+            f"scalefactor::lepton::Evaluate<{', '.join(types)}>({{df}}, correctionManager, {{output_vec}}, {{input_vec}}, "
+            f"{corrections}, "
+            f"{'true' if product is not None else 'false'})"
+        ),
+        input=columns,
+        output=outputs,
+        scopes=scopes,
+    )
+
+
+def trigger_scalefactors_producer_factory(
+    name: str,
+    pt: Quantity,
+    scalefactors: list[Tuple[Quantity, str, str, str, list]],
+    scopes: list[str],
+):
+    """
+    Create a producer evaluating the trigger scale factors of several triggers
+    for one leg, e.g. of all single muon triggers, with
+    `scalefactor::trigger::Evaluate` instead of one producer per trigger.
+
+    Each scale factor is given as tuple of the output quantity, the name of the
+    trigger flag, the correction file, the correction name and the list of
+    arguments of the correction. The arguments are given as for
+    `lepton_scalefactors_producer_factory`. A scale factor is only evaluated
+    if its trigger flag is set, otherwise it is set to 1. As for the vector
+    producers of the trigger scale factors, the trigger flags are passed by
+    name and are not shifted.
+
+    :param name: Name of the producer
+    :param pt: Quantity containing the transverse momentum of the leg
+    :param scalefactors: List of the scale factors given as tuples of the
+                         output quantity, the trigger flag, the correction
+                         file, the correction name and the arguments of the
+                         correction
+    :param scopes: Scopes of the producer
+    :return: Producer
+    """
+    columns = [pt]
+    types = ["float"]
+    corrections = _scalefactor_corrections(
+        columns, types, [(sf_file, sf_name, sf_arguments) for _, _, sf_file, sf_name, sf_arguments in scalefactors]
+    )
+    # the trigger flags follow the input columns
+    types.extend("bool" for _ in scalefactors)
+    flags = ", ".join(f'"{flag}"' for _, flag, _, _, _ in scalefactors)
+    return Producer(
+        name=name,
+        call=(
+            f"scalefactor::trigger::Evaluate<{', '.join(types)}>({{df}}, correctionManager, {{output_vec}}, {{input_vec}}, "
+            f"{{vec_open}}{flags}{{vec_close}}, "
+            f"{corrections})"
+        ),
+        input=columns,
+        output=[output for output, _, _, _, _ in scalefactors],
+        scopes=scopes,
+    )
+
+
+def _scalefactor_corrections(
+    columns: list[Quantity],
+    types: list[str],
+    corrections: list[Tuple[str, str, list]],
+) -> str:
+    """
+    Arguments of `scalefactor::lepton::Evaluate` and
+    `scalefactor::trigger::Evaluate` describing the corrections, i.e. the
+    vectors of the correction files, the correction names and the arguments.
+    Quantities used as arguments are appended to `columns` and their types to
+    `types`.
+
+    :param columns: Input quantities of the producer
+    :param types: C++ types of the input quantities
+    :param corrections: List of the corrections given as tuples of the
+                        correction file, the correction name and the
+                        arguments of the correction
+    :return: Arguments of the C++ function
+    """
+    files = []
+    names = []
+    arguments = []
+    for sf_file, sf_name, sf_arguments in corrections:
+        parsed_arguments = []
+        for argument in sf_arguments:
+            absolute = False
+            column_type = "float"
+            if isinstance(argument, tuple):
+                if not isinstance(argument[1], Quantity):
+                    raise ValueError(f"Unknown scale factor argument {argument}.")
+                if argument[0] == "abs":
+                    absolute = True
+                else:
+                    column_type = argument[0]
+                argument = argument[1]
+            if isinstance(argument, Quantity):
+                if argument not in columns:
+                    columns.append(argument)
+                    types.append(column_type)
+                elif types[columns.index(argument)] != column_type:
+                    raise ValueError(f"Scale factor argument {argument.name} is used with different types.")
+                index = f"${columns.index(argument)}"
+                parsed_arguments.append(f'"abs:{index}"' if absolute else f'"{index}"')
+            else:
+                parsed_arguments.append(f'"{argument}"')
+        files.append(f'"{sf_file}"')
+        names.append(f'"{sf_name}"')
+        arguments.append("{vec_open}" + ", ".join(parsed_arguments) + "{vec_close}")
+    return (
+        f"{{vec_open}}{', '.join(files)}{{vec_close}}, "
+        f"{{vec_open}}{', '.join(names)}{{vec_close}}, "
+        f"{{vec_open}}{', '.join(arguments)}{{vec_close}}"
+    )
@@ -1,6 +1,7 @@
 from ..quantities import output as q
 from ..quantities import nanoAOD
 from code_generation.producer import Producer, ProducerGroup, ExtendedVectorProducer
+from ._helpers import lorentzvector_components_producer_factory, object_attributes_producer_factory, tau_es_variations_producer_factory
 
 
 ####################
@@ -41,6 +42,56 @@ boostedTauEnergyCorrection = ProducerGroup(
         boostedTauMassCorrection,
     ],
 )
+# Energy scale variations of boosted hadronic taus, which are evaluated in one
+# pass with the nominal correction (see `TAU_ES_VARIATIONS_IN_ONE_PASS`), given
+# as tuples of the shift name, the category of the affected taus and the
+# variation
+BOOSTED_TAU_ES_VARIATIONS = [
+    ("boostedtauEs1prong0pizeroDown", "dm0", "down"),
+    ("boostedtauEs1prong0pizeroUp", "dm0", "up"),
+    ("boostedtauEs1prong1pizeroDown", "dm1", "down"),
+    ("boostedtauEs1prong1pizeroUp", "dm1", "up"),
+    ("boostedtauEs3prong0pizeroDown", "dm10", "down"),
+    ("boostedtauEs3prong0pizeroUp", "dm10", "up"),
+]
+boostedTauPtCorrectionNominal = Producer(
+    name="boostedTauPtCorrectionNominal",
+    call='physicsobject::tau::PtCorrectionMC_genuineTau({df}, correctionManager, {output}, {input}, "{boostedtau_sf_file}", "{boostedtau_ES_json_name}", "{boostedtau_id_algorithm}", "nom", "nom", "nom", "nom")',
+    input=[
+        nanoAOD.boostedTau_pt,
+        nanoAOD.boostedTau_eta,
+        nanoAOD.boostedTau_decayMode,
+        nanoAOD.boostedTau_genPartFlav,
+    ],
+    output=[q.boostedTau_pt_corrected_nominal],
+    scopes=["et", "mt", "tt"],
+)
+boostedTauPtCorrectionVariations, boostedTauPtCorrectionSelection = tau_es_variations_producer_factory(
+    name="boostedTauPtCorrection",
+    pt=nanoAOD.boostedTau_pt,
+    eta=nanoAOD.boostedTau_eta,
+    decay_mode=nanoAOD.boostedTau_decayMode,
+    gen_match=nanoAOD.boostedTau_genPartFlav,
+    pt_corrected_nominal=q.boostedTau_pt_corrected_nominal,
+    pt_corrected=q.boostedTau_pt_corrected,
+    correction_arguments='"{boostedtau_sf_file}", "{boostedtau_ES_json_name}", "{boostedtau_id_algorithm}", {vec_open}{vec_close}',
+    variation_parameter="boostedtau_ES_variation",
+    variations=BOOSTED_TAU_ES_VARIATIONS,
+    scopes=["et", "mt", "tt"],
+)
+boostedTauEnergyCorrectionVariations = ProducerGroup(
+    name="boostedTauEnergyCorrectionVariations",
+    call=None,
+    input=None,
+    output=None,
+    scopes=["et", "mt", "tt"],
+    subproducers=[
+        boostedTauPtCorrectionNominal,
+        boostedTauPtCorrectionVariations,
+        boostedTauPtCorrectionSelection,
+        boostedTauMassCorrection,
+    ],
+)
 boostedTauPtCorrection_data = Producer(
     name="boostedTauPtCorrection_data",
     call="event::quantity::Rename<ROOT::RVec<float>>({df}, {output}, {input})",
@@ -242,89 +293,39 @@ boostedLVTau2_uncorrected = Producer(
     scopes=["mt", "et", "tt"],
 )
 
-boosted_pt_1 = Producer(
-    name="boosted_pt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.boosted_p4_1],
-    output=[q.boosted_pt_1],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_pt_2 = Producer(
-    name="boosted_pt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.boosted_p4_2],
-    output=[q.boosted_pt_2],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_eta_1 = Producer(
-    name="boosted_eta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.boosted_p4_1],
-    output=[q.boosted_eta_1],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_eta_2 = Producer(
-    name="boosted_eta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.boosted_p4_2],
-    output=[q.boosted_eta_2],
+boosted_p4_1_components = lorentzvector_components_producer_factory(
+    name="boosted_p4_1_components",
+    p4=q.boosted_p4_1,
+    output={
+        "pt": q.boosted_pt_1,
+        "eta": q.boosted_eta_1,
+        "phi": q.boosted_phi_1,
+        "mass": q.boosted_mass_1,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
-boosted_phi_1 = Producer(
-    name="boosted_phi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.boosted_p4_1],
-    output=[q.boosted_phi_1],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_phi_2 = Producer(
-    name="boosted_phi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.boosted_p4_2],
-    output=[q.boosted_phi_2],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_mass_1 = Producer(
-    name="boosted_mass_1",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.boosted_p4_1],
-    output=[q.boosted_mass_1],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_mass_2 = Producer(
-    name="boosted_mass_2",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.boosted_p4_2],
-    output=[q.boosted_mass_2],
+boosted_p4_2_components = lorentzvector_components_producer_factory(
+    name="boosted_p4_2_components",
+    p4=q.boosted_p4_2,
+    output={
+        "pt": q.boosted_pt_2,
+        "eta": q.boosted_eta_2,
+        "phi": q.boosted_phi_2,
+        "mass": q.boosted_mass_2,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
 
-boosted_muon_dxy_1 = Producer(
-    name="boosted_muon_dxy_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_dxy, q.boosteddileptonpair],
-    output=[q.boosted_dxy_1],
-    scopes=["mt", "mm"],
-)
-boosted_muon_dz_1 = Producer(
-    name="boosted_muon_dz_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_dz, q.boosteddileptonpair],
-    output=[q.boosted_dz_1],
-    scopes=["mt", "mm"],
-)
-boosted_muon_q_1 = Producer(
-    name="boosted_muon_q_1",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_charge, q.boosteddileptonpair],
-    output=[q.boosted_q_1],
-    scopes=["mt", "mm"],
-)
-boosted_muon_iso_1 = Producer(
-    name="boosted_muon_iso_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_pfRelIso04_all, q.boosteddileptonpair],
-    output=[q.boosted_iso_1],
+boosted_muon_attributes_1 = object_attributes_producer_factory(
+    name="boosted_muon_attributes_1",
+    index=q.boosteddileptonpair,
+    position=0,
+    attributes=[
+        ("float", nanoAOD.Muon_dxy, q.boosted_dxy_1),
+        ("float", nanoAOD.Muon_dz, q.boosted_dz_1),
+        ("int", nanoAOD.Muon_charge, q.boosted_q_1),
+        ("float", nanoAOD.Muon_pfRelIso04_all, q.boosted_iso_1),
+    ],
     scopes=["mt", "mm"],
 )
 boosted_muon_is_global_1 = Producer(
@@ -342,54 +343,28 @@ boosted_tau_decaymode_1_notau = Producer(
     scopes=["et", "mt", "em", "ee", "mm"],
 )
 
-boosted_electron_dxy_1 = Producer(
-    name="boosted_electron_dxy_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Electron_dxy, q.boosteddileptonpair],
-    output=[q.boosted_dxy_1],
-    scopes=["et", "ee"],
-)
-boosted_electron_dz_1 = Producer(
-    name="boosted_electron_dz_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Electron_dz, q.boosteddileptonpair],
-    output=[q.boosted_dz_1],
-    scopes=["et", "ee"],
-)
-boosted_electron_q_1 = Producer(
-    name="boosted_electron_q_1",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Electron_charge, q.boosteddileptonpair],
-    output=[q.boosted_q_1],
-    scopes=["et", "ee"],
-)
-boosted_electron_iso_1 = Producer(
-    name="boosted_electron_iso_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Electron_pfRelIso03_all, q.boosteddileptonpair],
-    output=[q.boosted_iso_1],
+boosted_electron_attributes_1 = object_attributes_producer_factory(
+    name="boosted_electron_attributes_1",
+    index=q.boosteddileptonpair,
+    position=0,
+    attributes=[
+        ("float", nanoAOD.Electron_dxy, q.boosted_dxy_1),
+        ("float", nanoAOD.Electron_dz, q.boosted_dz_1),
+        ("int", nanoAOD.Electron_charge, q.boosted_q_1),
+        ("float", nanoAOD.Electron_pfRelIso03_all, q.boosted_iso_1),
+    ],
     scopes=["et", "ee"],
 )
 
-boosted_tau_q_1 = Producer(
-    name="boosted_tau_q_1",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.boostedTau_charge, q.boosteddileptonpair],
-    output=[q.boosted_q_1],
-    scopes=["tt"],
-)
-boosted_tau_iso_1 = Producer(
-    name="boosted_tau_iso_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.boostedTau_rawMVAoldDM2017v2, q.boosteddileptonpair],
-    output=[q.boosted_iso_1],
-    scopes=["tt"],
-)
-boosted_tau_decaymode_1 = Producer(
-    name="boosted_taudecaymode_1",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.boostedTau_decayMode, q.boosteddileptonpair],
-    output=[q.boosted_tau_decaymode_1],
+boosted_tau_attributes_1 = object_attributes_producer_factory(
+    name="boosted_tau_attributes_1",
+    index=q.boosteddileptonpair,
+    position=0,
+    attributes=[
+        ("int", nanoAOD.boostedTau_charge, q.boosted_q_1),
+        ("float", nanoAOD.boostedTau_rawMVAoldDM2017v2, q.boosted_iso_1),
+        ("int", nanoAOD.boostedTau_decayMode, q.boosted_tau_decaymode_1),
+    ],
     scopes=["tt"],
 )
 isoTauIDFlag_1 = ExtendedVectorProducer(
@@ -434,25 +409,15 @@ antiMuTauIDFlag_1 = ExtendedVectorProducer(
     scope=["tt"],
     vec_config="antimu_boostedtau_id",
 )
-boosted_tau_q_2 = Producer(
-    name="boosted_tau_q_2",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.boostedTau_charge, q.boosteddileptonpair],
-    output=[q.boosted_q_2],
-    scopes=["mt", "et", "tt"],
-)
-boosted_tau_iso_2 = Producer(
-    name="boosted_tau_iso_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.boostedTau_rawMVAoldDM2017v2, q.boosteddileptonpair],
-    output=[q.boosted_iso_2],
-    scopes=["mt", "et", "tt"],
-)
-boosted_tau_decaymode_2 = Producer(
-    name="boosted_taudecaymode_2",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.boostedTau_decayMode, q.boosteddileptonpair],
-    output=[q.boosted_tau_decaymode_2],
+boosted_tau_attributes_2 = object_attributes_producer_factory(
+    name="boosted_tau_attributes_2",
+    index=q.boosteddileptonpair,
+    position=1,
+    attributes=[
+        ("int", nanoAOD.boostedTau_charge, q.boosted_q_2),
+        ("float", nanoAOD.boostedTau_rawMVAoldDM2017v2, q.boosted_iso_2),
+        ("int", nanoAOD.boostedTau_decayMode, q.boosted_tau_decaymode_2),
+    ],
     scopes=["mt", "et", "tt"],
 )
 isoTauIDFlag_2 = ExtendedVectorProducer(
@@ -505,18 +470,13 @@ boosted_p4_vis = Producer(
     output=[q.boosted_p4_vis],
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
-boosted_m_vis = Producer(
-    name="boosted_m_vis",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.boosted_p4_vis],
-    output=[q.boosted_m_vis],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_pt_vis = Producer(
-    name="boosted_pt_vis",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.boosted_p4_vis],
-    output=[q.boosted_pt_vis],
+boosted_p4_vis_components = lorentzvector_components_producer_factory(
+    name="boosted_p4_vis_components",
+    p4=q.boosted_p4_vis,
+    output={
+        "mass": q.boosted_m_vis,
+        "pt": q.boosted_pt_vis,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
 boosted_deltaR_ditaupair = Producer(
@@ -548,47 +508,25 @@ boosted_p4_tautaubb = Producer(
     output=[q.boosted_p4_tautaubb],
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
-boosted_pt_tautaubb = Producer(
-    name="boosted_pt_tautaubb",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.boosted_p4_tautaubb],
-    output=[q.boosted_pt_tautaubb],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_mass_tautaubb = Producer(
-    name="boosted_mass_tautaubb",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.boosted_p4_tautaubb],
-    output=[q.boosted_mass_tautaubb],
+boosted_p4_tautaubb_components = lorentzvector_components_producer_factory(
+    name="boosted_p4_tautaubb_components",
+    p4=q.boosted_p4_tautaubb,
+    output={
+        "pt": q.boosted_pt_tautaubb,
+        "mass": q.boosted_mass_tautaubb,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
 
-boosted_pt_add = Producer(
-    name="boosted_pt_add",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.boosted_p4_add],
-    output=[q.boosted_pt_add],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_eta_add = Producer(
-    name="boosted_eta_add",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.boosted_p4_add],
-    output=[q.boosted_eta_add],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_phi_add = Producer(
-    name="boosted_phi_add",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.boosted_p4_add],
-    output=[q.boosted_phi_add],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-boosted_mass_add = Producer(
-    name="boosted_mass_add",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.boosted_p4_add],
-    output=[q.boosted_mass_add],
+boosted_p4_add_components = lorentzvector_components_producer_factory(
+    name="boosted_p4_add_components",
+    p4=q.boosted_p4_add,
+    output={
+        "pt": q.boosted_pt_add,
+        "eta": q.boosted_eta_add,
+        "phi": q.boosted_phi_add,
+        "mass": q.boosted_mass_add,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
 
@@ -599,14 +537,8 @@ UnrollboostedMuLV1 = ProducerGroup(
     output=None,
     scopes=["mt", "mm"],
     subproducers=[
-        boosted_pt_1,
-        boosted_eta_1,
-        boosted_phi_1,
-        boosted_mass_1,
-        boosted_muon_dxy_1,
-        boosted_muon_dz_1,
-        boosted_muon_q_1,
-        boosted_muon_iso_1,
+        boosted_p4_1_components,
+        boosted_muon_attributes_1,
         # boosted_muon_is_global_1,
     ],
 )
@@ -617,14 +549,8 @@ UnrollboostedElLV1 = ProducerGroup(
     output=None,
     scopes=["et", "ee"],
     subproducers=[
-        boosted_pt_1,
-        boosted_eta_1,
-        boosted_phi_1,
-        boosted_mass_1,
-        boosted_electron_dxy_1,
-        boosted_electron_dz_1,
-        boosted_electron_q_1,
-        boosted_electron_iso_1,
+        boosted_p4_1_components,
+        boosted_electron_attributes_1,
     ],
 )
 UnrollboostedTauLV1 = ProducerGroup(
@@ -634,13 +560,8 @@ UnrollboostedTauLV1 = ProducerGroup(
     output=None,
     scopes=["tt"],
     subproducers=[
-        boosted_pt_1,
-        boosted_eta_1,
-        boosted_phi_1,
-        boosted_mass_1,
-        boosted_tau_q_1,
-        boosted_tau_iso_1,
-        boosted_tau_decaymode_1,
+        boosted_p4_1_components,
+        boosted_tau_attributes_1,
         isoTauIDFlag_1,
         antiEleTauIDFlag_1,
         antiMuTauIDFlag_1,
@@ -653,13 +574,8 @@ UnrollboostedTauLV2 = ProducerGroup(
     output=None,
     scopes=["et", "mt", "tt"],
     subproducers=[
-        boosted_pt_2,
-        boosted_eta_2,
-        boosted_phi_2,
-        boosted_mass_2,
-        boosted_tau_q_2,
-        boosted_tau_iso_2,
-        boosted_tau_decaymode_2,
+        boosted_p4_2_components,
+        boosted_tau_attributes_2,
         isoTauIDFlag_2,
         antiEleTauIDFlag_2,
         antiMuTauIDFlag_2,
@@ -676,18 +592,13 @@ boostedMTDiTauPairQuantities = ProducerGroup(
         UnrollboostedTauLV2,
         boosted_tau_decaymode_1_notau,
         boosted_p4_vis,
-        boosted_m_vis,
-        boosted_pt_vis,
+        boosted_p4_vis_components,
         boosted_deltaR_ditaupair,
         boosted_mt_1,
         boosted_mt_2,
         boosted_p4_tautaubb,
-        boosted_pt_tautaubb,
-        boosted_mass_tautaubb,
-        # boosted_pt_add,
-        # boosted_eta_add,
-        # boosted_phi_add,
-        # boosted_mass_add,
+        boosted_p4_tautaubb_components,
+        # boosted_p4_add_components,
     ],
 )
 boostedETDiTauPairQuantities = ProducerGroup(
@@ -701,18 +612,13 @@ boostedETDiTauPairQuantities = ProducerGroup(
         UnrollboostedTauLV2,
         boosted_tau_decaymode_1_notau,
         boosted_p4_vis,
-        boosted_m_vis,
-        boosted_pt_vis,
+        boosted_p4_vis_components,
         boosted_deltaR_ditaupair,
         boosted_mt_1,
         boosted_mt_2,
         boosted_p4_tautaubb,
-        boosted_pt_tautaubb,
-        boosted_mass_tautaubb,
-        # boosted_pt_add,
-        # boosted_eta_add,
-        # boosted_phi_add,
-        # boosted_mass_add,
+        boosted_p4_tautaubb_components,
+        # boosted_p4_add_components,
     ],
 )
 boostedTTDiTauPairQuantities = ProducerGroup(
@@ -725,13 +631,11 @@ boostedTTDiTauPairQuantities = ProducerGroup(
         UnrollboostedTauLV1,
         UnrollboostedTauLV2,
         boosted_p4_vis,
-        boosted_m_vis,
-        boosted_pt_vis,
+        boosted_p4_vis_components,
         boosted_deltaR_ditaupair,
         boosted_mt_1,
         boosted_mt_2,
         boosted_p4_tautaubb,
-        boosted_pt_tautaubb,
-        boosted_mass_tautaubb,
+        boosted_p4_tautaubb_components,
     ],
 )
\ No newline at end of file
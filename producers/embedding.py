@@ -173,6 +173,9 @@ TauEmbeddingSelectionSF = ProducerGroup(
 )
 
 # Muon ID/Iso/Trigger SFS
+# The scale factors of the embedding measurements are evaluated with the
+# embedding functions of CROWN, which multiply them by the extrapolation
+# factors of the embedding settings, instead of scalefactor::lepton::Evaluate.
 
 TauEmbeddingMuonIDSF_1 = Producer(
     name="TauEmbeddingMuonIDSF_1",
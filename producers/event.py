@@ -7,6 +7,7 @@ from code_generation.producer import (
     ProducerGroup,
     VectorProducer,
 )
+from code_generation.quantity import Quantity
 from .electrons import DiElectronVeto
 from .muons import DiMuonVeto
 
@@ -27,9 +28,11 @@ RunLumiEventFilter = VectorProducer(
     ],
 )
 
+# The golden JSON file is indexed once, such that the certified luminosity
+# sections of each event are looked up with binary searches
 JSONFilter = BaseFilter(
     name="JSONFilter",
-    call='event::filter::GoldenJSON({df}, correctionManager, "GoldenJSONFilter", {input}, "{golden_json_file}")',
+    call='xyh::lumi::GoldenJSONFilter({df}, "GoldenJSONFilter", {input}, "{golden_json_file}")',
     input=[nanoAOD.run, nanoAOD.luminosityBlock],
     scopes=["global"],
 )
@@ -104,18 +107,35 @@ npartons = Producer(
     scopes=["global"],
 )
 
-PUweights = Producer(
-    name="PUweights",
-    call="""event::reweighting::Pileup(
+# The pileup weights of all variations are read from a table, which is
+# calculated once from the correction file. The pileup shifts only rerun
+# `PUweights`, which selects the variation given by `PU_reweighting_variation`.
+PUweightVariations = Producer(
+    name="PUweightVariations",
+    call="""event::reweighting::PileupTable(
         {df},
         correctionManager,
-        {output},
+        {output_vec},
         {input},
         "{PU_reweighting_file}",
         "{PU_reweighting_era}",
-        "{PU_reweighting_variation}")
+        {vec_open}"nominal", "up", "down"{vec_close})
         """,
     input=[nanoAOD.Pileup_nTrueInt],
+    output=[q.puweight_nominal, q.puweight_up, q.puweight_down],
+    scopes=["global"],
+)
+
+PUweights = Producer(
+    name="PUweights",
+    call="""event::reweighting::SelectVariation(
+        {df},
+        {output},
+        {input_vec},
+        {vec_open}"nominal", "up", "down"{vec_close},
+        "{PU_reweighting_variation}")
+        """,
+    input=[q.puweight_nominal, q.puweight_up, q.puweight_down],
     output=[q.puweight],
     scopes=["global"],
 )
@@ -261,3 +281,54 @@ NMSSM_LHE_Scale_weight = Producer(
     output=[q.lhe_scale_weight],
     scopes=["global", "em", "et", "mt", "tt", "mm", "ee"],
 )
+
+# LHE scale variations extracted in one pass together with the nominal LHE
+# scale weight by the `*LHEScaleWeightVariations` producers below, instead of
+# rerunning `LHE_Scale_weight` in one systematic shift per variation. Each
+# variation is given as (shift name, muR, muF), where `None` denotes the
+# nominal value given by the `muR` and `muF` parameters. The output columns
+# are named like the outputs of the corresponding systematic shifts, e.g.
+# `lhe_scale_weight__muRWeightUp`.
+LHE_SCALE_VARIATIONS = [
+    ("muRWeightUp", 2.0, None),
+    ("muRWeightDown", 0.5, None),
+    ("muFWeightUp", None, 2.0),
+    ("muFWeightDown", None, 0.5),
+]
+_lhe_scale_muRs = ", ".join(
+    ["{muR}"] + ["{muR}" if muR is None else str(muR) for _, muR, _ in LHE_SCALE_VARIATIONS]
+)
+_lhe_scale_muFs = ", ".join(
+    ["{muF}"] + ["{muF}" if muF is None else str(muF) for _, _, muF in LHE_SCALE_VARIATIONS]
+)
+LHE_SCALE_WEIGHT_VARIATIONS = [q.lhe_scale_weight] + [
+    Quantity(f"{q.lhe_scale_weight.name}__{shift}") for shift, _, _ in LHE_SCALE_VARIATIONS
+]
+LHEScaleWeightVariations = Producer(
+    name="LHEScaleWeightVariations",
+    call=f"""event::reweighting::LHEScaleWeights(
+        {{df}},
+        {{output_vec}},
+        {{input}},
+        {{vec_open}}{_lhe_scale_muRs}{{vec_close}},
+        {{vec_open}}{_lhe_scale_muFs}{{vec_close}},
+        false)
+        """,
+    input=[nanoAOD.LHEScaleWeight],
+    output=LHE_SCALE_WEIGHT_VARIATIONS,
+    scopes=["global", "em", "et", "mt", "tt", "mm", "ee"],
+)
+NMSSMLHEScaleWeightVariations = Producer(
+    name="NMSSMLHEScaleWeightVariations",
+    call=f"""event::reweighting::LHEScaleWeights(
+        {{df}},
+        {{output_vec}},
+        {{input}},
+        {{vec_open}}{_lhe_scale_muRs}{{vec_close}},
+        {{vec_open}}{_lhe_scale_muFs}{{vec_close}},
+        true)
+        """,
+    input=[nanoAOD.LHEScaleWeight],
+    output=LHE_SCALE_WEIGHT_VARIATIONS,
+    scopes=["global", "em", "et", "mt", "tt", "mm", "ee"],
+)
@@ -1,6 +1,8 @@
 from ..quantities import output as q
 from ..quantities import nanoAOD as nanoAOD
 from code_generation.producer import Producer
+from code_generation.quantity import Quantity
+from typing import Dict, List, Tuple
 
 RawFakeFactors_nmssm_lt = Producer(
     name="RawFakeFactors_nmssm_lt",
@@ -169,3 +171,329 @@ FakeFactors_nmssm_tt_boosted_2 = Producer(
     output=[q.fake_factor_boosted_2],
     scopes=["tt"],
 )
+
+# Fake factor variations evaluated in one pass together with the nominal fake
+# factor by the `*FakeFactorVariations*` producers below. Each variation is
+# given as (shift name, varied parameter of the C++ function, name of the
+# variation in the correctionlib files). The output columns are named like the
+# outputs of the corresponding systematic shifts, e.g.
+# `fake_factor__QCDFFslopeUncUp`.
+FF_VARIATIONS_LT = [
+    ("QCDFFslopeUncUp", "qcd", "QCDFFslopeUncUp"),
+    ("QCDFFslopeUncDown", "qcd", "QCDFFslopeUncDown"),
+    ("QCDFFnormUncUp", "qcd", "QCDFFnormUncUp"),
+    ("QCDFFnormUncDown", "qcd", "QCDFFnormUncDown"),
+    ("QCDFFmcSubUncUp", "qcd", "QCDFFmcSubUncUp"),
+    ("QCDFFmcSubUncDown", "qcd", "QCDFFmcSubUncDown"),
+    ("WjetsFFslopeUncUp", "wjets", "WjetsFFslopeUncUp"),
+    ("WjetsFFslopeUncDown", "wjets", "WjetsFFslopeUncDown"),
+    ("WjetsFFnormUncUp", "wjets", "WjetsFFnormUncUp"),
+    ("WjetsFFnormUncDown", "wjets", "WjetsFFnormUncDown"),
+    ("WjetsFFmcSubUncUp", "wjets", "WjetsFFmcSubUncUp"),
+    ("WjetsFFmcSubUncDown", "wjets", "WjetsFFmcSubUncDown"),
+    ("ttbarFFslopeUncUp", "ttbar", "ttbarFFslopeUncUp"),
+    ("ttbarFFslopeUncDown", "ttbar", "ttbarFFslopeUncDown"),
+    ("ttbarFFnormUncUp", "ttbar", "ttbarFFnormUncUp"),
+    ("ttbarFFnormUncDown", "ttbar", "ttbarFFnormUncDown"),
+    ("fracQCDUncUp", "fraction", "process_fractionsfracQCDUncUp"),
+    ("fracQCDUncDown", "fraction", "process_fractionsfracQCDUncDown"),
+    ("fracWjetsUncUp", "fraction", "process_fractionsfracWjetsUncUp"),
+    ("fracWjetsUncDown", "fraction", "process_fractionsfracWjetsUncDown"),
+    ("fracTTbarUncUp", "fraction", "process_fractionsfracTTbarUncUp"),
+    ("fracTTbarUncDown", "fraction", "process_fractionsfracTTbarUncDown"),
+    ("QCDClosureLeadingLepPtCorrUp", "qcd_corr_leppt", "QCDnonClosureLeadingLepPtCorrUp"),
+    ("QCDClosureLeadingLepPtCorrDown", "qcd_corr_leppt", "QCDnonClosureLeadingLepPtCorrDown"),
+    ("QCDClosureSubleadingTauMassCorrUp", "qcd_corr_taumass", "QCDnonClosureSubleadingLepMassCorrUp"),
+    ("QCDClosureSubleadingTauMassCorrDown", "qcd_corr_taumass", "QCDnonClosureSubleadingLepMassCorrDown"),
+    ("QCDDRtoSRCorrUp", "qcd_corr_drsr", "QCDDRtoSRCorrUp"),
+    ("QCDDRtoSRCorrDown", "qcd_corr_drsr", "QCDDRtoSRCorrDown"),
+    ("WjetsClosureLeadingLepPtCorrUp", "wjets_corr_leppt", "WjetsnonClosureLeadingLepPtCorrUp"),
+    ("WjetsClosureLeadingLepPtCorrDown", "wjets_corr_leppt", "WjetsnonClosureLeadingLepPtCorrDown"),
+    ("WjetsClosureSubleadingTauMassCorrUp", "wjets_corr_taumass", "WjetsnonClosureSubleadingLepMassCorrUp"),
+    ("WjetsClosureSubleadingTauMassCorrDown", "wjets_corr_taumass", "WjetsnonClosureSubleadingLepMassCorrDown"),
+    ("WjetsDRtoSRCorrUp", "wjets_corr_drsr", "WjetsDRtoSRCorrUp"),
+    ("WjetsDRtoSRCorrDown", "wjets_corr_drsr", "WjetsDRtoSRCorrDown"),
+    ("ttbarClosureLeadingLepPtCorrUp", "ttbar_corr_leppt", "ttbarnonClosureLeadingLepPtCorrUp"),
+    ("ttbarClosureLeadingLepPtCorrDown", "ttbar_corr_leppt", "ttbarnonClosureLeadingLepPtCorrDown"),
+    ("ttbarClosureSubleadingTauMassCorrUp", "ttbar_corr_taumass", "ttbarnonClosureSubleadingLepMassCorrUp"),
+    ("ttbarClosureSubleadingTauMassCorrDown", "ttbar_corr_taumass", "ttbarnonClosureSubleadingLepMassCorrDown"),
+]
+FF_VARIATIONS_TT_1 = [
+    ("QCDFFslopeUncUp", "qcd", "QCDFFslopeUncUp"),
+    ("QCDFFslopeUncDown", "qcd", "QCDFFslopeUncDown"),
+    ("QCDFFnormUncUp", "qcd", "QCDFFnormUncUp"),
+    ("QCDFFnormUncDown", "qcd", "QCDFFnormUncDown"),
+    ("QCDFFmcSubUncUp", "qcd", "QCDFFmcSubUncUp"),
+    ("QCDFFmcSubUncDown", "qcd", "QCDFFmcSubUncDown"),
+    ("ttbarFFslopeUncUp", "ttbar", "ttbarFFslopeUncUp"),
+    ("ttbarFFslopeUncDown", "ttbar", "ttbarFFslopeUncDown"),
+    ("ttbarFFnormUncUp", "ttbar", "ttbarFFnormUncUp"),
+    ("ttbarFFnormUncDown", "ttbar", "ttbarFFnormUncDown"),
+    ("fracQCDUncUp", "fraction", "process_fractionsfracQCDUncUp"),
+    ("fracQCDUncDown", "fraction", "process_fractionsfracQCDUncDown"),
+    ("fracWjetsUncUp", "fraction", "process_fractionsfracWjetsUncUp"),
+    ("fracWjetsUncDown", "fraction", "process_fractionsfracWjetsUncDown"),
+    ("fracTTbarUncUp", "fraction", "process_fractionsfracTTbarUncUp"),
+    ("fracTTbarUncDown", "fraction", "process_fractionsfracTTbarUncDown"),
+    ("QCDClosureSubleadingLepPtCorrUp", "qcd_corr_leppt", "QCDnonClosureSubleadingLepPtCorrUp"),
+    ("QCDClosureSubleadingLepPtCorrDown", "qcd_corr_leppt", "QCDnonClosureSubleadingLepPtCorrDown"),
+    ("QCDClosureLeadingTauMassCorrUp", "qcd_corr_taumass", "QCDnonClosureLeadingLepMassCorrUp"),
+    ("QCDClosureLeadingTauMassCorrDown", "qcd_corr_taumass", "QCDnonClosureLeadingLepMassCorrDown"),
+    ("QCDDRtoSRCorrUp", "qcd_corr_drsr", "QCDDRtoSRCorrUp"),
+    ("QCDDRtoSRCorrDown", "qcd_corr_drsr", "QCDDRtoSRCorrDown"),
+    ("ttbarClosureSubleadingLepPtCorrUp", "ttbar_corr_leppt", "ttbarnonClosureSubleadingLepPtCorrUp"),
+    ("ttbarClosureSubleadingLepPtCorrDown", "ttbar_corr_leppt", "ttbarnonClosureSubleadingLepPtCorrDown"),
+    ("ttbarClosureLeadingTauMassCorrUp", "ttbar_corr_taumass", "ttbarnonClosureLeadingLepMassCorrUp"),
+    ("ttbarClosureLeadingTauMassCorrDown", "ttbar_corr_taumass", "ttbarnonClosureLeadingLepMassCorrDown"),
+]
+FF_VARIATIONS_TT_2 = [
+    ("QCDSubleadingFFslopeUncUp", "qcd", "QCD_subleadingFFslopeUncUp"),
+    ("QCDSubleadingFFslopeUncDown", "qcd", "QCD_subleadingFFslopeUncDown"),
+    ("QCDSubleadingFFnormUncUp", "qcd", "QCD_subleadingFFnormUncUp"),
+    ("QCDSubleadingFFnormUncDown", "qcd", "QCD_subleadingFFnormUncDown"),
+    ("QCDSubleadingFFmcSubUncUp", "qcd", "QCD_subleadingFFmcSubUncUp"),
+    ("QCDSubleadingFFmcSubUncDown", "qcd", "QCD_subleadingFFmcSubUncDown"),
+    ("ttbarSubleadingFFslopeUncUp", "ttbar", "ttbar_subleadingFFslopeUncUp"),
+    ("ttbarSubleadingFFslopeUncDown", "ttbar", "ttbar_subleadingFFslopeUncDown"),
+    ("ttbarSubleadingFFnormUncUp", "ttbar", "ttbar_subleadingFFnormUncUp"),
+    ("ttbarSubleadingFFnormUncDown", "ttbar", "ttbar_subleadingFFnormUncDown"),
+    ("fracQCDSubleadingUncUp", "fraction", "process_fractions_subleadingfracQCDUncUp"),
+    ("fracQCDSubleadingUncDown", "fraction", "process_fractions_subleadingfracQCDUncDown"),
+    ("fracWjetsSubleadingUncUp", "fraction", "process_fractions_subleadingfracWjetsUncUp"),
+    ("fracWjetsSubleadingUncDown", "fraction", "process_fractions_subleadingfracWjetsUncDown"),
+    ("fracTTbarSubleadingUncUp", "fraction", "process_fractions_subleadingfracTTbarUncUp"),
+    ("fracTTbarSubleadingUncDown", "fraction", "process_fractions_subleadingfracTTbarUncDown"),
+    ("QCDSubleadingClosureLeadingLepPtCorrUp", "qcd_corr_leppt", "QCD_subleadingnonClosureLeadingLepPtCorrUp"),
+    ("QCDSubleadingClosureLeadingLepPtCorrDown", "qcd_corr_leppt", "QCD_subleadingnonClosureLeadingLepPtCorrDown"),
+    ("QCDSubleadingClosureSubleadingTauMassCorrUp", "qcd_corr_taumass", "QCD_subleadingnonClosureSubleadingLepMassCorrUp"),
+    ("QCDSubleadingClosureSubleadingTauMassCorrDown", "qcd_corr_taumass", "QCD_subleadingnonClosureSubleadingLepMassCorrDown"),
+    ("QCDSubleadingDRtoSRCorrUp", "qcd_corr_drsr", "QCD_subleadingDRtoSRCorrUp"),
+    ("QCDSubleadingDRtoSRCorrDown", "qcd_corr_drsr", "QCD_subleadingDRtoSRCorrDown"),
+    ("ttbarSubleadingClosureLeadingLepPtCorrUp", "ttbar_corr_leppt", "ttbar_subleadingnonClosureLeadingLepPtCorrUp"),
+    ("ttbarSubleadingClosureLeadingLepPtCorrDown", "ttbar_corr_leppt", "ttbar_subleadingnonClosureLeadingLepPtCorrDown"),
+    ("ttbarSubleadingClosureSubleadingTauMassCorrUp", "ttbar_corr_taumass", "ttbar_subleadingnonClosureSubleadingLepMassCorrUp"),
+    ("ttbarSubleadingClosureSubleadingTauMassCorrDown", "ttbar_corr_taumass", "ttbar_subleadingnonClosureSubleadingLepMassCorrDown"),
+]
+
+# only the fake factors and the process fractions enter the raw fake factors
+RAW_FF_VARIATION_PARAMETERS = ["qcd", "wjets", "ttbar", "fraction"]
+RAW_FF_VARIATIONS_LT = [
+    variation
+    for variation in FF_VARIATIONS_LT
+    if variation[1] in RAW_FF_VARIATION_PARAMETERS
+]
+RAW_FF_VARIATIONS_TT_1 = [
+    variation
+    for variation in FF_VARIATIONS_TT_1
+    if variation[1] in RAW_FF_VARIATION_PARAMETERS
+]
+RAW_FF_VARIATIONS_TT_2 = [
+    variation
+    for variation in FF_VARIATIONS_TT_2
+    if variation[1] in RAW_FF_VARIATION_PARAMETERS
+]
+
+
+def variation_outputs(
+    quantity: Quantity, variations: List[Tuple[str, str, str]]
+) -> List[Quantity]:
+    """
+    Output quantities of a fake factor variations producer: the nominal fake
+    factor followed by one quantity per variation.
+
+    :param quantity: Quantity of the nominal fake factor.
+    :param variations: List of (shift name, varied parameter, variation name).
+    :return: List of output quantities.
+    """
+    return [quantity] + [
+        Quantity(f"{quantity.name}__{shift}") for shift, _, _ in variations
+    ]
+
+
+def variation_config(
+    prefix: str, variations: List[Tuple[str, str, str]]
+) -> Dict[str, str]:
+    """
+    Configuration parameters with the varied parameters and variation names
+    as C++ string vectors, e.g. `{"qcd", "fraction"}`.
+
+    :param prefix: Prefix of the configuration parameters, e.g. `ff` results
+        in `ff_variation_parameters` and `ff_variation_names`.
+    :param variations: List of (shift name, varied parameter, variation name).
+    :return: Dictionary with the two configuration parameters.
+    """
+    parameters = ", ".join(f'"{parameter}"' for _, parameter, _ in variations)
+    names = ", ".join(f'"{name}"' for _, _, name in variations)
+    return {
+        f"{prefix}_variation_parameters": f"{{{parameters}}}",
+        f"{prefix}_variation_names": f"{{{names}}}",
+    }
+
+
+RawFakeFactorVariations_nmssm_lt = Producer(
+    name="RawFakeFactorVariations_nmssm_lt",
+    call='fakefactors::raw_fakefactor_nmssm_lt_variations({df}, {output_vec}, {input}, {raw_ff_variation_parameters}, {raw_ff_variation_names}, "{ff_file}")',
+    input=[
+        q.pt_2,
+        q.n_jets,
+        q.mt_1,
+        q.n_bjets,
+    ],
+    output=variation_outputs(q.raw_fake_factor, RAW_FF_VARIATIONS_LT),
+    scopes=["mt", "et"],
+)
+RawFakeFactorVariations_nmssm_boosted_lt = Producer(
+    name="RawFakeFactorVariations_nmssm_boosted_lt",
+    call='fakefactors::raw_fakefactor_nmssm_lt_variations({df}, {output_vec}, {input}, {raw_ff_variation_parameters}, {raw_ff_variation_names}, "{ff_file_boosted}")',
+    input=[
+        q.boosted_pt_2,
+        q.n_jets_boosted,
+        q.boosted_mt_1,
+        q.n_bjets_boosted,
+    ],
+    output=variation_outputs(q.raw_fake_factor_boosted, RAW_FF_VARIATIONS_LT),
+    scopes=["mt", "et"],
+)
+RawFakeFactorVariations_nmssm_tt_1 = Producer(
+    name="RawFakeFactorVariations_nmssm_tt_1",
+    call='fakefactors::raw_fakefactor_nmssm_tt_variations({df}, {output_vec}, 0, {input}, {raw_ff_variation_parameters}, {raw_ff_variation_names}, "{ff_file}")',
+    input=[
+        q.pt_1,
+        q.pt_2,
+        q.n_jets,
+        q.m_vis,
+        q.n_bjets,
+    ],
+    output=variation_outputs(q.raw_fake_factor_1, RAW_FF_VARIATIONS_TT_1),
+    scopes=["tt"],
+)
+RawFakeFactorVariations_nmssm_tt_2 = Producer(
+    name="RawFakeFactorVariations_nmssm_tt_2",
+    call='fakefactors::raw_fakefactor_nmssm_tt_variations({df}, {output_vec}, 1, {input}, {raw_ff_subleading_variation_parameters}, {raw_ff_subleading_variation_names}, "{ff_file}")',
+    input=[
+        q.pt_1,
+        q.pt_2,
+        q.n_jets,
+        q.m_vis,
+        q.n_bjets,
+    ],
+    output=variation_outputs(q.raw_fake_factor_2, RAW_FF_VARIATIONS_TT_2),
+    scopes=["tt"],
+)
+RawFakeFactorVariations_nmssm_tt_boosted_1 = Producer(
+    name="RawFakeFactorVariations_nmssm_tt_boosted_1",
+    call='fakefactors::raw_fakefactor_nmssm_tt_variations({df}, {output_vec}, 0, {input}, {raw_ff_variation_parameters}, {raw_ff_variation_names}, "{ff_file_boosted}")',
+    input=[
+        q.boosted_pt_1,
+        q.boosted_pt_2,
+        q.n_jets_boosted,
+        q.boosted_m_vis,
+        q.n_bjets_boosted,
+    ],
+    output=variation_outputs(q.raw_fake_factor_boosted_1, RAW_FF_VARIATIONS_TT_1),
+    scopes=["tt"],
+)
+RawFakeFactorVariations_nmssm_tt_boosted_2 = Producer(
+    name="RawFakeFactorVariations_nmssm_tt_boosted_2",
+    call='fakefactors::raw_fakefactor_nmssm_tt_variations({df}, {output_vec}, 1, {input}, {raw_ff_subleading_variation_parameters}, {raw_ff_subleading_variation_names}, "{ff_file_boosted}")',
+    input=[
+        q.boosted_pt_1,
+        q.boosted_pt_2,
+        q.n_jets_boosted,
+        q.boosted_m_vis,
+        q.n_bjets_boosted,
+    ],
+    output=variation_outputs(q.raw_fake_factor_boosted_2, RAW_FF_VARIATIONS_TT_2),
+    scopes=["tt"],
+)
+
+FakeFactorVariations_nmssm_lt = Producer(
+    name="FakeFactorVariations_nmssm_lt",
+    call='fakefactors::fakefactor_nmssm_lt_variations({df}, {output_vec}, {input}, {ff_variation_parameters}, {ff_variation_names}, "{ff_file}", "{ff_corr_file}")',
+    input=[
+        q.pt_2,
+        q.n_jets,
+        q.mt_1,
+        q.n_bjets,
+        q.pt_1,
+        q.mass_2,
+        q.m_vis,
+    ],
+    output=variation_outputs(q.fake_factor, FF_VARIATIONS_LT),
+    scopes=["mt", "et"],
+)
+FakeFactorVariations_nmssm_boosted_lt = Producer(
+    name="FakeFactorVariations_nmssm_boosted_lt",
+    call='fakefactors::fakefactor_nmssm_lt_variations({df}, {output_vec}, {input}, {ff_variation_parameters}, {ff_variation_names}, "{ff_file_boosted}", "{ff_corr_file_boosted}")',
+    input=[
+        q.boosted_pt_2,
+        q.n_jets_boosted,
+        q.boosted_mt_1,
+        q.n_bjets_boosted,
+        q.boosted_pt_1,
+        q.boosted_mass_2,
+        q.boosted_m_vis,
+    ],
+    output=variation_outputs(q.fake_factor_boosted, FF_VARIATIONS_LT),
+    scopes=["mt", "et"],
+)
+FakeFactorVariations_nmssm_tt_1 = Producer(
+    name="FakeFactorVariations_nmssm_tt_1",
+    call='fakefactors::fakefactor_nmssm_tt_variations({df}, {output_vec}, 0, {input}, {ff_variation_parameters}, {ff_variation_names}, "{ff_file}", "{ff_corr_file}")',
+    input=[
+        q.pt_1,
+        q.pt_2,
+        q.n_jets,
+        q.m_vis,
+        q.n_bjets,
+        q.mass_1,
+        q.mass_2,
+    ],
+    output=variation_outputs(q.fake_factor_1, FF_VARIATIONS_TT_1),
+    scopes=["tt"],
+)
+FakeFactorVariations_nmssm_tt_2 = Producer(
+    name="FakeFactorVariations_nmssm_tt_2",
+    call='fakefactors::fakefactor_nmssm_tt_variations({df}, {output_vec}, 1, {input}, {ff_subleading_variation_parameters}, {ff_subleading_variation_names}, "{ff_file}", "{ff_corr_file}")',
+    input=[
+        q.pt_1,
+        q.pt_2,
+        q.n_jets,
+        q.m_vis,
+        q.n_bjets,
+        q.mass_1,
+        q.mass_2,
+    ],
+    output=variation_outputs(q.fake_factor_2, FF_VARIATIONS_TT_2),
+    scopes=["tt"],
+)
+FakeFactorVariations_nmssm_tt_boosted_1 = Producer(
+    name="FakeFactorVariations_nmssm_tt_boosted_1",
+    call='fakefactors::fakefactor_nmssm_tt_variations({df}, {output_vec}, 0, {input}, {ff_variation_parameters}, {ff_variation_names}, "{ff_file_boosted}", "{ff_corr_file_boosted}")',
+    input=[
+        q.boosted_pt_1,
+        q.boosted_pt_2,
+        q.n_jets_boosted,
+        q.boosted_m_vis,
+        q.n_bjets_boosted,
+        q.boosted_mass_1,
+        q.boosted_mass_2,
+    ],
+    output=variation_outputs(q.fake_factor_boosted_1, FF_VARIATIONS_TT_1),
+    scopes=["tt"],
+)
+FakeFactorVariations_nmssm_tt_boosted_2 = Producer(
+    name="FakeFactorVariations_nmssm_tt_boosted_2",
+    call='fakefactors::fakefactor_nmssm_tt_variations({df}, {output_vec}, 1, {input}, {ff_subleading_variation_parameters}, {ff_subleading_variation_names}, "{ff_file_boosted}", "{ff_corr_file_boosted}")',
+    input=[
+        q.boosted_pt_1,
+        q.boosted_pt_2,
+        q.n_jets_boosted,
+        q.boosted_m_vis,
+        q.n_bjets_boosted,
+        q.boosted_mass_1,
+        q.boosted_mass_2,
+    ],
+    output=variation_outputs(q.fake_factor_boosted_2, FF_VARIATIONS_TT_2),
+    scopes=["tt"],
+)
@@ -9,7 +9,11 @@ from ..quantities import nanoAOD as nanoAOD
 from analysis_configurations.quantities import nanoAODv12_run3
 from code_generation.producer import Producer, ProducerGroup
 
-from ._helpers import jerc_producer_factory
+from ._helpers import (
+    jerc_producer_factory,
+    lorentzvector_components_producer_factory,
+    object_attributes_producer_factory,
+)
 from ..constants import SCOPES, GLOBAL_SCOPES
 
 
@@ -215,32 +219,15 @@ NumberOfFatJets_boosted = Producer(
     output=[q.nfatjets_boosted],
     scopes=SCOPES,
 )
-fj_pt_1 = Producer(
-    name="fj_pt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.fatjet_p4_1],
-    output=[q.fj_pt_1],
-    scopes=SCOPES,
-)
-fj_eta_1 = Producer(
-    name="fj_eta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.fatjet_p4_1],
-    output=[q.fj_eta_1],
-    scopes=SCOPES,
-)
-fj_phi_1 = Producer(
-    name="fj_phi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.fatjet_p4_1],
-    output=[q.fj_phi_1],
-    scopes=SCOPES,
-)
-fj_mass_1 = Producer(
-    name="fj_mass_1",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.fatjet_p4_1],
-    output=[q.fj_mass_1],
+fatjet_p4_1_components = lorentzvector_components_producer_factory(
+    name="fatjet_p4_1_components",
+    p4=q.fatjet_p4_1,
+    output={
+        "pt": q.fj_pt_1,
+        "eta": q.fj_eta_1,
+        "phi": q.fj_phi_1,
+        "mass": q.fj_mass_1,
+    },
     scopes=SCOPES,
 )
 fj_msoftdrop_1 = Producer(
@@ -271,32 +258,15 @@ fj_nsubjettiness_3over2_1 = Producer(
     output=[q.fj_nsubjettiness_3over2_1],
     scopes=SCOPES,
 )
-fj_pt_2 = Producer(
-    name="fj_pt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.fatjet_p4_2],
-    output=[q.fj_pt_2],
-    scopes=SCOPES,
-)
-fj_eta_2 = Producer(
-    name="fj_eta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.fatjet_p4_2],
-    output=[q.fj_eta_2],
-    scopes=SCOPES,
-)
-fj_phi_2 = Producer(
-    name="fj_phi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.fatjet_p4_2],
-    output=[q.fj_phi_2],
-    scopes=SCOPES,
-)
-fj_mass_2 = Producer(
-    name="fj_mass_2",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.fatjet_p4_2],
-    output=[q.fj_mass_2],
+fatjet_p4_2_components = lorentzvector_components_producer_factory(
+    name="fatjet_p4_2_components",
+    p4=q.fatjet_p4_2,
+    output={
+        "pt": q.fj_pt_2,
+        "eta": q.fj_eta_2,
+        "phi": q.fj_phi_2,
+        "mass": q.fj_mass_2,
+    },
     scopes=SCOPES,
 )
 fj_msoftdrop_2 = Producer(
@@ -339,18 +309,12 @@ BasicFatJetQuantities = ProducerGroup(
         # LVFatJet2,
         NumberOfFatJets,
         # NumberOfFatJets_boosted,
-        fj_pt_1,
-        fj_eta_1,
-        fj_phi_1,
-        fj_mass_1,
+        fatjet_p4_1_components,
         fj_msoftdrop_1,
         fj_particleNet_XbbvsQCD_1,
         fj_nsubjettiness_2over1_1,
         fj_nsubjettiness_3over2_1,
-        # fj_pt_2,
-        # fj_eta_2,
-        # fj_phi_2,
-        # fj_mass_2,
+        # fatjet_p4_2_components,
         # fj_msoftdrop_2,
         # fj_particleNet_XbbvsQCD_2,
         # fj_nsubjettiness_2over1_2,
@@ -389,32 +353,15 @@ LVmatchedFatJet = Producer(
     output=[q.matched_fatjet_p4],
     scopes=SCOPES,
 )
-fj_matched_pt = Producer(
-    name="fj_matched_pt",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.matched_fatjet_p4],
-    output=[q.fj_matched_pt],
-    scopes=SCOPES,
-)
-fj_matched_eta = Producer(
-    name="fj_matched_eta",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.matched_fatjet_p4],
-    output=[q.fj_matched_eta],
-    scopes=SCOPES,
-)
-fj_matched_phi = Producer(
-    name="fj_matched_phi",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.matched_fatjet_p4],
-    output=[q.fj_matched_phi],
-    scopes=SCOPES,
-)
-fj_matched_mass = Producer(
-    name="fj_matched_mass",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.matched_fatjet_p4],
-    output=[q.fj_matched_mass],
+matched_fatjet_p4_components = lorentzvector_components_producer_factory(
+    name="matched_fatjet_p4_components",
+    p4=q.matched_fatjet_p4,
+    output={
+        "pt": q.fj_matched_pt,
+        "eta": q.fj_matched_eta,
+        "phi": q.fj_matched_phi,
+        "mass": q.fj_matched_mass,
+    },
     scopes=SCOPES,
 )
 fj_matched_msoftdrop = Producer(
@@ -454,10 +401,7 @@ BasicMatchedFatJetQuantities = ProducerGroup(
     scopes=SCOPES,
     subproducers=[
         LVmatchedFatJet,
-        fj_matched_pt,
-        fj_matched_eta,
-        fj_matched_phi,
-        fj_matched_mass,
+        matched_fatjet_p4_components,
         fj_matched_msoftdrop,
         fj_matched_particleNet_XbbvsQCD,
         fj_matched_nsubjettiness_2over1,
@@ -489,32 +433,15 @@ LVXbbFatJet = Producer(
     output=[q.Xbb_fatjet_p4],
     scopes=SCOPES,
 )
-fj_Xbb_pt = Producer(
-    name="fj_Xbb_pt",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.Xbb_fatjet_p4],
-    output=[q.fj_Xbb_pt],
-    scopes=SCOPES,
-)
-fj_Xbb_eta = Producer(
-    name="fj_Xbb_eta",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.Xbb_fatjet_p4],
-    output=[q.fj_Xbb_eta],
-    scopes=SCOPES,
-)
-fj_Xbb_phi = Producer(
-    name="fj_Xbb_phi",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.Xbb_fatjet_p4],
-    output=[q.fj_Xbb_phi],
-    scopes=SCOPES,
-)
-fj_Xbb_mass = Producer(
-    name="fj_Xbb_mass",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.Xbb_fatjet_p4],
-    output=[q.fj_Xbb_mass],
+Xbb_fatjet_p4_components = lorentzvector_components_producer_factory(
+    name="Xbb_fatjet_p4_components",
+    p4=q.Xbb_fatjet_p4,
+    output={
+        "pt": q.fj_Xbb_pt,
+        "eta": q.fj_Xbb_eta,
+        "phi": q.fj_Xbb_phi,
+        "mass": q.fj_Xbb_mass,
+    },
     scopes=SCOPES,
 )
 fj_Xbb_msoftdrop = Producer(
@@ -588,10 +515,7 @@ BasicXbbFatJetQuantities = ProducerGroup(
     scopes=SCOPES,
     subproducers=[
         LVXbbFatJet,
-        fj_Xbb_pt,
-        fj_Xbb_eta,
-        fj_Xbb_phi,
-        fj_Xbb_mass,
+        Xbb_fatjet_p4_components,
         fj_Xbb_msoftdrop,
         fj_Xbb_particleNet_XbbvsQCD,
         fj_Xbb_nsubjettiness_2over1,
@@ -624,39 +548,25 @@ LVXbbFatJet_boosted = Producer(
     output=[q.Xbb_fatjet_p4_boosted],
     scopes=SCOPES,
 )
-fj_Xbb_pt_boosted = Producer(
-    name="fj_Xbb_pt_boosted",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.Xbb_fatjet_p4_boosted],
-    output=[q.fj_Xbb_pt_boosted],
-    scopes=SCOPES,
-)
-fj_Xbb_eta_boosted = Producer(
-    name="fj_Xbb_eta_boosted",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.Xbb_fatjet_p4_boosted],
-    output=[q.fj_Xbb_eta_boosted],
-    scopes=SCOPES,
-)
-fj_Xbb_phi_boosted = Producer(
-    name="fj_Xbb_phi_boosted",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.Xbb_fatjet_p4_boosted],
-    output=[q.fj_Xbb_phi_boosted],
-    scopes=SCOPES,
-)
-fj_Xbb_mass_boosted = Producer(
-    name="fj_Xbb_mass_boosted",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.Xbb_fatjet_p4_boosted],
-    output=[q.fj_Xbb_mass_boosted],
+Xbb_fatjet_p4_boosted_components = lorentzvector_components_producer_factory(
+    name="Xbb_fatjet_p4_boosted_components",
+    p4=q.Xbb_fatjet_p4_boosted,
+    output={
+        "pt": q.fj_Xbb_pt_boosted,
+        "eta": q.fj_Xbb_eta_boosted,
+        "phi": q.fj_Xbb_phi_boosted,
+        "mass": q.fj_Xbb_mass_boosted,
+    },
     scopes=SCOPES,
 )
-fj_Xbb_msoftdrop_boosted = Producer(
-    name="fj_Xbb_msoftdrop_boosted",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.FatJet_msoftdrop, q.Xbb_fatjet_boosted],
-    output=[q.fj_Xbb_msoftdrop_boosted],
+fj_Xbb_attributes_boosted = object_attributes_producer_factory(
+    name="fj_Xbb_attributes_boosted",
+    index=q.Xbb_fatjet_boosted,
+    position=0,
+    attributes=[
+        ("float", nanoAOD.FatJet_msoftdrop, q.fj_Xbb_msoftdrop_boosted),
+        ("UChar_t", nanoAOD.FatJet_hadronFlavour, q.fj_Xbb_hadflavor_boosted),
+    ],
     scopes=SCOPES,
 )
 fj_Xbb_particleNet_XbbvsQCD_boosted = Producer(
@@ -680,13 +590,6 @@ fj_Xbb_nsubjettiness_3over2_boosted = Producer(
     output=[q.fj_Xbb_nsubjettiness_3over2_boosted],
     scopes=SCOPES,
 )
-fj_Xbb_hadflavor_boosted = Producer(
-    name="fj_Xbb_hadflavor_boosted",
-    call="event::quantity::Get<UChar_t>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.FatJet_hadronFlavour, q.Xbb_fatjet_boosted],
-    output=[q.fj_Xbb_hadflavor_boosted],
-    scopes=SCOPES,
-)
 fj_Xbb_nBhad_boosted = Producer(
     name="fj_Xbb_nBhad_boosted",
     call="event::quantity::Get<UChar_t>({df}, {output}, {input}, 0)",
@@ -723,15 +626,11 @@ BasicXbbFatJetQuantities_boosted = ProducerGroup(
     scopes=SCOPES,
     subproducers=[
         LVXbbFatJet_boosted,
-        fj_Xbb_pt_boosted,
-        fj_Xbb_eta_boosted,
-        fj_Xbb_phi_boosted,
-        fj_Xbb_mass_boosted,
-        fj_Xbb_msoftdrop_boosted,
+        Xbb_fatjet_p4_boosted_components,
+        fj_Xbb_attributes_boosted,
         fj_Xbb_particleNet_XbbvsQCD_boosted,
         fj_Xbb_nsubjettiness_2over1_boosted,
         fj_Xbb_nsubjettiness_3over2_boosted,
-        fj_Xbb_hadflavor_boosted,
     ],
 )
 LVLeadingFatJet = Producer(
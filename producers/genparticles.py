@@ -1,8 +1,9 @@
 from ..quantities import output as q
 from ..quantities import nanoAOD as nanoAOD
 from code_generation.producer import Producer, ProducerGroup
+from ._helpers import lorentzvector_components_producer_factory
 
-from ..constants import ET_SCOPES, MT_SCOPES, TT_SCOPES, EE_SCOPES, MM_SCOPES, EM_SCOPES, HAD_TAU_SCOPES, SCOPES
+from ..constants import GLOBAL_SCOPES, ET_SCOPES, MT_SCOPES, TT_SCOPES, EE_SCOPES, MM_SCOPES, EM_SCOPES, HAD_TAU_SCOPES, SCOPES
 
 
 ####################
@@ -244,60 +245,26 @@ LVTrueGenTau2 = Producer(
     scopes=SCOPES,
 )
 
-gen_pt_1 = Producer(
-    name="gen_pt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.gen_p4_1],
-    output=[q.gen_pt_1],
-    scopes=SCOPES,
-)
-gen_pt_2 = Producer(
-    name="gen_pt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.gen_p4_2],
-    output=[q.gen_pt_2],
-    scopes=SCOPES,
-)
-gen_eta_1 = Producer(
-    name="gen_eta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.gen_p4_1],
-    output=[q.gen_eta_1],
-    scopes=SCOPES,
-)
-gen_eta_2 = Producer(
-    name="gen_eta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.gen_p4_2],
-    output=[q.gen_eta_2],
-    scopes=SCOPES,
-)
-gen_phi_1 = Producer(
-    name="gen_phi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.gen_p4_1],
-    output=[q.gen_phi_1],
-    scopes=SCOPES,
-)
-gen_phi_2 = Producer(
-    name="gen_phi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.gen_p4_2],
-    output=[q.gen_phi_2],
-    scopes=SCOPES,
-)
-gen_mass_1 = Producer(
-    name="gen_mass_1",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.gen_p4_1],
-    output=[q.gen_mass_1],
-    scopes=SCOPES,
-)
-gen_mass_2 = Producer(
-    name="gen_mass_2",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.gen_p4_2],
-    output=[q.gen_mass_2],
+gen_p4_1_components = lorentzvector_components_producer_factory(
+    name="gen_p4_1_components",
+    p4=q.gen_p4_1,
+    output={
+        "pt": q.gen_pt_1,
+        "eta": q.gen_eta_1,
+        "phi": q.gen_phi_1,
+        "mass": q.gen_mass_1,
+    },
+    scopes=SCOPES,
+)
+gen_p4_2_components = lorentzvector_components_producer_factory(
+    name="gen_p4_2_components",
+    p4=q.gen_p4_2,
+    output={
+        "pt": q.gen_pt_2,
+        "eta": q.gen_eta_2,
+        "phi": q.gen_phi_2,
+        "mass": q.gen_mass_2,
+    },
     scopes=SCOPES,
 )
 gen_pdgid_1 = Producer(
@@ -346,60 +313,26 @@ gen_taujet_pt_2 = Producer(
     scopes=HAD_TAU_SCOPES,
 )
 
-genjet_pt_1 = Producer(
-    name="genjet_pt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.genjet_p4_1],
-    output=[q.genjet_pt_1],
-    scopes=SCOPES,
-)
-genjet_pt_2 = Producer(
-    name="genjet_pt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.genjet_p4_2],
-    output=[q.genjet_pt_2],
-    scopes=SCOPES,
-)
-genjet_eta_1 = Producer(
-    name="genjet_eta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.genjet_p4_1],
-    output=[q.genjet_eta_1],
-    scopes=SCOPES,
-)
-genjet_eta_2 = Producer(
-    name="genjet_eta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.genjet_p4_2],
-    output=[q.genjet_eta_2],
-    scopes=SCOPES,
-)
-genjet_phi_1 = Producer(
-    name="genjet_phi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.genjet_p4_1],
-    output=[q.genjet_phi_1],
-    scopes=SCOPES,
-)
-genjet_phi_2 = Producer(
-    name="genjet_phi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.genjet_p4_2],
-    output=[q.genjet_phi_2],
-    scopes=SCOPES,
-)
-genjet_mass_1 = Producer(
-    name="genjet_mass_1",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.genjet_p4_1],
-    output=[q.genjet_mass_1],
-    scopes=SCOPES,
-)
-genjet_mass_2 = Producer(
-    name="genjet_mass_2",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.genjet_p4_2],
-    output=[q.genjet_mass_2],
+genjet_p4_1_components = lorentzvector_components_producer_factory(
+    name="genjet_p4_1_components",
+    p4=q.genjet_p4_1,
+    output={
+        "pt": q.genjet_pt_1,
+        "eta": q.genjet_eta_1,
+        "phi": q.genjet_phi_1,
+        "mass": q.genjet_mass_1,
+    },
+    scopes=SCOPES,
+)
+genjet_p4_2_components = lorentzvector_components_producer_factory(
+    name="genjet_p4_2_components",
+    p4=q.genjet_p4_2,
+    output={
+        "pt": q.genjet_pt_2,
+        "eta": q.genjet_eta_2,
+        "phi": q.genjet_phi_2,
+        "mass": q.genjet_mass_2,
+    },
     scopes=SCOPES,
 )
 genjet_hadFlavour_1 = Producer(
@@ -423,60 +356,26 @@ genjet_m_inv = Producer(
     output=[q.genjet_m_inv],
     scopes=SCOPES,
 )
-gen_b_pt_1 = Producer(
-    name="gen_b_pt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.gen_b_p4_1],
-    output=[q.gen_b_pt_1],
-    scopes=SCOPES,
-)
-gen_b_pt_2 = Producer(
-    name="gen_b_pt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.gen_b_p4_2],
-    output=[q.gen_b_pt_2],
-    scopes=SCOPES,
-)
-gen_b_eta_1 = Producer(
-    name="gen_b_eta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.gen_b_p4_1],
-    output=[q.gen_b_eta_1],
-    scopes=SCOPES,
-)
-gen_b_eta_2 = Producer(
-    name="gen_b_eta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.gen_b_p4_2],
-    output=[q.gen_b_eta_2],
+gen_b_p4_1_components = lorentzvector_components_producer_factory(
+    name="gen_b_p4_1_components",
+    p4=q.gen_b_p4_1,
+    output={
+        "pt": q.gen_b_pt_1,
+        "eta": q.gen_b_eta_1,
+        "phi": q.gen_b_phi_1,
+        "mass": q.gen_b_mass_1,
+    },
     scopes=SCOPES,
 )
-gen_b_phi_1 = Producer(
-    name="gen_b_phi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.gen_b_p4_1],
-    output=[q.gen_b_phi_1],
-    scopes=SCOPES,
-)
-gen_b_phi_2 = Producer(
-    name="gen_b_phi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.gen_b_p4_2],
-    output=[q.gen_b_phi_2],
-    scopes=SCOPES,
-)
-gen_b_mass_1 = Producer(
-    name="gen_b_mass_1",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.gen_b_p4_1],
-    output=[q.gen_b_mass_1],
-    scopes=SCOPES,
-)
-gen_b_mass_2 = Producer(
-    name="gen_b_mass_2",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.gen_b_p4_2],
-    output=[q.gen_b_mass_2],
+gen_b_p4_2_components = lorentzvector_components_producer_factory(
+    name="gen_b_p4_2_components",
+    p4=q.gen_b_p4_2,
+    output={
+        "pt": q.gen_b_pt_2,
+        "eta": q.gen_b_eta_2,
+        "phi": q.gen_b_phi_2,
+        "mass": q.gen_b_mass_2,
+    },
     scopes=SCOPES,
 )
 gen_b_m_inv = Producer(
@@ -494,60 +393,26 @@ gen_b_deltaR = Producer(
     scopes=SCOPES,
 )
 
-gen_tau_pt_1 = Producer(
-    name="gen_tau_pt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.gen_tau_p4_1],
-    output=[q.gen_tau_pt_1],
+gen_tau_p4_1_components = lorentzvector_components_producer_factory(
+    name="gen_tau_p4_1_components",
+    p4=q.gen_tau_p4_1,
+    output={
+        "pt": q.gen_tau_pt_1,
+        "eta": q.gen_tau_eta_1,
+        "phi": q.gen_tau_phi_1,
+        "mass": q.gen_tau_mass_1,
+    },
     scopes=HAD_TAU_SCOPES,
 )
-gen_tau_pt_2 = Producer(
-    name="gen_tau_pt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.gen_tau_p4_2],
-    output=[q.gen_tau_pt_2],
-    scopes=HAD_TAU_SCOPES,
-)
-gen_tau_eta_1 = Producer(
-    name="gen_tau_eta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.gen_tau_p4_1],
-    output=[q.gen_tau_eta_1],
-    scopes=HAD_TAU_SCOPES,
-)
-gen_tau_eta_2 = Producer(
-    name="gen_tau_eta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.gen_tau_p4_2],
-    output=[q.gen_tau_eta_2],
-    scopes=HAD_TAU_SCOPES,
-)
-gen_tau_phi_1 = Producer(
-    name="gen_tau_phi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.gen_tau_p4_1],
-    output=[q.gen_tau_phi_1],
-    scopes=HAD_TAU_SCOPES,
-)
-gen_tau_phi_2 = Producer(
-    name="gen_tau_phi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.gen_tau_p4_2],
-    output=[q.gen_tau_phi_2],
-    scopes=HAD_TAU_SCOPES,
-)
-gen_tau_mass_1 = Producer(
-    name="gen_tau_mass_1",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.gen_tau_p4_1],
-    output=[q.gen_tau_mass_1],
-    scopes=HAD_TAU_SCOPES,
-)
-gen_tau_mass_2 = Producer(
-    name="gen_tau_mass_2",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.gen_tau_p4_2],
-    output=[q.gen_tau_mass_2],
+gen_tau_p4_2_components = lorentzvector_components_producer_factory(
+    name="gen_tau_p4_2_components",
+    p4=q.gen_tau_p4_2,
+    output={
+        "pt": q.gen_tau_pt_2,
+        "eta": q.gen_tau_eta_2,
+        "phi": q.gen_tau_phi_2,
+        "mass": q.gen_tau_mass_2,
+    },
     scopes=HAD_TAU_SCOPES,
 )
 gen_tau_m_inv = Producer(
@@ -572,10 +437,7 @@ UnrollGenJetLV1 = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        genjet_pt_1,
-        genjet_eta_1,
-        genjet_phi_1,
-        genjet_mass_1,
+        genjet_p4_1_components,
         genjet_hadFlavour_1,
     ],
 )
@@ -586,10 +448,7 @@ UnrollGenJetLV2 = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        genjet_pt_2,
-        genjet_eta_2,
-        genjet_phi_2,
-        genjet_mass_2,
+        genjet_p4_2_components,
         genjet_hadFlavour_2,
     ],
 )
@@ -599,7 +458,7 @@ UnrollGenBLV1 = ProducerGroup(
     input=None,
     output=None,
     scopes=SCOPES,
-    subproducers=[gen_b_pt_1, gen_b_eta_1, gen_b_phi_1, gen_b_mass_1],
+    subproducers=[gen_b_p4_1_components],
 )
 UnrollGenBLV2 = ProducerGroup(
     name="UnrollGenBLV2",
@@ -607,7 +466,7 @@ UnrollGenBLV2 = ProducerGroup(
     input=None,
     output=None,
     scopes=SCOPES,
-    subproducers=[gen_b_pt_2, gen_b_eta_2, gen_b_phi_2, gen_b_mass_2],
+    subproducers=[gen_b_p4_2_components],
 )
 UnrollGenTrueTauLV1 = ProducerGroup(
     name="UnrollGenTrueTauLV1",
@@ -615,7 +474,7 @@ UnrollGenTrueTauLV1 = ProducerGroup(
     input=None,
     output=None,
     scopes=HAD_TAU_SCOPES,
-    subproducers=[gen_tau_pt_1, gen_tau_eta_1, gen_tau_phi_1, gen_tau_mass_1],
+    subproducers=[gen_tau_p4_1_components],
 )
 UnrollGenTrueTauLV2 = ProducerGroup(
     name="UnrollGenTrueTauLV2",
@@ -623,7 +482,7 @@ UnrollGenTrueTauLV2 = ProducerGroup(
     input=None,
     output=None,
     scopes=SCOPES,
-    subproducers=[gen_tau_pt_2, gen_tau_eta_2, gen_tau_phi_2, gen_tau_mass_2],
+    subproducers=[gen_tau_p4_2_components],
 )
 
 UnrollGenMuLV1 = ProducerGroup(
@@ -632,7 +491,7 @@ UnrollGenMuLV1 = ProducerGroup(
     input=None,
     output=None,
     scopes=MT_SCOPES + MM_SCOPES,
-    subproducers=[gen_pt_1, gen_eta_1, gen_phi_1, gen_mass_1, gen_pdgid_1],
+    subproducers=[gen_p4_1_components, gen_pdgid_1],
 )
 UnrollGenMuLV2 = ProducerGroup(
     name="UnrollGenMuLV2",
@@ -640,7 +499,7 @@ UnrollGenMuLV2 = ProducerGroup(
     input=None,
     output=None,
     scopes=EM_SCOPES + MM_SCOPES,
-    subproducers=[gen_pt_2, gen_eta_2, gen_phi_2, gen_mass_2, gen_pdgid_2],
+    subproducers=[gen_p4_2_components, gen_pdgid_2],
 )
 UnrollGenElLV1 = ProducerGroup(
     name="UnrollGenElLV1",
@@ -648,7 +507,7 @@ UnrollGenElLV1 = ProducerGroup(
     input=None,
     output=None,
     scopes=ET_SCOPES + EE_SCOPES + EM_SCOPES,
-    subproducers=[gen_pt_1, gen_eta_1, gen_phi_1, gen_mass_1, gen_pdgid_1],
+    subproducers=[gen_p4_1_components, gen_pdgid_1],
 )
 UnrollGenElLV2 = ProducerGroup(
     name="UnrollGenElLV2",
@@ -656,7 +515,7 @@ UnrollGenElLV2 = ProducerGroup(
     input=None,
     output=None,
     scopes=EE_SCOPES,
-    subproducers=[gen_pt_2, gen_eta_2, gen_phi_2, gen_mass_2, gen_pdgid_2],
+    subproducers=[gen_p4_2_components, gen_pdgid_2],
 )
 UnrollGenTauLV1 = ProducerGroup(
     name="UnrollGenTauLV1",
@@ -665,10 +524,7 @@ UnrollGenTauLV1 = ProducerGroup(
     output=None,
     scopes=TT_SCOPES,
     subproducers=[
-        gen_pt_1,
-        gen_eta_1,
-        gen_phi_1,
-        gen_mass_1,
+        gen_p4_1_components,
         gen_pdgid_1,
         gen_taujet_pt_1,
     ],
@@ -680,10 +536,7 @@ UnrollGenTauLV2 = ProducerGroup(
     output=None,
     scopes=HAD_TAU_SCOPES,
     subproducers=[
-        gen_pt_2,
-        gen_eta_2,
-        gen_phi_2,
-        gen_mass_2,
+        gen_p4_2_components,
         gen_pdgid_2,
         gen_taujet_pt_2,
     ],
@@ -847,6 +700,13 @@ MuMuTrueGenDiTauPairQuantities = ProducerGroup(
 # DiTau Genmatching
 #######################
 
+# The hadronic generator-level taus only depend on the GenPart collection.
+# They are determined once per event in the global scope and shared by the
+# generator matching of all scopes, instead of walking the decay chains of
+# the generator particles again in every scope. The generator pairs and the
+# generator matching are still built by the functions of CROWN, which walk
+# the GenPart collection themselves; there is no shared index of the children,
+# last copies and hard-process flags of the generator particles.
 GenPairForGenMatching = Producer(
     name="GenPairForGenMatching",
     call="genparticles::tau::HadronicGenTaus({df}, {output}, {input})",
@@ -856,7 +716,7 @@ GenPairForGenMatching = Producer(
         nanoAOD.GenPart_genPartIdxMother,
     ],
     output=[q.hadronic_gen_taus],
-    scopes=SCOPES,
+    scopes=GLOBAL_SCOPES,
 )
 
 GenMatchP1 = Producer(
@@ -900,7 +760,6 @@ GenMatching = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        GenPairForGenMatching,
         GenMatchP1,
         GenMatchP2,
     ],
@@ -11,6 +11,7 @@ from ._helpers import (
     type1_jet_collection_producer_factory,
     jerc_producer_factory,
     stepwise_jerc_producer_factory,
+    lorentzvector_components_producer_factory,
 )
 from ..helpers import era_producer_groups
 from ..constants import GLOBAL_SCOPES, SCOPES, ERAS_RUN2
@@ -657,46 +658,24 @@ NumberOfJets_boosted = Producer(
     scopes=SCOPES,
 )
 
-jpt_1 = Producer(
-    name="jpt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.jet_p4_1],
-    output=[q.jpt_1],
-    scopes=SCOPES,
-)
-jpt_2 = Producer(
-    name="jpt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.jet_p4_2],
-    output=[q.jpt_2],
-    scopes=SCOPES,
-)
-jeta_1 = Producer(
-    name="jeta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.jet_p4_1],
-    output=[q.jeta_1],
-    scopes=SCOPES,
-)
-jeta_2 = Producer(
-    name="jeta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.jet_p4_2],
-    output=[q.jeta_2],
-    scopes=SCOPES,
-)
-jphi_1 = Producer(
-    name="jphi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.jet_p4_1],
-    output=[q.jphi_1],
+jet_p4_1_components = lorentzvector_components_producer_factory(
+    name="jet_p4_1_components",
+    p4=q.jet_p4_1,
+    output={
+        "pt": q.jpt_1,
+        "eta": q.jeta_1,
+        "phi": q.jphi_1,
+    },
     scopes=SCOPES,
 )
-jphi_2 = Producer(
-    name="jphi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.jet_p4_2],
-    output=[q.jphi_2],
+jet_p4_2_components = lorentzvector_components_producer_factory(
+    name="jet_p4_2_components",
+    p4=q.jet_p4_2,
+    output={
+        "pt": q.jpt_2,
+        "eta": q.jeta_2,
+        "phi": q.jphi_2,
+    },
     scopes=SCOPES,
 )
 jtag_value_1 = Producer(
@@ -730,13 +709,9 @@ BasicJetQuantities = ProducerGroup(
         LVJet1,
         LVJet2,
         NumberOfJets,
-        jpt_1,
-        jeta_1,
-        jphi_1,
+        jet_p4_1_components,
         jtag_value_1,
-        jpt_2,
-        jeta_2,
-        jphi_2,
+        jet_p4_2_components,
         jtag_value_2,
         mjj,
     ],
@@ -2,8 +2,9 @@ from ..quantities import output as q
 from ..quantities import nanoAOD as nanoAOD
 from analysis_configurations.quantities import nanoAODv12_run3
 from code_generation.producer import Producer, ProducerGroup
+from ._helpers import lorentzvector_components_producer_factory
 
-from ..constants import GLOBAL_SCOPES, SCOPES, ERAS_RUN2, ERAS_RUN3
+from ..constants import GLOBAL_SCOPES, SCOPES, ERAS_RUN2, ERAS_RUN3, INCREMENTAL_TYPE1_MET
 from ..helpers import era_producer_groups
 
 #
@@ -134,21 +135,14 @@ MetSumEt = Producer(
     scopes=GLOBAL_SCOPES,
 )
 
-# Uncorrected PuppiMET pt
-MetPtUncorrected = Producer(
-    name="MetPtUncorrected",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.met_p4_uncorrected],
-    output=[q.met_uncorrected],
-    scopes=GLOBAL_SCOPES,
-)
-
-# Uncorrected PuppiMET phi
-MetPhiUncorrected = Producer(
-    name="MetPhiUncorrected",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.met_p4_uncorrected],
-    output=[q.metphi_uncorrected],
+# Uncorrected PuppiMET pt and phi
+met_p4_uncorrected_components = lorentzvector_components_producer_factory(
+    name="met_p4_uncorrected_components",
+    p4=q.met_p4_uncorrected,
+    output={
+        "pt": q.met_uncorrected,
+        "phi": q.metphi_uncorrected,
+    },
     scopes=GLOBAL_SCOPES,
 )
 
@@ -170,21 +164,14 @@ MetSumEtRaw = Producer(
     scopes=GLOBAL_SCOPES,
 )
 
-# Raw PuppiMET pt
-MetPtRaw = Producer(
-    name="MetPtRaw",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.met_p4_raw],
-    output=[q.met_raw],
-    scopes=GLOBAL_SCOPES,
-)
-
-# Raw PuppiMET phi
-MetPhiRaw = Producer(
-    name="MetPhiRaw",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.met_p4_raw],
-    output=[q.metphi_raw],
+# Raw PuppiMET pt and phi
+met_p4_raw_components = lorentzvector_components_producer_factory(
+    name="met_p4_raw_components",
+    p4=q.met_p4_raw,
+    output={
+        "pt": q.met_raw,
+        "phi": q.metphi_raw,
+    },
     scopes=GLOBAL_SCOPES,
 )
 
@@ -194,7 +181,36 @@ MetPhiRaw = Producer(
 #   to shifts) to the MET. The input to this function is the "uncorrected"
 #   PuppiMET from nanoAOD.
 # - In Run 3, we need to apply Type-I MET corrections to propagate the effect
-#   of JEC to the raw PuppiMET.
+#   of JEC to the raw PuppiMET. With `INCREMENTAL_TYPE1_MET`, the nominal
+#   corrected MET is calculated from all jets, while the shifted copies of the
+#   producer in the jet energy shifts only replace the contributions of the
+#   jets with shifted momenta. The nominal columns are passed by name, as the
+#   inputs of the shifted copies are replaced by their shifted variants.
+if INCREMENTAL_TYPE1_MET:
+    _met_type1_correction_call = f"""
+        met::Type1CorrectionIncremental(
+            {{df}},
+            {{output}},
+            {{input}},
+            {{t1jet_min_pt}},
+            {{t1jet_max_abs_eta}},
+            {{t1jet_max_em_ef}},
+            "{q.met_p4_jetcorrected.name}",
+            "{q.Type1Jet_correctedPt.name}",
+            {{t1met_validate_incremental}}
+        )
+        """
+else:
+    _met_type1_correction_call = """
+        met::Type1Correction(
+            {df},
+            {output},
+            {input},
+            {t1jet_min_pt},
+            {t1jet_max_abs_eta},
+            {t1jet_max_em_ef}
+        )
+        """
 MetJetCorrection = {
     tuple(ERAS_RUN2): Producer(
         name="MetJetCorrection",
@@ -223,16 +239,7 @@ MetJetCorrection = {
     ),
     tuple(ERAS_RUN3): Producer(
         name="MetJetCorrection",
-        call="""
-        met::Type1Correction(
-            {df},
-            {output},
-            {input},
-            {t1jet_min_pt},
-            {t1jet_max_abs_eta},
-            {t1jet_max_em_ef}
-        )
-        """,
+        call=_met_type1_correction_call,
         input=[
             q.met_p4_raw,
             q.Type1Jet_l1Pt,
@@ -252,12 +259,10 @@ MetGlobal = era_producer_groups(
     [
         MetCov,
         MetVectorUncorrected,
-        MetPtUncorrected,
-        MetPhiUncorrected,
+        met_p4_uncorrected_components,
         MetSumEt,
         MetVectorRaw,
-        MetPtRaw,
-        MetPhiRaw,
+        met_p4_raw_components,
         MetSumEtRaw,
         MetJetCorrection,
     ],
@@ -369,21 +374,14 @@ RenameMet = Producer(
     scopes=SCOPES,
 )
 
-# Final MET pt
-MetPt = Producer(
-    name="MetPt",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.met_p4_recoilcorrected],
-    output=[q.met],
-    scopes=SCOPES,
-)
-
-# Final MET phi
-MetPhi = Producer(
-    name="MetPhi",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.met_p4_recoilcorrected],
-    output=[q.metphi],
+# Final MET pt and phi
+met_p4_recoilcorrected_components = lorentzvector_components_producer_factory(
+    name="met_p4_recoilcorrected_components",
+    p4=q.met_p4_recoilcorrected,
+    output={
+        "pt": q.met,
+        "phi": q.metphi,
+    },
     scopes=SCOPES,
 )
 
@@ -395,8 +393,7 @@ MetQuantities = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        MetPt,
-        MetPhi,
+        met_p4_recoilcorrected_components,
     ],
 )
 
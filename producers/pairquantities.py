@@ -1,66 +1,33 @@
 from ..quantities import output as q
 from ..quantities import nanoAOD as nanoAOD
 from code_generation.producer import Producer, ProducerGroup, ExtendedVectorProducer
+from ._helpers import lorentzvector_components_producer_factory, object_attributes_producer_factory
 
 
 ####################
 # Set of general producers for DiTauPair Quantities
 ####################
 
-pt_1 = Producer(
-    name="pt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.p4_1],
-    output=[q.pt_1],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-pt_2 = Producer(
-    name="pt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.p4_2],
-    output=[q.pt_2],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-eta_1 = Producer(
-    name="eta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.p4_1],
-    output=[q.eta_1],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-eta_2 = Producer(
-    name="eta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.p4_2],
-    output=[q.eta_2],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-phi_1 = Producer(
-    name="phi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.p4_1],
-    output=[q.phi_1],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-phi_2 = Producer(
-    name="phi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.p4_2],
-    output=[q.phi_2],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-mass_1 = Producer(
-    name="mass_1",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.p4_1],
-    output=[q.mass_1],
+p4_1_components = lorentzvector_components_producer_factory(
+    name="p4_1_components",
+    p4=q.p4_1,
+    output={
+        "pt": q.pt_1,
+        "eta": q.eta_1,
+        "phi": q.phi_1,
+        "mass": q.mass_1,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
-mass_2 = Producer(
-    name="mass_2",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.p4_2],
-    output=[q.mass_2],
+p4_2_components = lorentzvector_components_producer_factory(
+    name="p4_2_components",
+    p4=q.p4_2,
+    output={
+        "pt": q.pt_2,
+        "eta": q.eta_2,
+        "phi": q.phi_2,
+        "mass": q.mass_2,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
 p4_vis = Producer(
@@ -70,18 +37,13 @@ p4_vis = Producer(
     output=[q.p4_vis],
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
-m_vis = Producer(
-    name="m_vis",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.p4_vis],
-    output=[q.m_vis],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-pt_vis = Producer(
-    name="pt_vis",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.p4_vis],
-    output=[q.pt_vis],
+p4_vis_components = lorentzvector_components_producer_factory(
+    name="p4_vis_components",
+    p4=q.p4_vis,
+    output={
+        "mass": q.m_vis,
+        "pt": q.pt_vis,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
 deltaR_ditaupair = Producer(
@@ -95,32 +57,30 @@ deltaR_ditaupair = Producer(
 ####################
 # Set of channel specific producers
 ####################
-muon_dxy_1 = Producer(
-    name="muon_dxy_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_dxy, q.dileptonpair],
-    output=[q.dxy_1],
-    scopes=["mt", "mm"],
-)
-muon_dxy_2 = Producer(
-    name="muon_dxy_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Muon_dxy, q.dileptonpair],
-    output=[q.dxy_2],
-    scopes=["em", "mm"],
-)
-muon_is_global_1 = Producer(
-    name="muon_is_global_1",
-    call="event::quantity::Get<bool>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_isGlobal, q.dileptonpair],
-    output=[q.is_global_1],
+muon_attributes_1 = object_attributes_producer_factory(
+    name="muon_attributes_1",
+    index=q.dileptonpair,
+    position=0,
+    attributes=[
+        ("float", nanoAOD.Muon_dxy, q.dxy_1),
+        ("bool", nanoAOD.Muon_isGlobal, q.is_global_1),
+        ("float", nanoAOD.Muon_dz, q.dz_1),
+        ("int", nanoAOD.Muon_charge, q.q_1),
+        ("float", nanoAOD.Muon_pfRelIso04_all, q.iso_1),
+    ],
     scopes=["mt", "mm"],
 )
-muon_is_global_2 = Producer(
-    name="muon_is_global_2",
-    call="event::quantity::Get<bool>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Muon_isGlobal, q.dileptonpair],
-    output=[q.is_global_2],
+muon_attributes_2 = object_attributes_producer_factory(
+    name="muon_attributes_2",
+    index=q.dileptonpair,
+    position=1,
+    attributes=[
+        ("float", nanoAOD.Muon_dxy, q.dxy_2),
+        ("bool", nanoAOD.Muon_isGlobal, q.is_global_2),
+        ("float", nanoAOD.Muon_dz, q.dz_2),
+        ("int", nanoAOD.Muon_charge, q.q_2),
+        ("float", nanoAOD.Muon_pfRelIso04_all, q.iso_2),
+    ],
     scopes=["em", "mm"],
 )
 muon_nstations_1 = Producer(
@@ -165,167 +125,56 @@ muon_pterr_2 = Producer(
     output=[q.muon_pterr_2],
     scopes=["em", "mm"],
 )
-electron_dxy_1 = Producer(
-    name="electron_dxy_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Electron_dxy, q.dileptonpair],
-    output=[q.dxy_1],
-    scopes=["et", "ee", "em"],
-)
-electron_dxy_2 = Producer(
-    name="electron_dxy_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Electron_dxy, q.dileptonpair],
-    output=[q.dxy_2],
-    scopes=["ee"],
-)
-tau_dxy_1 = Producer(
-    name="tau_dxy_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Tau_dxy, q.dileptonpair],
-    output=[q.dxy_1],
-    scopes=["tt"],
-)
-tau_dxy_2 = Producer(
-    name="tau_dxy_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Tau_dxy, q.dileptonpair],
-    output=[q.dxy_2],
-    scopes=["mt", "et", "tt"],
-)
-muon_dz_1 = Producer(
-    name="muon_dz_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_dz, q.dileptonpair],
-    output=[q.dz_1],
-    scopes=["mt", "mm"],
-)
-muon_dz_2 = Producer(
-    name="muon_dz_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Muon_dz, q.dileptonpair],
-    output=[q.dz_2],
-    scopes=["em", "mm"],
-)
-electron_dz_1 = Producer(
-    name="electron_dz_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Electron_dz, q.dileptonpair],
-    output=[q.dz_1],
-    scopes=["et", "ee", "em"],
-)
-electron_dz_2 = Producer(
-    name="electron_dz_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Electron_dz, q.dileptonpair],
-    output=[q.dz_2],
-    scopes=["ee"],
-)
-tau_dz_1 = Producer(
-    name="tau_dz_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Tau_dz, q.dileptonpair],
-    output=[q.dz_1],
-    scopes=["tt"],
-)
-tau_dz_2 = Producer(
-    name="tau_dz_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Tau_dz, q.dileptonpair],
-    output=[q.dz_2],
-    scopes=["mt", "et", "tt"],
-)
-muon_q_1 = Producer(
-    name="muon_q_1",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_charge, q.dileptonpair],
-    output=[q.q_1],
-    scopes=["mt", "mm"],
-)
-muon_q_2 = Producer(
-    name="muon_q_2",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Muon_charge, q.dileptonpair],
-    output=[q.q_2],
-    scopes=["em", "mm"],
-)
-electron_q_1 = Producer(
-    name="electron_q_1",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Electron_charge, q.dileptonpair],
-    output=[q.q_1],
-    scopes=["et", "ee", "em"],
-)
-electron_q_2 = Producer(
-    name="electron_q_2",
-    call="event::quantity::Get<int>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Electron_charge, q.dileptonpair],
-    output=[q.q_2],
-    scopes=["ee"],
-)
-tau_q_1 = Producer(
-    name="tau_q_1",
-    call="event::quantity::Get<Short_t>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Tau_charge, q.dileptonpair],
-    output=[q.q_1],
-    scopes=["tt"],
-)
-tau_q_2 = Producer(
-    name="tau_q_2",
-    call="event::quantity::Get<Short_t>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Tau_charge, q.dileptonpair],
-    output=[q.q_2],
-    scopes=["mt", "et", "tt"],
-)
-muon_iso_1 = Producer(
-    name="muon_iso_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Muon_pfRelIso04_all, q.dileptonpair],
-    output=[q.iso_1],
-    scopes=["mt", "mm"],
-)
-muon_iso_2 = Producer(
-    name="muon_iso_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Muon_pfRelIso04_all, q.dileptonpair],
-    output=[q.iso_2],
-    scopes=["em", "mm"],
-)
-electron_iso_1 = Producer(
-    name="electron_iso_1",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Electron_pfRelIso03_all, q.dileptonpair],
-    output=[q.iso_1],
+electron_attributes_1 = object_attributes_producer_factory(
+    name="electron_attributes_1",
+    index=q.dileptonpair,
+    position=0,
+    attributes=[
+        ("float", nanoAOD.Electron_dxy, q.dxy_1),
+        ("float", nanoAOD.Electron_dz, q.dz_1),
+        ("int", nanoAOD.Electron_charge, q.q_1),
+        ("float", nanoAOD.Electron_pfRelIso03_all, q.iso_1),
+    ],
     scopes=["et", "ee", "em"],
 )
-electron_iso_2 = Producer(
-    name="electron_iso_2",
-    call="event::quantity::Get<float>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Electron_pfRelIso03_all, q.dileptonpair],
-    output=[q.iso_2],
+electron_attributes_2 = object_attributes_producer_factory(
+    name="electron_attributes_2",
+    index=q.dileptonpair,
+    position=1,
+    attributes=[
+        ("float", nanoAOD.Electron_dxy, q.dxy_2),
+        ("float", nanoAOD.Electron_dz, q.dz_2),
+        ("int", nanoAOD.Electron_charge, q.q_2),
+        ("float", nanoAOD.Electron_pfRelIso03_all, q.iso_2),
+    ],
     scopes=["ee"],
 )
-tau_iso_1 = Producer(
-    name="tau_iso_1",
-    call="event::quantity::Get<Float_t>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Tau_rawDeepTau2018v2p5VSjet, q.dileptonpair],
-    output=[q.iso_1],
+tau_attributes_1 = object_attributes_producer_factory(
+    name="tau_attributes_1",
+    index=q.dileptonpair,
+    position=0,
+    attributes=[
+        ("float", nanoAOD.Tau_dxy, q.dxy_1),
+        ("float", nanoAOD.Tau_dz, q.dz_1),
+        ("Short_t", nanoAOD.Tau_charge, q.q_1),
+        ("Float_t", nanoAOD.Tau_rawDeepTau2018v2p5VSjet, q.iso_1),
+        ("UChar_t", nanoAOD.Tau_decayMode, q.tau_decaymode_1),
+    ],
     scopes=["tt"],
 )
-tau_iso_2 = Producer(
-    name="tau_iso_2",
-    call="event::quantity::Get<Float_t>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Tau_rawDeepTau2018v2p5VSjet, q.dileptonpair],
-    output=[q.iso_2],
+tau_attributes_2 = object_attributes_producer_factory(
+    name="tau_attributes_2",
+    index=q.dileptonpair,
+    position=1,
+    attributes=[
+        ("float", nanoAOD.Tau_dxy, q.dxy_2),
+        ("float", nanoAOD.Tau_dz, q.dz_2),
+        ("Short_t", nanoAOD.Tau_charge, q.q_2),
+        ("Float_t", nanoAOD.Tau_rawDeepTau2018v2p5VSjet, q.iso_2),
+        ("UChar_t", nanoAOD.Tau_decayMode, q.tau_decaymode_2),
+    ],
     scopes=["mt", "et", "tt"],
 )
-tau_decaymode_1 = Producer(
-    name="decaymode_1",
-    call="event::quantity::Get<UChar_t>({df}, {output}, {input}, 0)",
-    input=[nanoAOD.Tau_decayMode, q.dileptonpair],
-    output=[q.tau_decaymode_1],
-    scopes=["tt"],
-)
 tau_decaymode_1_notau = Producer(
     name="tau_decaymode_1_notau",
     call="event::quantity::Define({df}, {output}, -1)",
@@ -382,13 +231,6 @@ VsMuTauIDFlag_1 = ExtendedVectorProducer(
     scope=["et", "mt", "tt"],
     vec_config="vsmu_tau_id",
 )
-tau_decaymode_2 = Producer(
-    name="taudecaymode_2",
-    call="event::quantity::Get<UChar_t>({df}, {output}, {input}, 1)",
-    input=[nanoAOD.Tau_decayMode, q.dileptonpair],
-    output=[q.tau_decaymode_2],
-    scopes=["mt", "et", "tt"],
-)
 tau_decaymode_2_notau = Producer(
     name="tau_decaymode_2_notau",
     call="event::quantity::Define({df}, {output}, -1)",
@@ -452,15 +294,8 @@ UnrollMuLV1 = ProducerGroup(
     output=None,
     scopes=["mt", "mm"],
     subproducers=[
-        pt_1,
-        eta_1,
-        phi_1,
-        mass_1,
-        muon_dxy_1,
-        muon_dz_1,
-        muon_q_1,
-        muon_iso_1,
-        muon_is_global_1,
+        p4_1_components,
+        muon_attributes_1,
     ],
 )
 UnrollMuLV2 = ProducerGroup(
@@ -470,15 +305,8 @@ UnrollMuLV2 = ProducerGroup(
     output=None,
     scopes=["mm", "em"],
     subproducers=[
-        pt_2,
-        eta_2,
-        phi_2,
-        mass_2,
-        muon_dxy_2,
-        muon_dz_2,
-        muon_q_2,
-        muon_iso_2,
-        muon_is_global_2,
+        p4_2_components,
+        muon_attributes_2,
     ],
 )
 UnrollElLV1 = ProducerGroup(
@@ -488,14 +316,8 @@ UnrollElLV1 = ProducerGroup(
     output=None,
     scopes=["et", "ee", "em"],
     subproducers=[
-        pt_1,
-        eta_1,
-        phi_1,
-        mass_1,
-        electron_dxy_1,
-        electron_dz_1,
-        electron_q_1,
-        electron_iso_1,
+        p4_1_components,
+        electron_attributes_1,
     ],
 )
 UnrollElLV2 = ProducerGroup(
@@ -505,14 +327,8 @@ UnrollElLV2 = ProducerGroup(
     output=None,
     scopes=["ee"],
     subproducers=[
-        pt_2,
-        eta_2,
-        phi_2,
-        mass_2,
-        electron_dxy_2,
-        electron_dz_2,
-        electron_q_2,
-        electron_iso_2,
+        p4_2_components,
+        electron_attributes_2,
     ],
 )
 UnrollTauLV1 = ProducerGroup(
@@ -522,15 +338,8 @@ UnrollTauLV1 = ProducerGroup(
     output=None,
     scopes=["tt"],
     subproducers=[
-        pt_1,
-        eta_1,
-        phi_1,
-        mass_1,
-        tau_dxy_1,
-        tau_dz_1,
-        tau_q_1,
-        tau_iso_1,
-        tau_decaymode_1,
+        p4_1_components,
+        tau_attributes_1,
         taujet_pt_1,
         VsJetTauIDFlag_1,
         VsEleTauIDFlag_1,
@@ -544,15 +353,8 @@ UnrollTauLV2 = ProducerGroup(
     output=None,
     scopes=["et", "mt", "tt"],
     subproducers=[
-        pt_2,
-        eta_2,
-        phi_2,
-        mass_2,
-        tau_dxy_2,
-        tau_dz_2,
-        tau_q_2,
-        tau_iso_2,
-        tau_decaymode_2,
+        p4_2_components,
+        tau_attributes_2,
         taujet_pt_2,
         VsJetTauIDFlag_2,
         VsEleTauIDFlag_2,
@@ -575,8 +377,7 @@ MTDiTauPairQuantities = ProducerGroup(
         UnrollTauLV2,
         tau_decaymode_1_notau,
         p4_vis,
-        m_vis,
-        pt_vis,
+        p4_vis_components,
         deltaR_ditaupair,
     ],
 )
@@ -592,8 +393,7 @@ MuMuPairQuantities = ProducerGroup(
         tau_decaymode_1_notau,
         tau_decaymode_2_notau,
         p4_vis,
-        m_vis,
-        pt_vis,
+        p4_vis_components,
         deltaR_ditaupair,
     ],
 )
@@ -609,8 +409,7 @@ ElElPairQuantities = ProducerGroup(
         tau_decaymode_1_notau,
         tau_decaymode_2_notau,
         p4_vis,
-        m_vis,
-        pt_vis,
+        p4_vis_components,
         deltaR_ditaupair,
     ],
 )
@@ -625,8 +424,7 @@ ETDiTauPairQuantities = ProducerGroup(
         UnrollTauLV2,
         tau_decaymode_1_notau,
         p4_vis,
-        m_vis,
-        pt_vis,
+        p4_vis_components,
         deltaR_ditaupair,
     ],
 )
@@ -636,7 +434,7 @@ TTDiTauPairQuantities = ProducerGroup(
     input=None,
     output=None,
     scopes=["tt"],
-    subproducers=[UnrollTauLV1, UnrollTauLV2, p4_vis, m_vis, pt_vis, deltaR_ditaupair],
+    subproducers=[UnrollTauLV1, UnrollTauLV2, p4_vis, p4_vis_components, deltaR_ditaupair],
 )
 EMDiTauPairQuantities = ProducerGroup(
     name="EMDiTauPairQuantities",
@@ -650,8 +448,7 @@ EMDiTauPairQuantities = ProducerGroup(
         tau_decaymode_1_notau,
         tau_decaymode_2_notau,
         p4_vis,
-        m_vis,
-        pt_vis,
+        p4_vis_components,
         deltaR_ditaupair,
     ],
 )
@@ -725,18 +522,13 @@ p4_tautaubb = Producer(
     output=[q.p4_tautaubb],
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
-pt_tautaubb = Producer(
-    name="pt_tautaubb",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.p4_tautaubb],
-    output=[q.pt_tautaubb],
-    scopes=["mt", "et", "tt", "em", "ee", "mm"],
-)
-mass_tautaubb = Producer(
-    name="mass_tautaubb",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.p4_tautaubb],
-    output=[q.mass_tautaubb],
+p4_tautaubb_components = lorentzvector_components_producer_factory(
+    name="p4_tautaubb_components",
+    p4=q.p4_tautaubb,
+    output={
+        "pt": q.pt_tautaubb,
+        "mass": q.mass_tautaubb,
+    },
     scopes=["mt", "et", "tt", "em", "ee", "mm"],
 )
 mt_tot = Producer(
@@ -833,8 +625,7 @@ DiTauPairMETQuantities = ProducerGroup(
         pt_tautau,
         pt_ttjj,
         p4_tautaubb,
-        pt_tautaubb,
-        mass_tautaubb,
+        p4_tautaubb_components,
         mt_tot,
         #Pzetamissvis_pf,
         #mTdileptonMET_pf,
@@ -941,32 +732,15 @@ p4_fastmtt_em = Producer(
     output=[q.p4_fastmtt],
     scopes=["em"],
 )
-pt_fastmtt = Producer(
-    name="pt_fastmtt",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.p4_fastmtt],
-    output=[q.pt_fastmtt],
-    scopes=["mt", "et", "tt", "em"],
-)
-eta_fastmtt = Producer(
-    name="eta_fastmtt",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.p4_fastmtt],
-    output=[q.eta_fastmtt],
-    scopes=["mt", "et", "tt", "em"],
-)
-phi_fastmtt = Producer(
-    name="phi_fastmtt",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.p4_fastmtt],
-    output=[q.phi_fastmtt],
-    scopes=["mt", "et", "tt", "em"],
-)
-m_fastmtt = Producer(
-    name="m_fastmtt",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.p4_fastmtt],
-    output=[q.m_fastmtt],
+p4_fastmtt_components = lorentzvector_components_producer_factory(
+    name="p4_fastmtt_components",
+    p4=q.p4_fastmtt,
+    output={
+        "pt": q.pt_fastmtt,
+        "eta": q.eta_fastmtt,
+        "phi": q.phi_fastmtt,
+        "mass": q.m_fastmtt,
+    },
     scopes=["mt", "et", "tt", "em"],
 )
 FastMTTQuantities = ProducerGroup(
@@ -976,10 +750,10 @@ FastMTTQuantities = ProducerGroup(
     output=None,
     scopes=["mt", "et", "tt", "em"],
     subproducers={
-        "mt": [p4_fastmtt_mt, pt_fastmtt, eta_fastmtt, phi_fastmtt, m_fastmtt],
-        "et": [p4_fastmtt_et, pt_fastmtt, eta_fastmtt, phi_fastmtt, m_fastmtt],
-        "tt": [p4_fastmtt_tt, pt_fastmtt, eta_fastmtt, phi_fastmtt, m_fastmtt],
-        "em": [p4_fastmtt_em, pt_fastmtt, eta_fastmtt, phi_fastmtt, m_fastmtt],
+        "mt": [p4_fastmtt_mt, p4_fastmtt_components],
+        "et": [p4_fastmtt_et, p4_fastmtt_components],
+        "tt": [p4_fastmtt_tt, p4_fastmtt_components],
+        "em": [p4_fastmtt_em, p4_fastmtt_components],
     },
 )
 
@@ -1052,32 +826,15 @@ boosted_p4_fastmtt_tt = Producer(
     output=[q.boosted_p4_fastmtt],
     scopes=["tt"],
 )
-boosted_pt_fastmtt = Producer(
-    name="boosted_pt_fastmtt",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.boosted_p4_fastmtt],
-    output=[q.boosted_pt_fastmtt],
-    scopes=["mt", "et", "tt"],
-)
-boosted_eta_fastmtt = Producer(
-    name="boosted_eta_fastmtt",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.boosted_p4_fastmtt],
-    output=[q.boosted_eta_fastmtt],
-    scopes=["mt", "et", "tt"],
-)
-boosted_phi_fastmtt = Producer(
-    name="boosted_phi_fastmtt",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.boosted_p4_fastmtt],
-    output=[q.boosted_phi_fastmtt],
-    scopes=["mt", "et", "tt"],
-)
-boosted_m_fastmtt = Producer(
-    name="boosted_m_fastmtt",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.boosted_p4_fastmtt],
-    output=[q.boosted_m_fastmtt],
+boosted_p4_fastmtt_components = lorentzvector_components_producer_factory(
+    name="boosted_p4_fastmtt_components",
+    p4=q.boosted_p4_fastmtt,
+    output={
+        "pt": q.boosted_pt_fastmtt,
+        "eta": q.boosted_eta_fastmtt,
+        "phi": q.boosted_phi_fastmtt,
+        "mass": q.boosted_m_fastmtt,
+    },
     scopes=["mt", "et", "tt"],
 )
 BoostedFastMTTQuantities = ProducerGroup(
@@ -1087,8 +844,8 @@ BoostedFastMTTQuantities = ProducerGroup(
     output=None,
     scopes=["mt", "et", "tt"],
     subproducers={
-        "mt": [boosted_p4_fastmtt_mt, boosted_pt_fastmtt, boosted_eta_fastmtt, boosted_phi_fastmtt, boosted_m_fastmtt],
-        "et": [boosted_p4_fastmtt_et, boosted_pt_fastmtt, boosted_eta_fastmtt, boosted_phi_fastmtt, boosted_m_fastmtt],
-        "tt": [boosted_p4_fastmtt_tt, boosted_pt_fastmtt, boosted_eta_fastmtt, boosted_phi_fastmtt, boosted_m_fastmtt],
+        "mt": [boosted_p4_fastmtt_mt, boosted_p4_fastmtt_components],
+        "et": [boosted_p4_fastmtt_et, boosted_p4_fastmtt_components],
+        "tt": [boosted_p4_fastmtt_tt, boosted_p4_fastmtt_components],
     },
 )
@@ -1,6 +1,7 @@
 from ..quantities import output as q
 from ..quantities import nanoAOD, nanoAOD_run2
 from code_generation.producer import Producer, ProducerGroup
+from ._helpers import lorentzvector_components_producer_factory
 
 from ..constants import SCOPES, AvailableBJetIDs, BJET_ID_ALGORITHM
 
@@ -20,60 +21,26 @@ elif BJET_ID_ALGORITHM == AvailableBJetIDs.UPART:
 # Set of general producers for BBPair Quantities
 ####################
 
-bpair_pt_1 = Producer(
-    name="bpair_pt_1",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.bpair_p4_1],
-    output=[q.bpair_pt_1],
-    scopes=SCOPES,
-)
-bpair_pt_2 = Producer(
-    name="bpair_pt_2",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.bpair_p4_2],
-    output=[q.bpair_pt_2],
-    scopes=SCOPES,
-)
-bpair_eta_1 = Producer(
-    name="bpair_eta_1",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.bpair_p4_1],
-    output=[q.bpair_eta_1],
-    scopes=SCOPES,
-)
-bpair_eta_2 = Producer(
-    name="bpair_eta_2",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.bpair_p4_2],
-    output=[q.bpair_eta_2],
-    scopes=SCOPES,
-)
-bpair_phi_1 = Producer(
-    name="bpair_phi_1",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.bpair_p4_1],
-    output=[q.bpair_phi_1],
-    scopes=SCOPES,
-)
-bpair_phi_2 = Producer(
-    name="bpair_phi_2",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.bpair_p4_2],
-    output=[q.bpair_phi_2],
-    scopes=SCOPES,
-)
-bpair_mass_1 = Producer(
-    name="bpair_mass_1",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.bpair_p4_1],
-    output=[q.bpair_mass_1],
-    scopes=SCOPES,
-)
-bpair_mass_2 = Producer(
-    name="bpair_mass_2",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.bpair_p4_2],
-    output=[q.bpair_mass_2],
+bpair_p4_1_components = lorentzvector_components_producer_factory(
+    name="bpair_p4_1_components",
+    p4=q.bpair_p4_1,
+    output={
+        "pt": q.bpair_pt_1,
+        "eta": q.bpair_eta_1,
+        "phi": q.bpair_phi_1,
+        "mass": q.bpair_mass_1,
+    },
+    scopes=SCOPES,
+)
+bpair_p4_2_components = lorentzvector_components_producer_factory(
+    name="bpair_p4_2_components",
+    p4=q.bpair_p4_2,
+    output={
+        "pt": q.bpair_pt_2,
+        "eta": q.bpair_eta_2,
+        "phi": q.bpair_phi_2,
+        "mass": q.bpair_mass_2,
+    },
     scopes=SCOPES,
 )
 bpair_btag_value_1 = Producer(
@@ -97,18 +64,13 @@ p4_bpair = Producer(
     output=[q.p4_bpair],
     scopes=SCOPES,
 )
-bpair_m_inv = Producer(
-    name="bpair_m_inv",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.p4_bpair],
-    output=[q.bpair_m_inv],
-    scopes=SCOPES,
-)
-bpair_pt_dijet = Producer(
-    name="bpair_pt_dijet",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.p4_bpair],
-    output=[q.bpair_pt_dijet],
+p4_bpair_components = lorentzvector_components_producer_factory(
+    name="p4_bpair_components",
+    p4=q.p4_bpair,
+    output={
+        "mass": q.bpair_m_inv,
+        "pt": q.bpair_pt_dijet,
+    },
     scopes=SCOPES,
 )
 bpair_deltaR = Producer(
@@ -126,10 +88,7 @@ UnrollBjetLV1Run2 = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        bpair_pt_1,
-        bpair_eta_1,
-        bpair_phi_1,
-        bpair_mass_1,
+        bpair_p4_1_components,
         bpair_btag_value_1,
     ],
 )
@@ -140,10 +99,7 @@ UnrollBjetLV2Run2 = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        bpair_pt_2,
-        bpair_eta_2,
-        bpair_phi_2,
-        bpair_mass_2,
+        bpair_p4_2_components,
         bpair_btag_value_2,
     ],
 )
@@ -154,10 +110,7 @@ UnrollBjetLV1Run3 = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        bpair_pt_1,
-        bpair_eta_1,
-        bpair_phi_1,
-        bpair_mass_1,
+        bpair_p4_1_components,
         bpair_btag_value_1,
     ],
 )
@@ -168,10 +121,7 @@ UnrollBjetLV2Run3 = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        bpair_pt_2,
-        bpair_eta_2,
-        bpair_phi_2,
-        bpair_mass_2,
+        bpair_p4_2_components,
         bpair_btag_value_2,
     ],
 )
@@ -185,8 +135,7 @@ DiBjetPairQuantitiesRun2 = ProducerGroup(
         UnrollBjetLV1Run2,
         UnrollBjetLV2Run2,
         p4_bpair,
-        bpair_m_inv,
-        bpair_pt_dijet,
+        p4_bpair_components,
         bpair_deltaR,
     ],
 )
@@ -200,8 +149,7 @@ DiBjetPairQuantitiesRun3 = ProducerGroup(
         UnrollBjetLV1Run3,
         UnrollBjetLV2Run3,
         p4_bpair,
-        bpair_m_inv,
-        bpair_pt_dijet,
+        p4_bpair_components,
         bpair_deltaR,
     ],
 )
@@ -210,60 +158,26 @@ DiBjetPairQuantitiesRun3 = ProducerGroup(
 # Set of general producers for BBPair Quantities based on boosted tau pair
 ####################
 
-bpair_pt_1_boosted = Producer(
-    name="bpair_pt_1_boosted",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.bpair_p4_1_boosted],
-    output=[q.bpair_pt_1_boosted],
-    scopes=SCOPES,
-)
-bpair_pt_2_boosted = Producer(
-    name="bpair_pt_2_boosted",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.bpair_p4_2_boosted],
-    output=[q.bpair_pt_2_boosted],
-    scopes=SCOPES,
-)
-bpair_eta_1_boosted = Producer(
-    name="bpair_eta_1_boosted",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.bpair_p4_1_boosted],
-    output=[q.bpair_eta_1_boosted],
-    scopes=SCOPES,
-)
-bpair_eta_2_boosted = Producer(
-    name="bpair_eta_2_boosted",
-    call="lorentzvector::GetEta({df}, {output}, {input})",
-    input=[q.bpair_p4_2_boosted],
-    output=[q.bpair_eta_2_boosted],
-    scopes=SCOPES,
-)
-bpair_phi_1_boosted = Producer(
-    name="bpair_phi_1_boosted",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.bpair_p4_1_boosted],
-    output=[q.bpair_phi_1_boosted],
-    scopes=SCOPES,
-)
-bpair_phi_2_boosted = Producer(
-    name="bpair_phi_2_boosted",
-    call="lorentzvector::GetPhi({df}, {output}, {input})",
-    input=[q.bpair_p4_2_boosted],
-    output=[q.bpair_phi_2_boosted],
-    scopes=SCOPES,
-)
-bpair_mass_1_boosted = Producer(
-    name="bpair_mass_1_boosted",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.bpair_p4_1_boosted],
-    output=[q.bpair_mass_1_boosted],
-    scopes=SCOPES,
-)
-bpair_mass_2_boosted = Producer(
-    name="bpair_mass_2_boosted",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.bpair_p4_2_boosted],
-    output=[q.bpair_mass_2_boosted],
+bpair_p4_1_boosted_components = lorentzvector_components_producer_factory(
+    name="bpair_p4_1_boosted_components",
+    p4=q.bpair_p4_1_boosted,
+    output={
+        "pt": q.bpair_pt_1_boosted,
+        "eta": q.bpair_eta_1_boosted,
+        "phi": q.bpair_phi_1_boosted,
+        "mass": q.bpair_mass_1_boosted,
+    },
+    scopes=SCOPES,
+)
+bpair_p4_2_boosted_components = lorentzvector_components_producer_factory(
+    name="bpair_p4_2_boosted_components",
+    p4=q.bpair_p4_2_boosted,
+    output={
+        "pt": q.bpair_pt_2_boosted,
+        "eta": q.bpair_eta_2_boosted,
+        "phi": q.bpair_phi_2_boosted,
+        "mass": q.bpair_mass_2_boosted,
+    },
     scopes=SCOPES,
 )
 bpair_btag_value_1_boosted = Producer(
@@ -287,18 +201,13 @@ p4_bpair_boosted = Producer(
     output=[q.p4_bpair_boosted],
     scopes=SCOPES,
 )
-bpair_m_inv_boosted = Producer(
-    name="bpair_m_inv_boosted",
-    call="lorentzvector::GetMass({df}, {output}, {input})",
-    input=[q.p4_bpair_boosted],
-    output=[q.bpair_m_inv_boosted],
-    scopes=SCOPES,
-)
-bpair_pt_dijet_boosted = Producer(
-    name="bpair_pt_dijet_boosted",
-    call="lorentzvector::GetPt({df}, {output}, {input})",
-    input=[q.p4_bpair_boosted],
-    output=[q.bpair_pt_dijet_boosted],
+p4_bpair_boosted_components = lorentzvector_components_producer_factory(
+    name="p4_bpair_boosted_components",
+    p4=q.p4_bpair_boosted,
+    output={
+        "mass": q.bpair_m_inv_boosted,
+        "pt": q.bpair_pt_dijet_boosted,
+    },
     scopes=SCOPES,
 )
 bpair_deltaR_boosted = Producer(
@@ -316,10 +225,7 @@ UnrollBjetLV1Run2_boosted = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        bpair_pt_1_boosted,
-        bpair_eta_1_boosted,
-        bpair_phi_1_boosted,
-        bpair_mass_1_boosted,
+        bpair_p4_1_boosted_components,
         bpair_btag_value_1_boosted,
     ],
 )
@@ -330,10 +236,7 @@ UnrollBjetLV2Run2_boosted = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        bpair_pt_2_boosted,
-        bpair_eta_2_boosted,
-        bpair_phi_2_boosted,
-        bpair_mass_2_boosted,
+        bpair_p4_2_boosted_components,
         bpair_btag_value_2_boosted,
     ],
 )
@@ -344,10 +247,7 @@ UnrollBjetLV1Run3_boosted = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        bpair_pt_1_boosted,
-        bpair_eta_1_boosted,
-        bpair_phi_1_boosted,
-        bpair_mass_1_boosted,
+        bpair_p4_1_boosted_components,
         bpair_btag_value_1_boosted,
     ],
 )
@@ -358,10 +258,7 @@ UnrollBjetLV2Run3_boosted = ProducerGroup(
     output=None,
     scopes=SCOPES,
     subproducers=[
-        bpair_pt_2_boosted,
-        bpair_eta_2_boosted,
-        bpair_phi_2_boosted,
-        bpair_mass_2_boosted,
+        bpair_p4_2_boosted_components,
         bpair_btag_value_2_boosted,
     ],
 )
@@ -376,8 +273,7 @@ DiBjetPairQuantitiesRun2_boosted = ProducerGroup(
         UnrollBjetLV1Run2_boosted,
         UnrollBjetLV2Run2_boosted,
         p4_bpair_boosted,
-        bpair_m_inv_boosted,
-        bpair_pt_dijet_boosted,
+        p4_bpair_boosted_components,
         bpair_deltaR_boosted,
     ],
 )
@@ -392,8 +288,7 @@ DiBjetPairQuantitiesRun3_boosted = ProducerGroup(
         UnrollBjetLV1Run3_boosted,
         UnrollBjetLV2Run3_boosted,
         p4_bpair_boosted,
-        bpair_m_inv_boosted,
-        bpair_pt_dijet_boosted,
+        p4_bpair_boosted_components,
         bpair_deltaR_boosted,
     ],
 )
@@ -4,6 +4,8 @@ from code_generation.quantity import Quantity
 from code_generation.producer import Producer, ProducerGroup
 from code_generation.producer import ExtendedVectorProducer
 
+from ._helpers import lepton_scalefactors_producer_factory
+
 from ..constants import ET_SCOPES, MT_SCOPES, TT_SCOPES, SL_SCOPES, ELECTRON_SCOPES, MUON_SCOPES, HAD_TAU_SCOPES, SCOPES
 
 
@@ -12,64 +14,43 @@ from ..constants import ET_SCOPES, MT_SCOPES, TT_SCOPES, SL_SCOPES, ELECTRON_SCO
 # The readout is done via correctionlib
 ############################
 
-Muon_1_ID_SF = Producer(
-    name="MuonID_SF",
-    call="""physicsobject::muon::scalefactor::Id(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{muon_sf_file}", 
-        "{muon_id_sf_name}", 
-        "{muon_id_sf_variation}")
-        """,
-    input=[q.pt_1, q.eta_1],
-    output=[q.id_wgt_mu_1],
-    scopes=["mt", "mm"],
-)
-Muon_1_Iso_SF = Producer(
-    name="MuonIso_SF",
-    call="""physicsobject::muon::scalefactor::Iso(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{muon_sf_file}", 
-        "{muon_iso_sf_name}", 
-        "{muon_iso_sf_variation}")
-        """,
-    input=[q.pt_1, q.eta_1],
-    output=[q.iso_wgt_mu_1],
+# ID and isolation scale factors of one muon are evaluated in a single producer
+Muon_1_IDIso_SF = lepton_scalefactors_producer_factory(
+    name="Muon_1_IDIso_SF",
+    pt=q.pt_1,
+    scalefactors=[
+        (
+            q.id_wgt_mu_1,
+            "{muon_sf_file}",
+            "{muon_id_sf_name}",
+            [("abs", q.eta_1), q.pt_1, "{muon_id_sf_variation}"],
+        ),
+        (
+            q.iso_wgt_mu_1,
+            "{muon_sf_file}",
+            "{muon_iso_sf_name}",
+            [("abs", q.eta_1), q.pt_1, "{muon_iso_sf_variation}"],
+        ),
+    ],
     scopes=["mt", "mm"],
 )
-Muon_2_ID_SF = Producer(
-    name="MuonID_SF",
-    call="""physicsobject::muon::scalefactor::Id(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{muon_sf_file}", 
-        "{muon_id_sf_name}", 
-        "{muon_id_sf_variation}")
-        """,
-    input=[q.pt_2, q.eta_2],
-    output=[q.id_wgt_mu_2],
-    scopes=["em", "mm"],
-)
-Muon_2_Iso_SF = Producer(
-    name="MuonIso_SF",
-    call="""physicsobject::muon::scalefactor::Iso(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{muon_sf_file}", 
-        "{muon_iso_sf_name}", 
-        "{muon_iso_sf_variation}")
-        """,
-    input=[q.pt_2, q.eta_2],
-    output=[q.iso_wgt_mu_2],
+Muon_2_IDIso_SF = lepton_scalefactors_producer_factory(
+    name="Muon_2_IDIso_SF",
+    pt=q.pt_2,
+    scalefactors=[
+        (
+            q.id_wgt_mu_2,
+            "{muon_sf_file}",
+            "{muon_id_sf_name}",
+            [("abs", q.eta_2), q.pt_2, "{muon_id_sf_variation}"],
+        ),
+        (
+            q.iso_wgt_mu_2,
+            "{muon_sf_file}",
+            "{muon_iso_sf_name}",
+            [("abs", q.eta_2), q.pt_2, "{muon_iso_sf_variation}"],
+        ),
+    ],
     scopes=["em", "mm"],
 )
 MuonIDIso_SF = ProducerGroup(
@@ -80,18 +61,14 @@ MuonIDIso_SF = ProducerGroup(
     scopes=["mt", "em", "mm"],
     subproducers={
         "mt": [
-            Muon_1_ID_SF,
-            Muon_1_Iso_SF,
+            Muon_1_IDIso_SF,
         ],
         "em": [
-            Muon_2_ID_SF,
-            Muon_2_Iso_SF,
+            Muon_2_IDIso_SF,
         ],
         "mm": [
-            Muon_1_ID_SF,
-            Muon_1_Iso_SF,
-            Muon_2_ID_SF,
-            Muon_2_Iso_SF,
+            Muon_1_IDIso_SF,
+            Muon_2_IDIso_SF,
         ],
     },
 )
@@ -103,34 +80,23 @@ Muon_1_Reco_SF_boosted = Producer(
     output=[q.reco_wgt_mu_boosted_1],
     scopes=["mt"],
 )
-Muon_1_ID_SF_boosted = Producer(
-    name="MuonID_SF_boosted",
-    call="""physicsobject::muon::scalefactor::Id(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{muon_sf_file}", 
-        "{muon_id_sf_name}", 
-        "{muon_id_sf_variation}")
-        """,
-    input=[q.boosted_pt_1, q.boosted_eta_1],
-    output=[q.id_wgt_mu_boosted_1],
-    scopes=["mt"],
-)
-Muon_1_Iso_SF_boosted = Producer(
-    name="MuonIso_SF_boosted",
-    call="""physicsobject::muon::scalefactor::Iso(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{muon_sf_file}", 
-        "{muon_iso_sf_name}", 
-        "{muon_iso_sf_variation}")
-        """,
-    input=[q.boosted_pt_1, q.boosted_eta_1],
-    output=[q.iso_wgt_mu_boosted_1],
+Muon_1_IDIso_SF_boosted = lepton_scalefactors_producer_factory(
+    name="Muon_1_IDIso_SF_boosted",
+    pt=q.boosted_pt_1,
+    scalefactors=[
+        (
+            q.id_wgt_mu_boosted_1,
+            "{muon_sf_file}",
+            "{muon_id_sf_name}",
+            [("abs", q.boosted_eta_1), q.boosted_pt_1, "{muon_id_sf_variation}"],
+        ),
+        (
+            q.iso_wgt_mu_boosted_1,
+            "{muon_sf_file}",
+            "{muon_iso_sf_name}",
+            [("abs", q.boosted_eta_1), q.boosted_pt_1, "{muon_iso_sf_variation}"],
+        ),
+    ],
     scopes=["mt"],
 )
 Muon_SF_boosted = ProducerGroup(
@@ -142,8 +108,7 @@ Muon_SF_boosted = ProducerGroup(
     subproducers={
         "mt": [
             # Muon_1_Reco_SF_boosted,  does not exist in Run 3
-            Muon_1_ID_SF_boosted,
-            Muon_1_Iso_SF_boosted,
+            Muon_1_IDIso_SF_boosted,
         ],
     },
 )
@@ -518,38 +483,30 @@ Ele_2_Reco_SF = Producer(
     output=[q.reco_wgt_ele_2],
     scopes=["ee"],
 )
-Ele_1_IDWP90_SF = Producer(
+Ele_1_IDWP90_SF = lepton_scalefactors_producer_factory(
     name="Ele_1_IDWP90_SF",
-    call="""physicsobject::electron::scalefactor::Id(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{ele_sf_year_id}", 
-        "{ele_id_sf_name}", 
-        "{ele_sf_file}", 
-        "{ele_sf_cset_name}", 
-        "{ele_id_sf_variation}")
-        """,
-    input=[q.pt_1, q.eta_1, q.phi_1],
-    output=[q.id_wgt_ele_1],
+    pt=q.pt_1,
+    scalefactors=[
+        (
+            q.id_wgt_ele_1,
+            "{ele_sf_file}",
+            "{ele_sf_cset_name}",
+            ["{ele_sf_year_id}", "{ele_id_sf_variation}", "{ele_id_sf_name}", q.eta_1, q.pt_1, q.phi_1],
+        ),
+    ],
     scopes=["em", "ee", "et"],
 )
-Ele_2_IDWP90_SF = Producer(
+Ele_2_IDWP90_SF = lepton_scalefactors_producer_factory(
     name="Ele_2_IDWP90_SF",
-    call="""physicsobject::electron::scalefactor::Id(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{ele_sf_year_id}", 
-        "{ele_id_sf_name}", 
-        "{ele_sf_file}", 
-        "{ele_sf_cset_name}", 
-        "{ele_id_sf_variation}")
-        """,
-    input=[q.pt_2, q.eta_2, q.phi_2],
-    output=[q.id_wgt_ele_2],
+    pt=q.pt_2,
+    scalefactors=[
+        (
+            q.id_wgt_ele_2,
+            "{ele_sf_file}",
+            "{ele_sf_cset_name}",
+            ["{ele_sf_year_id}", "{ele_id_sf_variation}", "{ele_id_sf_name}", q.eta_2, q.pt_2, q.phi_2],
+        ),
+    ],
     scopes=["ee"],
 )
 EleID_SF = ProducerGroup(
@@ -592,21 +549,17 @@ Ele_1_Reco_SF_boosted = Producer(
     output=[q.reco_wgt_ele_boosted_1],
     scopes=["et"],
 )
-Ele_1_IDWP90_SF_boosted = Producer(
+Ele_1_IDWP90_SF_boosted = lepton_scalefactors_producer_factory(
     name="Ele_1_IDWP90_SF_boosted",
-    call="""physicsobject::electron::scalefactor::Id(
-        {df}, 
-        correctionManager, 
-        {output}, 
-        {input}, 
-        "{ele_sf_year_id}", 
-        "{ele_id_sf_name}", 
-        "{ele_sf_file}", 
-        "{ele_sf_cset_name}", 
-        "{ele_id_sf_variation}")
-        """,
-    input=[q.boosted_pt_1, q.boosted_eta_1, q.boosted_phi_1],
-    output=[q.id_wgt_ele_boosted_wp90nonIso_1],
+    pt=q.boosted_pt_1,
+    scalefactors=[
+        (
+            q.id_wgt_ele_boosted_wp90nonIso_1,
+            "{ele_sf_file}",
+            "{ele_sf_cset_name}",
+            ["{ele_sf_year_id}", "{ele_id_sf_variation}", "{ele_id_sf_name}", q.boosted_eta_1, q.boosted_pt_1, q.boosted_phi_1],
+        ),
+    ],
     scopes=["et"],
 )
 EleID_SF_boosted = ProducerGroup(
@@ -895,6 +848,9 @@ BoostedTTGenerateFatjetTriggerSF_MC = Producer(
 ####################################
 # Electron and Muon SFs coming from our measurements
 ####################################
+# These are evaluated with the embedding functions of CROWN, which multiply
+# the scale factors by the configurable extrapolation factors, instead of
+# scalefactor::lepton::Evaluate. They are not used by any configuration.
 TauEmbeddingMuonIDSF_1_MC = Producer(
     name="TauEmbeddingMuonIDSF_1_MC",
     call="""embedding::muon::Scalefactor(
@@ -5,6 +5,7 @@ Producers for hadronic tau energy scale corrections and object selections.
 from ..quantities import output as q
 from ..quantities import nanoAOD as nanoAOD
 from code_generation.producer import Producer, ProducerGroup
+from ._helpers import tau_es_variations_producer_factory
 from ..constants import HAD_TAU_SCOPES
 
 
@@ -92,6 +93,101 @@ TauEnergyCorrectionMC = ProducerGroup(
     ],
 )
 
+# Energy scale variations of hadronic taus, which are evaluated in one pass
+# with the nominal correction (see `TAU_ES_VARIATIONS_IN_ONE_PASS`), given as
+# tuples of the shift name, the category of the affected taus and the variation
+TAU_ES_VARIATIONS = [
+    ("tauEs1prong0pizeroDown", "dm0", "down"),
+    ("tauEs1prong0pizeroUp", "dm0", "up"),
+    ("tauEs1prong1pizeroDown", "dm1", "down"),
+    ("tauEs1prong1pizeroUp", "dm1", "up"),
+    ("tauEs3prong0pizeroDown", "dm10", "down"),
+    ("tauEs3prong0pizeroUp", "dm10", "up"),
+    ("tauEs3prong1pizeroDown", "dm11", "down"),
+    ("tauEs3prong1pizeroUp", "dm11", "up"),
+    ("tauMuFakeEsDown", "mufake", "down"),
+    ("tauMuFakeEsUp", "mufake", "up"),
+    ("tauEleFakeEs1prongBarrelDown", "efake_dm0_barrel", "down"),
+    ("tauEleFakeEs1prongBarrelUp", "efake_dm0_barrel", "up"),
+    ("tauEleFakeEs1prongEndcapDown", "efake_dm0_endcap", "down"),
+    ("tauEleFakeEs1prongEndcapUp", "efake_dm0_endcap", "up"),
+    ("tauEleFakeEs1prong1pizeroBarrelDown", "efake_dm1_barrel", "down"),
+    ("tauEleFakeEs1prong1pizeroBarrelUp", "efake_dm1_barrel", "up"),
+    ("tauEleFakeEs1prong1pizeroEndcapDown", "efake_dm1_endcap", "down"),
+    ("tauEleFakeEs1prong1pizeroEndcapUp", "efake_dm1_endcap", "up"),
+]
+
+# Nominal hadronic tau pt correction for DeepTau v2.5, from which the
+# variations are derived
+TauPtCorrectionNominalMC = Producer(
+    name="TauPtCorrectionNominalMC",
+    call="""
+        physicsobject::tau::PtCorrectionMC(
+            {df},
+            correctionManager,
+            {output},
+            {input},
+            "{tau_ides_sf_file}",
+            "{tau_ES_json_name}",
+            "{tau_id_algorithm}",
+            "nom",
+            "nom",
+            "nom",
+            "nom",
+            "nom",
+            "nom",
+            "nom",
+            "nom",
+            "nom",
+            "{tau_ides_sf_vsjet_wp}",
+            "{tau_ides_sf_vsele_wp}"
+        )
+    """,
+    input=[
+        nanoAOD.Tau_pt,
+        nanoAOD.Tau_eta,
+        nanoAOD.Tau_decayMode,
+        nanoAOD.Tau_genPartFlav,
+    ],
+    output=[q.Tau_pt_corrected_nominal],
+    scopes=HAD_TAU_SCOPES,
+)
+
+# All tau energy scale variations in one pass, and the selection of the
+# nominal or varied tau pt, which is rerun in the energy scale shifts
+TauPtCorrectionVariationsMC, TauPtCorrectionSelectionMC = tau_es_variations_producer_factory(
+    name="TauPtCorrection",
+    pt=nanoAOD.Tau_pt,
+    eta=nanoAOD.Tau_eta,
+    decay_mode=nanoAOD.Tau_decayMode,
+    gen_match=nanoAOD.Tau_genPartFlav,
+    pt_corrected_nominal=q.Tau_pt_corrected_nominal,
+    pt_corrected=q.Tau_pt_corrected,
+    correction_arguments=(
+        '"{tau_ides_sf_file}", "{tau_ES_json_name}", "{tau_id_algorithm}", '
+        '{vec_open}"{tau_ides_sf_vsjet_wp}", "{tau_ides_sf_vsele_wp}"{vec_close}'
+    ),
+    variation_parameter="tau_ES_variation",
+    variations=TAU_ES_VARIATIONS,
+    scopes=HAD_TAU_SCOPES,
+)
+
+# Producer group encapsulating all tau energy scale corrections in MC samples,
+# with all energy scale variations evaluated in one pass
+TauEnergyCorrectionVariationsMC = ProducerGroup(
+    name="TauEnergyCorrectionVariationsMC",
+    call=None,
+    input=None,
+    output=None,
+    scopes=HAD_TAU_SCOPES,
+    subproducers=[
+        TauPtCorrectionNominalMC,
+        TauPtCorrectionVariationsMC,
+        TauPtCorrectionSelectionMC,
+        TauMassCorrection,
+    ],
+)
+
 # producer group encapsulating dummy tau energy scale corrections in data
 TauEnergyCorrectionData = ProducerGroup(
     name="TauEnergyCorrectionData",
@@ -2,6 +2,9 @@ from code_generation.quantity import Quantity
 
 lumi = Quantity("lumi")
 puweight = Quantity("puweight")
+puweight_nominal = Quantity("puweight_nominal")
+puweight_up = Quantity("puweight_up")
+puweight_down = Quantity("puweight_down")
 prefireweight = Quantity("prefiring_wgt")
 lhe_scale_weight = Quantity("lhe_scale_weight")
 
@@ -112,6 +115,7 @@ base_photons_mask = Quantity("base_photons_mask")
 Tau_pt_ele_corrected = Quantity("Tau_pt_ele_corrected")
 Tau_pt_ele_mu_corrected = Quantity("Tau_pt_mu_corrected")
 Tau_pt_corrected = Quantity("Tau_pt_corrected")
+Tau_pt_corrected_nominal = Quantity("Tau_pt_corrected_nominal")
 Tau_mass_corrected = Quantity("Tau_mass_corrected")
 Jet_pt_raw = Quantity("Jet_pt_raw")
 Jet_mass_raw = Quantity("Jet_mass_raw")
@@ -151,6 +155,7 @@ Electron_pt_corrected = Quantity("Electron_pt_corrected")
 # boosted Tau quantities
 good_boostedtaus_mask = Quantity("good_boostedtaus_mask")
 boostedTau_pt_corrected = Quantity("boostedTau_pt_corrected")
+boostedTau_pt_corrected_nominal = Quantity("boostedTau_pt_corrected_nominal")
 boostedTau_mass_corrected = Quantity("boostedTau_mass_corrected")
 nboostedtaus = Quantity("nboostedtaus")
 boosteddileptonpair = Quantity("boosteddileptonpair")
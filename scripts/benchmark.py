@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark of the compiled CROWN executables.
+
+The executables of the selected samples are built like in
+`build_scripts/test_build_<era>.sh` and run on local synthetic NanoAOD files
+created with `scripts/synthetic_nano.py`, so that the results do not depend
+on the network access to the test files. Each executable is run twice:
+
+- on a small file, whose wall time is taken as the startup time (JIT
+  compilation of the computation graph, loading of the correction files and
+  ML models, ...),
+- on a large file, from which the event throughput is obtained after
+  subtracting the startup time.
+
+The peak resident memory of both runs is reported as well. The results are
+written to a json file, which can be passed as `--baseline` to later runs to
+check for regressions, e.g. in a CI job.
+
+Example:
+
+    python scripts/synthetic_nano.py --schema nano_2018.json \\
+        --events 1000 --output small_2018.root
+    python scripts/synthetic_nano.py --schema nano_2018.json \\
+        --events 100000 --output large_2018.root
+    python scripts/benchmark.py --era 2018 --samples ttbar,dyjets \\
+        --scopes et,mt,tt --small-input small_2018.root \\
+        --large-input large_2018.root --output benchmark_2018.json
+
+    # compare to a previous benchmark without rebuilding the executables
+    python scripts/benchmark.py --era 2018 --samples ttbar,dyjets \\
+        --scopes et,mt,tt --small-input small_2018.root \\
+        --large-input large_2018.root --skip-build \\
+        --baseline benchmark_2018.json --tolerance 0.1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ANALYSIS = "xyh_bbtautau"
+CONFIG = "nmssm_config"
+
+# metrics compared to the baseline, the bool states whether larger values
+# are better
+METRICS = {
+    "events_per_second": True,
+    "startup_time": False,
+    "peak_rss_mb": False,
+}
+
+
+def crown_directories(era: str) -> Tuple[str, str]:
+    analysis_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    crown_dir = os.path.abspath(os.path.join(analysis_dir, "..", "..", ".."))
+    return crown_dir, os.path.join(crown_dir, f"build_{era}")
+
+
+def build(
+    era: str, samples: List[str], scopes: List[str], threads: int, cores: int
+) -> None:
+    _, build_dir = crown_directories(era)
+    os.makedirs(build_dir, exist_ok=True)
+    commands = [
+        [
+            "cmake",
+            "..",
+            f"-DANALYSIS={ANALYSIS}",
+            f"-DCONFIG={CONFIG}",
+            f"-DERAS={era}",
+            f"-DSAMPLES={','.join(samples)}",
+            f"-DSCOPES={','.join(scopes)}",
+            "-DSHIFTS=none",
+            f"-DTHREADS={threads}",
+            "-DDEBUG=false",
+        ],
+        ["make", "-j", str(cores)],
+        ["make", "install"],
+    ]
+    for command in commands:
+        subprocess.run(command, cwd=build_dir, check=True)
+
+
+def run_executable(
+    executable: str, input_file: str, output_file: str, cwd: str
+) -> Dict[str, float]:
+    """
+    Run an executable and measure its wall time and peak resident memory.
+    The memory is taken from the resource usage of the finished process, so
+    that only the executable itself and not this script is measured.
+    """
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [executable, output_file, input_file],
+            cwd=cwd,
+            stdout=devnull,
+            stderr=subprocess.STDOUT,
+        )
+        _, status, usage = os.wait4(process.pid, 0)
+        wall_time = time.perf_counter() - start
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code != 0:
+        raise RuntimeError(
+            f"{executable} failed on {input_file} with exit code {exit_code}"
+        )
+    return {
+        "wall_time": wall_time,
+        # ru_maxrss is given in kilobytes on Linux
+        "peak_rss_mb": usage.ru_maxrss / 1024.0,
+    }
+
+
+def count_events(input_file: str) -> int:
+    import uproot
+
+    with uproot.open(input_file) as f:
+        return f["Events"].num_entries
+
+
+def benchmark(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    _, build_dir = crown_directories(args.era)
+    bin_dir = os.path.join(build_dir, "bin")
+    small_input = os.path.abspath(args.small_input)
+    large_input = os.path.abspath(args.large_input)
+    small_events = count_events(small_input)
+    large_events = count_events(large_input)
+    if large_events <= small_events:
+        raise ValueError(
+            "The large input file must contain more events than the small one"
+        )
+
+    results = {}
+    for sample in args.samples:
+        executable = os.path.join(bin_dir, f"{CONFIG}_{sample}_{args.era}")
+        if not os.path.isfile(executable):
+            raise FileNotFoundError(f"Executable {executable} not found")
+        small_runs, large_runs = [], []
+        for _ in range(args.repetitions):
+            small_runs.append(
+                run_executable(
+                    executable, small_input, f"benchmark_small_{sample}.root", bin_dir
+                )
+            )
+            large_runs.append(
+                run_executable(
+                    executable, large_input, f"benchmark_large_{sample}.root", bin_dir
+                )
+            )
+        # the fastest of the repetitions is least affected by other processes
+        small_time = min(r["wall_time"] for r in small_runs)
+        large_time = min(r["wall_time"] for r in large_runs)
+        results[sample] = {
+            "startup_time": small_time,
+            "events_per_second": (large_events - small_events)
+            / max(large_time - small_time, 1e-9),
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in small_runs + large_runs),
+            "wall_time": large_time,
+            "events": large_events,
+        }
+    return results
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    regressions = []
+    for sample, result in results.items():
+        if sample not in baseline:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            reference = baseline[sample][metric]
+            value = result[metric]
+            if higher_is_better:
+                regressed = value < reference * (1.0 - tolerance)
+            else:
+                regressed = value > reference * (1.0 + tolerance)
+            if regressed:
+                regressions.append(
+                    f"{sample}: {metric} changed from {reference:.3g} to {value:.3g}"
+                )
+    return regressions
+
+
+def print_report(results: Dict[str, Dict[str, float]]) -> None:
+    header = (
+        f"{'sample':>16} | {'events':>8} | {'startup [s]':>11} | "
+        f"{'events/s':>10} | {'peak RSS [MB]':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+    for sample, r in results.items():
+        print(
+            f"{sample:>16} | {r['events']:8d} | {r['startup_time']:11.2f} | "
+            f"{r['events_per_second']:10.0f} | {r['peak_rss_mb']:13.0f}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure startup time, throughput and memory usage of the CROWN executables"
+    )
+    parser.add_argument("--era", required=True, help="Era of the executables")
+    parser.add_argument(
+        "--samples",
+        type=lambda x: x.split(","),
+        required=True,
+        help="Comma-separated list of samples, e.g. 'ttbar,dyjets'",
+    )
+    parser.add_argument(
+        "--scopes",
+        type=lambda x: x.split(","),
+        default=["et", "mt", "tt"],
+        help="Comma-separated list of scopes compiled into the executables",
+    )
+    parser.add_argument(
+        "--small-input",
+        required=True,
+        help="Small synthetic NanoAOD file used to measure the startup time",
+    )
+    parser.add_argument(
+        "--large-input",
+        required=True,
+        help="Large synthetic NanoAOD file used to measure the throughput",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=1, help="Number of threads of the executables"
+    )
+    parser.add_argument(
+        "--cores", type=int, default=16, help="Number of cores used for the compilation"
+    )
+    parser.add_argument(
+        "--repetitions",
+        type=int,
+        default=1,
+        help="Number of repetitions of each measurement, the fastest run is reported",
+    )
+    parser.add_argument(
+        "--skip-build",
+        action="store_true",
+        help="Use the already installed executables instead of building them",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Optional json file for the results"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Json file of a previous benchmark to check for regressions",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Relative deviation from the baseline that is considered a regression",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not args.skip_build:
+        build(args.era, args.samples, args.scopes, args.threads, args.cores)
+    results = benchmark(args)
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Results saved to {args.output}")
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Precompile correctionlib payloads into the cache read by the configuration.
+
+Each payload is validated against the correctionlib schema and loaded with
+the correctionlib evaluator, which is also used by the correction manager of
+CROWN. Valid payloads are written as uncompressed, minified json files to the
+cache directory, named by the sha256 digest of the original file content,
+e.g. `payloads/correction_cache/<sha256>.json`. The cache entries are loaded
+again and compared to the original payloads, and the load times of both are
+reported.
+
+The payloads are recorded in the manifest of the cache, which maps each
+payload path to its cache entry, the digest and the sizes, and which is read
+by `correction_cache.py` when the code is generated. Json files, which are no
+correctionlib payloads, are recorded without cache entry. Payloads, which are
+not found on this machine, are not recorded, so that configurations using
+them fail to build with the cache instead of loading the original files.
+Existing manifest entries of other payloads are kept. With `--check`, the
+digests of the payloads in the manifest are compared to the original files
+without writing the cache.
+
+The payloads are given as files or directories, which are searched for
+`.json` and `.json.gz` files. If no payloads are given, the string literals
+ending with `.json` or `.json.gz` in the configuration modules of the
+analysis are used. Json files, which are no correctionlib payloads (e.g. the
+golden json files or the ML feature transformations), are skipped.
+
+Example:
+
+    # cache all payloads used by the configurations
+    python scripts/correction_cache.py
+
+    # cache single payloads and write a json report
+    python scripts/correction_cache.py \\
+        /cvmfs/cms-griddata.cern.ch/cat/metadata/JME/Run2-2018-UL-NanoAODv9/2025-09-23/jet_jerc.json.gz \\
+        payloads/fake_factors --output correction_cache.json
+
+    # check the cache entries against the original payloads
+    python scripts/correction_cache.py --check
+"""
+
+import argparse
+import ast
+import gzip
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+ANALYSIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CROWN_DIR = os.path.abspath(os.path.join(ANALYSIS_DIR, "..", ".."))
+
+# the naming scheme of the cache is shared with the configuration, which is
+# imported from the CROWN directory like in the code generation
+sys.path.insert(0, CROWN_DIR)
+correction_cache = importlib.import_module(
+    f"analysis_configurations.{os.path.basename(ANALYSIS_DIR)}.correction_cache"
+)
+CORRECTION_CACHE_DIR = correction_cache.CORRECTION_CACHE_DIR
+CORRECTION_CACHE_MANIFEST = correction_cache.CORRECTION_CACHE_MANIFEST
+PAYLOAD_EXTENSIONS = correction_cache.PAYLOAD_EXTENSIONS
+payload_digest = correction_cache.payload_digest
+
+
+def local_path(path: str) -> Optional[str]:
+    """
+    Path of a payload on this machine. Payloads given on the command line are
+    looked up relative to the working directory first, the paths in the
+    configuration relative to the analysis or the CROWN directory.
+    """
+    if os.path.isfile(path):
+        return os.path.abspath(path)
+    return correction_cache.local_payload_path(path)
+
+
+def configuration_payloads() -> List[str]:
+    """
+    Collect the paths ending with `.json` or `.json.gz`, which are given as
+    string literals in the python modules of the analysis, except for the
+    scripts.
+    """
+    payloads = set()
+    for root, dirs, files in os.walk(ANALYSIS_DIR):
+        dirs[:] = [
+            d
+            for d in dirs
+            if d not in ("scripts", "payloads", "__pycache__") and not d.startswith(".")
+        ]
+        for name in files:
+            if not name.endswith(".py"):
+                continue
+            with open(os.path.join(root, name)) as f:
+                tree = ast.parse(f.read())
+            # parts of f-strings are no complete paths
+            fragments = set(
+                id(value)
+                for node in ast.walk(tree)
+                if isinstance(node, ast.JoinedStr)
+                for value in node.values
+            )
+            for node in ast.walk(tree):
+                if (
+                    isinstance(node, ast.Constant)
+                    and isinstance(node.value, str)
+                    and node.value.endswith(PAYLOAD_EXTENSIONS)
+                    and "/" in node.value
+                    and id(node) not in fragments
+                ):
+                    payloads.add(node.value)
+    return sorted(payloads)
+
+
+def collect_payloads(paths: List[str]) -> List[str]:
+    payloads = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                payloads.extend(
+                    os.path.join(root, name)
+                    for name in sorted(files)
+                    if name.endswith(PAYLOAD_EXTENSIONS)
+                )
+        else:
+            payloads.append(path)
+    return payloads
+
+
+def read_payload(path: str) -> bytes:
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def load_time(path: str) -> float:
+    import correctionlib
+
+    start = time.perf_counter()
+    correctionlib.CorrectionSet.from_file(path)
+    return time.perf_counter() - start
+
+
+def cache_payload(path: str, cache_dir: str, force: bool) -> Dict[str, object]:
+    """
+    Validate a payload and write its cache entry. Returns a summary of the
+    payload with the status `cached`, `exists`, `missing`, `skipped` (no
+    correctionlib payload) or `invalid`.
+    """
+    import correctionlib
+    import correctionlib.schemav2 as schema
+
+    result = {"payload": path, "status": "missing"}
+    source = local_path(path)
+    if source is None:
+        return result
+    digest = payload_digest(source)
+    entry = os.path.join(cache_dir, f"{digest}.json")
+    result.update({"digest": digest, "entry": entry, "size": os.path.getsize(source)})
+    if os.path.isfile(entry) and not force:
+        result["status"] = "exists"
+    else:
+        content = json.loads(read_payload(source))
+        if not isinstance(content, dict) or content.get("schema_version") != 2:
+            result.update({"status": "skipped", "entry": None})
+            return result
+        try:
+            schema.CorrectionSet.model_validate(content)
+        except ValueError as error:
+            result.update({"status": "invalid", "error": str(error)})
+            return result
+        minified = json.dumps(content, separators=(",", ":"), allow_nan=False)
+        # the evaluator has to accept the minified payload, as the correction
+        # manager does not validate it against the schema
+        corrections = correctionlib.CorrectionSet.from_string(minified)
+        original = correctionlib.CorrectionSet.from_file(source)
+        if sorted(corrections.keys()) != sorted(original.keys()):
+            raise RuntimeError(
+                f"Corrections of the cache entry of {path} differ from the original payload"
+            )
+        # write to a temporary file first, so that concurrent builds never
+        # read incomplete cache entries
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = f"{entry}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(minified)
+        os.replace(temporary, entry)
+        result["status"] = "cached"
+    result["cached_size"] = os.path.getsize(entry)
+    result["load_time"] = load_time(source)
+    result["cached_load_time"] = load_time(entry)
+    return result
+
+
+def manifest_path(cache_dir: str) -> str:
+    return os.path.join(cache_dir, os.path.basename(CORRECTION_CACHE_MANIFEST))
+
+
+def read_manifest(cache_dir: str) -> Dict[str, Dict[str, object]]:
+    path = manifest_path(cache_dir)
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(cache_dir: str, results: List[Dict[str, object]]) -> None:
+    """
+    Record the cached and skipped payloads in the manifest of the cache. The
+    entries are given relative to the analysis directory, like the payloads
+    in the configurations.
+    """
+    manifest = read_manifest(cache_dir)
+    for r in results:
+        if r["status"] in ("cached", "exists"):
+            manifest[r["payload"]] = {
+                "entry": os.path.relpath(r["entry"], ANALYSIS_DIR),
+                "sha256": r["digest"],
+                "size": r["size"],
+                "cached_size": r["cached_size"],
+            }
+        elif r["status"] == "skipped":
+            manifest[r["payload"]] = {"entry": None, "sha256": r["digest"], "size": r["size"]}
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary = f"{manifest_path(cache_dir)}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=4)
+    os.replace(temporary, manifest_path(cache_dir))
+
+
+def check_manifest(cache_dir: str) -> List[str]:
+    """
+    Compare the digests in the manifest to the original payloads.
+
+    :return: Payloads, which are missing or differ from the manifest
+    """
+    outdated = []
+    for payload, entry in read_manifest(cache_dir).items():
+        source = local_path(payload)
+        if source is None or payload_digest(source) != entry["sha256"]:
+            outdated.append(payload)
+    return outdated
+
+
+def print_report(results: List[Dict[str, object]]) -> None:
+    print(
+        f"{'payload':>60} | {'status':>7} | {'size [MB]':>9} | {'cached [MB]':>11} | "
+        f"{'load [s]':>8} | {'cached [s]':>10}"
+    )
+    for r in results:
+        if "cached_size" not in r:
+            print(f"{r['payload'][-60:]:>60} | {r['status']:>7} |")
+            continue
+        print(
+            f"{r['payload'][-60:]:>60} | {r['status']:>7} | {r['size'] / 1e6:9.2f} | "
+            f"{r['cached_size'] / 1e6:11.2f} | {r['load_time']:8.3f} | {r['cached_load_time']:10.3f}"
+        )
+    load_time = sum(r.get("load_time", 0.0) for r in results)
+    cached_load_time = sum(r.get("cached_load_time", 0.0) for r in results)
+    print(f"Total load time: {load_time:.2f} s original, {cached_load_time:.2f} s cached")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Validate correctionlib payloads and store them in the payload cache"
+    )
+    parser.add_argument(
+        "payloads",
+        nargs="*",
+        help="Payload files or directories. Defaults to the payloads used in the configurations",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.path.join(ANALYSIS_DIR, CORRECTION_CACHE_DIR),
+        help="Cache directory. Defaults to `CORRECTION_CACHE_DIR` in `correction_cache.py`",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite existing cache entries",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only compare the digests in the manifest to the original payloads",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Optional json file for the report"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.check:
+        outdated = check_manifest(args.cache_dir)
+        for payload in outdated:
+            print(f"Outdated or missing payload: {payload}")
+        sys.exit(1 if outdated else 0)
+    payloads = collect_payloads(args.payloads) if args.payloads else configuration_payloads()
+    results = [cache_payload(payload, args.cache_dir, args.force) for payload in payloads]
+    write_manifest(args.cache_dir, results)
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Report saved to {args.output}")
+    if any(r["status"] == "invalid" for r in results):
+        sys.exit(1)
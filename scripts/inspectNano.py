@@ -2,7 +2,13 @@
 
 import sys
 import os.path
+import ast
+import copy
+import glob
 import json
+import multiprocessing
+import re
+import string
 from collections import defaultdict
 import ROOT
 
@@ -149,13 +155,15 @@ def inspectRootFile(infile):
                 counters[b.counter].append(b.name)
             else:
                 b.entries = entries
-        c1 = ROOT.TCanvas("c1", "c1")
+        # the sums of all counters are booked first and computed in a single
+        # event loop, which only reads the counter branches
+        if counters and entries > 0:
+            df = ROOT.RDataFrame(tree)
+            sums = dict((counter, df.Sum(counter)) for counter in counters)
+        else:
+            sums = {}
         for counter, countees in counters.items():
-            n = tree.Draw(counter + ">>htemp")
-            if n != 0:
-                htemp = ROOT.gROOT.FindObject("htemp")
-                n = htemp.GetEntries() * htemp.GetMean()
-                htemp.Delete()
+            n = sums[counter].GetValue() if counter in sums else 0
             branchmap[counter].entries = entries
             for c in countees:
                 br = branchmap[c]
@@ -197,11 +205,540 @@ def inspectRootFile(infile):
             branches=dict(b.toJSON() for b in allbranches),
             branchgroups=dict(bg.toJSON() for bg in branchgroups.values()),
         )
-        c1.Close()
     tfile.Close()
     return dict(filename=os.path.basename(infile), filesize=filesize, trees=trees)
 
 
+def mergeFileData(filedatas):
+    """Sum the sizes and entries of several surveyed files into one survey.
+    Branches missing in some of the files are taken from the files containing
+    them."""
+    merged = copy.deepcopy(filedatas[0])
+    if len(filedatas) > 1:
+        merged["filename"] = "%s (+%d files)" % (
+            merged["filename"],
+            len(filedatas) - 1,
+        )
+    for data in filedatas[1:]:
+        merged["filesize"] += data["filesize"]
+        for treeName, treeData in data["trees"].items():
+            mergedTree = merged["trees"][treeName]
+            mergedTree["entries"] += treeData["entries"]
+            mergedTree["allsize"] += treeData["allsize"]
+            for key in "branches", "branchgroups":
+                for name, item in treeData[key].items():
+                    if name not in mergedTree[key]:
+                        mergedTree[key][name] = copy.deepcopy(item)
+                        continue
+                    mergedItem = mergedTree[key][name]
+                    mergedItem["tot"] += item["tot"]
+                    if item["entries"] is not None:
+                        mergedEntries = mergedItem["entries"] or 0
+                        mergedItem["entries"] = mergedEntries + item["entries"]
+    return merged
+
+
+def inspectRootFiles(infiles, processes):
+    """Survey several files in parallel processes and merge the results."""
+    if len(infiles) == 1 or processes <= 1:
+        return mergeFileData([inspectRootFile(infile) for infile in infiles])
+    # ROOT is not fork-safe once initialized, hence the workers are spawned
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(min(processes, len(infiles))) as pool:
+        return mergeFileData(pool.map(inspectRootFile, infiles))
+
+
+# directory of the analysis, whose producers and quantities are used to group
+# the branches of CROWN ntuples
+ANALYSIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRODUCER_CLASSES = (
+    "Producer",
+    "ProducerGroup",
+    "VectorProducer",
+    "ExtendedVectorProducer",
+    "lorentzvector_components_producer_factory",
+    "object_attributes_producer_factory",
+    "lepton_scalefactors_producer_factory",
+)
+# size in bytes and value range of the integer leaf types, in the order in
+# which they are proposed for integral branches
+INTEGER_TYPES = [
+    ("Bool_t", 1, 0, 1),
+    ("Char_t", 1, -(2**7), 2**7 - 1),
+    ("UChar_t", 1, 0, 2**8 - 1),
+    ("Short_t", 2, -(2**15), 2**15 - 1),
+    ("UShort_t", 2, 0, 2**16 - 1),
+    ("Int_t", 4, -(2**31), 2**31 - 1),
+    ("UInt_t", 4, 0, 2**32 - 1),
+]
+LEAF_SIZES = dict((t[0], t[1]) for t in INTEGER_TYPES)
+LEAF_SIZES.update(
+    {"Float_t": 4, "Double_t": 8, "Long64_t": 8, "ULong64_t": 8}
+)
+# floats with a compression ratio below this value carry full-precision
+# mantissas and profit from a truncated mantissa (Float16_t)
+MANTISSA_COMPRESSION_RATIO = 1.5
+# fraction of the compressed size expected to be saved by a Float16_t with
+# a truncated mantissa
+MANTISSA_SAVING = 0.5
+
+
+def _callName(node):
+    if not isinstance(node, ast.Call):
+        return None
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def _keyword(call, name):
+    for kw in call.keywords:
+        if kw.arg == name:
+            return kw.value
+    return None
+
+
+def _stringPattern(node):
+    """Regular expression matching the values of a string literal in the
+    configuration, with the placeholders of formatted strings matching any
+    value. Returns None for values that cannot be resolved statically."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return re.escape(node.value)
+    if (
+        _callName(node) == "format"
+        and isinstance(node.func.value, ast.Constant)
+        and isinstance(node.func.value.value, str)
+    ):
+        pattern = ""
+        for literal, field, _, _ in string.Formatter().parse(node.func.value.value):
+            pattern += re.escape(literal)
+            if field is not None:
+                pattern += ".+"
+        return pattern
+    if isinstance(node, ast.JoinedStr):
+        pattern = ""
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                pattern += re.escape(value.value)
+            else:
+                pattern += ".+"
+        return pattern
+    return None
+
+
+def readQuantityNames(analysisDir):
+    """Map the attribute names of quantities/output.py to the names of the
+    quantities, i.e. the branch names in the ntuples."""
+    quantities = {}
+    with open(os.path.join(analysisDir, "quantities", "output.py")) as f:
+        module = ast.parse(f.read())
+    for node in module.body:
+        if (
+            isinstance(node, ast.Assign)
+            and _callName(node.value) == "Quantity"
+            and node.value.args
+            and isinstance(node.value.args[0], ast.Constant)
+        ):
+            for target in node.targets:
+                quantities[target.id] = node.value.args[0].value
+    return quantities
+
+
+def readProducers(analysisDir, quantities):
+    """Collect the outputs and subproducers of the producers defined in the
+    producers modules of the analysis. The modules are parsed instead of
+    imported, so that CROWN is not needed to profile the ntuples."""
+    producers = {}
+    for path in sorted(glob.glob(os.path.join(analysisDir, "producers", "*.py"))):
+        moduleName = os.path.basename(path)[:-3]
+        with open(path) as f:
+            module = ast.parse(f.read())
+        for node in module.body:
+            if not isinstance(node, ast.Assign) or not isinstance(
+                node.targets[0], ast.Name
+            ):
+                continue
+            label = "%s.%s" % (moduleName, node.targets[0].id)
+            # era dependent producers are defined as dicts of producers
+            calls = [
+                n for n in ast.walk(node.value) if _callName(n) in PRODUCER_CLASSES
+            ]
+            for call in calls:
+                producer = producers.setdefault(
+                    label, dict(outputs=set(), patterns=[], subproducers=set())
+                )
+                output = _keyword(call, "output")
+                if isinstance(output, ast.Dict):
+                    # outputs of the four-vector components factory
+                    output = ast.List(elts=output.values)
+                attributes = _keyword(call, "attributes")
+                if isinstance(attributes, ast.List):
+                    # outputs of the object attributes factory
+                    output = ast.List(
+                        elts=[a.elts[-1] for a in attributes.elts if isinstance(a, ast.Tuple)]
+                    )
+                scalefactors = _keyword(call, "scalefactors")
+                if isinstance(scalefactors, ast.List):
+                    # outputs of the lepton scale factors factory
+                    output = ast.List(
+                        elts=[sf.elts[0] for sf in scalefactors.elts if isinstance(sf, ast.Tuple)]
+                    )
+                    product = _keyword(call, "product")
+                    if product is not None:
+                        output.elts.append(product)
+                if isinstance(output, ast.List):
+                    for o in output.elts:
+                        if isinstance(o, ast.Attribute):
+                            producer["outputs"].add(quantities.get(o.attr, o.attr))
+                elif isinstance(output, ast.Constant) and isinstance(
+                    output.value, str
+                ):
+                    # vector producers, whose output names are configured
+                    vecConfig = _keyword(call, "vec_config")
+                    if isinstance(vecConfig, ast.Constant):
+                        producer["patterns"].append((vecConfig.value, output.value))
+                subproducers = _keyword(call, "subproducers")
+                if subproducers is not None:
+                    for n in ast.walk(subproducers):
+                        if isinstance(n, ast.Name):
+                            producer["subproducers"].add(
+                                "%s.%s" % (moduleName, n.id)
+                            )
+                        elif isinstance(n, ast.Attribute) and isinstance(
+                            n.value, ast.Name
+                        ):
+                            producer["subproducers"].add(
+                                "%s.%s" % (n.value.id, n.attr)
+                            )
+    return producers
+
+
+def readVectorOutputPatterns(analysisDir, vecConfigs):
+    """Find the output names of the vector producers in the configurations of
+    the analysis. The entries of a vector configuration are dicts, whose
+    values of the output key are the names of the quantities."""
+    patterns = defaultdict(set)
+    for path in sorted(glob.glob(os.path.join(analysisDir, "*.py"))):
+        with open(path) as f:
+            module = ast.parse(f.read())
+        # entries are often defined as variables before they are added to
+        # the vector configurations
+        assignments = defaultdict(list)
+        for node in ast.walk(module):
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        assignments[target.id].append(node.value)
+
+        def walk(node):
+            nodes, stack, seen = [], [node], set()
+            while stack:
+                n = stack.pop()
+                if isinstance(n, ast.Name):
+                    if n.id not in seen:
+                        seen.add(n.id)
+                        stack.extend(assignments.get(n.id, []))
+                    continue
+                nodes.append(n)
+                stack.extend(ast.iter_child_nodes(n))
+            return nodes
+
+        for node in ast.walk(module):
+            if not isinstance(node, ast.Dict):
+                continue
+            for key, value in zip(node.keys, node.values):
+                if not isinstance(key, ast.Constant) or key.value not in vecConfigs:
+                    continue
+                for entry in walk(value):
+                    if not isinstance(entry, ast.Dict):
+                        continue
+                    for entryKey, entryValue in zip(entry.keys, entry.values):
+                        if not isinstance(entryKey, ast.Constant):
+                            continue
+                        if entryKey.value not in vecConfigs[key.value]:
+                            continue
+                        pattern = _stringPattern(entryValue)
+                        # names built entirely from other values are too
+                        # unspecific to be attributed
+                        if pattern is not None and not pattern.startswith(".+"):
+                            patterns[(key.value, entryKey.value)].add(pattern)
+    return patterns
+
+
+def buildProducerGroupMap(analysisDir):
+    """Map the names of the ntuple quantities to the producer groups writing
+    them. Producers are attributed to the outermost producer group containing
+    them, vector producers to their output group, as they are added to the
+    outputs of the configuration.
+
+    :return: Tuple of the map of quantity names to groups and of a list of
+        regular expressions and groups for the configured vector outputs.
+    """
+    quantities = readQuantityNames(analysisDir)
+    producers = readProducers(analysisDir, quantities)
+    parents = defaultdict(set)
+    for label, producer in producers.items():
+        for sub in producer["subproducers"]:
+            parents[sub].add(label)
+
+    def group(label):
+        # producers shared by several groups, e.g. of different scopes, form
+        # their own group
+        seen = set()
+        while len(parents[label]) == 1 and label not in seen:
+            seen.add(label)
+            label = next(iter(parents[label]))
+        return label
+
+    vecConfigs = defaultdict(set)
+    for producer in producers.values():
+        for vecConfig, outputKey in producer["patterns"]:
+            vecConfigs[vecConfig].add(outputKey)
+    vectorPatterns = readVectorOutputPatterns(analysisDir, vecConfigs)
+    # quantities written by several producers, e.g. for data and embedded
+    # samples, are attributed to all of their groups
+    nameGroups, patternGroups = defaultdict(set), defaultdict(set)
+    for label, producer in producers.items():
+        for name in producer["outputs"]:
+            nameGroups[name].add(group(label))
+        for key in producer["patterns"]:
+            for pattern in vectorPatterns.get(key, []):
+                patternGroups[pattern].add(label + ".output_group")
+    names = dict((name, ", ".join(sorted(g))) for name, g in nameGroups.items())
+    for name in quantities.values():
+        names.setdefault(name, "unassigned")
+    patterns = [
+        (re.compile(pattern + "$"), ", ".join(sorted(g)))
+        for pattern, g in sorted(patternGroups.items())
+    ]
+    return names, patterns
+
+
+def precisionCandidate(branch):
+    """Propose a smaller leaf type for a branch based on its value range.
+
+    :return: Tuple of the proposed type (empty if none) and of the expected
+        saving of compressed bytes.
+    """
+    kind = branch["kind"]
+    if branch.get("min") is None or kind not in LEAF_SIZES:
+        return "", 0.0
+    size = LEAF_SIZES[kind]
+    if branch["min"] == branch["max"]:
+        return "constant", branch["zipped"]
+    if not branch["nonintegral"]:
+        for t, tsize, tmin, tmax in INTEGER_TYPES:
+            if tsize < size and tmin <= branch["min"] and branch["max"] <= tmax:
+                return t, branch["zipped"] * (1.0 - float(tsize) / size)
+    if kind == "Double_t":
+        return "Float_t", branch["zipped"] * 0.5
+    if (
+        kind == "Float_t"
+        and branch["nonintegral"]
+        and branch["total"] < MANTISSA_COMPRESSION_RATIO * branch["zipped"]
+    ):
+        return "Float16_t", branch["zipped"] * MANTISSA_SAVING
+    return "", 0.0
+
+
+def profileCrownFile(infile, treeName="ntuple", maxEntries=10000):
+    """Measure the compressed and uncompressed size of all branches of a CROWN
+    ntuple or friend tree. The value ranges of the scalar branches are taken
+    from the first `maxEntries` entries, which are read in a single event
+    loop."""
+    if not os.path.isfile(infile):
+        raise RuntimeError("Input file %s not found" % infile)
+    filesize = os.path.getsize(infile) / 1024.0
+    tfile = ROOT.TFile.Open(infile)
+    tree = tfile.Get(treeName)
+    if not tree:
+        raise RuntimeError("Tree %s not found in %s" % (treeName, infile))
+    entries = tree.GetEntries()
+    df = ROOT.RDataFrame(tree)
+    if 0 < maxEntries < entries:
+        df = df.Range(maxEntries)
+    branches, booked = {}, {}
+    for i, br in enumerate(tree.GetListOfBranches()):
+        name = br.GetName()
+        leaf = br.GetLeaf(name) if br.GetNleaves() == 1 else None
+        scalar = bool(leaf) and leaf.GetLen() == 1 and not leaf.GetLeafCount()
+        kind = leaf.GetTypeName() if scalar else (br.GetClassName() or "Unknown")
+        branches[name] = dict(
+            name=name,
+            kind=kind,
+            zipped=br.GetZipBytes("*") / 1024.0,
+            total=br.GetTotBytes("*") / 1024.0,
+            min=None,
+            max=None,
+            nonintegral=None,
+        )
+        if not scalar or kind not in LEAF_SIZES or entries == 0:
+            continue
+        booked[name] = [df.Min(name), df.Max(name)]
+        if kind in ("Float_t", "Double_t"):
+            column = "inspectNano_nonintegral_%d" % i
+            booked[name].append(
+                df.Define(column, "(int)(%s != std::trunc(%s))" % (name, name)).Sum(
+                    column
+                )
+            )
+    for name, results in booked.items():
+        branch = branches[name]
+        branch["min"] = float(results[0].GetValue())
+        branch["max"] = float(results[1].GetValue())
+        branch["nonintegral"] = (
+            int(results[2].GetValue()) if len(results) > 2 else 0
+        )
+    tfile.Close()
+    return dict(
+        filename=os.path.basename(infile),
+        filesize=filesize,
+        tree=treeName,
+        entries=entries,
+        profiled=min(entries, maxEntries) if maxEntries > 0 else entries,
+        branches=branches,
+    )
+
+
+def _profileCrownFileArgs(args):
+    return profileCrownFile(*args)
+
+
+def profileCrownFiles(infiles, treeName, maxEntries, processes, analysisDir):
+    """Profile CROWN ntuples and friend trees in parallel processes and group
+    their branches by the producers of the analysis."""
+    jobs = [(infile, treeName, maxEntries) for infile in infiles]
+    if len(infiles) == 1 or processes <= 1:
+        profiles = [_profileCrownFileArgs(job) for job in jobs]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(min(processes, len(infiles))) as pool:
+            profiles = pool.map(_profileCrownFileArgs, jobs)
+    names, patterns = buildProducerGroupMap(analysisDir)
+    for profile in profiles:
+        quantities = {}
+        for branch in profile["branches"].values():
+            # shifted quantities are written as <quantity>__<shift>
+            quantity = branch["name"].split("__", 1)[0]
+            branch["quantity"] = quantity
+            branch["candidate"], branch["saving"] = precisionCandidate(branch)
+            if quantity not in quantities:
+                group = names.get(quantity)
+                if group is None:
+                    group = next(
+                        (g for p, g in patterns if p.match(quantity)), "unassigned"
+                    )
+                quantities[quantity] = dict(
+                    name=quantity,
+                    group=group,
+                    kind=branch["kind"],
+                    branches=[],
+                    zipped=0.0,
+                    total=0.0,
+                    candidate="",
+                    saving=0.0,
+                )
+            q = quantities[quantity]
+            q["branches"].append(branch["name"])
+            q["zipped"] += branch["zipped"]
+            q["total"] += branch["total"]
+            q["saving"] += branch["saving"]
+            if branch["name"] == quantity:
+                q["kind"] = branch["kind"]
+                q["candidate"] = branch["candidate"]
+        groups = {}
+        for q in quantities.values():
+            group = groups.setdefault(
+                q["group"],
+                dict(
+                    name=q["group"],
+                    quantities=[],
+                    branches=0,
+                    zipped=0.0,
+                    total=0.0,
+                    saving=0.0,
+                ),
+            )
+            group["quantities"].append(q["name"])
+            group["branches"] += len(q["branches"])
+            for key in "zipped", "total", "saving":
+                group[key] += q[key]
+        profile["quantities"] = quantities
+        profile["groups"] = groups
+    return profiles
+
+
+def writeMarkdownProfileReport(profiles, stream):
+    for profile in profiles:
+        entries = max(profile["entries"], 1)
+        groups = sorted(profile["groups"].values(), key=lambda g: -g["zipped"])
+        treetotal = sum(g["zipped"] for g in groups) or 1.0
+        stream.write(
+            "**%s (tree %s, %.3f Mb, %d entries, %.2f kb/entry, value ranges from %d entries)**\n"
+            % (
+                profile["filename"],
+                profile["tree"],
+                profile["filesize"] / 1024.0,
+                profile["entries"],
+                profile["filesize"] / entries,
+                profile["profiled"],
+            )
+        )
+        stream.write("\n# Producer groups\n")
+        stream.write(
+            "| group | quantities | branches | compressed b/evt | uncompressed b/evt | ratio | % | lossy saving b/evt |\n"
+        )
+        stream.write("| - | - | - | - | - | - | - | - |\n")
+        for g in groups:
+            stream.write(
+                "| [**%s**](#%s) | %d | %d | %.1f | %.1f | %.2f | %.1f%% | %.1f |\n"
+                % (
+                    g["name"],
+                    g["name"].lower().replace(".", ""),
+                    len(g["quantities"]),
+                    g["branches"],
+                    g["zipped"] / entries * 1024,
+                    g["total"] / entries * 1024,
+                    g["total"] / g["zipped"] if g["zipped"] else 0,
+                    g["zipped"] / treetotal * 100.0,
+                    g["saving"] / entries * 1024,
+                )
+            )
+        stream.write(
+            "\nSizes are summed over the shifted variants of the quantities. "
+            "The lossy saving is the estimated reduction of the compressed size, "
+            "if the proposed types are used.\n\n"
+        )
+        stream.write("# Quantities\n")
+        for g in groups:
+            stream.write(
+                "\n## <a id='%s'></a>%s [<sup>[back to top]</sup>](#producer-groups)\n"
+                % (g["name"].lower().replace(".", ""), g["name"])
+            )
+            stream.write(
+                "| quantity | kind | shifts | compressed b/evt | uncompressed b/evt | ratio | proposed type | lossy saving b/evt |\n"
+            )
+            stream.write("| - | - | - | - | - | - | - | - |\n")
+            quantities = [profile["quantities"][q] for q in g["quantities"]]
+            for q in sorted(quantities, key=lambda q: -q["zipped"]):
+                stream.write(
+                    "| **%s** | %s | %d | %.2f | %.2f | %.2f | %s | %.2f |\n"
+                    % (
+                        q["name"],
+                        q["kind"],
+                        sum(b != q["name"] for b in q["branches"]),
+                        q["zipped"] / entries * 1024,
+                        q["total"] / entries * 1024,
+                        q["total"] / q["zipped"] if q["zipped"] else 0,
+                        q["candidate"],
+                        q["saving"] / entries * 1024,
+                    )
+                )
+        stream.write("\n")
+
+
 def makeSurvey(treeName, treeData):
     allsize = treeData["allsize"]
     entries = treeData["entries"]
@@ -708,7 +1245,7 @@ def _maybeOpen(filename):
 if __name__ == "__main__":
     from optparse import OptionParser
 
-    parser = OptionParser(usage="%prog [options] inputFile")
+    parser = OptionParser(usage="%prog [options] inputFile [inputFile ...]")
     parser.add_option(
         "-j",
         "--json",
@@ -747,12 +1284,60 @@ if __name__ == "__main__":
         default=None,
         help="Write out markdown size report",
     )
+    parser.add_option(
+        "-p",
+        "--processes",
+        dest="processes",
+        type="int",
+        default=multiprocessing.cpu_count(),
+        help="Number of parallel processes for surveying several root files",
+    )
+    parser.add_option(
+        "--crown",
+        dest="crown",
+        action="store_true",
+        default=False,
+        help="Profile the sizes of CROWN ntuples or friend trees instead of NanoAOD files, only json and markdown size reports are supported",
+    )
+    parser.add_option(
+        "--tree",
+        dest="tree",
+        type="string",
+        default="ntuple",
+        help="Name of the tree in the CROWN ntuples",
+    )
+    parser.add_option(
+        "--max-entries",
+        dest="maxEntries",
+        type="int",
+        default=10000,
+        help="Number of entries used to determine the value ranges of the CROWN ntuple branches, 0 for all entries",
+    )
     (options, args) = parser.parse_args()
-    if len(args) != 1:
-        raise RuntimeError("Please specify one input file")
+    if len(args) == 0:
+        raise RuntimeError("Please specify at least one input file")
+
+    if options.crown:
+        if options.doc or options.size or options.docmd:
+            raise RuntimeError(
+                "Only json and markdown size reports are supported for CROWN ntuples"
+            )
+        profiles = profileCrownFiles(
+            args, options.tree, options.maxEntries, options.processes, ANALYSIS_DIR
+        )
+        if options.json:
+            json.dump(profiles, _maybeOpen(options.json), indent=4)
+            sys.stderr.write("JSON output saved to %s\n" % options.json)
+        sizemd = options.sizemd or ("-" if not options.json else None)
+        if sizemd:
+            writeMarkdownProfileReport(profiles, _maybeOpen(sizemd))
+            sys.stderr.write("Markdown size profile saved to %s\n" % sizemd)
+        sys.exit(0)
 
-    if args[0].endswith(".root"):
-        filedata = FileData(inspectRootFile(args[0]))
+    if all(arg.endswith(".root") for arg in args):
+        filedata = FileData(inspectRootFiles(args, options.processes))
+    elif len(args) > 1:
+        raise RuntimeError("Several input files are only supported for root files")
     elif args[0].endswith(".json"):
         filedata = FileData(json.load(open(args[0], "r")))
     else:
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Tooling for reduced-precision variants of the PNN models in `payloads/ml`.
+
+The script has two subcommands:
+
+- `quantize`: convert ONNX models to `float16` or dynamically quantized `int8`
+  variants. The variants are written next to the original model with the
+  precision appended to the file stem, e.g.
+  `resolved_mt_best_pnn_even.onnx` -> `resolved_mt_best_pnn_even_int8.onnx`.
+  This is the naming scheme expected by `helpers.get_pnn_model_file`. The
+  input and output tensors stay `float32`, so the variants can be evaluated
+  with `ml::PNNEvaluate_ORT` without any changes to the producers.
+
+- `validate`: evaluate the original and the reduced-precision model on a
+  sample of events from existing ntuples (plus friend trees) and report the
+  score differences per mass point as well as the inference throughput of
+  both models.
+
+Example:
+
+    python scripts/pnn_quantization.py quantize --precision int8 \\
+        payloads/ml/nmssm/2018/*_pnn_*.onnx
+
+    python scripts/pnn_quantization.py validate \\
+        --model payloads/ml/nmssm/2018/resolved_mt_best_pnn_even.onnx \\
+        --precision int8 \\
+        --feature-transformation payloads/ml/nmssm/2018/resolved_mt_feature_transformation_even.json \\
+        --mass-transformation payloads/ml/nmssm/2018/mt_mass_transformation.json \\
+        --input ntuple.root fastmtt_friend.root kinfit_friend.root \\
+        --mass-points 300,90 500,125 650,400
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+PRECISIONS = ["float16", "int8"]
+
+# Names of the ntuple columns which differ from the keys in the feature
+# transformation files (the keys correspond to the names of the transformed
+# quantities without the `transformed_` prefix)
+FEATURE_COLUMN_NAMES = {
+    "njets": "n_jets",
+    "nbtag": "n_bjets",
+    "njets_boosted": "n_jets_boosted",
+    "nbtag_boosted": "n_bjets_boosted",
+}
+
+
+def variant_path(model_file: str, precision: str) -> str:
+    root, ext = os.path.splitext(model_file)
+    return f"{root}_{precision}{ext}"
+
+
+def quantize_model(model_file: str, precision: str) -> str:
+    output_file = variant_path(model_file, precision)
+    if precision == "float16":
+        import onnx
+        from onnxconverter_common import float16
+
+        model = onnx.load(model_file)
+        model_fp16 = float16.convert_float_to_float16(model, keep_io_types=True)
+        onnx.save(model_fp16, output_file)
+    elif precision == "int8":
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(
+            model_input=model_file,
+            model_output=output_file,
+            weight_type=QuantType.QInt8,
+        )
+    else:
+        raise ValueError(
+            f"Unknown precision {precision}, must be one of {PRECISIONS}"
+        )
+    return output_file
+
+
+def load_features(
+    input_files: List[str],
+    feature_transformation_file: str,
+    tree: str,
+    max_events: int,
+) -> np.ndarray:
+    """
+    Read the PNN input features from the ntuple and its friend trees and
+    apply the standard transformation stored in `feature_transformation_file`.
+    The columns are looked up in the given files in order, so friend trees can
+    simply be appended to the list of input files.
+    """
+    import uproot
+
+    with open(feature_transformation_file, "r") as f:
+        transformation = json.load(f)
+
+    trees = [uproot.open(f"{input_file}:{tree}") for input_file in input_files]
+    columns = []
+    for feature, parameters in transformation.items():
+        column = FEATURE_COLUMN_NAMES.get(feature, feature)
+        for t in trees:
+            if column in t.keys():
+                values = t[column].array(library="np", entry_stop=max_events)
+                break
+        else:
+            raise KeyError(f"Column {column} not found in any of {input_files}")
+        columns.append(
+            (values.astype(np.float32) - parameters["mean"]) / parameters["std"]
+        )
+    return np.stack(columns, axis=1).astype(np.float32)
+
+
+def add_mass_parameters(
+    features: np.ndarray,
+    mass_transformation: Dict[str, Dict[str, int]],
+    mass_x: str,
+    mass_y: str,
+) -> np.ndarray:
+    n_events = features.shape[0]
+    mass_columns = np.array(
+        [
+            [
+                mass_transformation["massX"][mass_x],
+                mass_transformation["massY"][mass_y],
+            ]
+        ]
+        * n_events,
+        dtype=np.float32,
+    )
+    return np.concatenate([features, mass_columns], axis=1)
+
+
+def evaluate(session, inputs: np.ndarray, batch_size: int) -> Tuple[np.ndarray, float]:
+    input_name = session.get_inputs()[0].name
+    outputs = []
+    start = time.perf_counter()
+    for i in range(0, inputs.shape[0], batch_size):
+        outputs.append(
+            session.run(None, {input_name: inputs[i : i + batch_size]})[0]
+        )
+    elapsed = time.perf_counter() - start
+    return np.concatenate(outputs, axis=0), elapsed
+
+
+def validate(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = args.threads
+    options.inter_op_num_threads = 1
+    reference = ort.InferenceSession(
+        args.model, options, providers=["CPUExecutionProvider"]
+    )
+    variant = ort.InferenceSession(
+        variant_path(args.model, args.precision),
+        options,
+        providers=["CPUExecutionProvider"],
+    )
+
+    features = load_features(
+        args.input, args.feature_transformation, args.tree, args.max_events
+    )
+    with open(args.mass_transformation, "r") as f:
+        mass_transformation = json.load(f)
+
+    results = {}
+    for mass_point in args.mass_points:
+        mass_x, mass_y = mass_point.split(",")
+        inputs = add_mass_parameters(features, mass_transformation, mass_x, mass_y)
+        scores_reference, time_reference = evaluate(
+            reference, inputs, args.batch_size
+        )
+        scores_variant, time_variant = evaluate(variant, inputs, args.batch_size)
+        diff = np.abs(scores_variant - scores_reference)
+        results[f"{mass_x}_{mass_y}"] = {
+            "events": int(inputs.shape[0]),
+            "max_abs_diff": float(np.max(diff)),
+            "mean_abs_diff": float(np.mean(diff)),
+            "class_agreement": float(
+                np.mean(
+                    np.argmax(scores_variant, axis=1)
+                    == np.argmax(scores_reference, axis=1)
+                )
+            ),
+            "throughput_reference": inputs.shape[0] / time_reference,
+            "throughput_variant": inputs.shape[0] / time_variant,
+        }
+    return results
+
+
+def print_report(results: Dict[str, Dict[str, float]], precision: str) -> None:
+    header = (
+        f"{'mass point':>12} | {'max |diff|':>10} | {'mean |diff|':>11} | "
+        f"{'class agr.':>10} | {'float32 ev/s':>12} | {precision + ' ev/s':>12} | "
+        f"{'speedup':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for mass_point, r in results.items():
+        print(
+            f"{mass_point:>12} | {r['max_abs_diff']:10.2e} | "
+            f"{r['mean_abs_diff']:11.2e} | {r['class_agreement']:10.4f} | "
+            f"{r['throughput_reference']:12.0f} | {r['throughput_variant']:12.0f} | "
+            f"{r['throughput_variant'] / r['throughput_reference']:7.2f}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Create and validate reduced-precision variants of the PNN models"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_quantize = subparsers.add_parser(
+        "quantize", help="Write float16 or int8 variants of ONNX models"
+    )
+    parser_quantize.add_argument(
+        "models", nargs="+", help="Paths to the float32 ONNX models"
+    )
+    parser_quantize.add_argument(
+        "--precision", choices=PRECISIONS, required=True, help="Target precision"
+    )
+
+    parser_validate = subparsers.add_parser(
+        "validate",
+        help="Compare a reduced-precision variant to the original model on ntuple events",
+    )
+    parser_validate.add_argument(
+        "--model", required=True, help="Path to the float32 ONNX model"
+    )
+    parser_validate.add_argument(
+        "--precision",
+        choices=PRECISIONS,
+        required=True,
+        help="Precision of the variant that is compared to the original model",
+    )
+    parser_validate.add_argument(
+        "--feature-transformation",
+        required=True,
+        help="Feature transformation json file belonging to the model",
+    )
+    parser_validate.add_argument(
+        "--mass-transformation",
+        required=True,
+        help="Mass transformation json file mapping masses to the PNN mass parameters",
+    )
+    parser_validate.add_argument(
+        "--input",
+        nargs="+",
+        required=True,
+        help="Ntuple followed by friend trees containing the input features",
+    )
+    parser_validate.add_argument(
+        "--tree", default="ntuple", help="Name of the tree in the input files"
+    )
+    parser_validate.add_argument(
+        "--mass-points",
+        nargs="+",
+        required=True,
+        help="Mass points to be evaluated in the form 'massX,massY'",
+    )
+    parser_validate.add_argument(
+        "--max-events",
+        type=int,
+        default=100000,
+        help="Maximum number of events read from the input files",
+    )
+    parser_validate.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Batch size for the inference; the default of 1 mimics the per-event evaluation in CROWN",
+    )
+    parser_validate.add_argument(
+        "--threads", type=int, default=1, help="Number of intra-op threads"
+    )
+    parser_validate.add_argument(
+        "--output", default=None, help="Optional json file for the results"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "quantize":
+        for model in args.models:
+            output_file = quantize_model(model, args.precision)
+            print(f"Written {args.precision} variant of {model} to {output_file}")
+    elif args.command == "validate":
+        results = validate(args)
+        print_report(results, args.precision)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=4)
+            print(f"Results saved to {args.output}")
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Generator for synthetic NanoAOD files, e.g. for offline throughput
+benchmarks of the CROWN executables with `scripts/benchmark.py`.
+
+The branch schema (names, types, counters and mean multiplicities) is taken
+from the json survey of a real NanoAOD file of the targeted era, created with
+
+    python scripts/inspectNano.py --json nano_2018.json nano_2018.root
+
+All branches of the `Events`, `Runs` and `LuminosityBlocks` trees are written
+with the NanoAOD layout, i.e. collections like `Muon_pt` with the counter
+`nMuon`. The multiplicities of the collections follow Poisson distributions
+with the mean multiplicities of the surveyed file, fixed-size vectors (e.g.
+`LHEScaleWeight`) keep their size. The values are drawn from simple
+distributions depending on the branch name (e.g. falling pt spectra, uniform
+eta and phi), so that the events pass through the selections of the
+executables. The `*Idx` branches hold valid indices of the collection they
+refer to, which is recorded in their kind (e.g. `Short_t(index to Jet)`), or
+-1. They are bounded by the multiplicity of the referenced collection in the
+same event, and mother indices like `GenPart_genPartIdxMother` point to
+earlier particles only.
+
+Example:
+
+    python scripts/synthetic_nano.py --schema nano_2018.json \\
+        --events 100000 --output synthetic_2018.root
+
+    # data-like file with a run number contained in the golden json
+    python scripts/synthetic_nano.py --schema nano_2018_data.json \\
+        --events 100000 --run 316187 --output synthetic_2018_data.root
+"""
+
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import argparse
+import json
+from typing import Dict, Tuple
+
+import awkward as ak
+import numpy as np
+import uproot
+
+# numpy types of the ROOT leaf types used in NanoAOD
+LEAF_TYPES = {
+    "Bool_t": np.bool_,
+    "Char_t": np.int8,
+    "UChar_t": np.uint8,
+    "Short_t": np.int16,
+    "UShort_t": np.uint16,
+    "Int_t": np.int32,
+    "UInt_t": np.uint32,
+    "Long64_t": np.int64,
+    "ULong64_t": np.uint64,
+    "Float_t": np.float32,
+    "Double_t": np.float64,
+}
+
+# pdg ids used for the generator level particles
+GEN_PDG_IDS = np.array([1, 2, 3, 4, 5, 6, 11, 12, 13, 14, 15, 16, 21, 22, 23, 24, 25])
+
+# deviation of the mean multiplicity of a vector from an integer, below which
+# the vector is treated as fixed-size vector
+FIXED_SIZE_THRESHOLD = 1e-3
+
+
+def index_target(kind: str) -> str | None:
+    """
+    Collection, to which an index branch refers, in lower case, e.g. `jet`
+    for the kind `Short_t(index to Jet)`. The survey capitalizes only the
+    first letter of the collection name, e.g. `Genpart` for `GenPart`.
+    """
+    if "(index to " not in kind:
+        return None
+    return kind.split("(index to ", 1)[1].rstrip(")").lower()
+
+
+def index_bounds(
+    target_counts: np.ndarray, source_counts: np.ndarray
+) -> np.ndarray:
+    """
+    Exclusive upper bounds of the indices of all entries of a collection with
+    `source_counts` entries per event, which refer to a collection with
+    `target_counts` entries per event.
+    """
+    return np.repeat(target_counts, source_counts)
+
+
+def local_positions(counts: np.ndarray) -> np.ndarray:
+    """
+    Positions of all entries of a collection within their event.
+    """
+    starts = np.cumsum(counts) - counts
+    return np.arange(int(np.sum(counts))) - np.repeat(starts, counts)
+
+
+def leaf_type(kind: str) -> type:
+    # the kind of index branches is e.g. "Int_t(index to Jet)"
+    base_kind = kind.split("(")[0]
+    if base_kind not in LEAF_TYPES:
+        raise ValueError(f"Unsupported leaf type {kind}")
+    return LEAF_TYPES[base_kind]
+
+
+def generate_values(
+    name: str,
+    kind: str,
+    size: int,
+    rng: np.random.Generator,
+    bounds: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Draw `size` values for the branch `name` from a distribution chosen by
+    the branch name and type. Indices are drawn from -1 up to the exclusive
+    upper bounds `bounds` of each value and are -1 without bounds.
+    """
+    dtype = leaf_type(kind)
+    quantity = name.split("_", 1)[-1]
+    if dtype == np.bool_:
+        # triggers and object IDs fire for a reasonable fraction of events,
+        # MET filters pass for almost all events
+        if name.startswith("Flag_"):
+            return rng.random(size) < 0.99
+        return rng.random(size) < 0.5
+    if "Idx" in quantity:
+        if bounds is None:
+            return np.full(size, -1, dtype=dtype)
+        return (np.floor(rng.random(size) * (bounds + 1)) - 1).astype(dtype)
+    if quantity == "pdgId":
+        if name.startswith(("GenPart", "LHEPart")):
+            pdg_ids = rng.choice(GEN_PDG_IDS, size)
+        elif name.startswith("Electron"):
+            pdg_ids = np.full(size, 11)
+        elif name.startswith("Muon"):
+            pdg_ids = np.full(size, 13)
+        else:
+            pdg_ids = np.full(size, 15)
+        return (pdg_ids * rng.choice([-1, 1], size)).astype(dtype)
+    if quantity == "charge":
+        return rng.choice([-1, 1], size).astype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        # IDs, working point bit masks, flavours and counts
+        return rng.integers(0, min(np.iinfo(dtype).max, 255) + 1, size).astype(dtype)
+    if quantity in ("pt", "sumEt") or quantity.endswith("_pt") or quantity == "et":
+        return (15.0 + rng.exponential(40.0, size)).astype(dtype)
+    if quantity == "eta" or quantity.endswith("_eta"):
+        return rng.uniform(-2.5, 2.5, size).astype(dtype)
+    if quantity == "phi" or quantity.endswith("_phi"):
+        return rng.uniform(-np.pi, np.pi, size).astype(dtype)
+    if quantity in ("mass", "msoftdrop") or quantity.endswith("_mass"):
+        return rng.exponential(5.0, size).astype(dtype)
+    if quantity in ("dxy", "dz", "dxyErr", "dzErr", "ip3d", "sip3d"):
+        return np.abs(rng.normal(0.0, 0.01, size)).astype(dtype)
+    if name in ("genWeight", "LHEWeight_originalXWGTUP") or "Weight" in name:
+        return rng.normal(1.0, 0.05, size).astype(dtype)
+    if name == "Pileup_nTrueInt":
+        return rng.uniform(10.0, 60.0, size).astype(dtype)
+    if name == "fixedGridRhoFastjetAll":
+        return rng.uniform(5.0, 40.0, size).astype(dtype)
+    # isolations, discriminator scores, energy fractions, ...
+    return rng.random(size).astype(dtype)
+
+
+def build_schema(tree: Dict) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """
+    Split the branches of a surveyed tree into single-valued branches and
+    groups of branches sharing a counter.
+
+    :return: Tuple of the single-valued branches and of the groups, the latter
+        keyed by the counter name with the branches and the mean multiplicity.
+    """
+    entries = max(tree["entries"], 1)
+    branches = tree["branches"]
+    counters = {b["counter"] for b in branches.values() if not b["single"]}
+    singles = {
+        name: branch
+        for name, branch in branches.items()
+        if branch["single"] and name not in counters
+    }
+    groups = {}
+    for name, branch in branches.items():
+        if branch["single"]:
+            continue
+        group = groups.setdefault(
+            branch["counter"],
+            dict(branches={}, mean=(branch["entries"] or 0) / entries),
+        )
+        group["branches"][name] = branch
+    return singles, groups
+
+
+def generate_multiplicities(
+    group: Dict, size: int, rng: np.random.Generator
+) -> np.ndarray:
+    mean = group["mean"]
+    # vectors with a fixed size like the LHE scale weights keep their size
+    if len(group["branches"]) == 1 and abs(mean - round(mean)) < FIXED_SIZE_THRESHOLD:
+        return np.full(size, int(round(mean)), dtype=np.int32)
+    return rng.poisson(mean, size).astype(np.int32)
+
+
+def generate_tree(
+    tree: Dict,
+    size: int,
+    rng: np.random.Generator,
+    fixed_values: Dict[str, np.ndarray],
+) -> Dict[str, object]:
+    """
+    Generate the content of a tree in the layout expected by `uproot`, i.e.
+    single-valued branches as flat arrays and collections as zipped awkward
+    arrays, from which `uproot` writes the branches `<collection>_<name>`
+    and the counter `n<collection>`.
+    """
+    singles, groups = build_schema(tree)
+    content = {}
+    for name, branch in singles.items():
+        if name in fixed_values:
+            content[name] = fixed_values[name].astype(leaf_type(branch["kind"]))
+        else:
+            content[name] = generate_values(name, branch["kind"], size, rng)
+    # the multiplicities of all collections are needed to bound the indices
+    multiplicities = {
+        counter: generate_multiplicities(group, size, rng)
+        for counter, group in groups.items()
+    }
+    collection_counters = {counter[1:].lower(): counter for counter in groups}
+    for counter, group in groups.items():
+        counts = multiplicities[counter]
+        total = int(np.sum(counts))
+        collection = counter[1:]
+        fields = {}
+        for name, branch in group["branches"].items():
+            bounds = None
+            target = index_target(branch["kind"])
+            if target == collection.lower():
+                # e.g. mother indices of generator particles
+                bounds = local_positions(counts)
+            elif target in collection_counters:
+                bounds = index_bounds(
+                    multiplicities[collection_counters[target]], counts
+                )
+            values = generate_values(name, branch["kind"], total, rng, bounds=bounds)
+            fields[name] = ak.unflatten(values, counts)
+        if list(fields) == [collection]:
+            # vector branches like LHEScaleWeight with counter nLHEScaleWeight
+            content[collection] = fields[collection]
+        elif all(name.startswith(collection + "_") for name in fields):
+            content[collection] = ak.zip(
+                {name[len(collection) + 1 :]: values for name, values in fields.items()}
+            )
+        else:
+            raise ValueError(
+                f"Cannot write branches {list(fields)} sharing the counter {counter}"
+            )
+    return content
+
+
+def generate_file(
+    schema: Dict,
+    output_file: str,
+    events: int,
+    run: int,
+    events_per_lumi: int,
+    seed: int,
+    chunk_size: int,
+) -> None:
+    rng = np.random.default_rng(seed)
+    trees = schema["trees"]
+    n_lumis = (events + events_per_lumi - 1) // events_per_lumi
+    # the trees are created with mktree, as uproot writes RNTuples instead of
+    # TTrees when assigning data to a new key
+    with uproot.recreate(output_file) as f:
+        for start in range(0, events, chunk_size):
+            stop = min(start + chunk_size, events)
+            event_numbers = np.arange(start + 1, stop + 1)
+            content = generate_tree(
+                trees["Events"],
+                stop - start,
+                rng,
+                fixed_values={
+                    "run": np.full(stop - start, run),
+                    "luminosityBlock": (event_numbers - 1) // events_per_lumi + 1,
+                    "event": event_numbers,
+                },
+            )
+            if start == 0:
+                events_tree = f.mktree("Events", content)
+            else:
+                events_tree.extend(content)
+        lumi_content = generate_tree(
+            trees["LuminosityBlocks"],
+            n_lumis,
+            rng,
+            fixed_values={
+                "run": np.full(n_lumis, run),
+                "luminosityBlock": np.arange(1, n_lumis + 1),
+            },
+        )
+        f.mktree("LuminosityBlocks", lumi_content)
+        run_content = generate_tree(
+            trees["Runs"],
+            1,
+            rng,
+            fixed_values={
+                "run": np.array([run]),
+                "genEventCount": np.array([events]),
+                "genEventSumw": np.array([float(events)]),
+                "genEventSumw2": np.array([float(events)]),
+            },
+        )
+        f.mktree("Runs", run_content)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Write synthetic NanoAOD files with the branch schema of a surveyed NanoAOD file"
+    )
+    parser.add_argument(
+        "--schema",
+        required=True,
+        help="Json survey of a NanoAOD file of the targeted era, created with 'inspectNano.py --json'",
+    )
+    parser.add_argument("--output", required=True, help="Output root file")
+    parser.add_argument(
+        "--events", type=int, default=10000, help="Number of generated events"
+    )
+    parser.add_argument(
+        "--run",
+        type=int,
+        default=1,
+        help="Run number of all events, should be contained in the golden json for data",
+    )
+    parser.add_argument(
+        "--events-per-lumi",
+        type=int,
+        default=1000,
+        help="Number of events per luminosity block",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Seed of the random number generator"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10000,
+        help="Number of events generated and written at once",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(args.schema, "r") as f:
+        schema = json.load(f)
+    generate_file(
+        schema,
+        args.output,
+        args.events,
+        args.run,
+        args.events_per_lumi,
+        args.seed,
+        args.chunk_size,
+    )
+    print(f"Written {args.events} synthetic events to {args.output}")
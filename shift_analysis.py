@@ -0,0 +1,363 @@
+"""
+Relevance and cost estimate of the systematic shifts of a configuration.
+
+For every systematic shift, CROWN reruns the producers of the shift and all
+producers, which depend on their outputs, in each scope. The number of these
+producers is taken as cost of the shift, as it determines both the size of
+the generated code and the work per event of the shift.
+
+Shifts, which cannot change any written quantity, are not added to the
+configuration (see `PRUNE_IRRELEVANT_SHIFTS` in `constants.py`). This is the
+case if none of the rerun producers writes an output or is a filter, e.g. for
+the vsJet shifts of the tt scope in configurations with only lt scopes, or the
+b-tagging shifts if the b-tagging scale factors are not written in the output
+profile. The pruned shifts and the reason are logged.
+
+The shifts of an executable can be split across several executables with the
+`XYH_SHIFT_EXECUTABLES` environment variable when running CMake, e.g.
+`XYH_SHIFT_EXECUTABLES=4 cmake ..`, see `generate.py`. The shifts are
+partitioned by `partition_shifts`, such that the summed costs of the
+executables are balanced. Shifts rerunning the same producers, e.g. the up
+and down variations of a source, are kept in the same executable. The
+configuration built with the survey contains the shifts of the first
+executable, the configurations of the other executables are built with their
+shifts only.
+
+Each of the executables writes the nominal quantities and the quantities of
+its shifts. The outputs are not merged: as the shifts can change the event
+selection, the outputs of the executables do not necessarily contain the same
+events and cannot be added to each other as friends. Instead, the nominal
+quantities are read from the output of the first executable, and the shifted
+quantities of each shift from the output of the executable, to which it is
+assigned in `<executable>_shifts.json`.
+"""
+
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import logging
+import math
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .configuration_hooks import ConfigurationHook, HookedConfiguration
+from .helpers import as_list, input_names, leaf_producers, output_names
+from .output_profiles import OutputProfileSelection
+
+__all__ = [
+    "ShiftSurvey",
+    "partition_shifts",
+    "describe_partition",
+    "shift_executable_name",
+]
+
+log = logging.getLogger(__name__)
+
+
+def _shift_name(shift) -> str:
+    name = getattr(shift, "shiftname", None) or getattr(shift, "name")
+    return name.lstrip("_")
+
+
+def _per_scope(items) -> Dict[str, list]:
+    """
+    Entries of a dictionary, whose keys are scopes or tuples of scopes, per
+    scope.
+    """
+    entries = {}
+    for scopes, values in (items or {}).items():
+        for scope in scopes if isinstance(scopes, tuple) else (scopes,):
+            entries.setdefault(scope, []).extend(as_list(values))
+    return entries
+
+
+class ShiftSurvey(ConfigurationHook):
+    """
+    Survey of the systematic shifts of a configuration and of the producers,
+    which they rerun.
+
+    The survey is registered as hook of the configuration and records the
+    added shifts instead of adding them. The requested shifts, which apply to
+    the sample of the configuration, are analyzed. The producers and outputs
+    of each scope are taken from the output profile selection of the
+    configuration. Hence, the survey has to be attached right after the
+    output profile has been selected, and the shifts are only added to the
+    configuration by `add_shifts`, after all producers and outputs have been
+    added. Only the active scopes of the configuration are analyzed, as the
+    configurations also add producers to scopes, which are not built.
+
+    :param executables: Number of executables, across which the shifts are
+                        split. Only the shifts of the first executable are
+                        added to the configuration, see `partition`.
+    """
+
+    def __init__(self, executables: int = 1):
+        self.executables = executables
+        self.partition: List[List[str]] = []
+        self.partition_summary: List[Dict[str, object]] = []
+        self.shifts: Dict[str, object] = {}
+        self.pruned: Dict[str, str] = {}
+        self.configuration: HookedConfiguration | None = None
+        self.selection: OutputProfileSelection | None = None
+        self.scopes: Set[str] = set()
+        self._calls: list = []
+
+    def attach(self, configuration: HookedConfiguration, selection: OutputProfileSelection):
+        """
+        Record the shifts added to a configuration.
+
+        :param configuration: Configuration, whose shifts are recorded
+        :param selection: Output profile selection of the configuration,
+                          which records the producers and outputs of each
+                          scope
+        """
+        self.configuration = configuration
+        self.selection = selection
+        self.scopes = set(as_list(configuration.scopes)) | {"global"}
+        configuration.add_hook(self)
+
+    def record_shift(self, shift, exclude_samples=None, samples=None) -> bool:
+        sample = self.selection.sample
+        requested = self.selection.shifts
+        name = _shift_name(shift)
+        if (
+            sample not in (exclude_samples or [])
+            and (samples is None or sample in samples)
+            and ("all" in requested or name.lower() in requested)
+        ):
+            self.shifts[name] = shift
+        self._calls.append((name, shift, exclude_samples, samples))
+        return True
+
+    def add_shifts(self, prune: bool = True):
+        """
+        Add the recorded shifts to the configuration. This function has to be
+        called after all other producers, outputs and modification rules have
+        been added.
+
+        If the shifts are split across several executables, the partition
+        is stored in `partition` and `partition_summary`, and only the shifts
+        of the first executable are added.
+
+        :param prune: Do not add the requested shifts, which cannot change
+                      any written quantity
+        """
+        if prune:
+            for name in list(self.shifts):
+                reason = self.irrelevance(name)
+                if reason is not None:
+                    self.pruned[name] = reason
+                    del self.shifts[name]
+                    log.info(f"Pruning shift {name}: {reason}")
+            self._check_pruned()
+            if self.pruned:
+                log.info(
+                    f"Pruned {len(self.pruned)} of {len(self.pruned) + len(self.shifts)} shifts"
+                )
+        skipped = set(self.pruned)
+        if self.executables > 1 and self.shifts:
+            costs = self.costs()
+            self.partition = partition_shifts(costs, self.executables)
+            self.partition_summary = describe_partition(costs, self.partition)
+            skipped |= set(name for names in self.partition[1:] for name in names)
+        for name, shift, exclude_samples, samples in self._calls:
+            if name not in skipped:
+                self.configuration.add_shift(shift, exclude_samples, samples, hooked=False)
+        self._calls = []
+
+    def _check_pruned(self):
+        """
+        Check that the shifts, which are only defined for inactive scopes,
+        e.g. the vsJet shifts of the tt scope in configurations with only lt
+        scopes, have been pruned.
+        """
+        for name, shift in self.shifts.items():
+            scopes = set(_per_scope(getattr(shift, "producers", None)))
+            if getattr(shift, "quantity_change", None):
+                scopes |= set(as_list(getattr(shift, "scopes", None) or ["global"]))
+            if scopes and not scopes & self.scopes:
+                raise RuntimeError(
+                    f"Shift {name} of the inactive scopes {', '.join(sorted(scopes))} has not been pruned."
+                )
+
+    def _active_scopes(self) -> List[str]:
+        return [
+            scope
+            for scope in self.selection.producers
+            if scope != "global" and scope in self.scopes
+        ]
+
+    def _scope_producers(self, scope: str) -> list:
+        return self.selection.producers.get(scope, []) + self.selection.rule_producers.get(
+            scope, []
+        )
+
+    def _rerun_scope(
+        self, scope: str, seeds: list, quantities: Set[str]
+    ) -> Tuple[list, Set[str]]:
+        """
+        Walk the producers of a scope in their order and collect the leaf
+        producers, which are rerun by a shift, i.e. the producers of the
+        shift and the producers reading an output of a rerun producer or a
+        shifted quantity.
+
+        :return: Rerun producers and their outputs
+        """
+        seed_ids = set(
+            id(leaf) for seed in seeds for leaf in leaf_producers(seed, scope)
+        )
+        shifted = set(quantities)
+        rerun = []
+        for producer in self._scope_producers(scope):
+            for leaf in leaf_producers(producer, scope):
+                if id(leaf) in seed_ids or input_names(leaf, scope) & shifted:
+                    rerun.append(leaf)
+                    shifted |= output_names(leaf, scope)
+        return rerun, shifted
+
+    def rerun_producers(self, name: str) -> Dict[str, list]:
+        """
+        Producers rerun by a shift in each active scope. The outputs of the
+        producers rerun in the global scope are shifted inputs of the other
+        scopes.
+
+        :param name: Name of the shift
+        :return: Dictionary of the rerun leaf producers per scope
+        """
+        shift = self.shifts[name]
+        seeds = _per_scope(getattr(shift, "producers", None))
+        quantities = {}
+        for quantity in getattr(shift, "quantity_change", None) or {}:
+            for scope in as_list(getattr(shift, "scopes", None) or ["global"]):
+                quantities.setdefault(scope, set()).add(getattr(quantity, "name", quantity))
+        rerun = {}
+        rerun["global"], shifted_global = self._rerun_scope(
+            "global", seeds.get("global", []), quantities.get("global", set())
+        )
+        for scope in self._active_scopes():
+            rerun[scope], _ = self._rerun_scope(
+                scope, seeds.get(scope, []), shifted_global | quantities.get(scope, set())
+            )
+        return rerun
+
+    def irrelevance(self, name: str) -> str | None:
+        """
+        Check whether a shift can change a written quantity. This is the case
+        if one of its rerun producers writes an output, including the output
+        groups of vector producers, or is a filter without outputs, which
+        changes the selected events.
+
+        :param name: Name of the shift
+        :return: Reason, why the shift cannot change any written quantity, or
+                 `None` if the shift is relevant
+        """
+        rerun = self.rerun_producers(name)
+        written_global = self.selection.outputs.get("global", [])
+        for scope, leaves in rerun.items():
+            written = self.selection.outputs.get(scope, []) + written_global
+            written_names = set(getattr(output, "name", None) for output in written)
+            for leaf in leaves:
+                outputs = output_names(leaf, scope)
+                if (
+                    not outputs
+                    or outputs & written_names
+                    or any(getattr(leaf, "output_group", None) is group for group in written)
+                ):
+                    return None
+        rerun_names = sorted(
+            set(
+                f"{getattr(leaf, 'name', leaf)} ({scope})"
+                for scope, leaves in rerun.items()
+                for leaf in leaves
+            )
+        )
+        if not rerun_names:
+            return "no producer of the active scopes is rerun"
+        return f"no output of the rerun producers {', '.join(rerun_names)} is written"
+
+    def costs(self) -> Dict[str, Tuple[int, frozenset]]:
+        """
+        Cost of each recorded shift, i.e. the number of rerun producers in all
+        active scopes, together with the set of the rerun producers. The costs
+        are passed to `partition_shifts`.
+
+        :return: Dictionary of the cost and the rerun producers per shift
+        """
+        costs = {}
+        for name in self.shifts:
+            rerun = self.rerun_producers(name)
+            producers = frozenset(
+                (scope, id(producer)) for scope, leaves in rerun.items() for producer in leaves
+            )
+            costs[name] = (len(producers), producers)
+        return costs
+
+
+def partition_shifts(
+    costs: Dict[str, Tuple[int, frozenset]], executables: int
+) -> List[List[str]]:
+    """
+    Partition shifts into groups with balanced summed costs.
+
+    Shifts rerunning the same producers are grouped first, as they share the
+    expensive parts of their computation. Groups exceeding the mean cost of an
+    executable are cut into consecutive chunks, so that the up and down
+    variations of a source, which are added one after another, stay together.
+    The groups are then assigned to the executables in the order of their
+    decreasing cost, each to the executable with the lowest summed cost
+    (longest processing time first).
+
+    :param costs: Cost and rerun producers of each shift, see
+                  `ShiftSurvey.costs`
+    :param executables: Number of executables
+    :return: List of the shift names of each executable, without empty
+             executables
+    """
+    if executables < 1:
+        raise ValueError(f"Number of executables has to be positive, got {executables}.")
+    # shifts without rerun producers still add their outputs
+    weight = dict((name, max(cost, 1)) for name, (cost, _) in costs.items())
+    limit = math.ceil(sum(weight.values()) / executables)
+
+    shared: Dict[frozenset, List[str]] = {}
+    for name, (_, producers) in costs.items():
+        shared.setdefault(producers, []).append(name)
+    groups = []
+    for names in shared.values():
+        chunk = []
+        for name in names:
+            if chunk and sum(weight[n] for n in chunk) + weight[name] > limit:
+                groups.append(chunk)
+                chunk = []
+            chunk.append(name)
+        groups.append(chunk)
+
+    partition: List[List[str]] = [[] for _ in range(executables)]
+    loads = [0] * executables
+    for group in sorted(groups, key=lambda group: -sum(weight[n] for n in group)):
+        index = loads.index(min(loads))
+        partition[index].extend(group)
+        loads[index] += sum(weight[n] for n in group)
+    return [names for names in partition if names]
+
+
+def describe_partition(
+    costs: Dict[str, Tuple[int, frozenset]], partition: Iterable[List[str]]
+) -> List[Dict[str, object]]:
+    """
+    Summary of a partition with the shifts and the summed cost of each
+    executable.
+    """
+    return [
+        {"shifts": list(names), "cost": sum(costs[name][0] for name in names)}
+        for names in partition
+    ]
+
+
+def shift_executable_name(executable_name: str, index: int) -> str:
+    """
+    Name of the executable `index` of a partition. The first executable keeps
+    the name of the executable without split shifts, so that it is run in the
+    same way.
+    """
+    if index == 0:
+        return executable_name
+    return f"{executable_name}_shifts{index}"
@@ -0,0 +1,144 @@
+"""
+Startup-time breakdown of the executables.
+
+The executables report the time and the resident memory spent in each phase
+of their startup as json file:
+
+- `initialization`: from the start of the executable to the first producer,
+- the call of each producer in each scope and shift, which constructs the
+  dataframe graph. This includes the loading of the correctionlib payloads and
+  the creation of the ONNX sessions used by the producer. As payloads are
+  loaded only once, the loading time of a payload is contained in the call of
+  the first producer using it. These calls are marked with the categories
+  `payload` and `onnx`,
+- `jit`: from the end of the graph construction to the first processed event,
+  which is dominated by the just-in-time compilation of the graph.
+
+The report is written next to the output file of the executable, e.g. to
+`output.startup_report.json` for `output.root`, or to the path given by the
+`XYH_STARTUP_REPORT` environment variable, see `xyh::startup::Report` in
+`cpp_addons/src/startup.cxx`.
+
+The calls of the producers are enclosed by the timers only in a copy of the
+expanded configuration, which is passed to the code generation. The producers
+themselves are shared between the configurations and are left untouched.
+"""
+
+from __future__ import annotations  # needed for type annotations in > python 3.7
+
+import re
+from typing import List
+
+from code_generation.configuration import Configuration
+from code_generation.producer import Producer, ProducerGroup
+
+from .configuration_hooks import ConfigurationHook, HookedConfiguration, reachable_objects
+from .constants import GLOBAL_SCOPES, STARTUP_REPORT
+from .helpers import as_list, scoped
+
+__all__ = [
+    "StartupReport",
+    "attach_startup_report",
+]
+
+
+# payload files are passed to the producers as quoted configuration parameters,
+# the names of the corrections in the payloads often follow as parameter, both
+# also as vectors of one entry
+_PAYLOAD_ARGUMENT = re.compile(
+    r'"\{(\w*file\w*)\}"(?:\{vec_close\})?'
+    r'(?:\s*,\s*(?:\{vec_open\})?"\{(\w*name\w*)\}")?',
+    re.IGNORECASE,
+)
+_TIMED_CALL_PREFIX = "(xyh::startup::Begin("
+
+
+def _timed_call(producer: Producer | ProducerGroup) -> str:
+    """
+    Call of a producer enclosed by `xyh::startup::Begin` and
+    `xyh::startup::End`, which record the time and memory spent in the call.
+    """
+    payloads = []
+    corrections = []
+    for match in _PAYLOAD_ARGUMENT.finditer(producer.call):
+        payloads.append(f'"{{{match.group(1)}}}"')
+        corrections.append(f'"{{{match.group(2)}}}"' if match.group(2) else '""')
+    outputs = "{output}" if scoped(getattr(producer, "output", None), None) else ""
+    return (
+        f'{_TIMED_CALL_PREFIX}"{producer.name}", "{{startup_report_scope}}", '
+        f"{{vec_open}}{outputs}{{vec_close}}, "
+        f'{{vec_open}}{", ".join(payloads)}{{vec_close}}, '
+        f'{{vec_open}}{", ".join(corrections)}{{vec_close}}), '
+        f"xyh::startup::End({producer.call}))"
+    )
+
+
+class StartupReport(ConfigurationHook):
+    """
+    Startup-time breakdown of the executables of a configuration.
+
+    The report is registered as hook of the configuration. When the
+    configuration is optimized, the producers writing the report are added to
+    each scope. The calls of all producers of the expanded configuration,
+    including the producers added by modification rules and systematic
+    shifts, are enclosed by the timers of the report in the copy of the
+    expanded configuration, which is passed to the code generation.
+
+    :param scopes: Scopes of the configuration, including the global scope
+    """
+
+    rewrites_expansion = True
+
+    def __init__(self, scopes: List[str]):
+        self.scopes = list(scopes)
+
+    def finalize(self, configuration: Configuration):
+        """
+        Write the report when the first event is processed.
+        """
+        for scope in self.scopes:
+            if scope in GLOBAL_SCOPES:
+                continue
+            configuration.add_producers(
+                scope,
+                [
+                    Producer(
+                        name="StartupReport",
+                        call="xyh::startup::Write({df})",
+                        input=[],
+                        output=None,
+                        scopes=[scope],
+                    ),
+                ],
+            )
+
+    def rewrite(self, expanded: Configuration):
+        for producer in reachable_objects(expanded):
+            if not isinstance(producer, (Producer, ProducerGroup)):
+                continue
+            call = getattr(producer, "call", None)
+            if (
+                isinstance(call, str)
+                and "{df}" in call
+                and not call.startswith(_TIMED_CALL_PREFIX)
+                and producer.name != "StartupReport"
+            ):
+                producer.call = _timed_call(producer)
+
+
+def attach_startup_report(
+    configuration: HookedConfiguration, scopes: List[str]
+) -> StartupReport | None:
+    """
+    Add the startup-time report to the executables of a configuration, if
+    `STARTUP_REPORT` is set in `constants.py`.
+
+    :param configuration: Configuration, whose executables report their startup
+    :param scopes: Scopes of the configuration, including the global scope
+    :return: Startup report or `None`, if no report is written
+    """
+    if not STARTUP_REPORT:
+        return None
+    for scope in as_list(scopes):
+        configuration.add_config_parameters([scope], {"startup_report_scope": scope})
+    return configuration.add_hook(StartupReport(scopes))
@@ -1,15 +1,24 @@
 from code_generation.configuration import Configuration
 from code_generation.modifiers import EraModifier
+from code_generation.producer import Producer, ProducerGroup
+from code_generation.quantity import Quantity
 
 from .constants import (
     ET_SCOPES,
     MT_SCOPES,
     TT_SCOPES,
+    EM_SCOPES,
+    MM_SCOPES,
     ELECTRON_SCOPES,
     MUON_SCOPES,
+    ERAS,
     ERAS_RUN2,
     ERAS_RUN3,
+    TRIGGER_SFS_IN_ONE_PASS,
 )
+from .helpers import get_for_era
+from .producers._helpers import trigger_scalefactors_producer_factory
+from .quantities import output as q
 
 
 def _get_updated_dict(
@@ -32,6 +41,236 @@ def _get_updated_dict(
     return modified_dict
 
 
+# keys of the output name, the trigger flag and the variation in the entries of
+# the vector configurations of the trigger scale factors
+_TRIGGER_SF_KEYS = {
+    "ele_trigger_sf": ("e_trigger_flagname", "e_trigger_flag", "e_trigger_variation"),
+    "mu_trigger_sf": ("m_trigger_flagname", "m_trigger_flag", "m_trigger_variation"),
+    "double_tautau_trigger_leg1_sf": ("tt_trigger_leg1_flagname", "tt_trigger_flag", "tt_trigger_leg1_variation"),
+    "double_tautau_trigger_leg2_sf": ("tt_trigger_leg2_flagname", "tt_trigger_flag", "tt_trigger_leg2_variation"),
+}
+
+
+def _trigger_scalefactor_entries(era: str) -> dict[str, list[dict]]:
+    """
+    Entries of the vector configurations of the single-lepton and double-tau
+    trigger scale factors in `era`. The entries are used for the vector
+    producers of the trigger scale factors, e.g. `scalefactors.SingleMuTriggerSF`,
+    and for the producers returned by `get_trigger_scalefactor_producers`.
+
+    :param era: Name of the era
+
+    :returns: Dictionary with the names of the vector configurations as keys
+              and the lists of entries as values. The double-tau trigger scale
+              factors are only included for eras, in which they are available.
+    """
+    entries = {
+        "ele_trigger_sf": [
+            {
+                "e_trigger_flagname": "trg_wgt_single_ele30",
+                "e_trigger_flag": "trg_single_ele30",
+                "e_trigger_era": get_for_era(
+                    {
+                        tuple(ERAS_RUN2): era,
+                        "2022preEE": "2022Re-recoBCD",
+                        "2022postEE": "2022Re-recoE+PromptFG",
+                        "2023preBPix": "2023PromptC",
+                        "2023postBPix": "2023PromptD",
+                        "2024": "2024Prompt",
+                    },
+                    era,
+                ),
+                "e_trigger_sf_name": "Electron-HLT-SF",
+                "e_trigger_path_id_name": "HLT_SF_Ele30_MVAiso90ID",
+                "e_trigger_variation": "sf",
+            },
+        ],
+        "mu_trigger_sf": [
+            {
+                "m_trigger_flagname": "trg_wgt_single_mu24",
+                "m_trigger_flag": "trg_single_mu24",
+                "m_trigger_sf_name": "NUM_IsoMu24_DEN_CutBasedIdTight_and_PFIsoTight",
+                "m_trigger_variation": "nominal",
+            },
+        ],
+    }
+
+    double_tautau_trigger_flags = get_for_era(
+        {
+            "2018": [
+                "trg_double_tau35_mediumiso",
+                "trg_double_tau35_tightiso",
+                "trg_double_tau40_mediumiso",
+                "trg_double_tau40_tightiso",
+            ],
+            ("2022preEE", "2022postEE", "2023preBPix", "2023postBPix"): [
+                "trg_double_tau35_mediumdeeptau",
+            ],
+            "2024": [
+                "trg_double_tau35_mediumpnet",
+            ],
+        },
+        era,
+        default=[],
+    )
+    if double_tautau_trigger_flags:
+        for leg in [1, 2]:
+            entries[f"double_tautau_trigger_leg{leg}_sf"] = [
+                {
+                    f"tt_trigger_leg{leg}_flagname": f"{flag.replace('trg_', 'trg_wgt')}_leg{leg}"
+                    if era == "2018"
+                    else f"{flag.replace('trg_', 'trg_wgt_')}_leg{leg}",
+                    "tt_trigger_flag": flag,
+                    "tt_trigger_leg1_sf_name": "ditau",
+                    "tt_trigger_leg1_variation": "nom",
+                    "tt_trigger_leg2_sf_name": "ditau",
+                    "tt_trigger_leg2_variation": "nom",
+                }
+                for flag in double_tautau_trigger_flags
+            ]
+
+    return entries
+
+
+def _trigger_scalefactor_outputs(vec_config: str, entries: list[dict]) -> list[tuple[str, str, str]]:
+    """
+    Output names, trigger flags and variations of the entries of a vector
+    configuration of trigger scale factors.
+
+    :param vec_config: Name of the vector configuration, e.g. `mu_trigger_sf`
+    :param entries: Entries of the vector configuration
+
+    :returns: List of tuples of the output name, the trigger flag and the variation
+    """
+    flagname_key, flag_key, variation_key = _TRIGGER_SF_KEYS[vec_config]
+    return [(entry[flagname_key], entry[flag_key], entry[variation_key]) for entry in entries]
+
+
+def get_trigger_scalefactor_producers(era: str) -> dict[str, Producer | ProducerGroup]:
+    """
+    Producers evaluating the trigger scale factors of all triggers of a leg in
+    one pass with `scalefactor::trigger::Evaluate`, which replace the vector
+    producers of the trigger scale factors in `era`, e.g.
+    `scalefactors.SingleMuTriggerSF`, if `TRIGGER_SFS_IN_ONE_PASS` is set.
+
+    The producers write the same columns as the vector producers. The
+    variation of each scale factor is given by the configuration parameter
+    `<output name>_variation`, e.g. `trg_wgt_single_mu24_variation`, which is
+    changed in the systematic shifts of the trigger scale factors.
+
+    :param era: Name of the era
+
+    :returns: Dictionary with the names of the replaced vector producers, i.e.
+              `SingleEleTriggerSF`, `SingleMuTriggerSF` and `TauTauTriggerSF`,
+              as keys and the producers as values. Vector producers, for
+              which no scale factors are available in `era`, are not included.
+    """
+    entries = _trigger_scalefactor_entries(era)
+    producers = {}
+
+    def scalefactors(vec_config, sf_file, sf_name, arguments):
+        flagname_key, flag_key, _ = _TRIGGER_SF_KEYS[vec_config]
+        return [
+            (
+                Quantity(entry[flagname_key]),
+                entry[flag_key],
+                sf_file,
+                sf_name(entry),
+                arguments(entry, f"{{{entry[flagname_key]}_variation}}"),
+            )
+            for entry in entries[vec_config]
+        ]
+
+    # single electron trigger, inputs of the correction are the era, the
+    # variation, the trigger path, eta and pt
+    producers["SingleEleTriggerSF"] = trigger_scalefactors_producer_factory(
+        name="SingleEleTriggerSFs",
+        pt=q.pt_1,
+        scalefactors=scalefactors(
+            "ele_trigger_sf",
+            "{e_trigger_sf_file}",
+            lambda entry: entry["e_trigger_sf_name"],
+            lambda entry, variation: [
+                entry["e_trigger_era"],
+                variation,
+                entry["e_trigger_path_id_name"],
+                q.eta_1,
+                q.pt_1,
+            ],
+        ),
+        scopes=ELECTRON_SCOPES,
+    )
+
+    # single muon trigger, inputs of the correction are |eta|, pt and the
+    # variation
+    muon_sfs = {
+        leg: trigger_scalefactors_producer_factory(
+            name=f"SingleMuTriggerSFs_{leg}",
+            pt=pt,
+            scalefactors=scalefactors(
+                "mu_trigger_sf",
+                "{muon_sf_file}",
+                lambda entry: entry["m_trigger_sf_name"],
+                lambda entry, variation: [("abs", eta), pt, variation],
+            ),
+            scopes=scopes,
+        )
+        for leg, pt, eta, scopes in [
+            (1, q.pt_1, q.eta_1, MT_SCOPES + MM_SCOPES),
+            (2, q.pt_2, q.eta_2, EM_SCOPES),
+        ]
+    }
+    producers["SingleMuTriggerSF"] = ProducerGroup(
+        name="SingleMuTriggerSFs",
+        call=None,
+        input=None,
+        output=None,
+        scopes=MUON_SCOPES,
+        subproducers={
+            **{scope: [muon_sfs[1]] for scope in MT_SCOPES + MM_SCOPES},
+            **{scope: [muon_sfs[2]] for scope in EM_SCOPES},
+        },
+    )
+
+    # double tau trigger, inputs of the correction "tau_trigger" are pt, the
+    # decay mode, the trigger type, e.g. "ditau", the working point, the
+    # correction type and the variation
+    if "double_tautau_trigger_leg1_sf" in entries:
+        producers["TauTauTriggerSF"] = ProducerGroup(
+            name="DoubleTauTauTriggerSFs",
+            call=None,
+            input=None,
+            output=None,
+            scopes=TT_SCOPES,
+            subproducers=[
+                trigger_scalefactors_producer_factory(
+                    name=f"DoubleTauTauTriggerSFs_{leg}",
+                    pt=pt,
+                    scalefactors=scalefactors(
+                        f"double_tautau_trigger_leg{leg}_sf",
+                        "{tau_trigger_sf_file}",
+                        lambda entry: "tau_trigger",
+                        lambda entry, variation: [
+                            pt,
+                            ("UChar_t", decaymode),
+                            entry[f"tt_trigger_leg{leg}_sf_name"],
+                            "Medium",
+                            "sf",
+                            variation,
+                        ],
+                    ),
+                    scopes=TT_SCOPES,
+                )
+                for leg, pt, decaymode in [
+                    (1, q.pt_1, q.tau_decaymode_1),
+                    (2, q.pt_2, q.tau_decaymode_2),
+                ]
+            ],
+        )
+
+    return producers
+
+
 def _add_electron_triggers(
     configuration: Configuration,
 ):
@@ -1208,28 +1447,12 @@ def add_diTauTriggerSetup(configuration: Configuration):
                     "2024": "/cvmfs/cms-griddata.cern.ch/cat/metadata/EGM/Run3-24CDEReprocessingFGHIPrompt-Summer24-NanoAODv15/2025-12-15/electronHlt.json.gz",
                 }
             ),
-            "ele_trigger_sf": [
+            "ele_trigger_sf": EraModifier(
                 {
-                    "e_trigger_flagname": "trg_wgt_single_ele30",
-                    "e_trigger_flag": "trg_single_ele30",
-                    "e_trigger_era": EraModifier(
-                        {
-                            **{
-                                _era: _era
-                                for _era in ERAS_RUN2
-                            },
-                            "2022preEE": "2022Re-recoBCD",
-                            "2022postEE": "2022Re-recoE+PromptFG",
-                            "2023preBPix": "2023PromptC",
-                            "2023postBPix": "2023PromptD",
-                            "2024": "2024Prompt",
-                        }
-                    ),
-                    "e_trigger_sf_name": "Electron-HLT-SF",
-                    "e_trigger_path_id_name": "HLT_SF_Ele30_MVAiso90ID",
-                    "e_trigger_variation": "sf",
-                },
-            ],
+                    _era: _trigger_scalefactor_entries(_era)["ele_trigger_sf"]
+                    for _era in ERAS
+                }
+            ),
         },
     )
 
@@ -1286,14 +1509,12 @@ def add_diTauTriggerSetup(configuration: Configuration):
     configuration.add_config_parameters(
         MUON_SCOPES,
         {
-            "mu_trigger_sf": [
+            "mu_trigger_sf": EraModifier(
                 {
-                    "m_trigger_flagname": "trg_wgt_single_mu24",
-                    "m_trigger_flag": "trg_single_mu24",
-                    "m_trigger_sf_name": "NUM_IsoMu24_DEN_CutBasedIdTight_and_PFIsoTight",
-                    "m_trigger_variation": "nominal",
-                },
-            ],
+                    _era: _trigger_scalefactor_entries(_era)["mu_trigger_sf"]
+                    for _era in ERAS
+                }
+            ),
         },
     )
 
@@ -1334,84 +1555,37 @@ def add_diTauTriggerSetup(configuration: Configuration):
     )
 
     # double tau-tau trigger scale factors
-    common_double_tautau_trigger_args = {
-        "tt_trigger_leg1_sf_name": "ditau",
-        "tt_trigger_leg1_variation": "nom",
-        "tt_trigger_leg2_sf_name": "ditau",
-        "tt_trigger_leg2_variation": "nom",
-    }
     configuration.add_config_parameters(
         TT_SCOPES,
         {
-            "double_tautau_trigger_leg1_sf": EraModifier(
+            f"double_tautau_trigger_leg{_leg}_sf": EraModifier(
                 {
-                    "2018": [
-                        {
-                            "tt_trigger_leg1_flagname": f"{flag.replace('trg_', 'trg_wgt')}_leg1",
-                            "tt_trigger_flag": flag,
-                            **common_double_tautau_trigger_args,
-                        }
-                        for flag in [
-                            "trg_double_tau35_mediumiso",
-                            "trg_double_tau35_tightiso",
-                            "trg_double_tau40_mediumiso",
-                            "trg_double_tau40_tightiso",
-                        ]
-                    ],
-                    **{
-                        _era: [
-                            {
-                                "tt_trigger_leg1_flagname": "trg_wgt_double_tau35_mediumdeeptau_leg1",
-                                "tt_trigger_flag": "trg_double_tau35_mediumdeeptau",
-                                **common_double_tautau_trigger_args,
-                            },
-                        ]
-                        for _era in ["2022preEE", "2022postEE", "2023preBPix", "2023postBPix"]
-                    },
-                    "2024": [
-                        {
-                            "tt_trigger_leg1_flagname": "trg_wgt_double_tau35_mediumpnet_leg1",
-                            "tt_trigger_flag": "trg_double_tau35_mediumpnet",
-                            **common_double_tautau_trigger_args,
-                        },
-                    ],
-                },
-            ),
-            "double_tautau_trigger_leg2_sf": EraModifier(
-                {
-                    "2018": [
-                        {
-                            "tt_trigger_leg2_flagname": f"{flag.replace('trg_', 'trg_wgt')}_leg2",
-                            "tt_trigger_flag": flag,
-                            **common_double_tautau_trigger_args,
-                        }
-                        for flag in [
-                            "trg_double_tau35_mediumiso",
-                            "trg_double_tau35_tightiso",
-                            "trg_double_tau40_mediumiso",
-                            "trg_double_tau40_tightiso",
-                        ]
-                    ],
-                    **{
-                        _era: [
-                            {
-                                "tt_trigger_leg2_flagname": "trg_wgt_double_tau35_mediumdeeptau_leg2",
-                                "tt_trigger_flag": "trg_double_tau35_mediumdeeptau",
-                                **common_double_tautau_trigger_args,
-                            },
-                        ]
-                        for _era in ["2022preEE", "2022postEE", "2023preBPix", "2023postBPix"]
-                    },
-                    "2024": [
-                        {
-                            "tt_trigger_leg2_flagname": "trg_wgt_double_tau35_mediumpnet_leg2",
-                            "tt_trigger_flag": "trg_double_tau35_mediumpnet",
-                            **common_double_tautau_trigger_args,
-                        },
-                    ],
-                },
-            ),
+                    _era: _trigger_scalefactor_entries(_era)[f"double_tautau_trigger_leg{_leg}_sf"]
+                    for _era in ERAS
+                    if f"double_tautau_trigger_leg{_leg}_sf" in _trigger_scalefactor_entries(_era)
+                }
+            )
+            for _leg in [1, 2]
         },
     )
 
+    # variations of the trigger scale factors evaluated in one pass, see
+    # `get_trigger_scalefactor_producers`
+    if TRIGGER_SFS_IN_ONE_PASS:
+        for scopes, vec_configs in [
+            (ELECTRON_SCOPES, ["ele_trigger_sf"]),
+            (MUON_SCOPES, ["mu_trigger_sf"]),
+            (TT_SCOPES, ["double_tautau_trigger_leg1_sf", "double_tautau_trigger_leg2_sf"]),
+        ]:
+            configuration.add_config_parameters(
+                scopes,
+                {
+                    f"{flagname}_variation": variation
+                    for _era in ERAS
+                    for vec_config, entries in _trigger_scalefactor_entries(_era).items()
+                    if vec_config in vec_configs
+                    for flagname, _, variation in _trigger_scalefactor_outputs(vec_config, entries)
+                },
+            )
+
     return configuration
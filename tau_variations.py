@@ -6,6 +6,32 @@ from .producers import pairselection as pairselection
 from .producers import muons as muons
 from .producers import electrons as electrons
 from .producers import taus as taus
+from .constants import TAU_ES_VARIATIONS_IN_ONE_PASS
+
+
+def tes_shift_config(
+    shift: str,
+    parameter: str,
+    variation: str,
+    variation_parameter: str = "tau_ES_variation",
+) -> dict:
+    """
+    Configuration of a tau energy scale shift. If the energy scale variations
+    are evaluated in one pass (see `TAU_ES_VARIATIONS_IN_ONE_PASS`), the shift
+    selects the precomputed variation named like the shift. Otherwise, the
+    variation of the correction is set for the parameter of the affected taus.
+
+    :param shift: Name of the shift
+    :param parameter: Configuration parameter of the affected taus, e.g.
+                      `tau_ES_shift_DM0`
+    :param variation: Variation of the correction, e.g. `up` or `down`
+    :param variation_parameter: Configuration parameter selecting the
+                                precomputed variation. Optional.
+    :return: Dictionary with the shifted configuration parameters
+    """
+    if TAU_ES_VARIATIONS_IN_ONE_PASS:
+        return {variation_parameter: shift}
+    return {parameter: variation}
 
 
 def add_tauVariations(
@@ -440,7 +466,9 @@ def add_tauVariations(
     configuration.add_shift(
         SystematicShift(
             name="tauEs1prong0pizeroDown",
-            shift_config={("et", "mt", "tt"): {"tau_ES_shift_DM0": "down"}},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config("tauEs1prong0pizeroDown", "tau_ES_shift_DM0", "down")
+            },
             producers={("et", "mt", "tt"): tau_pt_correction_producer},
             ignore_producers={
                 "et": [pairselection.LVEl1, electrons.VetoElectrons],
@@ -452,7 +480,9 @@ def add_tauVariations(
     configuration.add_shift(
         SystematicShift(
             name="tauEs1prong0pizeroUp",
-            shift_config={("et", "mt", "tt"): {"tau_ES_shift_DM0": "up"}},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config("tauEs1prong0pizeroUp", "tau_ES_shift_DM0", "up")
+            },
             producers={("et", "mt", "tt"): tau_pt_correction_producer},
             ignore_producers={
                 "et": [pairselection.LVEl1, electrons.VetoElectrons],
@@ -464,7 +494,9 @@ def add_tauVariations(
     configuration.add_shift(
         SystematicShift(
             name="tauEs1prong1pizeroDown",
-            shift_config={("et", "mt", "tt"): {"tau_ES_shift_DM1": "down"}},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config("tauEs1prong1pizeroDown", "tau_ES_shift_DM1", "down")
+            },
             producers={("et", "mt", "tt"): tau_pt_correction_producer},
             ignore_producers={
                 "et": [pairselection.LVEl1, electrons.VetoElectrons],
@@ -476,7 +508,9 @@ def add_tauVariations(
     configuration.add_shift(
         SystematicShift(
             name="tauEs1prong1pizeroUp",
-            shift_config={("et", "mt", "tt"): {"tau_ES_shift_DM1": "up"}},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config("tauEs1prong1pizeroUp", "tau_ES_shift_DM1", "up")
+            },
             producers={("et", "mt", "tt"): tau_pt_correction_producer},
             ignore_producers={
                 "et": [pairselection.LVEl1, electrons.VetoElectrons],
@@ -488,7 +522,9 @@ def add_tauVariations(
     configuration.add_shift(
         SystematicShift(
             name="tauEs3prong0pizeroDown",
-            shift_config={("et", "mt", "tt"): {"tau_ES_shift_DM10": "down"}},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config("tauEs3prong0pizeroDown", "tau_ES_shift_DM10", "down")
+            },
             producers={("et", "mt", "tt"): tau_pt_correction_producer},
             ignore_producers={
                 "et": [pairselection.LVEl1, electrons.VetoElectrons],
@@ -500,7 +536,9 @@ def add_tauVariations(
     configuration.add_shift(
         SystematicShift(
             name="tauEs3prong0pizeroUp",
-            shift_config={("et", "mt", "tt"): {"tau_ES_shift_DM10": "up"}},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config("tauEs3prong0pizeroUp", "tau_ES_shift_DM10", "up")
+            },
             producers={("et", "mt", "tt"): tau_pt_correction_producer},
             ignore_producers={
                 "et": [pairselection.LVEl1, electrons.VetoElectrons],
@@ -512,7 +550,9 @@ def add_tauVariations(
     configuration.add_shift(
         SystematicShift(
             name="tauEs3prong1pizeroDown",
-            shift_config={("et", "mt", "tt"): {"tau_ES_shift_DM11": "down"}},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config("tauEs3prong1pizeroDown", "tau_ES_shift_DM11", "down")
+            },
             producers={("et", "mt", "tt"): tau_pt_correction_producer},
             ignore_producers={
                 "et": [pairselection.LVEl1, electrons.VetoElectrons],
@@ -524,7 +564,9 @@ def add_tauVariations(
     configuration.add_shift(
         SystematicShift(
             name="tauEs3prong1pizeroUp",
-            shift_config={("et", "mt", "tt"): {"tau_ES_shift_DM11": "up"}},
+            shift_config={
+                ("et", "mt", "tt"): tes_shift_config("tauEs3prong1pizeroUp", "tau_ES_shift_DM11", "up")
+            },
             producers={("et", "mt", "tt"): tau_pt_correction_producer},
             ignore_producers={
                 "et": [pairselection.LVEl1, electrons.VetoElectrons],